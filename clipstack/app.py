@@ -12,9 +12,10 @@ from .clipboard_watcher import ClipboardWatcher
 from .ui.main_window import HistoryWindow
 from .ui.settings_dialog import SettingsDialog
 from .storage import Storage
+from .ocr_manager import OCRQueue, get_ocr_manager
 from .settings import Settings
 from .startup import set_launch_at_startup, is_launch_at_startup
-from .utils import resource_path, notify_tray, svg_icon, copy_to_clipboard_safely
+from .utils import resource_path, notify_tray, svg_icon, copy_to_clipboard_safely, warm_icon_cache
 from .hotkey import HotkeyManager
 from .i18n import i18n
 from .sensitive_detector import ensure_sensitive_access
@@ -131,6 +132,9 @@ class TrayApp:
         except Exception:
             pass
 
+        # Kart / araç çubuğu ikonları bir kez çizilir, sonra önbellekten gelir
+        warm_icon_cache()
+
         self.app_icon = self._resolve_app_icon()
         tray_icon = self._resolve_tray_icon()
         self.app.setWindowIcon(self.app_icon)
@@ -156,9 +160,26 @@ class TrayApp:
             password, ok = QInputDialog.getText(None, "Şifre", "Veri şifrenizi girin:", QLineEdit.Password)
             if ok and password:
                 self.settings.set("encryption_key", password)
+                # Eski şifreli verileri taşı, eksik içerik özetlerini arka planda hesapla
+                self.storage.start_background_maintenance()
+                self.storage.sync_blind_index()
             else:
                 QMessageBox.warning(None, "Hata", "Şifre girilmedi, uygulama kapatılıyor.")
                 sys.exit(1)
+        else:
+            # Eski sürümle kaydedilmiş kartların içerik özeti / akıllı içerik / hassas veri alanlarını doldur
+            self.storage.start_background_maintenance()
+            self.storage.start_reclassification()
+            self.storage.start_sensitive_rescan()
+
+        # Otomatik silme, öğe / boyut sınırı ve sahipsiz harici görseller
+        self.storage.start_retention()
+
+        # Görseller için arka plan OCR kuyruğu (bekleyen işler veritabanında tutulur)
+        # Sonuçlar (OCR metni ya da hassas içerik nedeniyle silinen görsel) Storage olaylarıyla yansır
+        self.ocr_queue = OCRQueue(self.storage, self.settings)
+        self.storage.on_ocr_pending = self.ocr_queue.notify
+        self.ocr_queue.start()
 
         self.tray = QSystemTrayIcon(tray_icon, self.app)
         self.menu = QMenu()
@@ -216,11 +237,8 @@ class TrayApp:
         self._refresh_texts()
         i18n.languageChanged.connect(self._refresh_texts)
 
+        # Yeni kayıtlar pencereye Storage değişiklik olaylarıyla ulaşır
         self.clipboard_watcher = ClipboardWatcher(self.app.clipboard(), self.storage, self.settings)
-        try:
-            self.clipboard_watcher.item_added.connect(self.window.on_item_added)
-        except Exception:
-            pass
 
         self._hotkey_bridge = HotkeyBridge()
         self._hotkey_bridge.trigger.connect(self.toggle_window)
@@ -597,6 +615,30 @@ class TrayApp:
         except Exception:
             pass
         self._rebind_all_hotkeys()
+
+        # Kör arama indeksi ayarı değiştiyse indeksi güncelle
+        try:
+            self.storage.sync_blind_index()
+        except Exception as e:
+            print(f"[STORAGE] Kör arama indeksi güncellenemedi: {e}")
+
+        # Hassas veri ayarları değiştiyse kayıtları yeniden tara
+        try:
+            self.storage.start_sensitive_rescan()
+        except Exception as e:
+            print(f"[STORAGE] Hassas veri taraması başlatılamadı: {e}")
+
+        # Saklama sınırları değiştiyse eski kayıtları temizle
+        try:
+            self.storage.start_retention()
+        except Exception as e:
+            print(f"[STORAGE] Saklama geçişi başlatılamadı: {e}")
+
+        # OCR açıldıysa bekleyen görselleri işlemeye başla
+        try:
+            self.ocr_queue.notify()
+        except Exception:
+            pass
         
         # Video recorder ayarlarını yeniden yükle
         try:
@@ -695,9 +737,7 @@ class TrayApp:
                 created_at=created_at
             )
             
-            if row:
-                self.window.on_item_added(row)
-            else:
+            if not row:
                 print("[SCREENSHOT] Görsel hassas veri politikası nedeniyle kaydedilmedi")
             
             if self.settings.get("show_toast", True):
@@ -732,8 +772,7 @@ class TrayApp:
                 )
                 return
             
-            from .ocr_manager import OCRManager
-            ocr = OCRManager(self.settings)
+            ocr = get_ocr_manager(self.settings)
             
             if not ocr.is_available():
                 notify_tray(
@@ -769,8 +808,7 @@ class TrayApp:
     def _on_ocr_screenshot(self, png_bytes: bytes):
         """OCR için alınan ekran görüntüsünü işle"""
         try:
-            from .ocr_manager import OCRManager
-            ocr = OCRManager(self.settings)
+            ocr = get_ocr_manager(self.settings)
             
             ocr_lang = self.settings.get("ocr_language", "tur+eng")
             text = ocr.extract_text(png_bytes, lang=ocr_lang)
@@ -788,9 +826,7 @@ class TrayApp:
                     created_at=created_at
                 )
                 
-                if row:
-                    self.window.on_item_added(row)
-                else:
+                if not row:
                     print("[OCR] Çıkarılan metin hassas veri politikası nedeniyle geçmişe eklenmedi")
                 
                 if self.settings.get("show_toast", True):
@@ -838,10 +874,6 @@ class TrayApp:
                     self.window.showCentered()
                 except Exception:
                     self.window.show()
-                try:
-                    QTimer.singleShot(0, self.window.reload_items)
-                except Exception:
-                    pass
                 self.window.activateWindow()
                 self.window.raise_()
         finally:
@@ -962,7 +994,7 @@ class TrayApp:
             pass
 
     def open_settings(self):
-        dlg = SettingsDialog(self.settings)
+        dlg = SettingsDialog(self.settings, storage=self.storage)
         if hasattr(dlg, "applied"):
             try:
                 dlg.applied.connect(self._apply_runtime_settings)
@@ -1205,6 +1237,23 @@ class TrayApp:
             print(f"[UPDATE] Başlangıç güncelleme kontrolü hatası: {e}")
 
     def exit_app(self):
+        try:
+            # Kuyrukta bekleyen pano kayıtlarını bitir
+            self.clipboard_watcher.stop()
+        except Exception:
+            pass
+        try:
+            self.ocr_queue.stop()
+        except Exception:
+            pass
+        try:
+            self.window.search_worker.stop()
+        except Exception:
+            pass
+        try:
+            self.storage.stop_background_tasks()
+        except Exception:
+            pass
         try:
             self.settings.clear_ephemeral()
         except Exception:
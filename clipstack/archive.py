@@ -0,0 +1,535 @@
+"""
+Yedek arşivi: akış hâlinde dışa ve içe aktarma
+
+Arşiv bir zip kabıdır. Pano kayıtları parça parça NDJSON üyelerine (satır
+başına bir kayıt) yazılır, görseller base64'e çevrilmeden ayrı ikili
+üyelerde durur:
+
+    clips/000001.ndjson ...   pano kayıtları (parça başına CLIP_CHUNK kayıt)
+    images/<id>.bin           kaydın tam görseli (sıkıştırılmadan)
+    notes.ndjson ...          not, hatırlatma, snippet, görev, çizim bölümleri
+    settings.json             hassas anahtarlar çıkarılmış ayarlar
+    manifest.json             biçim sürümü ve bölüm sayıları (en son yazılır)
+
+Yazarken ve okurken bellekte en fazla bir parça tutulur. İçe aktarma
+kayıtları parti parti tek işlemde ekler (Storage.import_clips) ve içerik
+özeti zaten bulunanları atlar. Eski tek parça JSON yedekleri de okunur; o
+biçim akış hâlinde ayrıştırılamadığından dosya bir kez belleğe alınır.
+
+ArchiveWorker bu işleri, anlık görüntü yedeklerini (clipstack.snapshot) ve
+artımlı bulut yedeğini (clipstack.cloud_backup) GUI thread'i dışında
+çalıştırır ve ilerlemeyi sinyalle bildirir.
+"""
+from __future__ import annotations
+
+import base64
+import gzip
+import io
+import json
+import os
+import threading
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+ARCHIVE_VERSION = 2
+# Bir NDJSON parçasındaki pano kaydı sayısı (bellekte tutulan en büyük birim)
+CLIP_CHUNK = 500
+# İçe aktarmada tek işlemde (transaction) eklenen kayıt sayısı
+IMPORT_BATCH = 200
+# Dışa aktarmada ilerleme bu kadar kayıtta bir bildirilir
+_PROGRESS_EVERY = 100
+# Dışa ve içe aktarılan yan bölümler (sırasıyla)
+SECTIONS = ("notes", "reminders", "snippets", "todos", "drawings")
+# Ayarlarda bu parçaları içeren anahtarlar yedeğe yazılmaz
+_SECRET_SETTING_PARTS = ("password", "secret", "key", "token")
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class ArchiveCancelled(Exception):
+    """Dışa / içe aktarma kullanıcı tarafından iptal edildi."""
+
+
+class ArchiveError(Exception):
+    """Dosya tanınan bir yedek biçiminde değil."""
+
+
+def _check_cancelled(cancel: Optional[threading.Event]) -> None:
+    if cancel is not None and cancel.is_set():
+        raise ArchiveCancelled()
+
+
+def safe_settings(data: dict) -> dict:
+    """Parola, anahtar ve jeton içeren ayarları çıkar."""
+    return {
+        key: value
+        for key, value in (data or {}).items()
+        if not any(part in key.lower() for part in _SECRET_SETTING_PARTS)
+    }
+
+
+# ---------- Dışa aktarma ----------
+
+def _clip_record(row: dict) -> dict:
+    return {
+        "id": row.get("id"),
+        "item_type": row.get("item_type"),
+        "created_at": row.get("created_at"),
+        "text_content": row.get("text_content"),
+        "html_content": row.get("html_content"),
+        "ocr_text": row.get("ocr_text"),
+        "favorite": row.get("favorite"),
+        "pinned": row.get("pinned"),
+        "source_app": row.get("source_app"),
+    }
+
+
+def _section_records(storage, section: str) -> List[dict]:
+    """Yan bölümün dışa aktarılan kayıtları (eski JSON yedekleriyle aynı alanlar)."""
+    if section == "notes":
+        return [
+            {
+                "id": note.get("id"),
+                "content": note.get("content"),
+                "created_at": note.get("created_at"),
+                "updated_at": note.get("updated_at"),
+            }
+            for note in storage.list_notes(limit=-1)
+        ]
+    if section == "reminders":
+        return [
+            {
+                "id": rem.get("id"),
+                "title": rem.get("title"),
+                "description": rem.get("description"),
+                "reminder_time": rem.get("reminder_time"),
+                "repeat": rem.get("repeat_type"),
+                "completed": rem.get("completed"),
+            }
+            for rem in storage.list_reminders(limit=-1)
+        ]
+    if section == "snippets":
+        return [
+            {
+                "id": snip.get("id"),
+                "title": snip.get("title"),
+                "content": snip.get("code"),
+                "language": snip.get("language"),
+                "tags": snip.get("tags"),
+                "created_at": snip.get("created_at"),
+            }
+            for snip in storage.list_snippets(limit=-1)
+        ]
+    if section == "todos":
+        return [
+            {
+                "id": todo.get("id"),
+                "title": todo.get("content"),  # todos tablosunda 'content' kullanılıyor
+                "completed": todo.get("completed"),
+                "list_id": todo.get("list_id"),
+                "created_at": todo.get("created_at"),
+            }
+            for todo in storage.list_todos()
+        ]
+    if section == "drawings":
+        return [
+            {
+                "id": drawing.get("id"),
+                "title": drawing.get("title"),
+                "image_data": drawing.get("image_data"),
+                "created_at": drawing.get("created_at"),
+            }
+            for drawing in storage.list_drawings(limit=-1)
+        ]
+    raise KeyError(section)
+
+
+def _write_ndjson(archive: zipfile.ZipFile, name: str, records: List[dict]) -> None:
+    with archive.open(name, "w", force_zip64=True) as member:
+        writer = io.TextIOWrapper(member, encoding="utf-8", newline="\n")
+        for record in records:
+            writer.write(json.dumps(record, ensure_ascii=False, default=str))
+            writer.write("\n")
+        writer.flush()
+        writer.detach()
+
+
+def export_archive(
+    storage,
+    path,
+    settings_data: Optional[dict] = None,
+    progress: Optional[ProgressCallback] = None,
+    cancel: Optional[threading.Event] = None,
+    chunk_size: int = CLIP_CHUNK,
+) -> Dict[str, int]:
+    """
+    Tüm verileri arşive yaz; bölüm başına kayıt sayılarını döndür. Dosya
+    önce yanındaki geçici dosyaya yazılır ve tamamlanınca yerine taşınır;
+    iptal ya da hata durumunda hedef dosyaya dokunulmaz.
+    """
+    path = Path(path)
+    partial = path.with_name(path.name + ".part")
+    counts = {"clips": 0, "images": 0}
+    sections = {}
+    total = storage.count_items()
+    try:
+        with zipfile.ZipFile(partial, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            chunk: List[dict] = []
+            chunk_no = 0
+
+            def flush_chunk():
+                nonlocal chunk, chunk_no
+                if chunk:
+                    chunk_no += 1
+                    _write_ndjson(archive, f"clips/{chunk_no:06d}.ndjson", chunk)
+                    chunk = []
+
+            for row in storage.iter_export_clips():
+                _check_cancelled(cancel)
+                record = _clip_record(row)
+                if row.get("image_blob"):
+                    record["image"] = f"images/{row['id']}.bin"
+                    # PNG zaten sıkıştırılmış; yeniden sıkıştırmak yalnızca CPU harcar
+                    archive.writestr(
+                        zipfile.ZipInfo(record["image"], date_time=datetime.now().timetuple()[:6]),
+                        bytes(row["image_blob"]),
+                        compress_type=zipfile.ZIP_STORED,
+                    )
+                    counts["images"] += 1
+                chunk.append(record)
+                counts["clips"] += 1
+                if len(chunk) >= chunk_size:
+                    flush_chunk()
+                if progress and counts["clips"] % _PROGRESS_EVERY == 0:
+                    progress(counts["clips"], total)
+            flush_chunk()
+            if progress:
+                progress(counts["clips"], total)
+
+            for section in SECTIONS:
+                _check_cancelled(cancel)
+                records = _section_records(storage, section)
+                _write_ndjson(archive, f"{section}.ndjson", records)
+                sections[section] = len(records)
+
+            archive.writestr(
+                "settings.json",
+                json.dumps(safe_settings(settings_data), ensure_ascii=False, indent=2, default=str),
+            )
+            manifest = {
+                "format": "taxclip-archive",
+                "version": ARCHIVE_VERSION,
+                "exported_at": datetime.now().isoformat(),
+                "clip_chunks": chunk_no,
+                "counts": {**counts, **sections},
+            }
+            archive.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2))
+        os.replace(partial, path)
+    except BaseException:
+        try:
+            partial.unlink()
+        except OSError:
+            pass
+        raise
+    counts.update(sections)
+    return counts
+
+
+# ---------- Okuma ----------
+
+class _ZipArchiveReader:
+    """Zip arşivindeki kayıtları parça parça okur."""
+
+    def __init__(self, path: Path):
+        self._zip = zipfile.ZipFile(path)
+        try:
+            self.manifest = json.loads(self._zip.read("manifest.json"))
+        except (KeyError, ValueError) as e:
+            self._zip.close()
+            raise ArchiveError(f"Arşiv bildirimi okunamadı: {e}") from e
+        if self.manifest.get("format") != "taxclip-archive":
+            self._zip.close()
+            raise ArchiveError("Tanınmayan arşiv biçimi")
+        self.counts = dict(self.manifest.get("counts") or {})
+        self._names = set(self._zip.namelist())
+
+    def _read_ndjson(self, name: str) -> Iterator[dict]:
+        if name not in self._names:
+            return
+        with self._zip.open(name) as member:
+            for line in io.TextIOWrapper(member, encoding="utf-8"):
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def iter_clips(self) -> Iterator[dict]:
+        chunks = sorted(name for name in self._names if name.startswith("clips/") and name.endswith(".ndjson"))
+        for name in chunks:
+            for record in self._read_ndjson(name):
+                image = record.pop("image", None)
+                if image and image in self._names:
+                    record["image_bytes"] = self._zip.read(image)
+                yield record
+
+    def iter_section(self, section: str) -> Iterator[dict]:
+        return self._read_ndjson(f"{section}.ndjson")
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+class _LegacyJsonReader:
+    """Eski tek parça JSON yedeği (SettingsDialog'un önceki biçimi; gzip'li olabilir)."""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as probe:
+            compressed = probe.read(2) == b"\x1f\x8b"
+        opener = gzip.open if compressed else open
+        try:
+            with opener(path, "rt", encoding="utf-8") as f:
+                self._data = json.load(f)
+        except (ValueError, OSError, EOFError) as e:
+            raise ArchiveError(f"Geçersiz JSON dosyası: {e}") from e
+        if not isinstance(self._data, dict):
+            raise ArchiveError("Geçersiz JSON yedeği")
+        self.counts = {
+            name: len(self._data.get(name) or []) for name in ("clips", *SECTIONS)
+        }
+
+    def iter_clips(self) -> Iterator[dict]:
+        clips = self._data.get("clips") or []
+        for index in range(len(clips)):
+            # Okunan kaydı bırak: base64 metinleri ve görseller birikmesin
+            clip, clips[index] = dict(clips[index]), None
+            encoded = clip.pop("image_base64", None)
+            if encoded:
+                clip["image_bytes"] = base64.b64decode(encoded)
+            if not clip.get("text_content") and clip.get("content"):
+                clip["text_content"] = clip["content"]
+            yield clip
+
+    def iter_section(self, section: str) -> Iterator[dict]:
+        return iter(self._data.get(section) or [])
+
+    def close(self) -> None:
+        self._data = {}
+
+
+def open_archive(path):
+    """Yedek dosyasını biçimine göre aç (zip arşivi ya da eski / gzip'li JSON)."""
+    path = Path(path)
+    if zipfile.is_zipfile(path):
+        return _ZipArchiveReader(path)
+    return _LegacyJsonReader(path)
+
+
+# ---------- İçe aktarma ----------
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _section_row(section: str, record: dict) -> Optional[dict]:
+    """Dışa aktarılan kaydı Storage.import_table_rows satırına çevir (geçersizse None)."""
+    created_at = record.get("created_at") or _now()
+    if section == "notes":
+        return {"created_at": created_at, "content": record.get("content") or ""}
+    if section == "reminders":
+        if not record.get("reminder_time"):
+            return None
+        return {
+            "created_at": created_at,
+            "title": record.get("title") or "İçe Aktarılan Hatırlatıcı",
+            "description": record.get("description") or "",
+            "reminder_time": record["reminder_time"],
+            "repeat_type": record.get("repeat") or record.get("repeat_type") or "none",
+        }
+    if section == "snippets":
+        return {
+            "created_at": created_at,
+            "title": record.get("title") or "İçe Aktarılan Snippet",
+            "code": record.get("content") or record.get("code") or "",
+            "language": record.get("language") or "text",
+            "tags": record.get("tags") or "",
+        }
+    if section == "todos":
+        return {
+            "list_id": 1,  # Varsayılan liste
+            "created_at": created_at,
+            "content": record.get("title") or record.get("content") or "İçe Aktarılan Görev",
+            "completed": 1 if record.get("completed") else 0,
+        }
+    if section == "drawings":
+        if not record.get("image_data"):
+            return None
+        return {
+            "created_at": created_at,
+            "image_data": record["image_data"],
+            "title": record.get("title") or "İçe Aktarılan Çizim",
+        }
+    raise KeyError(section)
+
+
+def _valid_clip(record: dict) -> bool:
+    from clipstack.storage import ClipItemType
+
+    try:
+        ClipItemType(int(record.get("item_type") or ClipItemType.TEXT))
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def import_archive(
+    storage,
+    path,
+    progress: Optional[ProgressCallback] = None,
+    cancel: Optional[threading.Event] = None,
+    batch_size: int = IMPORT_BATCH,
+) -> Dict[str, int]:
+    """
+    Arşivi mevcut verilere ekle; bölüm başına eklenen sayıları ve atlanan
+    (yinelenen / engellenen / geçersiz) pano kaydı sayısını döndür. Her parti
+    kendi işleminde yazılır: iptal edilirse o ana kadar eklenen partiler kalır.
+    """
+    reader = open_archive(path)
+    counts = {"clips": 0, "skipped": 0}
+    try:
+        total = sum(int(reader.counts.get(name) or 0) for name in ("clips", *SECTIONS))
+        done = 0
+        batch: List[dict] = []
+
+        def flush_clips():
+            nonlocal batch
+            if batch:
+                inserted, skipped = storage.import_clips(batch)
+                counts["clips"] += inserted
+                counts["skipped"] += skipped
+                batch = []
+
+        for record in reader.iter_clips():
+            _check_cancelled(cancel)
+            done += 1
+            if not _valid_clip(record):
+                counts["skipped"] += 1
+                continue
+            batch.append(record)
+            if len(batch) >= batch_size:
+                flush_clips()
+                if progress:
+                    progress(done, total)
+        flush_clips()
+        if progress:
+            progress(done, total)
+
+        for section in SECTIONS:
+            _check_cancelled(cancel)
+            rows = []
+            for record in reader.iter_section(section):
+                done += 1
+                row = _section_row(section, record)
+                if row is not None:
+                    rows.append(row)
+                if len(rows) >= batch_size:
+                    counts[section] = counts.get(section, 0) + storage.import_table_rows(section, rows)
+                    rows = []
+            counts[section] = counts.get(section, 0) + storage.import_table_rows(section, rows)
+            if progress:
+                progress(done, total)
+    finally:
+        reader.close()
+    return counts
+
+
+# ---------- Arka plan işçisi ----------
+
+def _cloud_backup(storage, drive, progress=None, cancel=None) -> dict:
+    return drive.backup_incremental(storage, progress=progress, cancel=cancel)
+
+
+def _cloud_restore(storage, drive, progress=None, cancel=None) -> dict:
+    return drive.prepare_restore(storage, progress=progress, cancel=cancel)
+
+
+class ArchiveWorker(QObject):
+    # (işlenen, toplam) — işçi thread'inden yayılır
+    progress = Signal(int, int)
+    # bölüm başına sayılar
+    finished = Signal(object)
+    # hata mesajı
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, storage, on_thread_exit: Optional[Callable[[], None]] = None):
+        super().__init__()
+        self._storage = storage
+        self._on_thread_exit = on_thread_exit
+        self._thread: Optional[threading.Thread] = None
+        self._cancel = threading.Event()
+
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def start_export(self, path, settings_data: Optional[dict] = None) -> bool:
+        return self._start(export_archive, path, settings_data=settings_data)
+
+    def start_import(self, path) -> bool:
+        return self._start(import_archive, path)
+
+    def start_snapshot(self, path) -> bool:
+        from clipstack.snapshot import create_snapshot
+
+        return self._start(create_snapshot, path)
+
+    def start_restore(self, path) -> bool:
+        """Anlık görüntüyü hazırla; finished sonucundaki "staged" dosyası GUI'de yerine konur."""
+        from clipstack.snapshot import prepare_restore
+
+        return self._start(prepare_restore, path)
+
+    def start_cloud_backup(self, drive) -> bool:
+        """Artımlı bulut yedeği (drive: GoogleDriveSync); sonuç sync_incremental sözlüğüdür."""
+        return self._start(_cloud_backup, drive)
+
+    def start_cloud_restore(self, drive) -> bool:
+        """Buluttaki taban + delta zincirini hazırla; "staged" dosyası GUI'de yerine konur."""
+        return self._start(_cloud_restore, drive)
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        thread = self._thread
+        if thread:
+            thread.join(timeout)
+        return not self.is_running()
+
+    def _start(self, job, target, **kwargs) -> bool:
+        if self.is_running():
+            return False
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(job, target, kwargs, self._cancel), name="TaxClipArchive", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def _run(self, job, target, kwargs: dict, cancel: threading.Event) -> None:
+        try:
+            counts = job(self._storage, target, progress=self.progress.emit, cancel=cancel, **kwargs)
+            self.finished.emit(counts)
+        except ArchiveCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            print(f"[ARCHIVE] İşlem başarısız: {e}")
+            self.failed.emit(str(e))
+        finally:
+            if self._on_thread_exit:
+                try:
+                    self._on_thread_exit()
+                except Exception:
+                    pass
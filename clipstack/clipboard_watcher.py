@@ -4,6 +4,7 @@ import re
 import time
 import zlib
 import html as htmllib
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import unquote, urlparse
@@ -11,7 +12,8 @@ from urllib.parse import unquote, urlparse
 from PySide6.QtCore import QObject, Signal, QMimeData, QBuffer, QByteArray, QIODevice, QTimer, QUrl
 from PySide6.QtGui import QClipboard, QImage, QTextDocument
 from .storage import Storage, ClipItemType
-from .sensitive_detector import get_sensitive_detector, contains_sensitive_data
+from .ingestion import IngestionPipeline
+from .sensitive_detector import get_sensitive_detector
 from .utils import copy_to_clipboard_safely
 from .win_process import get_foreground_process_name
 
@@ -71,6 +73,35 @@ def fingerprint_text(s: str) -> str:
     """Kısa ömürlü metin dedupe anahtarı (kimlik doğrulama / parola saklama DEĞİL)."""
     return fingerprint_bytes((s or "").encode("utf-8", errors="replace"))
 
+def fingerprint_image(img: QImage) -> str:
+    """Ham piksellerden dedupe anahtarı; PNG kodlaması gerektirmez."""
+    if img.format() != QImage.Format.Format_ARGB32:
+        img = img.convertToFormat(QImage.Format.Format_ARGB32)
+    return f"{img.width()}x{img.height()}-" + fingerprint_bytes(bytes(img.constBits()))
+
+def encode_png(img: QImage) -> bytes:
+    ba = QByteArray()
+    buf = QBuffer(ba)
+    buf.open(QIODevice.WriteOnly)
+    img.save(buf, "PNG")
+    return bytes(ba)
+
+
+@dataclass
+class ClipCapture:
+    """GUI thread'inde yakalanan ham pano verisi; işçi thread'inde işlenir."""
+    item_type: ClipItemType
+    created_at: str
+    source_app: str | None = None
+    text: str | None = None
+    html: str | None = None
+    image: QImage | None = None
+    png_bytes: bytes | None = None
+    # Düz metin: hassas veri engelleme / maskeleme işçi thread'inde yapılır
+    check_sensitive: bool = False
+    # İşçi thread'i doldurur: kopyalanan metinde hassas veri bulundu mu
+    is_sensitive: bool = False
+
 def _paths_from_mime(md: QMimeData) -> list[str]:
     """CF_HDROP / hasUrls dosya listesini çıkar."""
     paths: list[str] = []
@@ -110,8 +141,13 @@ class ClipboardWatcher(QObject):
         self._dedupe_window_sec = settings.get("dedupe_window_ms", 1200) / 1000.0
         self._image_stabilize_retry_delays_ms = (80, 200, 500)
         self._clear_timer: QTimer | None = None
+        self.ingestion = IngestionPipeline(
+            self._ingest_capture,
+            max_pending=int(settings.get("ingest_queue_size", 32) or 32),
+            on_thread_exit=getattr(storage, "close_thread_connection", None),
+        )
+        self.ingestion.item_ready.connect(self._on_item_ready)
         self.clipboard.dataChanged.connect(self._on_clip_changed)
-        self.sensitive_detector = get_sensitive_detector(settings)
 
     def set_paused(self, paused: bool):
         self._paused = paused
@@ -139,14 +175,12 @@ class ClipboardWatcher(QObject):
         return proc in excluded or any(proc.endswith(x) for x in excluded)
 
     def _schedule_clipboard_clear(self, text: str):
-        """Hassas veri panodan otomatik temizlensin."""
+        """Hassas veri panodan otomatik temizlensin (text: panodaki özgün metin)."""
         if not self.settings:
             return
         secs = int(self.settings.get("auto_clear_clipboard_seconds", 0) or 0)
         if secs <= 0:
             return
-        if not contains_sensitive_data(text, self.settings):
-            return
         if self._clear_timer is not None:
             self._clear_timer.stop()
             self._clear_timer.deleteLater()
@@ -199,20 +233,75 @@ class ClipboardWatcher(QObject):
         if img.isNull():
             return
 
-        ba = QByteArray()
-        buf = QBuffer(ba)
-        if not buf.open(QIODevice.WriteOnly):
-            return
-        img.save(buf, "PNG")
-        current_bytes = bytes(ba)
-
-        if "I:" + fingerprint_bytes(current_bytes) != expected_fp:
+        if "I:" + fingerprint_image(img) != expected_fp:
             return
 
         # Print Screen / Snipping Tool gibi kaynaklardan gelen ham bitmap'i
         # PNG + imageData formatlarıyla yeniden yazarak Ctrl+V kararlılığını artır.
         copy_to_clipboard_safely(None, ClipItemType.IMAGE, png_bytes)
 
+    # ---------- Kayıt hattı (işçi thread'i) ----------
+
+    def _submit(self, capture: ClipCapture) -> None:
+        self.ingestion.submit(capture)
+
+    def wait_for_ingestion(self, timeout: float | None = None) -> bool:
+        return self.ingestion.wait_idle(timeout)
+
+    def ingestion_stats(self) -> dict:
+        """Kuyruk derinliği ve aşama süreleri (ms)."""
+        return self.ingestion.stats()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self.ingestion.stop(timeout)
+
+    def _ingest_capture(self, capture: ClipCapture, timings: dict):
+        """İşçi thread'inde: PNG kodlama, hassas veri kontrolü, storage.add_item."""
+        started = time.perf_counter()
+        png_bytes = capture.png_bytes
+        if capture.image is not None and png_bytes is None:
+            png_bytes = encode_png(capture.image)
+            capture.png_bytes = png_bytes
+            timings["encode"] = time.perf_counter() - started
+
+        text = capture.text
+        scan = None
+        if capture.check_sensitive:
+            started = time.perf_counter()
+            # Tek tarama: engelleme, maskeleme ve is_sensitive aynı sonucu kullanır
+            detector = get_sensitive_detector(self.settings)
+            scan = detector.scan(text)
+            if scan.truncated:
+                print(f"[SENSITIVE] Metin çok uzun, yalnızca ilk {scan.scanned_chars} karakter tarandı")
+            should_block, block_reason = detector.should_block(text, scan)
+            if should_block:
+                print(f"[SENSITIVE] Metin engellendi: {block_reason}")
+                timings["sensitive"] = time.perf_counter() - started
+                return None
+
+            # Hassas veriyi maskele
+            capture.is_sensitive = bool(scan)
+            masked_text, was_masked = detector.mask_text(text, scan)
+            if was_masked:
+                print(f"[SENSITIVE] Hassas veri maskelendi")
+                text = masked_text
+                scan = None  # maskeli metin kayıtta yeniden taranır
+            timings["sensitive"] = time.perf_counter() - started
+
+        return self.storage.add_item(
+            capture.item_type, text, png_bytes, capture.html, capture.created_at,
+            source_app=capture.source_app, is_sensitive=capture.is_sensitive,
+            sensitive_scan=scan, timings=timings,
+        )
+
+    def _on_item_ready(self, capture: ClipCapture, row):
+        """GUI thread'inde: kaydedilen öğeyi yayınla."""
+        self.item_added.emit(row)
+        if capture.is_sensitive and capture.text:
+            self._schedule_clipboard_clear(capture.text)
+
+    # ---------- Pano yakalama (GUI thread'i) ----------
+
     def _on_clip_changed(self):
         if self._paused:
             return
@@ -232,31 +321,24 @@ class ClipboardWatcher(QObject):
             fp = "F:" + fingerprint_text(payload)
             if self._should_skip_by_fingerprint(fp):
                 return
-            row = self.storage.add_item(
-                ClipItemType.FILE, payload, None, None, created_at, source_app=source_app
-            )
-            if row is not None:
-                self.item_added.emit(row)
+            self._submit(ClipCapture(ClipItemType.FILE, created_at, source_app, text=payload))
             return
 
-        # 1) Görsel (HTML yoksa)
-        if self.clipboard.image() and not md.hasHtml():
-            img: QImage = self.clipboard.image()
+        # 1) Görsel (HTML yoksa): PNG kodlaması işçi thread'inde yapılır
+        img: QImage = self.clipboard.image()
+        if img and not md.hasHtml():
             if not img.isNull():
-                ba = QByteArray()
-                buf = QBuffer(ba)
-                buf.open(QIODevice.WriteOnly)
-                img.save(buf, "PNG")
-                img_bytes = bytes(ba)
-                fp = "I:" + fingerprint_bytes(img_bytes)
-                self._queue_image_stabilization(fp, img_bytes, md)
+                fp = "I:" + fingerprint_image(img)
+                png_bytes = None
+                if self._image_mime_needs_stabilization(md):
+                    # Ham bitmap kaynağı: panoya PNG olarak geri yazmak için gerekli
+                    png_bytes = encode_png(img)
+                    self._queue_image_stabilization(fp, png_bytes, md)
                 if self._should_skip_by_fingerprint(fp):
                     return
-                row = self.storage.add_item(
-                    ClipItemType.IMAGE, None, img_bytes, None, created_at, source_app=source_app
+                self._submit(
+                    ClipCapture(ClipItemType.IMAGE, created_at, source_app, image=img, png_bytes=png_bytes)
                 )
-                if row is not None:
-                    self.item_added.emit(row)
             return
 
         html = md.html() if md.hasHtml() else ""
@@ -274,11 +356,7 @@ class ClipboardWatcher(QObject):
             fp = "T:" + fingerprint_text(candidate_url)
             if self._should_skip_by_fingerprint(fp):
                 return
-            row = self.storage.add_item(
-                ClipItemType.TEXT, candidate_url, None, None, created_at, source_app=source_app
-            )
-            if row is not None:
-                self.item_added.emit(row)
+            self._submit(ClipCapture(ClipItemType.TEXT, created_at, source_app, text=candidate_url))
             return
 
         # 3) HTML varsa: önce plain'e çevir, metinle eşleşiyorsa TEXT olarak kaydet
@@ -288,41 +366,19 @@ class ClipboardWatcher(QObject):
                 norm_text = strip_invisible(plain_from_html)
                 if not norm_text:
                     return
-                
-                # Hassas veri kontrolü
-                should_block, block_reason = self.sensitive_detector.should_block(norm_text)
-                if should_block:
-                    print(f"[SENSITIVE] HTML metni engellendi: {block_reason}")
-                    return
-                
-                # Hassas veriyi maskele
-                masked_text, was_masked = self.sensitive_detector.mask_text(norm_text)
-                if was_masked:
-                    print(f"[SENSITIVE] HTML'den çıkan metin maskelendi")
-                    norm_text = masked_text
-                
                 fp = "T:" + fingerprint_text(norm_text)
                 if self._should_skip_by_fingerprint(fp):
                     return
-                is_sens = contains_sensitive_data(norm_text, self.settings) if not was_masked else True
-                row = self.storage.add_item(
-                    ClipItemType.TEXT, norm_text, None, None, created_at,
-                    source_app=source_app, is_sensitive=is_sens,
+                self._submit(
+                    ClipCapture(ClipItemType.TEXT, created_at, source_app, text=norm_text, check_sensitive=True)
                 )
-                if row is not None:
-                    self.item_added.emit(row)
-                    self._schedule_clipboard_clear(norm_text)
                 return
 
             # Gerçek zengin HTML ise ham HTML'i kaydet (önizleme düz metin olacak)
             fp = "H:" + fingerprint_text(html)
             if self._should_skip_by_fingerprint(fp):
                 return
-            row = self.storage.add_item(
-                ClipItemType.HTML, None, None, html, created_at, source_app=source_app
-            )
-            if row is not None:
-                self.item_added.emit(row)
+            self._submit(ClipCapture(ClipItemType.HTML, created_at, source_app, html=html))
             return
 
         # 4) Sade metin
@@ -330,27 +386,9 @@ class ClipboardWatcher(QObject):
             norm_text = strip_invisible(text)
             if not norm_text:
                 return
-            
-            # Hassas veri kontrolü
-            should_block, block_reason = self.sensitive_detector.should_block(norm_text)
-            if should_block:
-                print(f"[SENSITIVE] Metin engellendi: {block_reason}")
-                return
-            
-            # Hassas veriyi maskele
-            masked_text, was_masked = self.sensitive_detector.mask_text(norm_text)
-            if was_masked:
-                print(f"[SENSITIVE] Hassas veri maskelendi")
-                norm_text = masked_text
-            
             fp = "T:" + fingerprint_text(norm_text)
             if self._should_skip_by_fingerprint(fp):
                 return
-            is_sens = contains_sensitive_data(norm_text, self.settings) if not was_masked else True
-            row = self.storage.add_item(
-                ClipItemType.TEXT, norm_text, None, None, created_at,
-                source_app=source_app, is_sensitive=is_sens,
+            self._submit(
+                ClipCapture(ClipItemType.TEXT, created_at, source_app, text=norm_text, check_sensitive=True)
             )
-            if row is not None:
-                self.item_added.emit(row)
-                self._schedule_clipboard_clear(norm_text)
@@ -0,0 +1,300 @@
+"""
+Artımlı bulut yedeği: taban + delta zinciri
+
+Buluttaki yedek bir taban ve onu izleyen deltalardan oluşur:
+
+    taxclip_base_000000000120.db.gz                  anlık görüntü (clipstack.snapshot)
+    taxclip_delta_000000000120_000000000187.ndjson.gz  (120, 187] aralığındaki değişiklikler
+
+Sürümler veritabanındaki değişiklik günlüğünden (change_journal) gelir.
+Eşitleme yalnızca son onaylanan sürümden bu yana değişen satırları yükler;
+deltalar birikince (sayı ya da tabana göre boyut eşiği) yeni bir taban
+yüklenir, eski zincir silinir ve günlük budanır. Satırlar veritabanındaki
+hâliyle taşınır: şifreli alanlar deltada da şifrelidir.
+
+Geri yükleme tabanı indirip veritabanının yanına hazırlar, deltaları
+sırayla uygular ve sonucu Storage.replace_database'e bırakır.
+
+Sürücü (GoogleDriveSync ya da testlerdeki yerel taklit) şu yöntemleri sağlar:
+upload_file(yol, ad, mimetype), download_file(id, yol), list_backups(),
+delete_backups(id'ler). Harici klasöre kaydedilmiş görseller yedeğe girmez.
+"""
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from clipstack.snapshot import (
+    SNAPSHOT_SUFFIX,
+    _check_cancelled,
+    create_snapshot,
+    discard_restore,
+    prepare_restore,
+)
+
+DELTA_FORMAT = "taxclip-delta"
+DELTA_VERSION = 1
+DELTA_SUFFIX = ".ndjson.gz"
+# Bu kadar delta birikince ya da deltalar tabanın bu oranını geçince yeni taban
+COMPACT_DELTAS = 30
+COMPACT_RATIO = 0.5
+# Deltaya yazılırken tek seferde okunan günlük kaydı
+JOURNAL_BATCH = 200
+
+_BASE_RE = re.compile(r"^taxclip_base_(\d+)" + re.escape(SNAPSHOT_SUFFIX) + "$")
+_DELTA_RE = re.compile(r"^taxclip_delta_(\d+)_(\d+)" + re.escape(DELTA_SUFFIX) + "$")
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class CloudBackupError(Exception):
+    """Bulut yedeği yüklenemedi, indirilemedi ya da zincir eksik."""
+
+
+def base_name(version: int) -> str:
+    return f"taxclip_base_{int(version):012d}{SNAPSHOT_SUFFIX}"
+
+
+def delta_name(since: int, upto: int) -> str:
+    return f"taxclip_delta_{int(since):012d}_{int(upto):012d}{DELTA_SUFFIX}"
+
+
+def _chain_files(files: List[dict]) -> Tuple[List[Tuple[int, dict]], Dict[int, List[Tuple[int, dict]]]]:
+    bases, deltas = [], {}
+    for item in files:
+        name = item.get("name") or ""
+        match = _BASE_RE.match(name)
+        if match:
+            bases.append((int(match.group(1)), item))
+            continue
+        match = _DELTA_RE.match(name)
+        if match:
+            deltas.setdefault(int(match.group(1)), []).append((int(match.group(2)), item))
+    return bases, deltas
+
+
+def _base_version(item: dict) -> int:
+    return int(_BASE_RE.match(item["name"]).group(1))
+
+
+def backup_chain(files: List[dict]) -> Tuple[Optional[dict], List[dict], int]:
+    """
+    Dosya listesinden geri yüklenecek zinciri seç: en yeni taban ve onun
+    sürümünden kesintisiz devam eden deltalar. (taban, deltalar, son sürüm)
+    döner; taban yoksa (None, [], 0).
+    """
+    bases, deltas = _chain_files(files)
+    if not bases:
+        return None, [], 0
+    version, base = max(bases, key=lambda pair: pair[0])
+    chain = []
+    while deltas.get(version):
+        # Aynı başlangıçtan birden çok delta varsa (yarıda kalan yükleme) en uzunu
+        upto, item = max(deltas[version], key=lambda pair: pair[0])
+        if upto <= version:
+            break
+        chain.append(item)
+        version = upto
+    return base, chain, version
+
+
+def stale_chain_files(files: List[dict]) -> List[dict]:
+    """Geri yükleme zincirinde yer almayan taban ve delta dosyaları (yarıda kalmış eşitlemeler)."""
+    base, chain, _ = backup_chain(files)
+    live = {item["id"] for item in chain}
+    if base is not None:
+        live.add(base["id"])
+    bases, deltas = _chain_files(files)
+    candidates = [item for _, item in bases] + [item for group in deltas.values() for _, item in group]
+    return [item for item in candidates if item["id"] not in live]
+
+
+def _encode_row(row: Optional[dict]) -> Optional[dict]:
+    if row is None:
+        return None
+    encoded = {}
+    for key, value in row.items():
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            value = {"$b64": base64.b64encode(bytes(value)).decode("ascii")}
+        encoded[key] = value
+    return encoded
+
+
+def _decode_row(row: Optional[dict]) -> Optional[dict]:
+    if row is None:
+        return None
+    return {
+        key: base64.b64decode(value["$b64"]) if isinstance(value, dict) and "$b64" in value else value
+        for key, value in row.items()
+    }
+
+
+def write_delta(storage, path, since: int, upto: int, cancel: Optional[threading.Event] = None) -> int:
+    """(since, upto] değişikliklerini gzip'li NDJSON'a yaz; kayıt sayısını döndür."""
+    from clipstack.storage import SCHEMA_VERSION
+
+    records = 0
+    with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as target:
+        header = {
+            "format": DELTA_FORMAT,
+            "version": DELTA_VERSION,
+            "from": since,
+            "to": upto,
+            "schema": SCHEMA_VERSION,
+            # KDF tuzu günlüğe girmez ve tabandan sonra oluşmuş olabilir
+            "meta": storage.portable_meta(),
+        }
+        target.write(json.dumps(header) + "\n")
+        for _version, entity, entity_id, row in storage.iter_journal_changes(since, upto, batch_size=JOURNAL_BATCH):
+            if records % JOURNAL_BATCH == 0:
+                _check_cancelled(cancel)
+            record = {"entity": entity, "id": entity_id, "row": _encode_row(row)}
+            target.write(json.dumps(record, ensure_ascii=False) + "\n")
+            records += 1
+    return records
+
+
+def _read_delta_header(source, name: str = "") -> dict:
+    header = json.loads(source.readline() or "{}")
+    if header.get("format") != DELTA_FORMAT or int(header.get("version", 0)) > DELTA_VERSION:
+        raise CloudBackupError(f"Tanınmayan delta biçimi: {name}")
+    return header
+
+
+def read_delta(path) -> Iterator[Tuple[str, int, Optional[dict]]]:
+    """Delta dosyasındaki (tablo, id, satır) değişikliklerini sırayla ver."""
+    with gzip.open(path, "rt", encoding="utf-8") as source:
+        _read_delta_header(source, Path(path).name)
+        for line in source:
+            if line.strip():
+                record = json.loads(line)
+                yield record["entity"], int(record["id"]), _decode_row(record.get("row"))
+
+
+def _upload(drive, path: Path, mimetype: str) -> str:
+    success, result = drive.upload_file(str(path), path.name, mimetype)
+    if not success:
+        raise CloudBackupError(result)
+    return result
+
+
+def _download(drive, item: dict, path: Path) -> Path:
+    success, result = drive.download_file(item["id"], str(path))
+    if not success:
+        raise CloudBackupError(result)
+    return path
+
+
+def sync_incremental(
+    storage,
+    drive,
+    progress: Optional[ProgressCallback] = None,
+    cancel: Optional[threading.Event] = None,
+    compact_deltas: int = COMPACT_DELTAS,
+    compact_ratio: float = COMPACT_RATIO,
+) -> Dict[str, int]:
+    """
+    Son onaylanan sürümden bu yana değişenleri delta olarak yükle; zincir
+    buluttakiyle uyuşmuyorsa ya da deltalar birikmişse yeni taban yükle.
+    Sonuç: mode ("base", "delta", "none"), sürümler, kayıt ve bayt sayıları.
+    """
+    state = storage.sync_state()
+    acked = state.get("acked", 0)
+    files = drive.list_backups()
+    base, chain, chain_end = backup_chain(files)
+    # Buluttaki zincir yerel durumla eşleşmiyorsa (silinmiş, başka kurulum) taban yeniden yüklenir
+    chain_ok = base is not None and _base_version(base) == state.get("base") and chain_end == acked
+    compact = state.get("delta_count", 0) >= compact_deltas or (
+        state.get("delta_bytes", 0) > state.get("base_bytes", 0) * compact_ratio
+    )
+    upto = storage.journal_version()
+    with tempfile.TemporaryDirectory(prefix="taxclip_sync_") as tmp:
+        work = Path(tmp)
+        if not chain_ok or compact:
+            path = work / base_name(upto)
+            create_snapshot(storage, path, progress=progress, cancel=cancel)
+            _check_cancelled(cancel)
+            size = path.stat().st_size
+            _upload(drive, path, "application/gzip")
+            storage.update_sync_state(base=upto, acked=upto, delta_count=0, delta_bytes=0, base_bytes=size)
+            storage.prune_journal(upto)
+            # Yeni taban onaylandı: eski zincir artık gerekmez (toplu silinir)
+            bases, deltas = _chain_files(files)
+            stale = [item for _, item in bases] + [item for group in deltas.values() for _, item in group]
+            if stale:
+                _, failed = drive.delete_backups(item["id"] for item in stale)
+                if failed:
+                    print(f"[SYNC] {len(failed)} eski yedek silinemedi; sonraki budamada yeniden denenecek")
+            print(f"[SYNC] Taban yedek yüklendi: sürüm {upto}, {size} bayt")
+            return {"mode": "base", "from": 0, "to": upto, "records": 0, "bytes": size, "deleted": len(stale)}
+
+        if upto <= acked:
+            return {"mode": "none", "from": acked, "to": acked, "records": 0, "bytes": 0, "deleted": 0}
+        path = work / delta_name(acked, upto)
+        records = write_delta(storage, path, acked, upto, cancel=cancel)
+        _check_cancelled(cancel)
+        size = path.stat().st_size
+        _upload(drive, path, "application/gzip")
+        storage.update_sync_state(
+            acked=upto,
+            delta_count=state.get("delta_count", 0) + 1,
+            delta_bytes=state.get("delta_bytes", 0) + size,
+        )
+    if progress:
+        progress(1, 1)
+    print(f"[SYNC] Delta yüklendi: ({acked}, {upto}], {records} kayıt, {size} bayt")
+    return {"mode": "delta", "from": acked, "to": upto, "records": records, "bytes": size, "deleted": 0}
+
+
+def prepare_cloud_restore(
+    storage,
+    drive,
+    progress: Optional[ProgressCallback] = None,
+    cancel: Optional[threading.Event] = None,
+) -> Dict[str, object]:
+    """
+    Buluttaki tabanı indirip hazırla, deltaları sırayla uygula. Dönen
+    "staged" yolu Storage.replace_database'e verilir (bkz. snapshot.prepare_restore).
+    """
+    from clipstack.storage import Storage
+
+    base, chain, version = backup_chain(drive.list_backups())
+    if base is None:
+        raise CloudBackupError("Google Drive'da taban yedek bulunamadı")
+    total = len(chain) + 1
+    with tempfile.TemporaryDirectory(prefix="taxclip_restore_") as tmp:
+        work = Path(tmp)
+        base_path = _download(drive, base, work / base["name"])
+        _check_cancelled(cancel)
+        result = prepare_restore(storage, base_path, cancel=cancel)
+        if progress:
+            progress(1, total)
+        try:
+            # Hazırlanan dosya kendi Storage'ıyla açılır: eski şemalı taban göçlerden geçer
+            staged = Storage(Path(result["staged"]), storage.settings)
+            try:
+                for step, item in enumerate(chain, start=2):
+                    _check_cancelled(cancel)
+                    delta_path = _download(drive, item, work / item["name"])
+                    with gzip.open(delta_path, "rt", encoding="utf-8") as source:
+                        staged.merge_portable_meta(_read_delta_header(source, item["name"]).get("meta"))
+                    staged.apply_journal_changes(read_delta(delta_path))
+                    delta_path.unlink()
+                    if progress:
+                        progress(step, total)
+                # Geri yüklenen veritabanı sonraki eşitlemede yeni bir taban yükler
+                staged.reset_sync_state()
+            finally:
+                staged.close()
+        except BaseException:
+            discard_restore(result)
+            raise
+    print(f"[SYNC] Bulut yedeği hazırlandı: sürüm {version}, {len(chain)} delta")
+    result.update({"deltas": len(chain), "version": version})
+    return result
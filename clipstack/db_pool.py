@@ -0,0 +1,144 @@
+"""
+SQLite bağlantı katmanı
+
+- Tek bir paylaşılan yazma bağlantısı (yazma işlemleri write_lock ile sıralanır)
+- Arka plan okuyucuları için küçük bir salt okunur bağlantı havuzu
+- WAL günlüğü: okuyucular yazarı, yazar okuyucuları beklemez
+"""
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+# Bağlantı başına önbellek (KiB cinsinden negatif değer) ve bellek eşleme boyutu
+CACHE_SIZE_KIB = 8192
+MMAP_SIZE = 64 * 1024 * 1024
+BUSY_TIMEOUT_SEC = 10
+
+
+def configure_connection(conn: sqlite3.Connection, read_only: bool = False) -> sqlite3.Connection:
+    """Ortak pragmalar; WAL ile synchronous=NORMAL her commit'te fsync yapmaz."""
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        if read_only:
+            conn.execute("PRAGMA query_only = 1")
+        else:
+            conn.execute("PRAGMA synchronous = NORMAL")
+    except sqlite3.DatabaseError as e:
+        print(f"[DB] Pragma ayarlanamadı: {e}")
+    return conn
+
+
+def open_connection(path: Path, read_only: bool = False, shared: bool = False) -> sqlite3.Connection:
+    """Ayarlı bir bağlantı aç. shared=True ise bağlantı thread'ler arasında kullanılabilir."""
+    if read_only:
+        uri = Path(path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=BUSY_TIMEOUT_SEC, check_same_thread=not shared)
+    else:
+        conn = sqlite3.connect(str(path), timeout=BUSY_TIMEOUT_SEC, check_same_thread=not shared)
+    return configure_connection(conn, read_only=read_only)
+
+
+class ConnectionPool:
+    """
+    Paylaşılan yazma bağlantısı + salt okunur okuyucu havuzu.
+
+    Yazma bağlantısı farklı thread'lerden kullanılabilir; bir işlemin
+    (transaction) başka bir thread'in commit'i ile yarıda kesilmemesi için
+    yazan kod write_lock'u tutmalıdır. Okuyucular reader() ile alınıp geri
+    verilir; havuz doluysa geçici bir bağlantı açılıp kapatılır.
+    """
+
+    def __init__(self, path: Path, readers: int = 4):
+        self.path = Path(path)
+        self.write_lock = threading.RLock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=max(1, readers))
+        self._closed = False
+        # Verilmiş (henüz geri dönmemiş) okuyucular; close_connections bunları da kapatır
+        self._issued: Dict[int, sqlite3.Connection] = {}
+        self._issued_lock = threading.Lock()
+        # close_connections her çağrıldığında artar; eski kuşaktan okuyucular yenilenmeli
+        self.generation = 0
+
+    @property
+    def writer(self) -> sqlite3.Connection:
+        if self._writer is None:
+            self._writer = open_connection(self.path, shared=True)
+            try:
+                mode = self._writer.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+                if str(mode).lower() != "wal":
+                    print(f"[DB] WAL etkinleştirilemedi, günlük modu: {mode}")
+            except sqlite3.DatabaseError as e:
+                print(f"[DB] WAL etkinleştirilemedi: {e}")
+        return self._writer
+
+    @writer.setter
+    def writer(self, conn: sqlite3.Connection) -> None:
+        self._writer = conn
+
+    def acquire_reader(self) -> sqlite3.Connection:
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            # Veritabanı dosyası ve WAL ayarı yazma bağlantısıyla oluşmuş olmalı
+            self.writer
+            conn = open_connection(self.path, read_only=True, shared=True)
+        with self._issued_lock:
+            self._issued[id(conn)] = conn
+        return conn
+
+    def release_reader(self, conn: sqlite3.Connection) -> None:
+        with self._issued_lock:
+            current = self._issued.pop(id(conn), None) is conn
+        if self._closed or not current:
+            # Havuz kapandı ya da bağlantı close_connections'tan önceki kuşaktan
+            conn.close()
+            return
+        try:
+            conn.rollback()  # açık okuma işlemi WAL denetim noktasını bekletmesin
+            self._readers.put_nowait(conn)
+        except (queue.Full, sqlite3.Error):
+            conn.close()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        conn = self.acquire_reader()
+        try:
+            yield conn
+        finally:
+            self.release_reader(conn)
+
+    def close_connections(self) -> None:
+        """
+        Yazma bağlantısını ve bütün okuyucuları (verilmiş olanlar dahil) kapat;
+        havuz açık kalır ve sonraki kullanımda dosyayı yeniden açar. Veritabanı
+        dosyası değiştirilmeden önce write_lock tutularak çağrılır.
+        """
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._issued_lock:
+            issued, self._issued = list(self._issued.values()), {}
+            self.generation += 1
+        for conn in issued:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"[DB] Okuyucu kapatılamadı: {e}")
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def close(self) -> None:
+        self._closed = True
+        self.close_connections()
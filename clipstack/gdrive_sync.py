@@ -2,11 +2,16 @@
 Google Drive Sync - OAuth 2.0 ile Google Drive senkronizasyonu
 """
 import os
+import gzip
 import json
+import random
+import socket
+import tempfile
+import time
 import webbrowser
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Union
 
 # Google OAuth kütüphaneleri
 GOOGLE_AVAILABLE = False
@@ -35,6 +40,22 @@ class GoogleDriveSync:
     CLIENT_ID_ENV = "TAXCLIP_GOOGLE_CLIENT_ID"
     CLIENT_SECRET_ENV = "TAXCLIP_GOOGLE_CLIENT_SECRET"
     
+    # Tam JSON yedeklerinin ad öneki (artımlı zincir: clipstack.cloud_backup)
+    BACKUP_PREFIX = "taxclip_backup_"
+    # Devam ettirilebilir yükleme / indirme parça boyutu (256 KiB'ın katı)
+    CHUNK_SIZE = 4 * 1024 * 1024
+    # Geçici hatada aynı parça en fazla bu kadar yeniden denenir (üstel bekleme)
+    MAX_RETRIES = 6
+    RETRY_BASE_DELAY = 1.0
+    RETRY_MAX_DELAY = 32.0
+    RETRIABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+    # Tek toplu (batch) istekteki silme sayısı ve liste sayfa boyutu
+    DELETE_BATCH = 100
+    LIST_PAGE_SIZE = 1000
+    # Saklanan tam yedek sayısı (gdrive_keep_backups ayarı yoksa)
+    KEEP_BACKUPS = 10
+    _sleep = staticmethod(time.sleep)
+    
     def __init__(self, settings=None):
         self.settings = settings
         self.credentials = None
@@ -263,13 +284,19 @@ class GoogleDriveSync:
         except Exception as e:
             print(f"[GDRIVE] Klasör hatası: {e}")
     
-    def upload_backup(self, json_data: str, filename: str = None) -> tuple[bool, str]:
+    def upload_backup(self, json_data: Union[str, Iterable[str]], filename: str = None, progress=None) -> tuple[bool, str]:
         """
-        JSON yedek dosyasını Google Drive'a yükle
+        JSON yedeğini gzip ile sıkıştırıp Google Drive'a yükle
+        
+        Sıkıştırma geçici dosyaya parça parça yapılır; json_data tek bir metin
+        ya da metin parçaları üreten bir yineleyici olabilir (bellekte tüm
+        yedek tutulmaz). Yükleme upload_file ile devam ettirilebilir parçalar
+        hâlinde yapılır.
         
         Args:
-            json_data: JSON string
+            json_data: JSON string ya da string parçaları
             filename: Dosya adı (opsiyonel)
+            progress: (gönderilen, toplam) bayt geri çağrısı
         
         Returns:
             (success, message/file_id)
@@ -277,61 +304,96 @@ class GoogleDriveSync:
         if not self.service:
             return False, "Google Drive'a bağlı değil"
         
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"{self.BACKUP_PREFIX}{timestamp}.json.gz"
+        
+        tmp_path = None
         try:
-            if not filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"taxclip_backup_{timestamp}.json"
-            
-            # Geçici dosya oluştur
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp:
-                tmp.write(json_data)
+            with tempfile.NamedTemporaryFile(suffix='.json.gz', delete=False) as tmp:
                 tmp_path = tmp.name
-            
+                with gzip.GzipFile(filename='', mode='wb', fileobj=tmp, compresslevel=6) as target:
+                    for chunk in _text_chunks(json_data):
+                        target.write(chunk.encode('utf-8'))
+            return self.upload_file(tmp_path, filename, 'application/gzip', progress=progress)
+        
+        except Exception as e:
+            return False, f"Yükleme hatası: {str(e)}"
+        finally:
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+    
+    def upload_file(self, path: str, filename: str = None, mimetype: str = "application/octet-stream",
+                    progress=None) -> tuple[bool, str]:
+        """
+        Diskteki dosyayı TaxClip klasörüne devam ettirilebilir parçalar hâlinde yükle
+        
+        Geçici bir hatada (bağlantı, 429, 5xx) aynı oturumla üstel bekleyip son
+        onaylanan parçadan devam edilir; dosya baştan gönderilmez.
+        
+        Returns:
+            (success, file_id or error_message)
+        """
+        if not self.service:
+            return False, "Google Drive'a bağlı değil"
+        
+        try:
             file_metadata = {
-                'name': filename,
+                'name': filename or Path(path).name,
                 'parents': [self.folder_id] if self.folder_id else []
             }
-            
-            media = MediaFileUpload(tmp_path, mimetype='application/json')
-            
-            file = self.service.files().create(
+            media = self._media_upload(path, mimetype, self.CHUNK_SIZE)
+            request = self.service.files().create(
                 body=file_metadata,
                 media_body=media,
                 fields='id'
-            ).execute()
-            
-            # Geçici dosyayı sil
-            os.unlink(tmp_path)
-            
-            return True, file.get('id')
+            )
+            response = None
+            while response is None:
+                status, response = self._next_chunk(request, "Yükleme")
+                if status and progress:
+                    progress(status.resumable_progress, status.total_size)
+            return True, response.get('id')
         
         except Exception as e:
             return False, f"Yükleme hatası: {str(e)}"
     
     def list_backups(self) -> list:
-        """Google Drive'daki yedekleri listele"""
+        """Google Drive'daki yedekleri listele (yeniden eskiye, tüm sayfalar)"""
         if not self.service:
             return []
         
         try:
             query = f"'{self.folder_id}' in parents and trashed=false" if self.folder_id else "trashed=false"
             
-            results = self.service.files().list(
-                q=query,
-                spaces='drive',
-                fields='files(id, name, createdTime, size)',
-                orderBy='createdTime desc'
-            ).execute()
-            
-            return results.get('files', [])
+            files = []
+            page_token = None
+            while True:
+                results = self.service.files().list(
+                    q=query,
+                    spaces='drive',
+                    fields='nextPageToken, files(id, name, createdTime, size)',
+                    orderBy='createdTime desc',
+                    pageSize=self.LIST_PAGE_SIZE,
+                    pageToken=page_token
+                ).execute()
+                files.extend(results.get('files', []))
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    return files
         except Exception as e:
             print(f"[GDRIVE] Liste hatası: {e}")
             return []
     
     def download_backup(self, file_id: str) -> tuple[bool, str]:
         """
-        Yedek dosyasını indir
+        Yedek dosyasını indir (gzip'li yedekler açılır)
+        
+        Büyük yedekler için import_backup tercih edilmeli; bu yöntem sonucu
+        tek bir metin olarak döndürür.
         
         Returns:
             (success, json_data or error_message)
@@ -339,25 +401,133 @@ class GoogleDriveSync:
         if not self.service:
             return False, "Google Drive'a bağlı değil"
         
+        with tempfile.TemporaryDirectory(prefix="taxclip_gdrive_") as tmp:
+            path = Path(tmp) / "backup"
+            success, result = self.download_file(file_id, str(path))
+            if not success:
+                return False, result
+            try:
+                with open(path, 'rb') as probe:
+                    compressed = probe.read(2) == b"\x1f\x8b"
+                opener = gzip.open if compressed else open
+                with opener(path, 'rt', encoding='utf-8') as source:
+                    return True, source.read()
+            except Exception as e:
+                return False, f"İndirme hatası: {str(e)}"
+    
+    def download_file(self, file_id: str, dest_path: str, progress=None) -> tuple[bool, str]:
+        """
+        Dosyayı belleğe almadan parça parça diske indir
+        
+        Geçici hatalarda kalınan parçadan yeniden denenir. Dosya önce .part
+        olarak yazılır; yarıda kalan indirme hedefi bozmaz.
+        
+        Returns:
+            (success, dest_path or error_message)
+        """
+        if not self.service:
+            return False, "Google Drive'a bağlı değil"
+        
+        partial = f"{dest_path}.part"
         try:
-            import io
-            
             request = self.service.files().get_media(fileId=file_id)
-            file_stream = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_stream, request)
-            
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-            
-            file_stream.seek(0)
-            json_data = file_stream.read().decode('utf-8')
-            
-            return True, json_data
+            with open(partial, 'wb') as target:
+                downloader = self._media_download(target, request, self.CHUNK_SIZE)
+                done = False
+                while not done:
+                    status, done = self._next_chunk(downloader, "İndirme")
+                    if status and progress:
+                        progress(status.resumable_progress, status.total_size)
+            os.replace(partial, dest_path)
+            return True, dest_path
         
         except Exception as e:
+            try:
+                os.unlink(partial)
+            except OSError:
+                pass
             return False, f"İndirme hatası: {str(e)}"
     
+    def _media_upload(self, path: str, mimetype: str, chunk_size: int):
+        return MediaFileUpload(path, mimetype=mimetype, chunksize=chunk_size, resumable=True)
+    
+    def _media_download(self, target, request, chunk_size: int):
+        return MediaIoBaseDownload(target, request, chunksize=chunk_size)
+    
+    def _is_retriable(self, error: Exception) -> bool:
+        """Bağlantı hataları, 408, 429 ve 5xx yanıtları yeniden denenir"""
+        status = getattr(getattr(error, 'resp', None), 'status', None)
+        if status is not None:
+            try:
+                return int(status) in self.RETRIABLE_STATUS
+            except (TypeError, ValueError):
+                return False
+        return isinstance(error, (ConnectionError, TimeoutError, socket.timeout))
+    
+    def _next_chunk(self, request, action: str):
+        """
+        Sıradaki parçayı gönder/al. Geçici hatada üstel (rastgele sapmalı)
+        bekleyip aynı isteği yeniden dener; devam ettirilebilir istek son
+        onaylanan konumdan sürer. Deneme hakkı biterse hata yükseltilir.
+        """
+        failures = 0
+        while True:
+            try:
+                return request.next_chunk()
+            except Exception as e:
+                if not self._is_retriable(e) or failures >= self.MAX_RETRIES:
+                    raise
+                failures += 1
+                delay = min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * (2 ** (failures - 1)))
+                delay *= 0.5 + random.random() / 2
+                print(f"[GDRIVE] {action} geçici hata ({e}); {delay:.1f} sn sonra yeniden deneniyor")
+                self._sleep(delay)
+    
+    def _ensure_service(self) -> None:
+        """Kayıtlı geçerli token ile servisi kur (arka plan thread'inden; tarayıcı açılmaz)"""
+        if self.service is not None:
+            return
+        if not self.is_connected():
+            raise RuntimeError("Google Drive'a bağlı değil")
+        self.service = build('drive', 'v3', credentials=self.credentials)
+        self._ensure_folder()
+    
+    def backup_incremental(self, storage, progress=None, cancel=None) -> dict:
+        """
+        Son eşitlemeden bu yana değişenleri delta olarak yükle (bkz.
+        clipstack.cloud_backup); ardından eski yedekleri buda
+        """
+        from clipstack.cloud_backup import sync_incremental
+        self._ensure_service()
+        result = sync_incremental(storage, self, progress=progress, cancel=cancel)
+        deleted, failed = self.prune_backups()
+        if deleted or failed:
+            print(f"[GDRIVE] Eski yedekler budandı: {deleted} silindi, {len(failed)} silinemedi")
+        return result
+    
+    def prepare_restore(self, storage, progress=None, cancel=None) -> dict:
+        """
+        Taban + delta zincirini indirip veritabanının yanına hazırla; sonuçtaki
+        "staged" dosyası Storage.replace_database ile yerine konur
+        """
+        from clipstack.cloud_backup import prepare_cloud_restore
+        self._ensure_service()
+        return prepare_cloud_restore(storage, self, progress=progress, cancel=cancel)
+    
+    def import_backup(self, storage, file_id: str, progress=None, cancel=None) -> dict:
+        """
+        Tam yedeği (zip arşivi ya da eski JSON / JSON.gz) diske akıtıp
+        doğrudan içe aktarıcıya ver; bölüm başına sayıları döndürür
+        """
+        from clipstack.archive import import_archive
+        self._ensure_service()
+        with tempfile.TemporaryDirectory(prefix="taxclip_gdrive_") as tmp:
+            path = Path(tmp) / "backup"
+            success, result = self.download_file(file_id, str(path))
+            if not success:
+                raise RuntimeError(result)
+            return import_archive(storage, path, progress=progress, cancel=cancel)
+    
     def delete_backup(self, file_id: str) -> tuple[bool, str]:
         """Yedek dosyasını sil"""
         if not self.service:
@@ -368,7 +538,76 @@ class GoogleDriveSync:
             return True, "Dosya silindi"
         except Exception as e:
             return False, f"Silme hatası: {str(e)}"
+    
+    def delete_backups(self, file_ids: Iterable[str], batch_size: int = None) -> tuple[int, list]:
+        """
+        Dosyaları toplu (batch) isteklerle sil: her istek en fazla
+        DELETE_BATCH silme taşır
+        
+        Returns:
+            (silinen sayısı, silinemeyen id listesi)
+        """
+        file_ids = list(file_ids)
+        if not self.service:
+            return 0, file_ids
+        
+        batch_size = batch_size or self.DELETE_BATCH
+        deleted = 0
+        failed = []
+        for start in range(0, len(file_ids), batch_size):
+            chunk = file_ids[start:start + batch_size]
+            errors = {}
+            
+            def on_response(request_id, response, exception, errors=errors):
+                errors[request_id] = exception
+            
+            batch = self.service.new_batch_http_request(callback=on_response)
+            for file_id in chunk:
+                batch.add(self.service.files().delete(fileId=file_id), request_id=file_id)
+            try:
+                batch.execute()
+            except Exception as e:
+                print(f"[GDRIVE] Toplu silme hatası: {e}")
+                failed.extend(chunk)
+                continue
+            for file_id in chunk:
+                if file_id in errors and errors[file_id] is None:
+                    deleted += 1
+                else:
+                    failed.append(file_id)
+        return deleted, failed
+    
+    def prune_backups(self, keep: int = None) -> tuple[int, list]:
+        """
+        Saklama: en yeni `keep` tam yedek (gdrive_keep_backups ayarı) ve
+        geçerli taban + delta zinciri kalır; diğerleri toplu silinir
+        
+        Returns:
+            (silinen sayısı, silinemeyen id listesi)
+        """
+        from clipstack.cloud_backup import stale_chain_files
+        if not self.service:
+            return 0, []
+        
+        if keep is None:
+            keep = int(self.settings.get("gdrive_keep_backups", self.KEEP_BACKUPS)) if self.settings else self.KEEP_BACKUPS
+        files = self.list_backups()
+        full = [item for item in files if (item.get('name') or '').startswith(self.BACKUP_PREFIX)]
+        full.sort(key=lambda item: item.get('createdTime') or '', reverse=True)
+        stale = full[max(0, keep):] + stale_chain_files(files)
+        if not stale:
+            return 0, []
+        return self.delete_backups(item['id'] for item in stale)
+
 
+def _text_chunks(data: Union[str, Iterable[str]], size: int = 1024 * 1024) -> Iterator[str]:
+    """Metni (ya da metin parçalarını) en fazla size karakterlik parçalara böl"""
+    if isinstance(data, str):
+        for start in range(0, len(data), size):
+            yield data[start:start + size]
+        return
+    for chunk in data:
+        yield from _text_chunks(chunk, size)
 
 # Test fonksiyonu
 if __name__ == "__main__":
@@ -0,0 +1,163 @@
+"""
+Pano kayıt hattı (ingestion pipeline)
+
+GUI thread'i yalnızca ham panoyu yakalar ve kuyruğa koyar; PNG kodlama,
+hassas veri taraması, OCR, şifreleme ve SQLite yazımı işçi thread'inde
+yapılır. Kuyruk sınırlıdır: dolarsa en eski bekleyen kayıt düşürülür.
+Kuyruk derinliği ve aşama süreleri stats() ile okunabilir.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+_STOP = object()
+
+
+class IngestionPipeline(QObject):
+    # (işlenen yakalama, storage satırı) — işçi thread'inden yayılır,
+    # alıcı GUI thread'inde olduğundan Qt kuyruklu bağlantı kullanır
+    item_ready = Signal(object, object)
+
+    def __init__(
+        self,
+        process: Callable[[object, dict], Optional[object]],
+        max_pending: int = 32,
+        on_thread_exit: Optional[Callable[[], None]] = None,
+    ):
+        """
+        process(capture, timings) -> satır | None: işçi thread'inde çalışır,
+        aşama sürelerini (saniye) timings sözlüğüne yazar.
+        """
+        super().__init__()
+        self._process = process
+        self._on_thread_exit = on_thread_exit
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(max_pending)))
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._processed = 0
+        self._dropped = 0
+        self._failed = 0
+        self._stages: dict = {}
+
+    # ---------- Kuyruk ----------
+
+    def submit(self, capture) -> bool:
+        """Yakalamayı kuyruğa ekle; kuyruk doluysa en eskisini düşür."""
+        self._ensure_thread()
+        while True:
+            try:
+                self._queue.put_nowait((time.perf_counter(), capture))
+                return True
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                except queue.Empty:
+                    continue
+                with self._lock:
+                    self._dropped += 1
+                print("[INGEST] Kuyruk dolu, en eski bekleyen kayıt düşürüldü")
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Kuyruktaki tüm işler bitene kadar bekle (testler / kapanış için)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = 2.0) -> None:
+        thread = self._thread
+        if not thread or not thread.is_alive():
+            return
+        self.wait_idle(timeout)
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+    # ---------- İstatistikler ----------
+
+    def stats(self) -> dict:
+        """
+        {"pending", "processed", "dropped", "failed",
+         "stages": {aşama: {"count", "last_ms", "avg_ms", "max_ms"}}}
+        """
+        with self._lock:
+            stages = {
+                name: {
+                    "count": data["count"],
+                    "last_ms": data["last"] * 1000.0,
+                    "avg_ms": data["total"] * 1000.0 / data["count"],
+                    "max_ms": data["max"] * 1000.0,
+                }
+                for name, data in self._stages.items()
+            }
+            return {
+                "pending": self._queue.qsize(),
+                "processed": self._processed,
+                "dropped": self._dropped,
+                "failed": self._failed,
+                "stages": stages,
+            }
+
+    def _record(self, timings: dict) -> None:
+        with self._lock:
+            for name, seconds in timings.items():
+                data = self._stages.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0, "last": 0.0})
+                data["count"] += 1
+                data["total"] += seconds
+                data["last"] = seconds
+                data["max"] = max(data["max"], seconds)
+
+    # ---------- İşçi thread ----------
+
+    def _ensure_thread(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="TaxClipIngest", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                job = self._queue.get()
+                try:
+                    if job is _STOP:
+                        return
+                    queued_at, capture = job
+                    timings = {"queue_wait": time.perf_counter() - queued_at}
+                    started = time.perf_counter()
+                    try:
+                        row = self._process(capture, timings)
+                    except Exception as e:
+                        with self._lock:
+                            self._failed += 1
+                        print(f"[INGEST] Kayıt işlenemedi: {e}")
+                        continue
+                    timings["total"] = time.perf_counter() - started
+                    self._record(timings)
+                    with self._lock:
+                        self._processed += 1
+                    if row is not None:
+                        self.item_ready.emit(capture, row)
+                finally:
+                    self._queue.task_done()
+        finally:
+            if self._on_thread_exit:
+                try:
+                    self._on_thread_exit()
+                except Exception:
+                    pass
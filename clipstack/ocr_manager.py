@@ -2,14 +2,21 @@
 OCR (Optik Karakter Tanıma) Yöneticisi
 1) Tesseract OCR (varsa) ile tanıma
 2) Windows native OCR (Windows.Media.Ocr) fallback
+
+Windows OCR, her çağrıda yeni PowerShell açmak yerine thread başına uzun
+ömürlü bir PowerShell sürecine stdin/stdout üzerinden istek gönderir.
+Görsel kayıtlarının OCR'si OCRQueue ile arka planda yapılır.
 """
 import base64
 import os
+import queue
 import sys
 import subprocess
 import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from io import BytesIO
 
 try:
@@ -89,12 +96,212 @@ try {
 _WIN_OCR_SCRIPT_B64 = base64.b64encode(_WIN_OCR_SCRIPT.encode("utf-16le")).decode("ascii")
 
 
+# Kalıcı Windows OCR süreci: her satır "<dil> <base64 png>", yanıt "OK|ERR <base64 utf-8>"
+_WIN_OCR_SERVER_SCRIPT = r'''
+$ProgressPreference = 'SilentlyContinue'
+Add-Type -AssemblyName System.Runtime.WindowsRuntime
+$null = [Windows.Media.Ocr.OcrEngine, Windows.Foundation, ContentType=WindowsRuntime]
+$null = [Windows.Graphics.Imaging.BitmapDecoder, Windows.Foundation, ContentType=WindowsRuntime]
+$null = [Windows.Storage.Streams.RandomAccessStream, Windows.Foundation, ContentType=WindowsRuntime]
+
+function Await($WinRtTask, $ResultType) {
+    $asTask = $WinRtTask.GetType().GetMethod('AsTask', [Type[]]@())
+    if (-not $asTask) {
+        $asTask = [System.WindowsRuntimeSystemExtensions].GetMethods() | Where-Object {
+            $_.Name -eq 'AsTask' -and $_.GetParameters().Count -eq 1 -and
+            $_.GetParameters()[0].ParameterType.Name -eq 'IAsyncOperation`1'
+        } | Select-Object -First 1
+        $asTask = $asTask.MakeGenericMethod($ResultType)
+        $task = $asTask.Invoke($null, @($WinRtTask))
+    } else {
+        $task = $asTask.Invoke($WinRtTask, @())
+    }
+    $task.Wait(-1) | Out-Null
+    $task.Result
+}
+
+function Encode($text) {
+    [Convert]::ToBase64String([System.Text.Encoding]::UTF8.GetBytes([string]$text))
+}
+
+$engines = @{}
+function Get-Engine($lang) {
+    if ($engines.ContainsKey($lang)) { return $engines[$lang] }
+    $engine = $null
+    try {
+        $langTag = [Windows.Globalization.Language]::new($lang)
+        if ([Windows.Media.Ocr.OcrEngine]::IsLanguageSupported($langTag)) {
+            $engine = [Windows.Media.Ocr.OcrEngine]::TryCreateFromLanguage($langTag)
+        }
+    } catch {}
+    if (-not $engine) {
+        $engine = [Windows.Media.Ocr.OcrEngine]::TryCreateFromUserProfileLanguages()
+    }
+    $engines[$lang] = $engine
+    return $engine
+}
+
+[Console]::Out.WriteLine("READY")
+[Console]::Out.Flush()
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($line -eq $null) { break }
+    $parts = $line.Split(' ', 2)
+    $stream = $null
+    $randomStream = $null
+    try {
+        $bytes = [Convert]::FromBase64String($parts[1])
+        $stream = New-Object System.IO.MemoryStream(,$bytes)
+        $randomStream = [System.IO.WindowsRuntimeStreamExtensions]::AsRandomAccessStream($stream)
+        $decoder = Await ([Windows.Graphics.Imaging.BitmapDecoder]::CreateAsync($randomStream)) ([Windows.Graphics.Imaging.BitmapDecoder])
+        $softBitmap = Await ($decoder.GetSoftwareBitmapAsync()) ([Windows.Graphics.Imaging.SoftwareBitmap])
+        $engine = Get-Engine $parts[0]
+        if (-not $engine) { throw "Windows OCR engine could not be created." }
+        $result = Await ($engine.RecognizeAsync($softBitmap)) ([Windows.Media.Ocr.OcrResult])
+        [Console]::Out.WriteLine("OK " + (Encode $result.Text))
+    } catch {
+        [Console]::Out.WriteLine("ERR " + (Encode $_.Exception.Message))
+    } finally {
+        if ($randomStream) { $randomStream.Dispose() }
+        if ($stream) { $stream.Dispose() }
+    }
+    [Console]::Out.Flush()
+}
+'''
+
+_WIN_OCR_SERVER_SCRIPT_B64 = base64.b64encode(_WIN_OCR_SERVER_SCRIPT.encode("utf-16le")).decode("ascii")
+
+# Dil eşleme (Tesseract format → BCP-47)
+_WIN_OCR_LANG_MAP = {
+    "tur": "tr", "eng": "en", "deu": "de", "fra": "fr",
+    "spa": "es", "ita": "it", "rus": "ru", "jpn": "ja",
+    "chi_sim": "zh-Hans", "chi_tra": "zh-Hant", "kor": "ko",
+    "ara": "ar", "por": "pt", "nld": "nl", "pol": "pl",
+}
+
+
+def _win_ocr_lang(lang: str) -> str:
+    # İlk dili al (tur+eng → tur → tr)
+    first_lang = lang.split("+")[0] if "+" in lang else lang
+    return _WIN_OCR_LANG_MAP.get(first_lang, "en")
+
+
+class _WinOcrProcess:
+    """Uzun ömürlü PowerShell OCR süreci (istekler sırayla işlenir)."""
+
+    def __init__(self, startup_timeout: float = 30.0):
+        self._startup_timeout = startup_timeout
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+
+    def _start(self) -> bool:
+        self._lines = queue.Queue()
+        try:
+            self._proc = subprocess.Popen(
+                [
+                    "powershell",
+                    "-NoProfile",
+                    "-NonInteractive",
+                    "-ExecutionPolicy",
+                    "Bypass",
+                    "-EncodedCommand",
+                    _WIN_OCR_SERVER_SCRIPT_B64,
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0),
+                text=True,
+                encoding="ascii",
+                errors="replace",
+                bufsize=1,
+            )
+        except Exception as e:
+            print(f"[OCR WinNative] Süreç başlatılamadı: {e}")
+            self._proc = None
+            return False
+
+        lines = self._lines
+        stdout = self._proc.stdout
+
+        def _reader():
+            for line in stdout:
+                lines.put(line.rstrip("\r\n"))
+            lines.put(None)
+
+        threading.Thread(target=_reader, name="TaxClipOCRReader", daemon=True).start()
+        if self._read_line(self._startup_timeout) != "READY":
+            self.close()
+            return False
+        return True
+
+    def _read_line(self, timeout: float) -> Optional[str]:
+        try:
+            return self._lines.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def is_running(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def recognize(self, image_bytes: bytes, lang: str, timeout: float = 30.0) -> tuple[bool, Optional[str]]:
+        """(başarılı, metin); süreç çalışmıyorsa başlatılır, zaman aşımında kapatılır."""
+        with self._lock:
+            if not self.is_running() and not self._start():
+                return False, None
+            try:
+                payload = base64.b64encode(image_bytes).decode("ascii")
+                self._proc.stdin.write(f"{lang} {payload}\n")
+                self._proc.stdin.flush()
+            except Exception as e:
+                print(f"[OCR WinNative] İstek gönderilemedi: {e}")
+                self.close()
+                return False, None
+
+            line = self._read_line(timeout)
+            if line is None:
+                print("[OCR WinNative] Zaman aşımı")
+                self.close()
+                return False, None
+
+        status, _, data = line.partition(" ")
+        try:
+            decoded = base64.b64decode(data).decode("utf-8", errors="replace").strip()
+        except Exception:
+            decoded = ""
+        if status != "OK":
+            print(f"[OCR WinNative] Hata: {decoded}")
+            return False, None
+        return True, (decoded or None)
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except Exception:
+            pass
+        try:
+            proc.wait(timeout=2)
+        except Exception:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+
+
 class OCRManager:
     def __init__(self, settings=None):
         self.settings = settings
         self.tesseract_path = None
         self._has_tesseract = False
         self._has_win_ocr = None  # lazy check
+        # Thread başına kalıcı Windows OCR süreci
+        self._win_local = threading.local()
+        self._win_procs: list = []
+        self._win_procs_lock = threading.Lock()
         self._check_tesseract()
     
     def _check_tesseract(self):
@@ -171,39 +378,78 @@ class OCRManager:
         Resimden metin çıkar.
         Önce Tesseract dener, yoksa Windows native OCR kullanır.
         """
+        return self.recognize(image_bytes, lang)[1]
+
+    def recognize(self, image_bytes: bytes, lang: str = "tur+eng") -> tuple[bool, Optional[str]]:
+        """
+        extract_text gibi; (başarılı, metin) döner. Başarısızlık motordan
+        kaynaklanır (zaman aşımı, çöken süreç, izin hatası) ve aynı görselle
+        yeniden denenebilir. Metin içermeyen ya da açılamayan görsel
+        (True, None) döner.
+        """
+        ok = False
         if self._has_tesseract:
-            result = self._extract_tesseract(image_bytes, lang)
-            if result:
-                return result
-        
+            ok, text = self._extract_tesseract(image_bytes, lang)
+            if text:
+                return True, text
+
         if self._check_win_ocr():
             return self._extract_win_ocr(image_bytes, lang)
-        
-        return None
-    
-    def _extract_tesseract(self, image_bytes: bytes, lang: str) -> Optional[str]:
-        """Tesseract OCR ile metin çıkar"""
+
+        return ok, None
+
+    def _extract_tesseract(self, image_bytes: bytes, lang: str) -> tuple[bool, Optional[str]]:
+        """Tesseract OCR ile metin çıkar: (başarılı, metin)"""
         try:
             image = Image.open(BytesIO(image_bytes))
+        except Exception as e:
+            print(f"[OCR Tesseract] Görsel açılamadı: {e}")
+            return True, None  # yeniden denemek sonucu değiştirmez
+        try:
             try:
                 text = pytesseract.image_to_string(image, lang=lang)
             except PermissionError:
                 print("[OCR] Tesseract izin hatası")
-                return None
+                return False, None
             except OSError as e:
                 if "740" in str(e):
                     print("[OCR] Tesseract yükseltme gerektiriyor")
-                    return None
+                    return False, None
                 raise
             
             text = text.strip()
-            return text if text else None
+            return True, (text if text else None)
         except Exception as e:
             print(f"[OCR Tesseract] Hata: {e}")
-            return None
+            return False, None
     
-    def _extract_win_ocr(self, image_bytes: bytes, lang: str = "tur+eng") -> Optional[str]:
-        """Windows native OCR ile metin çıkar"""
+    def _win_process(self) -> _WinOcrProcess:
+        proc = getattr(self._win_local, "proc", None)
+        if proc is None:
+            proc = _WinOcrProcess()
+            self._win_local.proc = proc
+            with self._win_procs_lock:
+                self._win_procs.append(proc)
+        return proc
+
+    def close(self) -> None:
+        """Kalıcı OCR süreçlerini kapat."""
+        with self._win_procs_lock:
+            procs, self._win_procs = self._win_procs, []
+        for proc in procs:
+            proc.close()
+        self._win_local = threading.local()
+
+    def _extract_win_ocr(self, image_bytes: bytes, lang: str = "tur+eng") -> tuple[bool, Optional[str]]:
+        """Windows native OCR ile metin çıkar (kalıcı süreç, olmazsa tek seferlik): (başarılı, metin)"""
+        proc = self._win_process()
+        ok, text = proc.recognize(image_bytes, _win_ocr_lang(lang))
+        if ok or proc.is_running():
+            return ok, text
+        return self._extract_win_ocr_once(image_bytes, lang)
+
+    def _extract_win_ocr_once(self, image_bytes: bytes, lang: str = "tur+eng") -> tuple[bool, Optional[str]]:
+        """Windows native OCR ile metin çıkar (her çağrıda yeni PowerShell): (başarılı, metin)"""
         tmp_path = None
         try:
             # Geçici dosyaya yaz
@@ -211,17 +457,7 @@ class OCRManager:
                 tmp_path = tmp.name
                 tmp.write(image_bytes)
             
-            # Dil eşleme (Tesseract format → BCP-47)
-            lang_map = {
-                "tur": "tr", "eng": "en", "deu": "de", "fra": "fr",
-                "spa": "es", "ita": "it", "rus": "ru", "jpn": "ja",
-                "chi_sim": "zh-Hans", "chi_tra": "zh-Hant", "kor": "ko",
-                "ara": "ar", "por": "pt", "nld": "nl", "pol": "pl",
-            }
-            
-            # İlk dili al (tur+eng → tur → tr)
-            first_lang = lang.split("+")[0] if "+" in lang else lang
-            win_lang = lang_map.get(first_lang, "en")
+            win_lang = _win_ocr_lang(lang)
 
             env = os.environ.copy()
             env["CLIPSTACK_OCR_IMAGE_PATH"] = tmp_path
@@ -248,18 +484,18 @@ class OCRManager:
             
             if result.returncode == 0:
                 text = (result.stdout or "").strip()
-                return text if text else None
+                return True, (text if text else None)
             else:
                 err = (result.stderr or "").strip()
                 print(f"[OCR WinNative] Hata: {err}")
-                return None
+                return False, None
                 
         except subprocess.TimeoutExpired:
             print("[OCR WinNative] Zaman aşımı")
-            return None
+            return False, None
         except Exception as e:
             print(f"[OCR WinNative] Hata: {e}")
-            return None
+            return False, None
         finally:
             if tmp_path:
                 try:
@@ -293,3 +529,147 @@ class OCRManager:
             "  2. Kurulumda Türkçe dil paketini seçin\n"
             "  3. Uygulamayı yeniden başlatın"
         )
+
+
+# Geçici OCR hatalarında kayıt başına deneme sınırı ve bekleme (saniye, her
+# denemede iki katına çıkar)
+OCR_MAX_ATTEMPTS = 5
+_OCR_RETRY_DELAY = 30.0
+_OCR_RETRY_DELAY_MAX = 30 * 60.0
+
+_shared_manager: Optional[OCRManager] = None
+_shared_manager_lock = threading.Lock()
+
+
+def get_ocr_manager(settings=None) -> OCRManager:
+    """Paylaşılan OCRManager (Tesseract denetimi ve kalıcı süreçler bir kez kurulur)."""
+    global _shared_manager
+    with _shared_manager_lock:
+        if _shared_manager is None or _shared_manager.settings is not settings:
+            if _shared_manager is not None:
+                _shared_manager.close()
+            _shared_manager = OCRManager(settings)
+        return _shared_manager
+
+
+class OCRQueue:
+    """
+    Görsel kayıtları için kalıcı OCR iş kuyruğu.
+
+    İşler clip_items.pending_ocr sütununda tutulur; böylece uygulama
+    kapanıp açılsa da bekleyen görseller işlenir. Küçük bir işçi havuzu
+    bekleyen kayıtları yeniden eskiye alır, OCR metnini yazar ve arama
+    indeksini günceller. Geçici hatalarda (zaman aşımı, çöken OCR süreci)
+    kayıt beklemede kalır ve artan aralıklarla yeniden denenir; yalnızca
+    OCR_MAX_ATTEMPTS deneme dolunca ya da görsel okunamıyorsa bırakılır.
+    on_done(item_id, text, dropped) işçi thread'inde çağrılır; dropped, OCR
+    metni hassas veri politikasına takıldığı için kaydın silindiğini belirtir.
+    """
+
+    def __init__(self, storage, settings, workers: Optional[int] = None, idle_timeout: float = 30.0):
+        self.storage = storage
+        self.settings = settings
+        if workers is None:
+            workers = settings.get("ocr_workers", 1) if settings else 1
+        self._workers = max(1, int(workers or 1))
+        self._idle_timeout = idle_timeout
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._inflight: set = set()
+        # Geçici hatadan sonra bekleyen kayıtlar (id -> yeniden deneme zamanı, monotonic)
+        self._retry_at: dict = {}
+        self._threads: list = []
+        self.on_done: Optional[Callable[[int, Optional[str], bool], None]] = None
+
+    def start(self) -> None:
+        if any(thread.is_alive() for thread in self._threads):
+            self.notify()
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"TaxClipOCR-{index}", daemon=True)
+            for index in range(self._workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        self.notify()
+
+    def notify(self, item_id: Optional[int] = None) -> None:
+        """Yeni iş var; bekleyen işçileri uyandır."""
+        self._wake.set()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        get_ocr_manager(self.settings).close()
+
+    def _enabled(self) -> bool:
+        return bool(self.settings and self.settings.get("ocr_enabled", False))
+
+    def _claim(self) -> Optional[int]:
+        with self._lock:
+            now = time.monotonic()
+            self._retry_at = {item_id: at for item_id, at in self._retry_at.items() if at > now}
+            skip = self._inflight | set(self._retry_at)
+            for item_id in self.storage.pending_ocr_ids(limit=len(skip) + 1):
+                if item_id not in skip:
+                    self._inflight.add(item_id)
+                    return item_id
+        return None
+
+    def _retry_later(self, item_id: int) -> None:
+        """Geçici hata: kayıt beklemede kalır; deneme sınırı dolduysa bırakılır."""
+        attempts = self.storage.record_ocr_failure(item_id)
+        if attempts >= OCR_MAX_ATTEMPTS:
+            print(f"[OCR QUEUE] #{item_id} {attempts} denemede okunamadı, bırakıldı")
+            self.storage.set_ocr_result(item_id, None)
+        elif attempts:
+            delay = min(_OCR_RETRY_DELAY * 2 ** (attempts - 1), _OCR_RETRY_DELAY_MAX)
+            with self._lock:
+                self._retry_at[item_id] = time.monotonic() + delay
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                self._wake.clear()
+                item_id = None
+                if self._enabled() and get_ocr_manager(self.settings).is_available():
+                    item_id = self._claim()
+                if item_id is None:
+                    self._wake.wait(self._idle_timeout)
+                    continue
+                try:
+                    if not self._process(item_id):
+                        self._retry_later(item_id)
+                except Exception as e:
+                    print(f"[OCR QUEUE] Hata (#{item_id}): {e}")
+                    try:
+                        self._retry_later(item_id)
+                    except Exception:
+                        pass
+                finally:
+                    with self._lock:
+                        self._inflight.discard(item_id)
+        finally:
+            close = getattr(self.storage, "close_thread_connection", None)
+            if close:
+                close()
+
+    def _process(self, item_id: int) -> bool:
+        """Kaydın OCR'sini yap; OCR motoru geçici olarak başarısızsa False döner."""
+        row = self.storage.get_item(item_id)
+        text = None
+        if row and row.get("image_blob"):
+            lang = self.settings.get("ocr_language", "tur+eng")
+            ok, text = get_ocr_manager(self.settings).recognize(row["image_blob"], lang=lang)
+            if not ok:
+                return False
+        dropped = self.storage.set_ocr_result(item_id, text)
+        if text:
+            print(f"[OCR QUEUE] #{item_id} metin çıkarıldı: {text[:50]}...")
+        if self.on_done:
+            self.on_done(item_id, text, dropped)
+        return True
@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import Optional, Callable
+import heapq
+import math
+from typing import List, Optional, Callable, Tuple
 from datetime import datetime, timedelta
 from PySide6.QtCore import QObject, Signal, QTimer, Qt
 from .settings import Settings
@@ -7,92 +9,150 @@ from .storage import Storage
 
 
 class ReminderManager(QObject):
-    """Hatırlatmaları kontrol eder ve zamanı gelenleri bildirir"""
+    """Hatırlatmaları zamanlar ve zamanı gelenleri bildirir
+
+    Aktif hatırlatmaların bir sonraki tetiklenme zamanları bir min-heap'te
+    tutulur ve en yakını için tek seferlik bir zamanlayıcı kurulur; boştayken
+    veritabanı okunmaz. Storage hatırlatmaları değiştirdiğinde heap yeniden
+    yüklenir.
+    """
     
     reminder_triggered = Signal(dict)  # Hatırlatma tetiklendiğinde sinyal
+    _reload_requested = Signal()  # Storage değişikliği (herhangi bir thread'den)
+
+    # Saat değişikliği / uykudan dönüş en geç bu sürede fark edilir
+    MAX_WAIT_MS = 60_000
+    # Tetiklenen hatırlatma, kullanıcı işlem yapmazsa bu süre sonra tekrar açılır
+    RETRIGGER_DELAY = timedelta(seconds=120)
     
     def __init__(self, storage: Storage, settings: Settings, parent=None):
         super().__init__(parent)
         self.storage = storage
         self.settings = settings
-        self.startup_time = datetime.now()  # Uygulama başlangıç zamanı
+        self._heap: Optional[List[Tuple[datetime, int]]] = None
+        self._running = True
         
-        # Hatırlatmaları sık aralıklarla kontrol et
+        # En yakın hatırlatma için tek seferlik zamanlayıcı
         self.check_timer = QTimer(self)
-        self.check_timer.timeout.connect(self._check_reminders)
+        self.check_timer.setSingleShot(True)
         self.check_timer.setTimerType(Qt.PreciseTimer)
-        self.check_timer.start(2000)  # 2 saniye
+        self.check_timer.timeout.connect(self._check_reminders)
+
+        # Art arda gelen değişiklikleri tek bir yeniden yüklemede birleştir
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.timeout.connect(self.reschedule)
+        self._reload_requested.connect(self._on_reload_requested)
+        self.storage.on_reminders_changed = self._reload_requested.emit
         
-        # İlk kontrolü hemen yap (sadece gelecekteki hatırlatmalar için)
-        QTimer.singleShot(1000, lambda: self._check_reminders(skip_past=True))
+        # İlk yükleme arayüz hazır olduktan sonra
+        self._reload_timer.start(1000)
+
+    # ---------- Zamanlama ----------
+
+    def _due_time(self, reminder: dict) -> datetime:
+        """Hatırlatmanın tetikleneceği an (yakın zamanda tetiklendiyse ertelenir)"""
+        due = datetime.fromisoformat(reminder["reminder_time"])
+        last_triggered = reminder.get("last_triggered")
+        if last_triggered:
+            due = max(due, datetime.fromisoformat(last_triggered) + self.RETRIGGER_DELAY)
+        return due
+
+    def _load_schedule(self) -> None:
+        heap = []
+        for reminder in self.storage.list_reminder_schedule():
+            try:
+                heap.append((self._due_time(reminder), reminder["id"]))
+            except (TypeError, ValueError) as e:
+                print(f"[REMINDER] ID {reminder.get('id')} zamanı okunamadı: {e}")
+        heapq.heapify(heap)
+        self._heap = heap
+
+    def _on_reload_requested(self):
+        if self._running:
+            self._reload_timer.start(0)
+
+    def reschedule(self):
+        """Zamanlamayı veritabanından yeniden yükle ve zamanlayıcıyı kur"""
+        try:
+            self._load_schedule()
+        except Exception as e:
+            print(f"[REMINDER] Zamanlama yüklenemedi: {e}")
+            return
+        self._arm()
+
+    def _arm(self):
+        self.check_timer.stop()
+        if not self._running or not self._heap:
+            return
+        delay = (self._heap[0][0] - datetime.now()).total_seconds() * 1000
+        self.check_timer.start(int(min(max(math.ceil(delay), 0), self.MAX_WAIT_MS)))
+
+    def _pop_due(self, now: datetime) -> List[int]:
+        due_ids = []
+        while self._heap and self._heap[0][0] <= now:
+            due_ids.append(heapq.heappop(self._heap)[1])
+        return due_ids
+
+    # ---------- Tetikleme ----------
     
-    def _check_reminders(self, skip_past: bool = False):
-        """Aktif hatırlatmaları kontrol et
-        
-        Args:
-            skip_past: True ise, uygulama başlangıcından önceki hatırlatmaları atla
-        """
+    def _check_reminders(self):
+        """Zamanı gelen hatırlatmaları tetikle ve sonraki için zamanlayıcıyı kur"""
         try:
-            now = datetime.now()
-            reminders = self.storage.list_reminders(active_only=True)
-            
-            for reminder in reminders:
-                reminder_time = datetime.fromisoformat(reminder["reminder_time"])
-                reminder_id = reminder["id"]
-                last_triggered = reminder.get("last_triggered")
-                
-                # Eğer skip_past aktifse ve hatırlatma zamanı uygulama başlangıcından önceyse atla
-                if skip_past and hasattr(self, 'startup_time') and reminder_time < self.startup_time:
-                    continue
-                
-                # Zaman geldi mi kontrol et
-                if reminder_time <= now:
-                    # Daha önce tetiklenmiş mi kontrol et (tekrar tetiklenmesini önle)
-                    if last_triggered:
-                        last_triggered_dt = datetime.fromisoformat(last_triggered)
-                        # Eğer son 2 dakika içinde tetiklendiyse tekrar tetikleme
-                        if (now - last_triggered_dt).total_seconds() < 120:
-                            print(f"[REMINDER] ID {reminder_id} yakın zamanda tetiklendi, atlanıyor")
-                            continue
-
-                    print(f"[REMINDER] Hatırlatma tetikleniyor: ID={reminder_id}, Title={reminder.get('title')}")
-
-                    # Önce tetiklenme zamanını kaydet. Uygulama içi modal açıkken
-                    # nested event loop tetiklenirse aynı hatırlatma tekrar açılmasın.
-                    self.storage.mark_reminder_triggered(reminder_id)
-
-                    original_time = reminder["reminder_time"]
-
-                    # Bildirimi tetikle
-                    self.reminder_triggered.emit(reminder)
-
-                    # Modal sırasında kullanıcı snooze yaptıysa veya başka bir akış kaydı
-                    # güncellediyse sonraki işlemleri eski veriyle ezme.
-                    latest_reminder = self.storage.get_reminder(reminder_id)
-                    if not latest_reminder:
-                        continue
-
-                    if latest_reminder.get("reminder_time") != original_time:
-                        print(f"[REMINDER] Hatırlatma zamanı kullanıcı aksiyonu ile değişti: ID={reminder_id}")
-                        continue
-
-                    if not latest_reminder.get("is_active", 1):
-                        continue
-
-                    # Tekrarlama varsa güncelle, yoksa switch'i kapat
-                    repeat_type = latest_reminder.get("repeat_type", "none")
-                    if repeat_type and repeat_type != "none":
-                        # Tekrarlayan hatırlatma - sonraki zamanı ayarla
-                        self._schedule_next_repeat(latest_reminder)
-                    else:
-                        # Tek seferlik hatırlatma - sadece switch'i kapat, KARTINI SILME!
-                        self.storage.set_reminder_active(reminder_id, False)
-                        print(f"[REMINDER] Tek seferlik hatırlatma pasif yapıldı: ID={reminder_id}")
-        
+            if self._heap is None:
+                self._load_schedule()
+            for reminder_id in self._pop_due(datetime.now()):
+                self._trigger(reminder_id)
         except Exception as e:
             print(f"Hatırlatma kontrol hatası: {e}")
             import traceback
             traceback.print_exc()
+        self._arm()
+
+    def _trigger(self, reminder_id: int):
+        reminder = self.storage.get_reminder(reminder_id)
+        if not reminder or not reminder.get("is_active", 1):
+            return
+
+        # Heap eski kalmış olabilir; zamanı kayıttan tekrar doğrula
+        due = self._due_time(reminder)
+        if due > datetime.now():
+            heapq.heappush(self._heap, (due, reminder_id))
+            return
+
+        print(f"[REMINDER] Hatırlatma tetikleniyor: ID={reminder_id}, Title={reminder.get('title')}")
+
+        # Önce tetiklenme zamanını kaydet. Uygulama içi modal açıkken
+        # nested event loop tetiklenirse aynı hatırlatma tekrar açılmasın.
+        self.storage.mark_reminder_triggered(reminder_id)
+
+        original_time = reminder["reminder_time"]
+
+        # Bildirimi tetikle
+        self.reminder_triggered.emit(reminder)
+
+        # Modal sırasında kullanıcı snooze yaptıysa veya başka bir akış kaydı
+        # güncellediyse sonraki işlemleri eski veriyle ezme.
+        latest_reminder = self.storage.get_reminder(reminder_id)
+        if not latest_reminder:
+            return
+
+        if latest_reminder.get("reminder_time") != original_time:
+            print(f"[REMINDER] Hatırlatma zamanı kullanıcı aksiyonu ile değişti: ID={reminder_id}")
+            return
+
+        if not latest_reminder.get("is_active", 1):
+            return
+
+        # Tekrarlama varsa güncelle, yoksa switch'i kapat
+        repeat_type = latest_reminder.get("repeat_type", "none")
+        if repeat_type and repeat_type != "none":
+            # Tekrarlayan hatırlatma - sonraki zamanı ayarla
+            self._schedule_next_repeat(latest_reminder)
+        else:
+            # Tek seferlik hatırlatma - sadece switch'i kapat, KARTINI SILME!
+            self.storage.set_reminder_active(reminder_id, False)
+            print(f"[REMINDER] Tek seferlik hatırlatma pasif yapıldı: ID={reminder_id}")
     
     def _schedule_next_repeat(self, reminder: dict):
         """Tekrarlayan hatırlatma için sonraki zamanı planla"""
@@ -139,10 +199,11 @@ class ReminderManager(QObject):
     
     def start(self):
         """Hatırlatma kontrolünü başlat"""
-        if not self.check_timer.isActive():
-            self.check_timer.start(2000)
+        self._running = True
+        self.reschedule()
     
     def stop(self):
         """Hatırlatma kontrolünü durdur"""
-        if self.check_timer.isActive():
-            self.check_timer.stop()
+        self._running = False
+        self._reload_timer.stop()
+        self.check_timer.stop()
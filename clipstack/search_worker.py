@@ -0,0 +1,132 @@
+"""
+Arka plan arama işçisi
+
+Aramalar GUI thread'inde değil işçi thread'inde çalışır. Her sorgu kendi
+iptal belirtecini (threading.Event) alır; yeni bir sorgu gelince önceki
+belirteç tetiklenir ve süren tarama ilk parça arasında bırakılır. Sonuçlar
+sıralı partiler hâlinde sorgu numarasıyla yayınlanır; alıcı güncel olmayan
+numaraları yok sayar.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, Signal
+
+from .storage import SearchCancelled
+
+
+class SearchWorker(QObject):
+    # (sorgu no, sıralı sonuçlar, son parti mi) — işçi thread'inden yayılır
+    results_ready = Signal(int, object, bool)
+    # (sorgu no, hata mesajı)
+    search_failed = Signal(int, str)
+
+    def __init__(
+        self,
+        search: Callable[..., Iterator[Tuple[List[dict], bool]]],
+        on_thread_exit: Optional[Callable[[], None]] = None,
+    ):
+        """
+        search(cancel=Event, **params): (satırlar, bitti mi) çiftleri veren
+        üreteç (Storage.iter_search); işçi thread'inde çalışır.
+        """
+        super().__init__()
+        self._search = search
+        self._on_thread_exit = on_thread_exit
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._pending: Optional[tuple] = None
+        self._cancel: Optional[threading.Event] = None
+        self._query_id = 0
+        self._stopping = False
+        self._last_first_batch_ms: Optional[float] = None
+
+    # ---------- Sorgular ----------
+
+    def submit(self, **params) -> int:
+        """Yeni aramayı başlat (süren aramayı iptal eder); sorgu numarasını döndür."""
+        with self._cond:
+            if self._cancel is not None:
+                self._cancel.set()
+            self._query_id += 1
+            self._cancel = threading.Event()
+            self._pending = (self._query_id, params, self._cancel, time.perf_counter())
+            self._stopping = False
+            self._cond.notify()
+            query_id = self._query_id
+        self._ensure_thread()
+        return query_id
+
+    def cancel(self) -> None:
+        """Bekleyen ve süren aramayı iptal et; gelecek partiler yayınlanmaz."""
+        with self._cond:
+            if self._cancel is not None:
+                self._cancel.set()
+            self._cancel = None
+            self._pending = None
+            self._query_id += 1
+
+    def is_current(self, query_id: int) -> bool:
+        with self._cond:
+            return query_id == self._query_id and self._cancel is not None
+
+    @property
+    def last_first_batch_ms(self) -> Optional[float]:
+        """Son aramada isteğin ilk partisinin yayınlanmasına kadar geçen süre."""
+        return self._last_first_batch_ms
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self.cancel()
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        thread = self._thread
+        if thread and thread.is_alive():
+            thread.join(timeout)
+
+    # ---------- İşçi thread ----------
+
+    def _ensure_thread(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="TaxClipSearch", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._cond:
+                    while self._pending is None and not self._stopping:
+                        self._cond.wait()
+                    if self._pending is None:
+                        return
+                    query_id, params, cancel, submitted_at = self._pending
+                    self._pending = None
+                self._execute(query_id, params, cancel, submitted_at)
+        finally:
+            if self._on_thread_exit:
+                try:
+                    self._on_thread_exit()
+                except Exception:
+                    pass
+
+    def _execute(self, query_id: int, params: dict, cancel: threading.Event, submitted_at: float) -> None:
+        first = True
+        try:
+            for rows, done in self._search(cancel=cancel, **params):
+                if cancel.is_set():
+                    return
+                if first:
+                    self._last_first_batch_ms = (time.perf_counter() - submitted_at) * 1000.0
+                    first = False
+                self.results_ready.emit(query_id, rows, done)
+        except SearchCancelled:
+            return
+        except Exception as e:
+            if cancel.is_set():
+                return
+            print(f"[SEARCH] Arama başarısız: {e}")
+            self.search_failed.emit(query_id, str(e))
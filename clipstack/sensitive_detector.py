@@ -2,8 +2,85 @@
 Hassas Veri Algılama ve Maskeleme
 Kredi kartı, şifre, email vb. hassas bilgileri tespit eder
 """
+import bisect
+import functools
 import re
-from typing import Tuple, List, Dict
+from dataclasses import dataclass, field
+from typing import Tuple, List, Dict, Optional
+
+# Kayıtlarda saklanan algılama sonucunun sürümü; kalıplar değişirse artırılır
+DETECTOR_VERSION = 2
+
+# Algılama sonucunu etkileyen ayarlar ve varsayılanları (SensitiveDataDetector ile aynı)
+DETECTION_SETTINGS = (
+    ("sensitive_data_detection", True),
+    ("mask_credit_cards", True),
+    ("mask_passwords", True),
+    ("mask_api_keys", True),
+    ("mask_emails", False),
+    ("mask_phones", False),
+    ("mask_tc_ids", True),
+    ("mask_ibans", True),
+)
+
+# Kategoriler (maskeleme sırasıyla), açan ayar ve kullanıcıya gösterilen adı
+CATEGORY_SETTINGS = (
+    ("credit_cards", "mask_credit_cards"),
+    ("passwords", "mask_passwords"),
+    ("api_keys", "mask_api_keys"),
+    ("emails", "mask_emails"),
+    ("phones", "mask_phones"),
+    ("tc_ids", "mask_tc_ids"),
+    ("ibans", "mask_ibans"),
+)
+CATEGORY_LABELS = {
+    "credit_cards": "kredi kartı",
+    "passwords": "şifre",
+    "api_keys": "API key",
+    "emails": "email",
+    "phones": "telefon",
+    "tc_ids": "TC kimlik",
+    "ibans": "IBAN",
+}
+
+# Uzun metinler bu boyutta parçalarla taranır; parça sınırında kalan
+# eşleşmeler için pencere SCAN_OVERLAP_CHARS kadar taşar
+SCAN_CHUNK_CHARS = 1 << 20
+SCAN_OVERLAP_CHARS = 4096
+
+
+@dataclass
+class SensitiveMatch:
+    category: str
+    start: int
+    end: int
+    value: str
+
+
+@dataclass
+class SensitiveScan:
+    """Bir metnin tek taramasının sonucu: eşleşmeler metin sırasıyla."""
+    text: str
+    matches: List[SensitiveMatch] = field(default_factory=list)
+    scanned_chars: int = 0
+    truncated: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.matches)
+
+    def covers(self, text: str) -> bool:
+        return self.text is text or self.text == (text or "")
+
+    @property
+    def categories(self) -> List[str]:
+        found = {match.category for match in self.matches}
+        return [category for category, _ in CATEGORY_SETTINGS if category in found]
+
+    def by_category(self) -> Dict[str, List[str]]:
+        detected: Dict[str, List[str]] = {}
+        for category in self.categories:
+            detected[category] = [m.value for m in self.matches if m.category == category]
+        return detected
 
 
 class SensitiveDataDetector:
@@ -29,7 +106,7 @@ class SensitiveDataDetector:
     
     # API Keys / Tokens
     API_KEY_PATTERN = re.compile(
-        r'(?:api[_-]?key|api[_-]?token|access[_-]?token|secret[_-]?key)\s*[:=]\s*[\'"]?([a-zA-Z0-9_\-]{20,})[\'"]?',
+        r'(?:api[_-]?key|api[_-]?token|access[_-]?token|secret[_-]?key)\s*[:=]\s*[\'"]?(?P<api_key>[a-zA-Z0-9_\-]{20,})[\'"]?',
         re.IGNORECASE
     )
     
@@ -38,9 +115,9 @@ class SensitiveDataDetector:
         r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
     )
     
-    # Telefon numaraları (Türkiye)
+    # Telefon numaraları (Türkiye); öndeki boşluk eşleşmeye dahil edilmez
     PHONE_PATTERN = re.compile(
-        r'(?:\+90|0)?[\s\-]?\(?5\d{2}\)?[\s\-]?\d{3}[\s\-]?\d{2}[\s\-]?\d{2}'
+        r'(?:(?:\+90|0)[\s\-]?)?\(?5\d{2}\)?[\s\-]?\d{3}[\s\-]?\d{2}[\s\-]?\d{2}'
     )
     
     # TC Kimlik No
@@ -54,6 +131,9 @@ class SensitiveDataDetector:
         re.IGNORECASE
     )
     
+    # Tek metinde taranan en fazla karakter (çok büyük yapıştırmalar için)
+    MAX_SCAN_CHARS = 8 * 1024 * 1024
+    
     def __init__(self, settings=None):
         self.settings = settings
         self.enabled = settings.get("sensitive_data_detection", True) if settings else True
@@ -65,7 +145,65 @@ class SensitiveDataDetector:
         self.mask_tc_ids = settings.get("mask_tc_ids", True) if settings else True
         self.mask_ibans = settings.get("mask_ibans", True) if settings else True
         self.block_sensitive = settings.get("block_sensitive_data", False) if settings else False
+        enabled = tuple(category for category, attr in CATEGORY_SETTINGS if getattr(self, attr))
+        self._scanner, self._branches, self._later_branches = (
+            _compile_scanner(enabled) if self.enabled and enabled else (None, {}, {})
+        )
     
+    def scan(self, text: str) -> "SensitiveScan":
+        """
+        Etkin tüm kategorileri tek bir birleşik kalıpla, metni bir kez
+        yürüyerek bul. Çok uzun metinler parça parça ve en fazla
+        MAX_SCAN_CHARS karaktere kadar taranır (truncated ile işaretlenir).
+        """
+        result = SensitiveScan(text or "")
+        if not self.enabled or not text or self._scanner is None:
+            return result
+        limit = min(len(text), self.MAX_SCAN_CHARS)
+        result.truncated = len(text) > limit
+        pos = 0
+        while pos < limit:
+            end = min(pos + SCAN_CHUNK_CHARS, limit)
+            # Parça sınırındaki eşleşmeler kesilmesin diye pencere biraz taşar
+            window = min(end + SCAN_OVERLAP_CHARS, limit)
+            pos = self._scan_chunk(text, pos, end, window, limit, result)
+        result.scanned_chars = limit
+        return result
+
+    def _scan_chunk(self, text, pos, end, window, limit, result) -> int:
+        search = self._scanner.search
+        while True:
+            match = search(text, pos, window)
+            if match is None or match.start() >= end:
+                return end
+            start = match.start()
+            if window < limit and match.end() >= window and start > pos:
+                return start  # sonraki parçada bütün olarak bulunur
+            category = match.lastgroup
+            self._record(category, match, result)
+            # Birleşik kalıpta aynı konumda ilk eşleşen dal kazanır; diğer
+            # kategoriler bu konumda ayrıca denenir
+            for other in self._later_branches[category]:
+                other_match = self._branches[other].match(text, start, window)
+                if other_match:
+                    self._record(other, other_match, result)
+            pos = start + 1
+
+    def _record(self, category: str, match: "re.Match", result: "SensitiveScan") -> None:
+        start, end = match.span(_VALUE_GROUPS.get(category, category))
+        value = match.string[start:end]
+        if category == "credit_cards" and not self._validate_luhn(value):
+            return
+        if category == "tc_ids" and not self._validate_tc_id(value):
+            return
+        result.matches.append(SensitiveMatch(category, start, end, value))
+
+    def scan_once(self, text: str, scan: Optional["SensitiveScan"] = None) -> "SensitiveScan":
+        """Verilen tarama bu metne aitse onu, değilse yeni taramayı döndür."""
+        if scan is not None and scan.covers(text):
+            return scan
+        return self.scan(text)
+
     def detect_sensitive_data(self, text: str) -> Dict[str, List[str]]:
         """
         Metindeki hassas verileri tespit et
@@ -73,66 +211,12 @@ class SensitiveDataDetector:
         Returns:
             Dict of detected sensitive data types and their values
         """
-        if not self.enabled or not text:
-            return {}
-        
-        detected = {}
-        
-        # Kredi kartı
-        if self.mask_credit_cards:
-            cards = self.CREDIT_CARD_PATTERN.findall(text)
-            if cards:
-                # Luhn algoritması ile doğrula
-                valid_cards = [card for card in cards if self._validate_luhn(card)]
-                if valid_cards:
-                    detected['credit_cards'] = valid_cards
-        
-        # Şifreler
-        if self.mask_passwords:
-            passwords = []
-            for pattern in self.PASSWORD_PATTERNS:
-                matches = pattern.findall(text)
-                passwords.extend(matches)
-            if passwords:
-                detected['passwords'] = passwords
-        
-        # API Keys
-        if self.mask_api_keys:
-            api_keys = self.API_KEY_PATTERN.findall(text)
-            if api_keys:
-                detected['api_keys'] = api_keys
-        
-        # Email
-        if self.mask_emails:
-            emails = self.EMAIL_PATTERN.findall(text)
-            if emails:
-                detected['emails'] = emails
-        
-        # Telefon
-        if self.mask_phones:
-            phones = self.PHONE_PATTERN.findall(text)
-            if phones:
-                detected['phones'] = phones
-        
-        # TC Kimlik
-        if self.mask_tc_ids:
-            tc_ids = self.TC_ID_PATTERN.findall(text)
-            # 11 haneli ve Luhn kontrolü
-            valid_tc = [tc for tc in tc_ids if len(tc) == 11 and self._validate_tc_id(tc)]
-            if valid_tc:
-                detected['tc_ids'] = valid_tc
-        
-        # IBAN
-        if self.mask_ibans:
-            ibans = self.IBAN_PATTERN.findall(text)
-            if ibans:
-                detected['ibans'] = ibans
-        
-        return detected
+        return self.scan(text).by_category()
     
-    def should_block(self, text: str) -> Tuple[bool, str]:
+    def should_block(self, text: str, scan: Optional["SensitiveScan"] = None) -> Tuple[bool, str]:
         """
-        Bu metin kaydedilmemeli mi?
+        Bu metin kaydedilmemeli mi? `scan` aynı metnin önceki taramasıysa
+        yeniden kullanılır.
         
         Returns:
             (block: bool, reason: str)
@@ -140,37 +224,18 @@ class SensitiveDataDetector:
         if not self.block_sensitive:
             return False, ""
         
-        detected = self.detect_sensitive_data(text)
-        
-        if not detected:
+        categories = self.scan_once(text, scan).categories
+        if not categories:
             return False, ""
         
         # Hangi türler tespit edildi
-        types = []
-        if 'credit_cards' in detected:
-            types.append("kredi kartı")
-        if 'passwords' in detected:
-            types.append("şifre")
-        if 'api_keys' in detected:
-            types.append("API key")
-        if 'emails' in detected:
-            types.append("email")
-        if 'phones' in detected:
-            types.append("telefon")
-        if 'tc_ids' in detected:
-            types.append("TC kimlik")
-        if 'ibans' in detected:
-            types.append("IBAN")
-        
-        if types:
-            reason = f"Hassas veri tespit edildi: {', '.join(types)}"
-            return True, reason
-        
-        return False, ""
+        types = [CATEGORY_LABELS[category] for category in categories]
+        return True, f"Hassas veri tespit edildi: {', '.join(types)}"
     
-    def mask_text(self, text: str) -> Tuple[str, bool]:
+    def mask_text(self, text: str, scan: Optional["SensitiveScan"] = None) -> Tuple[str, bool]:
         """
-        Metindeki hassas verileri maskele
+        Metindeki hassas verileri maskele (eşleşme konumlarına göre tek geçişte).
+        `scan` aynı metnin önceki taramasıysa yeniden kullanılır.
         
         Returns:
             (masked_text, was_masked)
@@ -178,56 +243,67 @@ class SensitiveDataDetector:
         if not self.enabled or not text:
             return text, False
         
-        detected = self.detect_sensitive_data(text)
-        
-        if not detected:
+        scan = self.scan_once(text, scan)
+        if not scan:
             return text, False
         
-        masked_text = text
-        
-        # Kredi kartlarını maskele
-        if 'credit_cards' in detected:
-            for card in detected['credit_cards']:
-                masked = self._mask_credit_card(card)
-                masked_text = masked_text.replace(card, masked)
-        
-        # Şifreleri maskele
-        if 'passwords' in detected:
-            for pwd in detected['passwords']:
-                masked = self._mask_password(pwd)
-                masked_text = masked_text.replace(pwd, masked)
-        
-        # API Keys
-        if 'api_keys' in detected:
-            for key in detected['api_keys']:
-                masked = f"{'*' * len(key)}"
-                masked_text = masked_text.replace(key, masked)
-        
-        # Email
-        if 'emails' in detected:
-            for email in detected['emails']:
-                masked = self._mask_email(email)
-                masked_text = masked_text.replace(email, masked)
-        
-        # Telefon
-        if 'phones' in detected:
-            for phone in detected['phones']:
-                masked = self._mask_phone(phone)
-                masked_text = masked_text.replace(phone, masked)
-        
-        # TC Kimlik
-        if 'tc_ids' in detected:
-            for tc_id in detected['tc_ids']:
-                masked = f"{tc_id[:2]}{'*' * 7}{tc_id[-2:]}"
-                masked_text = masked_text.replace(tc_id, masked)
-        
-        # IBAN
-        if 'ibans' in detected:
-            for iban in detected['ibans']:
-                masked = f"TR** **** **** **** **** **** {iban[-2:]}"
-                masked_text = masked_text.replace(iban.replace(' ', ''), masked)
-        
-        return masked_text, True
+        pieces = []
+        pos = 0
+        for category, start, end in self._mask_regions(scan):
+            pieces.append(text[pos:start])
+            pieces.append(self._mask_value(category, text[start:end]))
+            pos = end
+        pieces.append(text[pos:])
+        return "".join(pieces), True
+    
+    @staticmethod
+    def _mask_regions(scan: "SensitiveScan") -> List[Tuple[str, int, int]]:
+        """
+        Maskelenecek örtüşmeyen bölgeler (başlangıca göre sıralı). Aynı
+        kategoride örtüşen eşleşmeler birleştirilir; farklı kategoriler
+        örtüşürse kategori sırasında önce gelen kazanır (kart > şifre > ...).
+        """
+        merged: List[Tuple[int, str, int, int]] = []
+        priority = {category: index for index, (category, _) in enumerate(CATEGORY_SETTINGS)}
+        for category in scan.categories:
+            spans = sorted((m.start, m.end) for m in scan.matches if m.category == category)
+            start, end = spans[0]
+            for next_start, next_end in spans[1:]:
+                if next_start < end:
+                    end = max(end, next_end)
+                    continue
+                merged.append((priority[category], category, start, end))
+                start, end = next_start, next_end
+            merged.append((priority[category], category, start, end))
+        
+        starts: List[int] = []
+        regions: List[Tuple[str, int, int]] = []
+        for _, category, start, end in sorted(merged):
+            index = bisect.bisect_right(starts, start)
+            if index and regions[index - 1][2] > start:
+                continue
+            if index < len(regions) and regions[index][1] < end:
+                continue
+            starts.insert(index, start)
+            regions.insert(index, (category, start, end))
+        return regions
+    
+    def _mask_value(self, category: str, value: str) -> str:
+        if category == "credit_cards":
+            return self._mask_credit_card(value)
+        if category == "passwords":
+            return self._mask_password(value)
+        if category == "api_keys":
+            return '*' * len(value)
+        if category == "emails":
+            return self._mask_email(value)
+        if category == "phones":
+            return self._mask_phone(value)
+        if category == "tc_ids":
+            return f"{value[:2]}{'*' * 7}{value[-2:]}"
+        if category == "ibans":
+            return f"TR** **** **** **** **** **** {value[-2:]}"
+        return '*' * len(value)
     
     def _mask_credit_card(self, card: str) -> str:
         """Kredi kartı numarasını maskele"""
@@ -313,36 +389,128 @@ class SensitiveDataDetector:
             return False
 
 
+# Eşleşmenin maskelenen kısmı (API anahtarında yalnızca anahtarın kendisi)
+_VALUE_GROUPS = {"api_keys": "api_key"}
+
+
+@functools.lru_cache(maxsize=16)
+def _compile_scanner(categories: Tuple[str, ...]):
+    """
+    Etkin kategorilerin kalıplarını adlandırılmış gruplarla tek kalıpta birleştir.
+    Baştaki ileri bakış, hiçbir kategorinin başlayamayacağı konumları ucuzca atlar.
+    Ayrıca kategori başına dal kalıpları ve her dalın ardından gelen kategoriler
+    (aynı konumda ikinci bir kategori aramak için) döner.
+    """
+    cls = SensitiveDataDetector
+    # kategori: (ilk karakter kümesi, ilk iki karakter kalıbı, kalıp)
+    sources = {
+        "credit_cards": ("0-9", "[0-9]", cls.CREDIT_CARD_PATTERN.pattern),
+        "passwords": (
+            "pPşŞ",
+            "[pP][aAwW]|[şŞ][iIİ]",
+            "(?i:" + "|".join(p.pattern for p in cls.PASSWORD_PATTERNS) + ")",
+        ),
+        "api_keys": ("aAsS", "[aA][pPcC]|[sS][eE]", "(?i:" + cls.API_KEY_PATTERN.pattern + ")"),
+        "emails": ("A-Za-z0-9._%+\\-", "[A-Za-z0-9._%+\\-]", cls.EMAIL_PATTERN.pattern),
+        "phones": ("0-9+(", "[0-9+(]", cls.PHONE_PATTERN.pattern),
+        "tc_ids": ("1-9", "[1-9]", cls.TC_ID_PATTERN.pattern),
+        "ibans": ("tT", "[tT][rR]", "(?i:" + cls.IBAN_PATTERN.pattern + ")"),
+    }
+    leads = "".join(sources[category][0] for category in categories)
+    prefixes = "|".join(sources[category][1] for category in categories)
+    branches = {category: f"(?P<{category}>{sources[category][2]})" for category in categories}
+    pattern = re.compile(f"(?=[{leads}])(?={prefixes})(?:{'|'.join(branches.values())})")
+    compiled = {category: re.compile(branch) for category, branch in branches.items()}
+    later = {category: categories[index + 1:] for index, category in enumerate(categories)}
+    return pattern, compiled, later
+
+
 # Global instance
 _detector: SensitiveDataDetector = None
 
 
 def get_sensitive_detector(settings=None) -> SensitiveDataDetector:
-    """Global detector instance'ını döndür"""
+    """Global detector instance'ını döndür (ayarlar değişmedikçe aynı örnek)"""
     global _detector
-    if _detector is None or settings is not None:
-        _detector = SensitiveDataDetector(settings)
+    if settings is not None:
+        _detector = _detector_for(settings)
+    elif _detector is None:
+        _detector = SensitiveDataDetector()
     return _detector
 
 
+def detection_fingerprint(settings=None) -> str:
+    """
+    Algılamayı etkileyen ayarların parmak izi. Kayıtta saklanan kategoriler
+    yalnızca parmak izi güncel ayarlarla eşleşiyorsa geçerlidir.
+    """
+    flags = "".join(
+        "1" if (settings.get(key, default) if settings else default) else "0"
+        for key, default in DETECTION_SETTINGS
+    )
+    return f"{DETECTOR_VERSION}:{flags}"
+
+
+_scan_detector: Optional[Tuple[str, SensitiveDataDetector]] = None
+
+
+def _detector_for(settings=None) -> SensitiveDataDetector:
+    # Ayarlar değişmedikçe aynı dedektör (ve derlenmiş kalıp) kullanılır
+    global _scan_detector
+    block = bool(settings.get("block_sensitive_data", False)) if settings else False
+    key = f"{detection_fingerprint(settings)}:{int(block)}"
+    if _scan_detector is None or _scan_detector[0] != key:
+        _scan_detector = (key, SensitiveDataDetector(settings))
+    return _scan_detector[1]
+
+
+def detect_categories(text: str, settings=None, scan: Optional[SensitiveScan] = None) -> List[str]:
+    """
+    Metinde bulunan hassas veri kategorileri (ör. 'credit_cards'), sıralı.
+    `scan` aynı metnin önceki taramasıysa yeniden kullanılır.
+    """
+    if not text:
+        return []
+    return sorted(_detector_for(settings).scan_once(text, scan).categories)
+
+
+def stored_categories(row, settings=None) -> Optional[List[str]]:
+    """
+    Kayıtta saklanan kategoriler; ayarlar kayıt tarandığından beri değiştiyse
+    (ya da kayıt hiç taranmadıysa) None döner ve metin yeniden taranmalıdır.
+    """
+    try:
+        fingerprint = row["sensitive_fingerprint"]
+        value = row["sensitive_categories"]
+    except (KeyError, IndexError, TypeError):
+        return None
+    if not fingerprint or fingerprint != detection_fingerprint(settings):
+        return None
+    return [part for part in (value or "").split(",") if part]
+
+
 def contains_sensitive_data(text: str, settings=None) -> bool:
     """Metin mevcut ayarlara göre hassas veri içeriyor mu?"""
-    if not text:
-        return False
-    detector = SensitiveDataDetector(settings)
-    return bool(detector.detect_sensitive_data(text))
+    return bool(detect_categories(text, settings))
 
 
-def requires_sensitive_access(settings, text: str) -> bool:
-    """Hassas veri gösterimi için erişim doğrulaması gerekli mi?"""
+def requires_sensitive_access(settings, text: str, categories: Optional[List[str]] = None) -> bool:
+    """
+    Hassas veri gösterimi için erişim doğrulaması gerekli mi? `categories`
+    verilirse (stored_categories) metin yeniden taranmaz.
+    """
     if not settings or not settings.get("totp_for_sensitive", False):
         return False
+    if categories is not None:
+        return bool(categories)
     return contains_sensitive_data(text, settings)
 
 
-def ensure_sensitive_access(settings, text: str, parent_widget=None) -> bool:
+def ensure_sensitive_access(
+    settings, text: str, parent_widget=None, categories: Optional[List[str]] = None
+) -> bool:
     """Gerekliyse TOTP doğrulaması isteyerek erişimi kontrol et."""
-    if not requires_sensitive_access(settings, text):
+    if not requires_sensitive_access(settings, text, categories):
         return True
     return verify_totp_for_sensitive(settings, parent_widget)
 
@@ -26,7 +26,9 @@ class Settings:
             "stay_on_top": False,
             "animations": True,
             "max_items": 1000,
+            "max_history_mb": 0,                  # Geçmiş boyutu kotası (0 = sınırsız)
             "dedupe_window_ms": 1200,
+            "ingest_queue_size": 32,              # Arka plan kayıt kuyruğu sınırı
             "confirm_delete": True,
             "show_toast": True,
             "tray_icon": "assets/icons/tray/tray1.svg",  # .svg olarak güncellendi
@@ -36,6 +38,7 @@ class Settings:
             "hotkey_screenshot": "ctrl+shift+s",  # Tam ekran screenshot
             "pause_recording": False,
             "encrypt_data": False,                # Şifreleme aktif mi?
+            "encrypted_search_index": False,      # Şifreli geçmişte kör (HMAC) arama indeksi
             "save_images_externally": False,      # Resimleri harici klasöre kaydet
             "external_images_path": "",           # Harici resim klasörü yolu
             "auto_delete_enabled": False,          # Otomatik silme switch
@@ -51,6 +54,7 @@ class Settings:
             "reminder_snooze_minutes": 5,             # Erteleme süresi (dakika)
             "ocr_enabled": False,                     # OCR (Optik Karakter Tanıma) aktif mi?
             "ocr_language": "tur+eng",                # OCR dili (tur=Türkçe, eng=İngilizce)
+            "ocr_workers": 1,                         # Arka plan OCR işçi sayısı
             "tesseract_path": "",                     # Tesseract yolu (boşsa otomatik bulur)
             "hotkey_ocr": "ctrl+shift+t",             # Ekran bölgesinden OCR kısayolu
             "windows_hello_enabled": False,           # Windows Hello ile iki faktörlü doğrulama
@@ -7,9 +7,14 @@ import json
 import re
 from dataclasses import dataclass
 from enum import Enum
+from html.parser import HTMLParser
 from pathlib import Path
 from typing import Optional
 
+# Kayıtlarda saklanan sınıflandırmanın sürümü. analyze_text kuralları
+# değiştiğinde artırılır; eski sürümlü kayıtlar arka planda yeniden sınıflanır.
+CLASSIFIER_VERSION = 1
+
 
 class ContentKind(str, Enum):
     URL = "url"
@@ -67,6 +72,49 @@ def hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
     return int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
 
 
+_BLOCK_TAGS = {
+    "br", "p", "div", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6",
+    "pre", "blockquote", "table", "ul", "ol", "section", "article",
+}
+
+
+class _PlainTextParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style", "head"):
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style", "head"):
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS and tag != "br":
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """HTML'in düz metin hâli (Qt gerektirmez; arka plan thread'lerinde kullanılabilir)."""
+    if not html:
+        return ""
+    parser = _PlainTextParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        return re.sub(r"<[^>]+>", " ", html).strip()
+    lines = (" ".join(line.split()) for line in "".join(parser.parts).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
 def analyze_text(text: str) -> SmartContent:
     raw = (text or "").strip()
     if not raw:
@@ -0,0 +1,215 @@
+"""
+Anlık görüntü (snapshot) yedekleri
+
+Yedek, veritabanı dosyasının SQLite çevrimiçi yedekleme API'siyle
+(Connection.backup) sayfa sayfa alınmış tutarlı bir kopyasıdır; satırlar
+çözülüp yeniden yazılmadığı için şifreli alanlar yedekte de şifreli kalır
+(KDF tuzu veritabanının içindedir, parola yedeğe girmez).
+
+- Kopya ayrı bir salt okunur bağlantıdan, açık tutulan tek bir okuma
+  işleminde alınır: WAL sayesinde pano yazıcısı beklemez, adımlar arasında
+  yapılan yazımlar kopyayı yeniden başlatmaz ve kopya okuma anını yansıtır.
+- Kopya gzip ile parça parça sıkıştırılır; hedef dosya önce .part olarak
+  yazılır ve tamamlanınca yerine taşınır.
+- Geri yükleme dosyayı arka planda açıp doğrular (quick_check, şema) ve
+  veritabanının yanına hazırlar; yerine koyma Storage.replace_database ile
+  GUI thread'inde tek adımda yapılır.
+"""
+from __future__ import annotations
+
+import gzip
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from clipstack.db_pool import open_connection
+
+# Yedekleme adımı başına kopyalanan sayfa sayısı (4 KiB sayfada ~1 MiB)
+SNAPSHOT_PAGES = 256
+# Sıkıştırma / açma parça boyutu
+COPY_CHUNK = 1024 * 1024
+SNAPSHOT_SUFFIX = ".db.gz"
+
+_SQLITE_MAGIC = b"SQLite format 3\x00"
+_GZIP_MAGIC = b"\x1f\x8b"
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class SnapshotError(Exception):
+    """Dosya geri yüklenebilir bir TaxClip veritabanı değil."""
+
+
+def _check_cancelled(cancel: Optional[threading.Event]) -> None:
+    from clipstack.archive import ArchiveCancelled
+
+    if cancel is not None and cancel.is_set():
+        raise ArchiveCancelled()
+
+
+def _remove_quietly(path: Path, keep_main: bool = False) -> None:
+    """Dosyayı ve SQLite yan dosyalarını (-wal, -shm) sil."""
+    candidates = [path.with_name(path.name + "-wal"), path.with_name(path.name + "-shm")]
+    if not keep_main:
+        candidates.insert(0, path)
+    for candidate in candidates:
+        try:
+            candidate.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[SNAPSHOT] Geçici dosya silinemedi: {candidate} ({e})")
+
+
+def _copy_stream(source, target, size: int, progress, cancel, offset: int, total: int) -> None:
+    done = 0
+    while True:
+        _check_cancelled(cancel)
+        chunk = source.read(COPY_CHUNK)
+        if not chunk:
+            return
+        target.write(chunk)
+        done += len(chunk)
+        if progress and size:
+            progress(offset + min(done, size) * (total - offset) // size, total)
+
+
+def _backup_pages(db_path: Path, target_path: Path, pages: int, progress, cancel) -> int:
+    """Tutarlı kopyayı target_path'e al; kopyalanan sayfa sayısını döndür."""
+    source = open_connection(db_path, read_only=True)
+    target = sqlite3.connect(str(target_path))
+    copied = {"total": 0}
+    try:
+        # Açık okuma işlemi anlık görüntüyü sabitler (yazıcı WAL'e devam eder)
+        source.isolation_level = None
+        source.execute("BEGIN")
+        source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+
+        def on_step(status, remaining, total):
+            copied["total"] = total
+            _check_cancelled(cancel)
+            if progress and total:
+                # İlerlemenin ilk yarısı sayfa kopyası, ikinci yarısı sıkıştırma
+                progress(total - remaining, total * 2)
+
+        source.backup(target, pages=max(1, int(pages)), progress=on_step)
+        source.execute("COMMIT")
+    finally:
+        target.close()
+        source.close()
+    return copied["total"]
+
+
+def create_snapshot(
+    storage,
+    path,
+    progress: Optional[ProgressCallback] = None,
+    cancel: Optional[threading.Event] = None,
+    pages: int = SNAPSHOT_PAGES,
+) -> Dict[str, int]:
+    """
+    Veritabanının sıkıştırılmış anlık görüntüsünü path'e yaz. İptal ya da
+    hata durumunda hedef dosyaya dokunulmaz. Sayfa sayısı ve boyutlar döner.
+    """
+    path = Path(path)
+    copy_path = path.with_name(path.name + ".db.part")
+    partial = path.with_name(path.name + ".part")
+    try:
+        _remove_quietly(copy_path)
+        page_count = _backup_pages(storage.path, copy_path, pages, progress, cancel)
+        size = copy_path.stat().st_size
+        with open(copy_path, "rb") as source, open(partial, "wb") as raw:
+            # Dosya adı ve zaman damgası yazılmaz: aynı içerik aynı arşivi verir
+            with gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=6, mtime=0) as target:
+                _copy_stream(source, target, size, progress, cancel, page_count, page_count * 2)
+        os.replace(partial, path)
+    except BaseException:
+        _remove_quietly(partial)
+        raise
+    finally:
+        _remove_quietly(copy_path)
+    print(f"[SNAPSHOT] {page_count} sayfa yedeklendi: {path}")
+    return {"pages": page_count, "bytes": size, "compressed_bytes": path.stat().st_size}
+
+
+def validate_database(path) -> int:
+    """Dosyanın sağlam bir TaxClip veritabanı olduğunu doğrula; şema sürümünü döndür."""
+    from clipstack.storage import SCHEMA_VERSION
+
+    path = Path(path)
+    with open(path, "rb") as f:
+        if f.read(len(_SQLITE_MAGIC)) != _SQLITE_MAGIC:
+            raise SnapshotError("Dosya bir SQLite veritabanı değil")
+    conn = sqlite3.connect(path.resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        result = conn.execute("PRAGMA quick_check").fetchone()[0]
+        if result != "ok":
+            raise SnapshotError(f"Veritabanı bozuk: {result}")
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if "clip_items" not in tables:
+            raise SnapshotError("Yedekte pano geçmişi tablosu yok")
+        version = int(conn.execute("PRAGMA user_version").fetchone()[0])
+    except sqlite3.DatabaseError as e:
+        raise SnapshotError(f"Veritabanı okunamadı: {e}") from e
+    finally:
+        conn.close()
+    if version > SCHEMA_VERSION:
+        raise SnapshotError(f"Yedek daha yeni bir sürümle alınmış (şema {version})")
+    return version
+
+
+def prepare_restore(
+    storage,
+    path,
+    progress: Optional[ProgressCallback] = None,
+    cancel: Optional[threading.Event] = None,
+) -> Dict[str, object]:
+    """
+    Anlık görüntüyü (gzip ya da düz SQLite dosyası) veritabanının yanına
+    açıp doğrula. Dönen "staged" yolu Storage.replace_database'e verilir.
+    """
+    path = Path(path)
+    staged = storage.path.with_name(storage.path.name + ".restore")
+    _remove_quietly(staged)
+    size = path.stat().st_size
+    try:
+        with open(path, "rb") as probe:
+            compressed = probe.read(len(_GZIP_MAGIC)) == _GZIP_MAGIC
+        with open(path, "rb") as raw, open(staged, "wb") as target:
+            source = gzip.GzipFile(fileobj=raw, mode="rb") if compressed else raw
+            while True:
+                _check_cancelled(cancel)
+                chunk = source.read(COPY_CHUNK)
+                if not chunk:
+                    break
+                target.write(chunk)
+                if progress:
+                    # Sıkıştırılmış dosyada okunan ham bayt konumu ilerlemeyi verir
+                    progress(min(raw.tell(), size), size)
+        version = validate_database(staged)
+        # Doğrulama bağlantısının yan dosyaları yeni adla eşleşmez; kalmasın
+        _remove_quietly(staged, keep_main=True)
+    except (OSError, EOFError, gzip.BadGzipFile) as e:
+        _remove_quietly(staged)
+        raise SnapshotError(f"Yedek açılamadı: {e}") from e
+    except BaseException:
+        _remove_quietly(staged)
+        raise
+    return {"staged": str(staged), "schema": version}
+
+
+def restore_snapshot(storage, path, progress=None, cancel=None) -> Dict[str, object]:
+    """Hazırla ve hemen yerine koy (GUI dışı kullanım ve testler için)."""
+    result = prepare_restore(storage, path, progress=progress, cancel=cancel)
+    storage.replace_database(Path(result["staged"]))
+    return result
+
+
+def discard_restore(result: Dict[str, object]) -> None:
+    """Kullanılmayan hazırlanmış geri yükleme dosyasını sil."""
+    staged = result.get("staged") if result else None
+    if staged:
+        _remove_quietly(Path(staged))
+
@@ -1,16 +1,54 @@
 import base64
 import binascii
+import functools
+import hashlib
+import hmac
+import itertools
+import os
+import secrets
 import sqlite3
 import re
+import threading
+import time
 import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
 from enum import IntEnum
 from pathlib import Path
-from typing import List, Optional
-from clipstack.utils_crypto import encrypt_aes256, decrypt_aes256, encrypt_bytes, decrypt_bytes
-from clipstack.sensitive_detector import get_sensitive_detector
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from clipstack.utils_crypto import (
+    blind_index_token,
+    decrypt_aes256,
+    decrypt_bytes,
+    decrypt_bytes_envelope,
+    decrypt_text_envelope,
+    derive_master_key,
+    derive_subkey,
+    encrypt_bytes_with_key,
+    encrypt_text_with_key,
+    is_v2_blob_envelope,
+    is_v2_text_envelope,
+)
+from clipstack.db_pool import ConnectionPool
+from clipstack.sensitive_detector import (
+    SensitiveScan,
+    detect_categories,
+    detection_fingerprint,
+    get_sensitive_detector,
+)
+from clipstack.smart_content import CLASSIFIER_VERSION, analyze_text, html_to_text
 from datetime import datetime, timedelta
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
+try:
+    import numpy as np
+except ImportError:  # toplu puanlama yoksa kayıtlar tek tek puanlanır
+    np = None
+
+
+# Veritabanı şema sürümü (PRAGMA user_version); göçler dosya sonundaki _MIGRATIONS'ta
+SCHEMA_VERSION = 8
 
 _whitespace_re = re.compile(r"\s+")
 _html_tag_re = re.compile(r"<[^>]+>")
@@ -36,10 +74,6 @@ def _html_to_plain_text(value: str) -> str:
     return _whitespace_re.sub(" ", _html_tag_re.sub(" ", value or "")).strip()
 
 
-def _tokenize_search_text(value: str) -> List[str]:
-    return [token for token in _search_token_re.findall(_normalize_search_text(value)) if token]
-
-
 def _term_matches_word_prefix(term: str, word: str) -> bool:
     return bool(term and word.startswith(term))
 
@@ -55,7 +89,8 @@ def _score_search_match(normalized_query: str, searchable_text: str) -> int:
         return 0
 
     query_terms = [term for term in normalized_query.split(" ") if term]
-    searchable_terms = _tokenize_search_text(searchable_text)
+    # Arama gövdeleri (_build_search_body) zaten normalize; yeniden normalize edilmez
+    searchable_terms = _search_token_re.findall(searchable_text)
     if not query_terms or not searchable_terms:
         return 0
 
@@ -114,6 +149,208 @@ def _score_search_match(normalized_query: str, searchable_text: str) -> int:
     return 0
 
 
+# Toplu puanlama: bulanık aşamaya bu sayıdan az kayıt kalırsa tek tek
+# puanlanır (cdist kurulumu küçük partilerde kazandırmaz); workers=-1 tüm
+# çekirdekleri kullanır
+_BATCH_SCORING_MIN = 32
+_SEARCH_SCORING_WORKERS = -1
+
+
+@dataclass(frozen=True)
+class _SearchQueryPlan:
+    """Toplu puanlama için sorgu başına bir kez derlenen desenler."""
+    terms: Tuple[str, ...]
+    # Terim bir kelimenin başında mı (yalnızca \w karakterlerinden oluşan terimler)
+    word_starts: Tuple[Optional["re.Pattern"], ...]
+    # Tek terimli sorguda terim tam bir kelime mi
+    whole_word: Optional["re.Pattern"]
+
+
+@functools.lru_cache(maxsize=64)
+def _search_query_plan(normalized_query: str) -> _SearchQueryPlan:
+    terms = tuple(term for term in normalized_query.split(" ") if term)
+    word_starts = tuple(
+        re.compile(r"(?<!\w)" + re.escape(term)) if _search_token_re.fullmatch(term) else None
+        for term in terms
+    )
+    whole_word = None
+    if len(terms) == 1 and word_starts[0] is not None:
+        whole_word = re.compile(r"(?<!\w)" + re.escape(terms[0]) + r"(?!\w)")
+    return _SearchQueryPlan(terms, word_starts, whole_word)
+
+
+def _score_search_matches(
+    normalized_query: str,
+    bodies: Dict[int, str],
+    workers: int = _SEARCH_SCORING_WORKERS,
+) -> Dict[int, int]:
+    """
+    _score_search_match'in toplu hâli: {id: normalize gövde} -> {id: skor}.
+
+    100/98/96 katmanları derlenmiş desenlerle belirlenir; bulanık aşamaya
+    kalan kayıtların kelimeleri tekilleştirilip rapidfuzz.process.cdist ile
+    tek çağrıda (score_cutoff, çok iş parçacıklı) puanlanır. Skorlar tek
+    tek puanlamayla aynıdır.
+    """
+    plan = _search_query_plan(normalized_query)
+    if not plan.terms:
+        return {item_id: 0 for item_id in bodies}
+    single = len(plan.terms) == 1
+    scores = {}
+    pending = []
+    for item_id, body in bodies.items():
+        if not body or not _search_token_re.search(body):
+            scores[item_id] = 0
+        elif single:
+            term = plan.terms[0]
+            if term in body and plan.whole_word is not None and plan.whole_word.search(body):
+                scores[item_id] = 100
+            elif term in body and plan.word_starts[0] is not None and plan.word_starts[0].search(body):
+                scores[item_id] = 98
+            elif len(term) >= 4 and term in body:
+                scores[item_id] = 96
+            elif len(term) < 5:
+                scores[item_id] = 0
+            else:
+                pending.append((item_id, body))
+        elif normalized_query in body:
+            scores[item_id] = 100
+        else:
+            contained = all(term in body for term in plan.terms)
+            if contained and all(
+                pattern is not None and pattern.search(body) for pattern in plan.word_starts
+            ):
+                scores[item_id] = 98
+            elif contained and all(
+                pattern is not None and len(term) >= 4 for term, pattern in zip(plan.terms, plan.word_starts)
+            ):
+                scores[item_id] = 96
+            elif len(normalized_query) < 6:
+                scores[item_id] = 0
+            else:
+                pending.append((item_id, body))
+
+    if len(pending) < _BATCH_SCORING_MIN or np is None:
+        scores.update((item_id, _score_search_match(normalized_query, body)) for item_id, body in pending)
+    elif single:
+        scores.update(_batch_score_term(plan.terms[0], pending, workers))
+    else:
+        scores.update(_batch_score_phrase(normalized_query, pending, workers))
+    return scores
+
+
+def _cdist_scores(query: str, choices: List[str], scorer, cutoff: int, workers: int):
+    """query ile her seçeneğin skoru (float64; cutoff altı 0)."""
+    return process.cdist(
+        [query], choices, scorer=scorer, score_cutoff=cutoff, dtype=np.float64, workers=workers
+    )[0]
+
+
+def _batch_score_term(term: str, pending: List[Tuple[int, str]], workers: int) -> Dict[int, int]:
+    """Tek terim: en iyi kelime skoru (ratio / partial_ratio >= 90), yoksa token_set_ratio >= 94."""
+    # Kelimeler (\w dizileri) boşlukla ayrılmış parçaların içindedir: kayıtları
+    # tek tek bölmek yerine tekil parçalar bir kez kelimelere ayrılır
+    pieces = {piece: _search_token_re.findall(piece) for piece in set("\n".join(body for _, body in pending).split())}
+    words = list(set(itertools.chain.from_iterable(pieces.values())))
+    word_scores = np.maximum(
+        _cdist_scores(term, words, fuzz.ratio, 90, workers),
+        _cdist_scores(term, words, fuzz.partial_ratio, 90, workers),
+    )
+    hits = {words[i]: int(word_scores[i]) for i in np.flatnonzero(word_scores >= 90)}
+    # Eşleşen kelime içeren parçalar -> en iyi kelime skoru
+    piece_hits = {}
+    if hits:
+        for piece, parts in pieces.items():
+            best = max((hits.get(word, 0) for word in parts), default=0)
+            if best:
+                piece_hits[piece] = best
+
+    scores = {}
+    phrase = []
+    hit_words = list(hits)
+    for item_id, body in pending:
+        matched = ()
+        if piece_hits and any(word in body for word in hit_words):
+            matched = piece_hits.keys() & set(body.split())
+        if matched:
+            scores[item_id] = max(piece_hits[piece] for piece in matched)
+        else:
+            phrase.append((item_id, body))
+    if phrase:
+        phrase_scores = _cdist_scores(term, [body for _, body in phrase], fuzz.token_set_ratio, 94, workers)
+        for (item_id, _), score in zip(phrase, phrase_scores):
+            scores[item_id] = int(score) if score >= 94 else 0
+    return scores
+
+
+def _batch_score_phrase(normalized_query: str, pending: List[Tuple[int, str]], workers: int) -> Dict[int, int]:
+    """Çok terim: token_set_ratio / ratio en iyisi >= 88."""
+    texts = [body for _, body in pending]
+    combined = np.maximum(
+        _cdist_scores(normalized_query, texts, fuzz.token_set_ratio, 88, workers),
+        _cdist_scores(normalized_query, texts, fuzz.ratio, 88, workers),
+    )
+    return {item_id: int(score) if score >= 88 else 0 for (item_id, _), score in zip(pending, combined)}
+
+
+def _build_search_body(
+    item_type: int,
+    text: Optional[str],
+    html: Optional[str],
+    ocr_text: Optional[str],
+) -> str:
+    """Arama indeksine yazılacak normalize metni üret (search_items ile aynı alanlar)."""
+    parts = []
+    # Harici kaydedilen resimlerde text_content dosya yoludur, aranmaz
+    if text and int(item_type) != int(ClipItemType.IMAGE):
+        parts.append(_normalize_search_text(text))
+    if html:
+        parts.append(_strip_html_tags(html))
+    if ocr_text:
+        parts.append(_normalize_search_text(ocr_text))
+    return " ".join(part for part in parts if part).strip()
+
+
+def _search_allows_fuzzy(normalized_query: str) -> bool:
+    """_score_search_match terimleri içermeyen bir kaydı bu sorgu için eşleyebilir mi?"""
+    terms = [term for term in normalized_query.split(" ") if term]
+    if len(terms) == 1:
+        return len(terms[0]) >= 5
+    return len(normalized_query) >= 6
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+_BLIND_INDEX_MAX_WORDS = 256
+_BLIND_INDEX_MARKER = "m:"
+
+
+def _word_trigrams(word: str) -> List[str]:
+    return [word[i:i + 3] for i in range(len(word) - 2)]
+
+
+def _blind_index_terms(body: str) -> set:
+    """Kör indeks terimleri: kelime trigramları ve 1-2 harflik kelime önekleri."""
+    terms = {_BLIND_INDEX_MARKER}
+    words = list(dict.fromkeys(_search_token_re.findall(body or "")))
+    for word in words[:_BLIND_INDEX_MAX_WORDS]:
+        terms.add("p:" + word[:1])
+        if len(word) >= 2:
+            terms.add("p:" + word[:2])
+        terms.update("g:" + gram for gram in _word_trigrams(word))
+    return terms
+
+
+def _write_blind_index(conn: sqlite3.Connection, index_key: bytes, item_id: int, body: str) -> None:
+    conn.execute("DELETE FROM clip_blind_index WHERE item_id = ?", (item_id,))
+    conn.executemany(
+        "INSERT OR IGNORE INTO clip_blind_index (token, item_id) VALUES (?, ?)",
+        [(blind_index_token(index_key, term), item_id) for term in _blind_index_terms(body)],
+    )
+
+
 def _looks_like_encrypted_value(value: str) -> bool:
     if not isinstance(value, str) or len(value) < 24:
         return False
@@ -124,15 +361,153 @@ def _looks_like_encrypted_value(value: str) -> bool:
     return len(raw) >= 16
 
 
-def _decrypt_field_if_needed(value: Optional[str], password: Optional[str]) -> Optional[str]:
+_DECRYPT_FAILED = "[Şifreli veri çözülemedi]"
+
+
+def _decrypt_field_if_needed(
+    value: Optional[str],
+    password: Optional[str],
+    key: Optional[bytes] = None,
+) -> Optional[str]:
     if not value or not password:
         return value
-    if not _looks_like_encrypted_value(value):
+    if not is_v2_text_envelope(value) and not _looks_like_encrypted_value(value):
         return value
     try:
-        return decrypt_aes256(value, password)
+        return decrypt_text_envelope(value, password, key)
     except Exception:
-        return "[Şifreli veri çözülemedi]"
+        return _DECRYPT_FAILED
+
+
+# Şifreli saklanan metin sütunları (eski format -> ENC2 geçişi için)
+_ENCRYPTED_TEXT_COLUMNS = {
+    "clip_items": ("text_content", "html_content", "ocr_text"),
+    "notes": ("content",),
+    "reminders": ("title", "description"),
+    "snippets": ("title", "code", "tags"),
+    "snippet_files": ("content",),
+    "todos": ("content",),
+    "drawings": ("title", "image_data"),
+}
+_ENCRYPTED_BLOB_COLUMNS = {
+    "clip_items": ("image_blob",),
+}
+
+# Arama: FTS adaylarının üst sınırı ve bulanık eşleşme için aday sayısı
+_SEARCH_CANDIDATE_LIMIT = 2000
+_FUZZY_CANDIDATE_LIMIT = 500
+# Akışlı arama: ilk parti küçük tutulur ki ilk eşleşmeler bir kare süresinde
+# çizilebilsin; dizinlenmemiş kayıtlar parça parça çözülüp puanlanır, ara
+# sıralamalar en sık bu aralıkla yayınlanır
+_SEARCH_FIRST_BATCH = 20
+_SEARCH_SCAN_CHUNK = 200
+_SEARCH_BATCH_INTERVAL = 0.1
+# Yazarken arama: önbellekte tutulan son sorgu sayısı
+_SEARCH_REFINE_CACHE_SIZE = 16
+# Arama gövdesini etkileyen sütunlar; bunlar değişince önbellek boşaltılır
+_SEARCH_BODY_COLUMNS = frozenset(("text_content", "html_content", "ocr_text"))
+
+
+class SearchCancelled(Exception):
+    """Arama, iptal belirteci tetiklendiği için yarıda bırakıldı."""
+
+
+@dataclass(frozen=True)
+class _SearchCandidates:
+    """Bir sorgunun tüm terimlerini içeren kayıtlar (yazarken arama önbelleği)."""
+    indexed: frozenset  # FTS indeksindekiler; floor varsa yalnızca floor ve üstü tamdır
+    floor: Optional[int]  # indeks adayları sınıra takıldıysa en küçük id
+    unindexed: frozenset  # indekste olmayıp çözülerek puanlananlar
+
+    def without(self, removed: frozenset) -> "_SearchCandidates":
+        return _SearchCandidates(self.indexed - removed, self.floor, self.unindexed - removed)
+
+
+class _SearchRefinementCache:
+    """
+    Yazarken arama için son sorguların aday kümeleri (LRU). Bir kaydın tüm
+    sorgu terimlerini içermesi sorgu uzadıkça da gerekir; yeni sorgu
+    önbellekteki birinin uzantısıysa ("pass" -> "passw") terim içeren
+    eşleşmeler tüm tablo yerine yalnızca o kümeden aranır.
+
+    Eklenen ya da metni değişen kayıtlar önbelleği boşaltır (nesil artar,
+    o sırada süren aramaların sonucu saklanmaz); silinenler kümelerden çıkar.
+    """
+
+    def __init__(self, capacity: int = _SEARCH_REFINE_CACHE_SIZE):
+        self.capacity = capacity
+        self._entries: "OrderedDict[tuple, _SearchCandidates]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, scope: tuple, normalized_query: str) -> Optional[_SearchCandidates]:
+        """Sorgunun önbellekteki en uzun önekinin adayları (yoksa None)."""
+        with self._lock:
+            best = None
+            for key in self._entries:
+                entry_scope, entry_query = key
+                if entry_scope != scope or not normalized_query.startswith(entry_query):
+                    continue
+                if best is None or len(entry_query) > len(best[1]):
+                    best = key
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(best)
+            return self._entries[best]
+
+    def store(self, scope: tuple, normalized_query: str, entry: _SearchCandidates, generation: int) -> None:
+        with self._lock:
+            if generation != self.generation:
+                return
+            key = (scope, normalized_query)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def apply_change(self, kind: "ClipChangeKind", ids: Tuple[int, ...], columns) -> None:
+        if kind == ClipChangeKind.DELETED:
+            removed = frozenset(ids)
+            with self._lock:
+                for key, entry in self._entries.items():
+                    self._entries[key] = entry.without(removed)
+            return
+        if kind == ClipChangeKind.UPDATED and not (_SEARCH_BODY_COLUMNS & set(columns)):
+            return
+        self.clear()
+
+
+class _StageTimer:
+    """add_item aşamalarının sürelerini (saniye) verilen sözlüğe ekler."""
+
+    def __init__(self, timings: Optional[dict]):
+        self.timings = timings
+        self._last = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        if self.timings is None:
+            return
+        now = time.perf_counter()
+        self.timings[stage] = self.timings.get(stage, 0.0) + (now - self._last)
+        self._last = now
+
+
+@dataclass
+class _PreparedClip:
+    """Kilit dışında hazırlanmış (korunmuş, sınıflandırılmış, şifrelenmiş) kayıt."""
+    values: Dict[str, object]
+    search_body: str
+    encrypted: bool
+    blind_index_key: Optional[bytes]
 
 
 class ClipItemType(IntEnum):
@@ -142,38 +517,474 @@ class ClipItemType(IntEnum):
     FILE = 4  # Dosya/klasör yolları (CF_HDROP) — yalnızca yol saklanır
 
 
+class ClipChangeKind(IntEnum):
+    INSERTED = 1
+    UPDATED = 2
+    DELETED = 3
+    CLEARED = 4  # tüm geçmiş silindi
+    RELOADED = 5  # veritabanı dosyası değiştirildi (geri yükleme); görünümler baştan okur
+
+
+@dataclass(frozen=True)
+class ClipChange:
+    """
+    Storage'ın pano kayıtları için yayınladığı değişiklik olayı.
+
+    - INSERTED: rows yeni liste satırlarını taşır (list_items biçiminde)
+    - UPDATED: values değişen sütunların yeni (çözülmüş) değerleri; liste
+      üyeliğini değiştirebilecek güncellemelerde (favori / sabitleme) rows
+      da doludur, böylece satırı henüz göstermeyen görünüm sorgu yapmaz
+    - DELETED: ids silinen kayıtlar
+    - CLEARED: tüm kayıtlar silindi
+    - RELOADED: veritabanı yerine başkası kondu; id'ler artık eski satırları göstermez
+    """
+    kind: ClipChangeKind
+    ids: Tuple[int, ...] = ()
+    values: Dict[str, object] = field(default_factory=dict)
+    rows: Tuple[dict, ...] = ()
+
+    @property
+    def columns(self) -> frozenset:
+        return frozenset(self.values)
+
+
+# Liste sırası: sabitlenenler, favoriler, sonra en yeniler (recency: eklenme ya da
+# yeniden kopyalanma sırası; yeniden kopyalanan kayıt yerinde öne alınır)
+_CLIP_LIST_ORDER = "ORDER BY pinned DESC, favorite DESC, recency DESC"
+# (pinned, favorite) grupları liste sırasıyla; keyset sayfalama bu gruplar üzerinden ilerler
+_CLIP_PAGE_GROUPS = ((1, 1), (1, 0), (0, 1), (0, 0))
+
+
+# Liste kartı küçük resmi: bu kutuya sığacak şekilde küçültülür
+THUMBNAIL_SIZE = (240, 100)
+
+
+def _make_thumbnail(image_bytes: Optional[bytes]) -> Optional[bytes]:
+    """Tam görselden liste kartları için küçük PNG üret."""
+    if not image_bytes:
+        return None
+    try:
+        from PySide6.QtCore import QBuffer, QByteArray, QIODevice, Qt
+        from PySide6.QtGui import QImage
+    except Exception:
+        return None
+    image = QImage.fromData(QByteArray(image_bytes))
+    if image.isNull():
+        return None
+    width, height = THUMBNAIL_SIZE
+    if image.width() > width or image.height() > height:
+        image = image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(buffer.data())
+
+
+# Kayıt anında hesaplanıp saklanan akıllı içerik alanları (şifreleme açıksa
+# smart_kind dışındakiler şifrelenir)
+_SMART_TEXT_COLUMNS = ("smart_title", "smart_summary", "plain_text")
+
+
+def _classify_clip(item_type: int, text: Optional[str], html: Optional[str]) -> dict:
+    """
+    Kartların gösterdiği tür / başlık / özet ve HTML'in düz metin hâli.
+    analyze_text (JSON ayrıştırma, base64 çözme, dosya yolu kontrolü) böylece
+    her çizimde değil, kayıt başına bir kez çalışır.
+    """
+    fields = {
+        "smart_kind": None,
+        "smart_title": None,
+        "smart_summary": None,
+        "plain_text": None,
+        "smart_version": CLASSIFIER_VERSION,
+    }
+    if int(item_type) not in (int(ClipItemType.TEXT), int(ClipItemType.HTML)):
+        return fields
+    plain = text or ""
+    if not plain and html:
+        plain = html_to_text(html)
+        fields["plain_text"] = plain or None
+    smart = analyze_text(plain)
+    fields["smart_kind"] = smart.kind.value
+    fields["smart_title"] = smart.title
+    fields["smart_summary"] = smart.summary
+    return fields
+
+
+def _scan_sensitive(
+    settings,
+    item_type: int,
+    text: Optional[str],
+    html: Optional[str],
+    ocr_text: Optional[str],
+    plain_text: Optional[str] = None,
+    scan: Optional[SensitiveScan] = None,
+) -> dict:
+    """
+    Kartın erişim kontrolünde taranan metindeki hassas veri kategorileri ve
+    taramanın yapıldığı ayarların parmak izi. `scan` aynı metne aitse
+    yeniden tarama yapılmaz.
+    """
+    item_type = int(item_type)
+    probe = ""
+    if item_type in (int(ClipItemType.TEXT), int(ClipItemType.HTML)):
+        probe = text or plain_text or (html_to_text(html) if html else "")
+    elif item_type == int(ClipItemType.IMAGE):
+        probe = ocr_text or ""
+    return {
+        "sensitive_categories": ",".join(detect_categories(probe, settings, scan)),
+        "sensitive_fingerprint": detection_fingerprint(settings),
+    }
+
+
+def _content_hash(
+    item_type: ClipItemType,
+    text: Optional[str],
+    html: Optional[str],
+    image_bytes: Optional[bytes],
+    key: Optional[bytes] = None,
+) -> Optional[str]:
+    """
+    Yineleme kontrolü için içerik özeti (şifrelemeden önceki ham veri üzerinden).
+    Şifreleme açıkken anahtarlı HMAC kullanılır; böylece özet, içeriği
+    tahmin etmeye yarayan düz bir SHA-256 olarak veritabanında durmaz.
+    """
+    if item_type == ClipItemType.IMAGE:
+        data = bytes(image_bytes) if image_bytes else b""
+    elif item_type == ClipItemType.HTML and html:
+        data = html.encode("utf-8", errors="replace")
+    else:
+        data = (text or "").encode("utf-8", errors="replace")
+    if not data:
+        return None
+    payload = b"%d:" % int(item_type) + data
+    if key:
+        return hmac.new(key, payload, hashlib.sha256).hexdigest()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _unhashed_mark(item_id: int) -> str:
+    """
+    Özetlenemeyen (boş içerik, dosyası kaybolmuş görsel) ya da eski bir
+    yinelemesi olan kayıtların content_hash değeri. Onaltılık özetlerle
+    çakışmaz ve satıra özgüdür (UNIQUE indeks); geri doldurma bu satırlara
+    bir daha bakmaz.
+    """
+    return f"-{int(item_id)}"
+
+
+# Yedekten içe aktarılabilen yan tablolar: (sütunlar, şifrelenen sütunlar)
+_IMPORT_TABLES = {
+    "notes": (("created_at", "content"), ("content",)),
+    "reminders": (
+        ("created_at", "title", "description", "reminder_time", "repeat_type"),
+        ("title", "description"),
+    ),
+    "snippets": (("created_at", "title", "code", "language", "tags"), ("title", "code", "tags")),
+    "todos": (("list_id", "created_at", "content", "completed"), ("content",)),
+    "drawings": (("created_at", "image_data", "title"), ("image_data", "title")),
+}
+
+
+# Değişiklik günlüğüne (artımlı bulut yedeği) yazılan tablolar
+_JOURNAL_TABLES = (
+    "clip_items",
+    "notes",
+    "reminders",
+    "snippets",
+    "snippet_files",
+    "todo_lists",
+    "todos",
+    "drawings",
+)
+
+
+# Saklama kotasında sayılan sütunlar (harici görsel dosyaları sayılmaz)
+_PAYLOAD_COLUMNS = (
+    "text_content",
+    "html_content",
+    "ocr_text",
+    "image_blob",
+    "thumb_blob",
+    "plain_text",
+    "smart_title",
+    "smart_summary",
+)
+# Sınır aşılınca sınırın bu kadar altına inilir (küçük sınırlarda pay yok):
+# silme her eklemede değil, birkaç düzine eklemede bir yapılır
+_RETENTION_BATCH = 50
+_RETENTION_BYTE_SLACK = 16 * 1024 * 1024
+# Tek çağrıda silinen en fazla kayıt (ekleme yolunun gecikmesini sınırlar)
+_RETENTION_DELETE_BATCH = 500
+# Yazımı süren harici görsellere dokunulmasın (saniye)
+_ORPHAN_IMAGE_GRACE = 3600
+
+
+def _payload_size_sql(ref: str) -> str:
+    """Satırın kotada sayılan bayt boyutu için SQL ifadesi (ref: NEW, OLD, tablo adı)."""
+    return " + ".join(f"COALESCE(length(CAST({ref}.{col} AS BLOB)), 0)" for col in _PAYLOAD_COLUMNS)
+
+
+def _parse_created_at(value) -> Optional[datetime]:
+    """created_at'i yerel saatle naive datetime'a çevir ("T"li ISO ve boşluklu biçim)."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def clip_page_cursor(row) -> tuple:
+    """list_items(after=...) için satırın sıralama anahtarı (pinned, favorite, recency)."""
+    return (int(row["pinned"] or 0), int(row["favorite"] or 0), int(row["recency"] or row["id"]))
+
+
+def _write_locked(method):
+    """Metodu paylaşılan yazma bağlantısında, yazma kilidi tutularak çalıştır."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._writing():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class Storage:
     def __init__(self, path: Path, settings=None):
         self.path = Path(path)
         self.settings = settings
-        self.conn = sqlite3.connect(str(self.path))
-        self.conn.row_factory = sqlite3.Row
+        # Tek paylaşılan yazma bağlantısı + salt okunur okuyucu havuzu (WAL).
+        # Yalnızca yazma kilidini tutan kod yazma bağlantısını kullanır; GUI
+        # dahil her thread okumalarını havuzdan aldığı kendi okuyucusuyla yapar
+        # (başka bir thread'in açık, commit edilmemiş işlemini görmez).
+        self._pool = ConnectionPool(self.path)
+        self._owner_thread = threading.get_ident()
+        self._thread_state = threading.local()
+        # Parola -> türetilmiş oturum anahtarı (PBKDF2 oturum başına bir kez)
+        self._key_cache: dict = {}
+        self._key_lock = threading.Lock()
+        self._reencrypt_thread: Optional[threading.Thread] = None
+        self._background_stop = threading.Event()
+        self._smart_thread: Optional[threading.Thread] = None
+        self._sensitive_thread: Optional[threading.Thread] = None
+        self._retention_thread: Optional[threading.Thread] = None
+        self._search_index_state: Optional[bool] = None
+        self._clip_columns_cache: Optional[list] = None
+        self._blind_index_thread: Optional[threading.Thread] = None
+        # Yeni bir görsel OCR kuyruğuna alındığında çağrılır (item_id)
+        self.on_ocr_pending: Optional[Callable[[int], None]] = None
+        # Hatırlatmalar eklenince/değişince çağrılır (zamanlayıcı yeniden kurulur)
+        self.on_reminders_changed: Optional[Callable[[], None]] = None
+        # Pano kaydı değişikliği aboneleri (bkz. subscribe_clip_changes)
+        self._clip_listeners: List[Callable[[ClipChange], None]] = []
+        self._search_cache = _SearchRefinementCache()
         self._init_db()
+        if not self._blind_index_enabled():
+            self.clear_blind_index()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        state = self._thread_state
+        if getattr(state, "write_depth", 0):
+            return self._pool.writer
+        reader = getattr(state, "reader", None)
+        if reader is None or state.reader_generation != self._pool.generation:
+            # Veritabanı değiştirildiyse (geri yükleme) eski okuyucu kapatılmıştır
+            reader = self._pool.acquire_reader()
+            state.reader = reader
+            state.reader_generation = self._pool.generation
+        return reader
+
+    @conn.setter
+    def conn(self, value: sqlite3.Connection) -> None:
+        self._pool.writer = value
+
+    @contextmanager
+    def _writing(self) -> Iterator[sqlite3.Connection]:
+        """Yazma kilidini al; bu blokta `conn` her thread'de yazma bağlantısıdır."""
+        state = self._thread_state
+        with self._pool.write_lock:
+            state.write_depth = getattr(state, "write_depth", 0) + 1
+            try:
+                yield self._pool.writer
+            finally:
+                state.write_depth -= 1
+
+    def reader(self):
+        """Havuzdan salt okunur bağlantı (with bloğu bitince geri verilir)."""
+        return self._pool.reader()
+
+    # ---------- Değişiklik olayları ----------
+
+    def subscribe_clip_changes(self, callback: Callable[[ClipChange], None]) -> Callable[[], None]:
+        """
+        Pano kaydı değişikliklerine abone ol; aboneliği bitiren fonksiyon döner.
+        Geri çağrı, değişikliği yapan thread'de (yazma kilidi tutulurken)
+        çalışır; kısa olmalı ve arayüzü doğrudan güncellememelidir.
+        """
+        self._clip_listeners = self._clip_listeners + [callback]
+
+        def unsubscribe():
+            self._clip_listeners = [cb for cb in self._clip_listeners if cb is not callback]
+        return unsubscribe
+
+    def _publish_clip_change(
+        self,
+        kind: ClipChangeKind,
+        ids=(),
+        values: Optional[dict] = None,
+        rows=(),
+    ) -> None:
+        ids = tuple(int(i) for i in ids)
+        self._search_cache.apply_change(kind, ids, (values or {}).keys())
+        listeners = self._clip_listeners
+        if not listeners:
+            return
+        change = ClipChange(kind, ids, dict(values or {}), tuple(rows))
+        for callback in listeners:
+            try:
+                callback(change)
+            except Exception as e:
+                print(f"[STORAGE] Değişiklik bildirimi hatası: {e}")
+
+    def close_thread_connection(self) -> None:
+        """Arka plan thread'i biterken okuyucusunu havuza geri ver."""
+        reader = getattr(self._thread_state, "reader", None)
+        if reader is not None:
+            self._thread_state.reader = None
+            self._pool.release_reader(reader)
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def replace_database(self, staged_path: Path, attempts: int = 20) -> None:
+        """
+        Arka planda hazırlanıp doğrulanmış veritabanını (geri yükleme) yerine
+        koy. Yazma kilidi tutulurken WAL denetim noktası alınır, bütün
+        bağlantılar kapatılır ve dosya os.replace ile tek adımda değiştirilir;
+        yarıda kalırsa eski veritabanı olduğu gibi kalır. Eski şemalı
+        yedekler göçlerden geçer ve görünümler RELOADED olayıyla baştan
+        yüklenir. GUI (sahip) thread'inden çağrılmalıdır.
+        """
+        staged_path = Path(staged_path)
+        self.stop_background_tasks()
+        with self._writing():
+            try:
+                self._pool.writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error as e:
+                print(f"[STORAGE] Denetim noktası alınamadı: {e}")
+            self._pool.close_connections()
+            sidecars = [self.path.with_name(self.path.name + suffix) for suffix in ("-wal", "-shm")]
+            # Windows'ta kapanmakta olan bir tutamaç dosyayı kısa süre kilitli tutabilir
+            for attempt in range(attempts):
+                try:
+                    for sidecar in sidecars:
+                        if sidecar.exists():
+                            sidecar.unlink()
+                    os.replace(staged_path, self.path)
+                    break
+                except PermissionError:
+                    if attempt == attempts - 1:
+                        raise
+                    time.sleep(0.1)
+            # Önbellekler eski dosyaya aitti (KDF tuzu, indeks durumu, sütunlar)
+            with self._key_lock:
+                self._key_cache = {}
+            self._search_index_state = None
+            self._clip_columns_cache = None
+            self._init_db()
+            if not self._get_encryption_password():
+                # Günlükten uygulanan kayıtlar (bulut yedeği) indekse girmemiş olabilir
+                self._backfill_search_index()
+            if not self._blind_index_enabled():
+                self.clear_blind_index()
+        print(f"[STORAGE] Veritabanı geri yüklendi: {self.path}")
+        # Açılıştaki gibi: yedekteki eski biçimli kayıtlar arka planda güncellenir
+        self._background_stop.clear()
+        self.start_background_maintenance()
+        if self._get_encryption_password():
+            self.sync_blind_index()
+        else:
+            self.start_reclassification()
+            self.start_sensitive_rescan()
+        self._publish_clip_change(ClipChangeKind.RELOADED)
+        self._notify_reminders_changed()
 
     def _get_encryption_password(self) -> Optional[str]:
         if not self.settings or not self.settings.get("encrypt_data", False):
             return None
         return self.settings.get("encryption_key", None)
 
+    @_write_locked
+    def _get_kdf_salt(self) -> bytes:
+        """Veritabanına özgü KDF tuzunu döndür (yoksa oluştur)."""
+        cur = self.conn.cursor()
+        cur.execute("SELECT value FROM storage_meta WHERE key = 'kdf_salt'")
+        row = cur.fetchone()
+        if not row:
+            salt = base64.b64encode(secrets.token_bytes(16)).decode("ascii")
+            cur.execute(
+                "INSERT OR IGNORE INTO storage_meta (key, value) VALUES ('kdf_salt', ?)",
+                (salt,),
+            )
+            self.conn.commit()
+            cur.execute("SELECT value FROM storage_meta WHERE key = 'kdf_salt'")
+            row = cur.fetchone()
+        return base64.b64decode(row[0])
+
+    def _get_session_key(self) -> Optional[bytes]:
+        """Geçerli parola için türetilmiş anahtarı önbellekten döndür."""
+        password = self._get_encryption_password()
+        if not password:
+            return None
+        with self._key_lock:
+            key = self._key_cache.get(password)
+        if key is not None:
+            return key
+        # Tuz yazma kilidiyle okunur; kilit sırası her yerde yazma → _key_lock
+        # olmalı, bu yüzden _key_lock tutulurken _get_kdf_salt çağrılmaz
+        salt = self._get_kdf_salt()
+        with self._key_lock:
+            key = self._key_cache.get(password)
+            if key is None:
+                key = derive_master_key(password, salt)
+                # Yalnızca geçerli parolanın anahtarı tutulur
+                self._key_cache = {password: key}
+        return key
+
     def _encrypt_text_field(self, value: Optional[str]) -> Optional[str]:
         if not value:
             return value
-        password = self._get_encryption_password()
-        if not password:
+        key = self._get_session_key()
+        if not key:
+            return value
+        return encrypt_text_with_key(value, key)
+
+    def _encrypt_blob_field(self, value: Optional[bytes]) -> Optional[bytes]:
+        if not value:
             return value
-        return encrypt_aes256(value, password)
+        key = self._get_session_key()
+        if not key:
+            return value
+        return encrypt_bytes_with_key(value, key)
 
     def _decrypt_text_field(self, value: Optional[str]) -> Optional[str]:
         password = self._get_encryption_password()
-        return _decrypt_field_if_needed(value, password)
+        if not password:
+            return value
+        return _decrypt_field_if_needed(value, password, self._get_session_key())
 
     def _decrypt_row_fields(self, row_dict: dict, fields: tuple) -> dict:
         password = self._get_encryption_password()
         if not password or not row_dict:
             return row_dict
+        key = self._get_session_key()
         for field in fields:
             if row_dict.get(field):
-                row_dict[field] = _decrypt_field_if_needed(row_dict[field], password)
+                row_dict[field] = _decrypt_field_if_needed(row_dict[field], password, key)
         return row_dict
 
     def _decrypt_clip_row(self, row_dict: dict) -> dict:
@@ -181,44 +992,508 @@ class Storage:
         if not password:
             return row_dict
 
-        for field in ("text_content", "html_content", "ocr_text"):
+        key = self._get_session_key()
+        for field in ("text_content", "html_content", "ocr_text") + _SMART_TEXT_COLUMNS:
             if row_dict.get(field):
-                row_dict[field] = _decrypt_field_if_needed(row_dict[field], password)
-        if row_dict.get("image_blob"):
-            try:
-                row_dict["image_blob"] = decrypt_bytes(row_dict["image_blob"], password)
-            except Exception:
-                pass  # düz metin blob (eski kayıt)
+                row_dict[field] = _decrypt_field_if_needed(row_dict[field], password, key)
+        for field in ("image_blob", "thumb_blob"):
+            if row_dict.get(field):
+                try:
+                    row_dict[field] = decrypt_bytes_envelope(row_dict[field], password, key)
+                except Exception:
+                    pass  # düz metin blob (eski kayıt)
         return row_dict
 
+    def _get_content_hash_key(self) -> Optional[bytes]:
+        key = self._get_session_key()
+        return derive_subkey(key, b"content-hash") if key else None
+
+    # ---------- Eski şifreleme formatından geçiş ----------
+
+    def start_background_maintenance(self, batch_size: int = 50) -> bool:
+        """
+        Arka planda:
+        - (parola açıksa) kayıt başına tuzlu (PBKDF2'li) eski şifreli değerleri
+          ENC2'ye dönüştür, sınıflandırma ve hassas veri taramasını yap,
+        - içerik özeti olmayan kayıtların özetini hesapla,
+        - küçük resmi olmayan görsel kayıtların küçük resmini üret.
+        Okuma yolu her iki formatı da çözebildiği için iş yarıda kalsa bile
+        veri kaybı olmaz. Şifreleme kapalıyken yalnızca özeti ya da küçük
+        resmi eksik kayıt varsa thread başlatılır.
+        """
+        password = self._get_encryption_password()
+        if self.settings and self.settings.get("encrypt_data", False) and not password:
+            return False
+        if self._reencrypt_thread and self._reencrypt_thread.is_alive():
+            return False
+        if not password and not (self._has_unhashed_rows() or self._has_missing_thumbnails()):
+            return False
+        key = self._get_session_key() if password else None
+        self._reencrypt_thread = threading.Thread(
+            target=self._run_unlock_maintenance,
+            args=(password, key, batch_size),
+            name="TaxClipMaintenance",
+            daemon=True,
+        )
+        self._reencrypt_thread.start()
+        return True
+
+    def _run_unlock_maintenance(self, password: Optional[str], key: Optional[bytes], batch_size: int) -> None:
+        try:
+            if password:
+                self._reencrypt_legacy_rows(password, key, batch_size)
+            self._backfill_content_hashes(password, key, batch_size)
+            self._backfill_thumbnails(password, key, batch_size)
+            if password:
+                # Şifresiz geçmişte bunları start_reclassification / start_sensitive_rescan yapar
+                self._reclassify_clips()
+                self._rescan_sensitive()
+        finally:
+            if threading.get_ident() != self._owner_thread:
+                self.close_thread_connection()
+
+    def stop_background_tasks(self, timeout: float = 2.0) -> None:
+        """Arka plan bakım işlerini (şifreleme geçişi, indeksleme, sınıflandırma) durdur."""
+        self._background_stop.set()
+        threads = (
+            self._reencrypt_thread,
+            self._blind_index_thread,
+            self._smart_thread,
+            self._sensitive_thread,
+            self._retention_thread,
+        )
+        for thread in threads:
+            if thread and thread.is_alive():
+                thread.join(timeout)
+
+    # ---------- Akıllı içerik sınıflandırması ----------
+
+    def start_reclassification(self, batch_size: int = 200) -> bool:
+        """
+        Sınıflandırması eski sürümde (ya da hiç) yapılmış metin kayıtlarını arka
+        planda yeniden sınıfla. Şifreleme açık ama parola yoksa çalışmaz;
+        parola girilince start_background_maintenance bu işi de yapar.
+        """
+        if self.settings and self.settings.get("encrypt_data", False) and not self._get_encryption_password():
+            return False
+        if self._smart_thread and self._smart_thread.is_alive():
+            return False
+        if not self._stale_smart_ids(1):
+            return False
+        self._smart_thread = threading.Thread(
+            target=self._reclassify_clips,
+            args=(batch_size,),
+            name="TaxClipReclassify",
+            daemon=True,
+        )
+        self._smart_thread.start()
+        return True
+
+    def _stale_smart_ids(self, limit: int, after_id: int = 0) -> list:
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT id, item_type, text_content, html_content FROM clip_items
+            WHERE smart_version < ? AND item_type IN (?, ?) AND id > ?
+            ORDER BY id LIMIT ?
+            """,
+            (CLASSIFIER_VERSION, int(ClipItemType.TEXT), int(ClipItemType.HTML), after_id, limit),
+        )
+        return cur.fetchall()
+
+    def _reclassify_clips(self, batch_size: int = 200) -> int:
+        """Eski sürümlü kayıtların kart alanlarını yeniden hesapla; güncellenen sayı döner."""
+        updated = 0
+        last_id = 0
+        try:
+            while not self._background_stop.is_set():
+                rows = self._stale_smart_ids(batch_size, last_id)
+                if not rows:
+                    break
+                last_id = rows[-1]["id"]
+                results = []
+                for row in rows:
+                    plain = self._decrypt_clip_row(dict(row))
+                    text, html = plain.get("text_content"), plain.get("html_content")
+                    if any(v == _DECRYPT_FAILED or is_v2_text_envelope(v) for v in (text, html) if v):
+                        continue  # parola yanlış / yok: yanlış sınıflandırma yazma
+                    results.append((row["id"], _classify_clip(row["item_type"], text, html)))
+                updated += self._store_smart_fields(results)
+        except Exception as e:
+            print(f"[STORAGE] Yeniden sınıflandırma hatası: {e}")
+        finally:
+            if threading.get_ident() != self._owner_thread:
+                self.close_thread_connection()
+        if updated:
+            print(f"[STORAGE] {updated} kayıt yeniden sınıflandırıldı (sürüm {CLASSIFIER_VERSION})")
+        return updated
+
+    @_write_locked
+    def _store_smart_fields(self, results: list) -> int:
+        encrypting = bool(self._get_encryption_password())
+        cur = self.conn.cursor()
+        changed = []
+        for item_id, fields in results:
+            stored = dict(fields)
+            if encrypting:
+                for column in _SMART_TEXT_COLUMNS:
+                    stored[column] = self._encrypt_text_field(stored[column])
+            cur.execute(
+                """
+                UPDATE clip_items SET smart_kind = ?, smart_title = ?, smart_summary = ?,
+                    plain_text = ?, smart_version = ?
+                WHERE id = ? AND smart_version < ?
+                """,
+                (
+                    stored["smart_kind"],
+                    stored["smart_title"],
+                    stored["smart_summary"],
+                    stored["plain_text"],
+                    stored["smart_version"],
+                    item_id,
+                    CLASSIFIER_VERSION,
+                ),
+            )
+            if cur.rowcount:
+                changed.append((item_id, fields))
+        self.conn.commit()
+        for item_id, fields in changed:
+            self._publish_clip_change(ClipChangeKind.UPDATED, (item_id,), fields)
+        return len(changed)
+
+    # ---------- Hassas veri taraması ----------
+
+    def start_sensitive_rescan(self, batch_size: int = 200) -> bool:
+        """
+        Hassas veri ayarları değiştiyse (parmak izi tutmuyorsa) kayıtları arka
+        planda yeniden tara. Kartlar tarama bitene kadar metni kendileri tarar.
+        """
+        if self.settings and self.settings.get("encrypt_data", False) and not self._get_encryption_password():
+            return False
+        if self._sensitive_thread and self._sensitive_thread.is_alive():
+            return False
+        if not self._stale_sensitive_rows(1):
+            return False
+        self._sensitive_thread = threading.Thread(
+            target=self._rescan_sensitive,
+            args=(batch_size,),
+            name="TaxClipSensitiveRescan",
+            daemon=True,
+        )
+        self._sensitive_thread.start()
+        return True
+
+    def _stale_sensitive_rows(self, limit: int, after_id: int = 0) -> list:
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT id, item_type, text_content, html_content, plain_text, ocr_text, sensitive_categories
+            FROM clip_items
+            WHERE sensitive_fingerprint IS NOT ? AND id > ?
+            ORDER BY id LIMIT ?
+            """,
+            (detection_fingerprint(self.settings), after_id, limit),
+        )
+        return cur.fetchall()
+
+    def _rescan_sensitive(self, batch_size: int = 200) -> int:
+        """Parmak izi eski kayıtları güncel ayarlarla tara; kategorisi değişen sayı döner."""
+        changed = 0
+        last_id = 0
+        try:
+            while not self._background_stop.is_set():
+                rows = self._stale_sensitive_rows(batch_size, last_id)
+                if not rows:
+                    break
+                last_id = rows[-1]["id"]
+                results = []
+                for row in rows:
+                    plain = self._decrypt_clip_row(dict(row))
+                    probe = [plain.get(col) for col in ("text_content", "html_content", "ocr_text", "plain_text")]
+                    if any(v == _DECRYPT_FAILED or is_v2_text_envelope(v) for v in probe if v):
+                        continue
+                    fields = _scan_sensitive(self.settings, row["item_type"], *probe)
+                    results.append((row["id"], row["sensitive_categories"], fields))
+                changed += self._store_sensitive_fields(results)
+        except Exception as e:
+            print(f"[STORAGE] Hassas veri taraması hatası: {e}")
+        finally:
+            if threading.get_ident() != self._owner_thread:
+                self.close_thread_connection()
+        if changed:
+            print(f"[STORAGE] {changed} kaydın hassas veri durumu değişti")
+        return changed
+
+    @_write_locked
+    def _store_sensitive_fields(self, results: list) -> int:
+        cur = self.conn.cursor()
+        changed = []
+        for item_id, previous, fields in results:
+            cur.execute(
+                """
+                UPDATE clip_items SET sensitive_categories = ?, sensitive_fingerprint = ?
+                WHERE id = ? AND sensitive_fingerprint IS NOT ?
+                """,
+                (fields["sensitive_categories"], fields["sensitive_fingerprint"], item_id, fields["sensitive_fingerprint"]),
+            )
+            # Kategorisi aynı kalan kartların yeniden çizilmesine gerek yok
+            if cur.rowcount and (previous or "") != fields["sensitive_categories"]:
+                changed.append((item_id, fields))
+        self.conn.commit()
+        for item_id, fields in changed:
+            self._publish_clip_change(ClipChangeKind.UPDATED, (item_id,), fields)
+        return len(changed)
+
+    def _reencrypt_legacy_rows(self, password: str, key: bytes, batch_size: int = 50) -> int:
+        """
+        Eski formattaki şifreli alanları ENC2'ye çevir; dönüştürülen alan sayısını
+        döndür. Satırlar thread'in okuyucusundan okunur, her partinin güncellemesi
+        paylaşılan yazma bağlantısında kilit altında tek commit ile yazılır.
+        """
+        converted = 0
+        try:
+            tables = set(_ENCRYPTED_TEXT_COLUMNS) | set(_ENCRYPTED_BLOB_COLUMNS)
+            for table in sorted(tables):
+                text_cols = _ENCRYPTED_TEXT_COLUMNS.get(table, ())
+                blob_cols = _ENCRYPTED_BLOB_COLUMNS.get(table, ())
+                columns = text_cols + blob_cols
+                last_id = 0
+                while not self._background_stop.is_set():
+                    rows = self.conn.execute(
+                        f"SELECT id, {', '.join(columns)} FROM {table} WHERE id > ? ORDER BY id LIMIT ?",
+                        (last_id, batch_size),
+                    ).fetchall()
+                    if not rows:
+                        break
+                    updates = []
+                    for row in rows:
+                        last_id = row[0]
+                        for idx, column in enumerate(columns, start=1):
+                            value = row[idx]
+                            new_value = None
+                            try:
+                                if column in blob_cols:
+                                    if isinstance(value, bytes) and value and not is_v2_blob_envelope(value):
+                                        plain = decrypt_bytes(value, password)
+                                        if plain is not value:
+                                            new_value = encrypt_bytes_with_key(plain, key)
+                                elif (
+                                    isinstance(value, str)
+                                    and not is_v2_text_envelope(value)
+                                    and _looks_like_encrypted_value(value)
+                                ):
+                                    new_value = encrypt_text_with_key(decrypt_aes256(value, password), key)
+                            except Exception:
+                                new_value = None  # düz metin ya da başka parola; dokunma
+                            if new_value is not None:
+                                updates.append((column, new_value, row[0], value))
+                    if not updates:
+                        continue
+                    with self._writing() as conn:
+                        for column, new_value, row_id, old_value in updates:
+                            # Bu arada değişen satırların üzerine yazma
+                            cur = conn.execute(
+                                f"UPDATE {table} SET {column} = ? WHERE id = ? AND {column} = ?",
+                                (new_value, row_id, old_value),
+                            )
+                            converted += cur.rowcount
+                        conn.commit()
+        except Exception as e:
+            print(f"[STORAGE] Şifreleme geçişi hatası: {e}")
+        if converted:
+            print(f"[STORAGE] {converted} şifreli alan yeni formata taşındı")
+        return converted
+
+    def _backfill_content_hashes(
+        self,
+        password: Optional[str] = None,
+        key: Optional[bytes] = None,
+        batch_size: int = 50,
+    ) -> int:
+        """
+        İçerik özeti olmayan (eski) kayıtların özetini hesapla. Özetler kilit
+        dışında hesaplanır, her parti paylaşılan yazma bağlantısına yazılır.
+        Parola verilmezse şifreli kayıtlar atlanır (NULL kalır, parolayla
+        yeniden denenir). Yeniden eskiye gidildiği için yinelenen kayıtlarda
+        özet en yenisinde kalır; eskileri ve özetlenemeyen kayıtlar
+        _unhashed_mark ile işaretlenir, böylece tarama bir kez biter.
+        Özetlenen kayıt sayısı döner.
+        """
+        hash_key = derive_subkey(key, b"content-hash") if key else None
+        updated = 0
+        try:
+            last_id = None
+            while not self._background_stop.is_set():
+                id_filter = " AND id < ?" if last_id is not None else ""
+                params = ([last_id] if last_id is not None else []) + [batch_size]
+                rows = self.conn.execute(
+                    f"""
+                    SELECT id, item_type, text_content, html_content, image_blob FROM clip_items
+                    WHERE content_hash IS NULL{id_filter}
+                    ORDER BY id DESC LIMIT ?
+                    """,
+                    params,
+                ).fetchall()
+                if not rows:
+                    break
+                digests = []
+                for item_id, item_type, text, html, image_blob in rows:
+                    last_id = item_id
+                    try:
+                        if password:
+                            text = _decrypt_field_if_needed(text, password, key)
+                            html = _decrypt_field_if_needed(html, password, key)
+                            if _DECRYPT_FAILED in (text, html):
+                                continue  # başka parolayla şifrelenmiş; sonra yeniden denenir
+                            if image_blob:
+                                image_blob = decrypt_bytes_envelope(image_blob, password, key)
+                        elif any(
+                            is_v2_text_envelope(value) or _looks_like_encrypted_value(value)
+                            for value in (text, html)
+                            if value
+                        ) or bytes(image_blob or b"")[:4] in (b"ENC1", b"ENC2"):
+                            continue  # parola olmadan şifreli kayıt özetlenemez
+                        if item_type == int(ClipItemType.IMAGE) and not image_blob and text:
+                            image_path = Path(text)
+                            image_blob = image_path.read_bytes() if image_path.exists() else None
+                    except Exception:
+                        continue
+                    digests.append((_content_hash(item_type, text, html, image_blob, hash_key), item_id))
+                if not digests:
+                    continue
+                with self._writing() as conn:
+                    for digest, item_id in digests:
+                        if digest:
+                            cur = conn.execute(
+                                "UPDATE OR IGNORE clip_items SET content_hash = ? WHERE id = ? AND content_hash IS NULL",
+                                (digest, item_id),
+                            )
+                            if cur.rowcount:
+                                updated += 1
+                                continue
+                        # Boş içerik ya da özeti daha yeni bir kayıtta: bir daha taranmasın
+                        conn.execute(
+                            "UPDATE clip_items SET content_hash = ? WHERE id = ? AND content_hash IS NULL",
+                            (_unhashed_mark(item_id), item_id),
+                        )
+                    conn.commit()
+        except Exception as e:
+            print(f"[STORAGE] İçerik özeti oluşturma hatası: {e}")
+        if updated:
+            print(f"[STORAGE] {updated} kayıt için içerik özeti oluşturuldu")
+        return updated
+
+    def _has_unhashed_rows(self) -> bool:
+        """İçerik özeti hiç hesaplanmamış kayıt var mı (UNIQUE indeksten okunur)."""
+        return self.conn.execute("SELECT 1 FROM clip_items WHERE content_hash IS NULL LIMIT 1").fetchone() is not None
+
+    def _has_missing_thumbnails(self) -> bool:
+        """Küçük resmi hiç üretilmemiş görsel kayıt var mı."""
+        return (
+            self.conn.execute(
+                "SELECT 1 FROM clip_items WHERE item_type = ? AND thumb_blob IS NULL LIMIT 1",
+                (int(ClipItemType.IMAGE),),
+            ).fetchone()
+            is not None
+        )
+
+    def _backfill_thumbnails(self, password: Optional[str], key: Optional[bytes], batch_size: int = 50) -> int:
+        """
+        Küçük resmi olmayan eski görsel kayıtları için küçük resim üret. Tam
+        görsel kilit dışında okunup küçültülür, her parti tek commit ile
+        paylaşılan yazıcıdan yazılır. Küçük resmi üretilemeyen kayıtlar (bozuk
+        veri, eksik harici dosya) boş blob ile işaretlenir, böylece bir daha
+        denenmez; başka parolayla şifrelenmiş kayıtlar NULL kalır. Üretilen
+        küçük resim sayısı döner.
+        """
+        made = 0
+        try:
+            last_id = None
+            while not self._background_stop.is_set():
+                id_filter = " AND id < ?" if last_id is not None else ""
+                params = [int(ClipItemType.IMAGE)] + ([last_id] if last_id is not None else []) + [batch_size]
+                rows = self.conn.execute(
+                    f"""
+                    SELECT id, text_content, image_blob FROM clip_items
+                    WHERE item_type = ? AND thumb_blob IS NULL{id_filter}
+                    ORDER BY id DESC LIMIT ?
+                    """,
+                    params,
+                ).fetchall()
+                if not rows:
+                    break
+                thumbs = []
+                for item_id, text, image_blob in rows:
+                    last_id = item_id
+                    try:
+                        if bytes(image_blob or b"")[:4] in (b"ENC1", b"ENC2"):
+                            if not password:
+                                continue  # parola olmadan şifreli görsel okunamaz
+                            try:
+                                image_blob = decrypt_bytes_envelope(image_blob, password, key)
+                            except Exception:
+                                continue  # başka parolayla şifrelenmiş; sonra yeniden denenir
+                        elif not image_blob and text:
+                            image_path = Path(text)
+                            image_blob = image_path.read_bytes() if image_path.exists() else None
+                        thumb = _make_thumbnail(image_blob)
+                    except Exception:
+                        thumb = None
+                    stored = encrypt_bytes_with_key(thumb, key) if thumb and key else thumb
+                    thumbs.append((item_id, thumb, stored or b""))
+                if not thumbs:
+                    continue
+                with self._writing() as conn:
+                    conn.executemany(
+                        "UPDATE clip_items SET thumb_blob = ? WHERE id = ? AND thumb_blob IS NULL",
+                        [(stored, item_id) for item_id, _, stored in thumbs],
+                    )
+                    conn.commit()
+                for item_id, thumb, _ in thumbs:
+                    if thumb:
+                        made += 1
+                        self._publish_clip_change(ClipChangeKind.UPDATED, (item_id,), {"thumb_blob": thumb})
+        except Exception as e:
+            print(f"[STORAGE] Küçük resim oluşturma hatası: {e}")
+        if made:
+            print(f"[STORAGE] {made} görsel kayıt için küçük resim oluşturuldu")
+        return made
+
     def _protect_clip_item(
         self,
         item_type: ClipItemType,
         text: Optional[str],
         html: Optional[str],
         ocr_text: Optional[str],
+        scan: Optional[SensitiveScan] = None,
     ) -> tuple[ClipItemType, Optional[str], Optional[str], Optional[str], bool]:
+        """
+        Hassas veri politikasını uygula (engelle / maskele). `scan` metnin
+        (ya da OCR metninin) önceki taramasıysa yeniden kullanılır.
+        """
         if not self.settings:
             return item_type, text, html, ocr_text, False
 
         detector = get_sensitive_detector(self.settings)
 
         if item_type == ClipItemType.TEXT and text:
-            should_block, reason = detector.should_block(text)
+            scan = detector.scan_once(text, scan)
+            should_block, reason = detector.should_block(text, scan)
             if should_block:
                 print(f"[STORAGE SENSITIVE] Metin engellendi: {reason}")
                 return item_type, text, html, ocr_text, True
-            text, _ = detector.mask_text(text)
+            text, _ = detector.mask_text(text, scan)
 
         elif item_type == ClipItemType.HTML and html:
             plain_text = _html_to_plain_text(html)
             if plain_text:
-                should_block, reason = detector.should_block(plain_text)
+                plain_scan = detector.scan(plain_text)
+                should_block, reason = detector.should_block(plain_text, plain_scan)
                 if should_block:
                     print(f"[STORAGE SENSITIVE] HTML engellendi: {reason}")
                     return item_type, text, html, ocr_text, True
 
-                masked_plain_text, was_masked = detector.mask_text(plain_text)
+                masked_plain_text, was_masked = detector.mask_text(plain_text, plain_scan)
                 if was_masked:
                     item_type = ClipItemType.TEXT
                     text = masked_plain_text
@@ -226,16 +1501,77 @@ class Storage:
                     print("[STORAGE SENSITIVE] Zengin HTML maskeli düz metne dönüştürüldü")
 
         if item_type == ClipItemType.IMAGE and ocr_text:
-            should_block, reason = detector.should_block(ocr_text)
+            scan = detector.scan_once(ocr_text, scan)
+            should_block, reason = detector.should_block(ocr_text, scan)
             if should_block:
                 print(f"[STORAGE SENSITIVE] OCR ile hassas içerik taşıyan görsel engellendi: {reason}")
                 return item_type, text, html, ocr_text, True
 
         return item_type, text, html, ocr_text, False
 
+    # ---------- Şema göçleri ----------
+
+    @property
+    def _search_index_available(self) -> bool:
+        if self._search_index_state is None:
+            row = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'clip_search'"
+            ).fetchone()
+            self._search_index_state = row is not None
+        return self._search_index_state
+
+    @_search_index_available.setter
+    def _search_index_available(self, value: bool) -> None:
+        self._search_index_state = bool(value)
+
+    @property
+    def _clip_columns(self) -> list:
+        if self._clip_columns_cache is None:
+            self._clip_columns_cache = [row[1] for row in self.conn.execute("PRAGMA table_info(clip_items)")]
+        return self._clip_columns_cache
+
+    @property
+    def _clip_list_columns(self) -> str:
+        # Liste sorguları tam görseli (image_blob) okumaz
+        return ", ".join(col for col in self._clip_columns if col != "image_blob")
+
+    @_write_locked
     def _init_db(self):
+        """
+        Şemayı PRAGMA user_version'a göre güncelle. Güncel bir veritabanında
+        yalnızca sürüm okunur; eksik göçler sırayla ve her biri kendi commit'i
+        ile çalışır. Göçler yarıda kesilirse yeniden çalışabilmeleri için
+        idempotent yazılmalıdır.
+        """
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            if version > SCHEMA_VERSION:
+                print(f"[STORAGE] Veritabanı şema sürümü ({version}) uygulamadan yeni ({SCHEMA_VERSION})")
+            return
+        for target, migrate in _MIGRATIONS:
+            if version >= target:
+                continue
+            started = time.perf_counter()
+            migrate(self)
+            self.conn.execute(f"PRAGMA user_version = {int(target)}")
+            self.conn.commit()
+            version = target
+            print(f"[MIGRATION] Şema sürümü {target} ({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+    def _migrate_v1_baseline(self):
+        """Sürümsüz (eski) veritabanlarını ve yeni kurulumları güncel tablolara getir."""
         cur = self.conn.cursor()
 
+        # Veritabanı düzeyinde ayarlar (KDF tuzu vb.)
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS storage_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+            """
+        )
+
         # Mevcut: kopya öğeleri tablosu
         cur.execute(
             """
@@ -274,6 +1610,9 @@ class Storage:
             ("tags", "TEXT"),
             ("collection", "TEXT"),
             ("is_sensitive", "INTEGER NOT NULL DEFAULT 0"),
+            ("thumb_blob", "BLOB"),
+            ("content_hash", "TEXT"),
+            ("pending_ocr", "INTEGER NOT NULL DEFAULT 0"),
         ):
             try:
                 cur.execute(f"SELECT {col} FROM clip_items LIMIT 1")
@@ -282,12 +1621,71 @@ class Storage:
                     cur.execute(f"ALTER TABLE clip_items ADD COLUMN {col} {typedef}")
                 except Exception as e:
                     print(f"[STORAGE] {col} sütunu eklenemedi: {e}")
+        self._clip_columns_cache = None
 
+        # İçerik özeti ile yineleme kontrolü. Tip, özet girdisine dahil olduğundan
+        # tekillik tip başınadır; eski kayıtlarda özet NULL kalabilir.
         try:
-            cur.execute("CREATE INDEX IF NOT EXISTS idx_clip_items_pinned ON clip_items(pinned DESC)")
-        except Exception:
-            pass
-
+            cur.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_clip_items_content_hash ON clip_items(content_hash)"
+            )
+        except Exception as e:
+            print(f"[STORAGE] İçerik özeti indeksi oluşturulamadı: {e}")
+
+        # Bekleyen OCR işleri (kısmi indeks: yalnızca bekleyen satırlar)
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_clip_items_pending_ocr ON clip_items(id) WHERE pending_ocr = 1"
+        )
+
+        # Keyset sayfalama indeksleri (liste sırası: pinned, favorite, id)
+        try:
+            cur.execute("DROP INDEX IF EXISTS idx_clip_items_pinned")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_clip_items_page ON clip_items(pinned, favorite, id)")
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_clip_items_type_page ON clip_items(item_type, pinned, favorite, id)"
+            )
+        except Exception as e:
+            print(f"[STORAGE] Sayfalama indeksleri oluşturulamadı: {e}")
+
+        # Arama indeksi (FTS5 trigram): normalize edilmiş metin, rowid = clip_items.id.
+        # Şifreli kayıtlar indekslenmez; bunlar arama sırasında ayrıca taranır.
+        try:
+            cur.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS clip_search USING fts5(body, tokenize='trigram')"
+            )
+            cur.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS clip_items_search_ad AFTER DELETE ON clip_items
+                BEGIN
+                    DELETE FROM clip_search WHERE rowid = old.id;
+                END
+                """
+            )
+            self._search_index_available = True
+        except sqlite3.OperationalError as e:
+            print(f"[STORAGE] Arama indeksi oluşturulamadı (FTS5 desteklenmiyor olabilir): {e}")
+            self._search_index_available = False
+
+        # Şifreli kayıtlar için kör arama indeksi: HMAC(token), düz metin saklanmaz
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS clip_blind_index (
+                token BLOB NOT NULL,
+                item_id INTEGER NOT NULL,
+                PRIMARY KEY (token, item_id)
+            ) WITHOUT ROWID
+            """
+        )
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_clip_blind_index_item ON clip_blind_index(item_id)")
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS clip_items_blind_index_ad AFTER DELETE ON clip_items
+            BEGIN
+                DELETE FROM clip_blind_index WHERE item_id = old.id;
+            END
+            """
+        )
+
         # Yeni: notlar tablosu (varsa dokunmaz)
         cur.execute(
             """
@@ -465,6 +1863,431 @@ class Storage:
 
         self.conn.commit()
 
+    def _migrate_v2_search_backfill(self):
+        """Arama indeksinden önce eklenmiş şifresiz kayıtları bir kez indeksle."""
+        self._backfill_search_index()
+
+    def _migrate_v3_smart_columns(self):
+        """
+        Kayıt anında hesaplanan akıllı içerik sütunları. Mevcut kayıtlar
+        smart_version = 0 ile kalır ve start_reclassification ile doldurulur.
+        """
+        cur = self.conn.cursor()
+        for col, typedef in (
+            ("smart_kind", "TEXT"),
+            ("smart_title", "TEXT"),
+            ("smart_summary", "TEXT"),
+            ("plain_text", "TEXT"),
+            ("smart_version", "INTEGER NOT NULL DEFAULT 0"),
+        ):
+            try:
+                cur.execute(f"SELECT {col} FROM clip_items LIMIT 1")
+            except Exception:
+                cur.execute(f"ALTER TABLE clip_items ADD COLUMN {col} {typedef}")
+        self._clip_columns_cache = None
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_clip_items_smart_kind ON clip_items(smart_kind)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_clip_items_smart_version ON clip_items(smart_version, id)")
+
+    def _migrate_v4_sensitive_columns(self):
+        """
+        Hassas veri kategorileri ve taramanın yapıldığı ayarların parmak izi.
+        Parmak izi güncel ayarlarla eşleşmeyen kayıtlar start_sensitive_rescan ile taranır.
+        """
+        cur = self.conn.cursor()
+        for col in ("sensitive_categories", "sensitive_fingerprint"):
+            try:
+                cur.execute(f"SELECT {col} FROM clip_items LIMIT 1")
+            except Exception:
+                cur.execute(f"ALTER TABLE clip_items ADD COLUMN {col} TEXT")
+        self._clip_columns_cache = None
+
+    def _migrate_v5_change_journal(self):
+        """
+        Artımlı bulut yedeği için değişiklik günlüğü. Her varlığın yalnızca son
+        değişikliği tutulur: sürüm AUTOINCREMENT sırasıdır, silinen varlık
+        deleted=1 ile kalır (tombstone). Mevcut kayıtlar günlüğe yazılmaz;
+        ilk eşitleme zaten tam bir taban yedek yükler.
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS change_journal (
+                version INTEGER PRIMARY KEY AUTOINCREMENT,
+                entity TEXT NOT NULL,
+                entity_id INTEGER NOT NULL,
+                deleted INTEGER NOT NULL DEFAULT 0,
+                UNIQUE (entity, entity_id)
+            )
+            """
+        )
+        # INSERT OR REPLACE yerine DELETE + INSERT: dış ifadenin çakışma
+        # kuralı tetikleyicinin içindekini ezer (import_clips vb.)
+        for table in _JOURNAL_TABLES:
+            for event, ref, deleted in (("INSERT", "NEW", 0), ("UPDATE", "NEW", 0), ("DELETE", "OLD", 1)):
+                cur.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_journal_{event.lower()} AFTER {event} ON {table}
+                    BEGIN
+                        DELETE FROM change_journal WHERE entity = '{table}' AND entity_id = {ref}.id;
+                        INSERT INTO change_journal (entity, entity_id, deleted) VALUES ('{table}', {ref}.id, {deleted});
+                    END
+                    """
+                )
+        self.conn.commit()
+
+    def _migrate_v6_retention_stats(self):
+        """
+        Saklama motoru için kayıt sayısı ve içerik boyutu özeti. clip_stats tek
+        satırlıktır ve tetikleyicilerle güncel tutulur; max_items / boyut kotası
+        kontrolü her eklemede COUNT(*) yerine bu satırı okur.
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS clip_stats (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                item_count INTEGER NOT NULL DEFAULT 0,
+                unfavorited_count INTEGER NOT NULL DEFAULT 0,
+                payload_bytes INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        new_size = _payload_size_sql("NEW")
+        old_size = _payload_size_sql("OLD")
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS clip_items_stats_insert AFTER INSERT ON clip_items
+            BEGIN
+                UPDATE clip_stats SET
+                    item_count = item_count + 1,
+                    unfavorited_count = unfavorited_count + (COALESCE(NEW.favorite, 0) = 0),
+                    payload_bytes = payload_bytes + ({new_size})
+                WHERE id = 1;
+            END
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS clip_items_stats_delete AFTER DELETE ON clip_items
+            BEGIN
+                UPDATE clip_stats SET
+                    item_count = item_count - 1,
+                    unfavorited_count = unfavorited_count - (COALESCE(OLD.favorite, 0) = 0),
+                    payload_bytes = payload_bytes - ({old_size})
+                WHERE id = 1;
+            END
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS clip_items_stats_update
+            AFTER UPDATE OF favorite, {", ".join(_PAYLOAD_COLUMNS)} ON clip_items
+            BEGIN
+                UPDATE clip_stats SET
+                    unfavorited_count = unfavorited_count
+                        + (COALESCE(NEW.favorite, 0) = 0) - (COALESCE(OLD.favorite, 0) = 0),
+                    payload_bytes = payload_bytes + ({new_size}) - ({old_size})
+                WHERE id = 1;
+            END
+            """
+        )
+        self.conn.commit()
+        self.rebuild_clip_stats()
+
+    def _migrate_v7_recency_order(self):
+        """
+        Liste sırası için recency sütunu. Yeniden kopyalanan kayıt satırı
+        kopyalanıp silinmeden, yerinde en büyük recency değerini alarak öne
+        çıkar (bkz. _bump_duplicate_item). Mevcut kayıtlarda recency = id;
+        keyset sayfalama indeksleri id yerine recency üzerinden kurulur.
+        recency vermeden eklenen satırlar (eski biçimli bulut günlüğü vb.)
+        tetikleyiciyle en sona değil en başa yerleşir.
+        """
+        cur = self.conn.cursor()
+        if "recency" not in [row[1] for row in cur.execute("PRAGMA table_info(clip_items)")]:
+            cur.execute("ALTER TABLE clip_items ADD COLUMN recency INTEGER")
+        self._clip_columns_cache = None
+        cur.execute("UPDATE clip_items SET recency = id WHERE recency IS NULL")
+        cur.execute("DROP INDEX IF EXISTS idx_clip_items_page")
+        cur.execute("DROP INDEX IF EXISTS idx_clip_items_type_page")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_clip_items_recency ON clip_items(recency)")
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_clip_items_recency_page ON clip_items(pinned, favorite, recency)"
+        )
+        cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_clip_items_type_recency_page
+            ON clip_items(item_type, pinned, favorite, recency)
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS clip_items_recency_insert AFTER INSERT ON clip_items
+            WHEN NEW.recency IS NULL
+            BEGIN
+                UPDATE clip_items SET recency = (SELECT COALESCE(MAX(recency), 0) + 1 FROM clip_items)
+                WHERE id = NEW.id;
+            END
+            """
+        )
+        self.conn.commit()
+
+    def _migrate_v8_ocr_attempts(self):
+        """
+        Bekleyen OCR işleri için başarısız deneme sayacı. Geçici hatalar
+        (zaman aşımı, çöken OCR süreci) işi düşürmez; sayaç artar ve OCRQueue
+        sınıra ulaşana kadar yeniden dener. Sayaç yeniden başlatmada korunur.
+        """
+        cur = self.conn.cursor()
+        if "ocr_attempts" not in [row[1] for row in cur.execute("PRAGMA table_info(clip_items)")]:
+            cur.execute("ALTER TABLE clip_items ADD COLUMN ocr_attempts INTEGER NOT NULL DEFAULT 0")
+        self._clip_columns_cache = None
+        self.conn.commit()
+
+    # ---------- Arama indeksi ----------
+
+    @_write_locked
+    def _update_search_index(self, item_id: int, body: str, commit: bool = True) -> None:
+        if not self._search_index_available:
+            return
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM clip_search WHERE rowid = ?", (item_id,))
+        cur.execute("INSERT INTO clip_search (rowid, body) VALUES (?, ?)", (item_id, body or ""))
+        if commit:
+            self.conn.commit()
+
+    @_write_locked
+    def _backfill_search_index(self, batch_size: int = 500) -> int:
+        """İndekste olmayan şifresiz kayıtları indekse ekle (eski veritabanları için)."""
+        if not self._search_index_available:
+            return 0
+        added = 0
+        last_id = 0
+        cur = self.conn.cursor()
+        while True:
+            cur.execute(
+                """
+                SELECT id, item_type, text_content, html_content, ocr_text FROM clip_items
+                WHERE id > ? AND id NOT IN (SELECT rowid FROM clip_search)
+                ORDER BY id LIMIT ?
+                """,
+                (last_id, batch_size),
+            )
+            rows = cur.fetchall()
+            if not rows:
+                break
+            for row in rows:
+                last_id = row["id"]
+                values = (row["text_content"], row["html_content"], row["ocr_text"])
+                if any(
+                    is_v2_text_envelope(value) or _looks_like_encrypted_value(value)
+                    for value in values
+                    if value
+                ):
+                    continue  # şifreli kayıt: düz metin indekse yazılmaz
+                body = _build_search_body(row["item_type"], *values)
+                self._update_search_index(row["id"], body, commit=False)
+                added += 1
+            self.conn.commit()
+        if added:
+            print(f"[STORAGE] Arama indeksine {added} kayıt eklendi")
+        return added
+
+    # ---------- Kör (şifreli) arama indeksi ----------
+
+    def _blind_index_enabled(self) -> bool:
+        return bool(self.settings and self.settings.get("encrypted_search_index", False))
+
+    def _get_blind_index_key(self) -> Optional[bytes]:
+        if not self._blind_index_enabled():
+            return None
+        key = self._get_session_key()
+        if not key:
+            return None
+        return derive_subkey(key, b"search-index")
+
+    @_write_locked
+    def clear_blind_index(self) -> None:
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM clip_blind_index")
+        self.conn.commit()
+
+    def sync_blind_index(self) -> bool:
+        """Ayar kapalıysa indeksi temizle, açıksa eksik kayıtları arka planda indeksle."""
+        if not self._blind_index_enabled():
+            self.clear_blind_index()
+            return False
+        index_key = self._get_blind_index_key()
+        if not index_key:
+            return False
+        if self._blind_index_thread and self._blind_index_thread.is_alive():
+            return False
+        self._blind_index_thread = threading.Thread(
+            target=self._backfill_blind_index,
+            args=(self._get_encryption_password(), self._get_session_key(), index_key),
+            name="TaxClipBlindIndex",
+            daemon=True,
+        )
+        self._blind_index_thread.start()
+        return True
+
+    def _backfill_blind_index(self, password: str, key: bytes, index_key: bytes, batch_size: int = 200) -> int:
+        """
+        Kör indekste olmayan şifreli kayıtları çözüp indeksle. Çözme kilit dışında
+        yapılır; her partinin indeks satırları kilit altında tek commit ile yazılır.
+        """
+        added = 0
+        marker = blind_index_token(index_key, _BLIND_INDEX_MARKER)
+        fts_filter = " AND id NOT IN (SELECT rowid FROM clip_search)" if self._search_index_available else ""
+        try:
+            last_id = 0
+            while not self._background_stop.is_set():
+                rows = self.conn.execute(
+                    f"""
+                    SELECT id, item_type, text_content, html_content, ocr_text FROM clip_items
+                    WHERE id > ?{fts_filter}
+                      AND id NOT IN (SELECT item_id FROM clip_blind_index WHERE token = ?)
+                    ORDER BY id LIMIT ?
+                    """,
+                    (last_id, marker, batch_size),
+                ).fetchall()
+                if not rows:
+                    break
+                bodies = []
+                for item_id, item_type, text, html, ocr_text in rows:
+                    last_id = item_id
+                    body = _build_search_body(
+                        item_type,
+                        _decrypt_field_if_needed(text, password, key),
+                        _decrypt_field_if_needed(html, password, key),
+                        _decrypt_field_if_needed(ocr_text, password, key),
+                    )
+                    bodies.append((item_id, body))
+                with self._writing() as conn:
+                    for item_id, body in bodies:
+                        # Okumadan sonra silinen kayda sahipsiz indeks satırı yazma
+                        if conn.execute("SELECT 1 FROM clip_items WHERE id = ?", (item_id,)).fetchone():
+                            _write_blind_index(conn, index_key, item_id, body)
+                            added += 1
+                    conn.commit()
+        except Exception as e:
+            print(f"[STORAGE] Kör arama indeksi oluşturma hatası: {e}")
+        finally:
+            if threading.get_ident() != self._owner_thread:
+                self.close_thread_connection()
+        if added:
+            print(f"[STORAGE] Kör arama indeksine {added} kayıt eklendi")
+        return added
+
+    def _score_blind_index_candidates(
+        self,
+        index_key: bytes,
+        normalized_query: str,
+        filter_sql: str,
+        filter_params: list,
+        fuzzy_threshold: int,
+        limit: int,
+    ) -> dict:
+        """
+        Kör indeksten aday id'leri bul, yalnızca bu kayıtları çözüp puanla (id -> skor).
+        Adaylar yeniden eskiye işlenir; `limit` kadar tam (100) eşleşme bulununca
+        daha eski adaylar sıralamayı değiştiremeyeceği için durulur.
+        """
+        cur = self.conn.cursor()
+        scores = {}
+        words = _search_token_re.findall(normalized_query)
+        if not words:
+            return scores
+
+        def _matching_ids(terms: set, min_hits: int, limit: int) -> List[int]:
+            tokens = [blind_index_token(index_key, term) for term in terms]
+            placeholders = ",".join("?" * len(tokens))
+            cur.execute(
+                f"""
+                SELECT b.item_id FROM clip_blind_index b JOIN clip_items c ON c.id = b.item_id
+                WHERE b.token IN ({placeholders}){filter_sql}
+                GROUP BY b.item_id HAVING COUNT(DISTINCT b.token) >= ?
+                ORDER BY COUNT(DISTINCT b.token) DESC, b.item_id DESC LIMIT ?
+                """,
+                tokens + filter_params + [min_hits, limit],
+            )
+            return [row[0] for row in cur.fetchall()]
+
+        def _score_ids(ids: List[int]) -> int:
+            """Verilen id'leri çözüp puanla; tam eşleşme (100) sayısını döndür."""
+            perfect = 0
+            for start in range(0, len(ids), 200):
+                chunk = [item_id for item_id in ids[start:start + 200] if item_id not in scores]
+                if not chunk:
+                    continue
+                placeholders = ",".join("?" * len(chunk))
+                cur.execute(
+                    f"""
+                    SELECT id, item_type, text_content, html_content, ocr_text
+                    FROM clip_items WHERE id IN ({placeholders})
+                    """,
+                    chunk,
+                )
+                bodies = {}
+                for row in cur.fetchall():
+                    row_dict = self._decrypt_row_fields(dict(row), ("text_content", "html_content", "ocr_text"))
+                    bodies[row_dict["id"]] = _build_search_body(
+                        row_dict["item_type"],
+                        row_dict.get("text_content"),
+                        row_dict.get("html_content"),
+                        row_dict.get("ocr_text"),
+                    )
+                chunk_scores = _score_search_matches(normalized_query, bodies)
+                scores.update(chunk_scores)
+                perfect += sum(1 for score in chunk_scores.values() if score >= 100)
+                if perfect >= limit:
+                    break
+            return perfect
+
+        # 1) Tüm terimleri içerenler (tam / önek / içerir eşleşmeleri), yeniden eskiye
+        strong_terms = set()
+        for word in words:
+            if len(word) >= 3:
+                strong_terms.update("g:" + gram for gram in _word_trigrams(word))
+            else:
+                strong_terms.add("p:" + word)
+        perfect = _score_ids(_matching_ids(strong_terms, len(strong_terms), _SEARCH_CANDIDATE_LIMIT))
+
+        # 2) Bulanık eşleşme: trigramların en az yarısını paylaşanlar
+        if _search_allows_fuzzy(normalized_query) and perfect < limit:
+            grams = {"g:" + gram for word in words for gram in _word_trigrams(word)}
+            if grams:
+                _score_ids(_matching_ids(grams, max(1, (len(grams) + 1) // 2), _FUZZY_CANDIDATE_LIMIT))
+
+        return {item_id: score for item_id, score in scores.items() if score >= fuzzy_threshold}
+
+    def _load_clip_rows(self, item_ids: List[int]) -> dict:
+        """
+        Liste görünümleri için satırları yükle (id -> satır). Tam görsel
+        okunmaz: image_blob None döner, kartlar thumb_blob kullanır. Tam veri
+        kopyalama / önizleme anında get_item ile alınır.
+        """
+        result = {}
+        if not item_ids:
+            return result
+        cur = self.conn.cursor()
+        for start in range(0, len(item_ids), 500):
+            chunk = item_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cur.execute(
+                f"SELECT {self._clip_list_columns} FROM clip_items WHERE id IN ({placeholders})",
+                chunk,
+            )
+            for row in cur.fetchall():
+                row_dict = self._decrypt_clip_row(dict(row))
+                row_dict["image_blob"] = None
+                if row_dict.get("item_type") == int(ClipItemType.IMAGE):
+                    # harici resim yolu görünmesin; küçük resmi olmayan eski kayıt
+                    # boş kartla döner, küçük resmi bakım geçişi üretir
+                    row_dict["text_content"] = None
+                result[row_dict["id"]] = row_dict
+        return result
+
     # ---------- Clip items (ESKİ işlevler korunmuştur) ----------
 
     def add_item(
@@ -477,42 +2300,118 @@ class Storage:
         ocr_text: Optional[str] = None,
         source_app: Optional[str] = None,
         is_sensitive: bool = False,
+        timings: Optional[dict] = None,
+        sensitive_scan: Optional[SensitiveScan] = None,
     ) -> Optional[sqlite3.Row]:
-        # Yinelenenleri engelle
-        last = self.get_last_item()
-        if last and last["item_type"] == int(item_type):
-            if item_type == ClipItemType.TEXT and (last["text_content"] or "") == (text or ""):
-                return None
-            if item_type == ClipItemType.HTML and (last["html_content"] or "") == (html or ""):
-                return None
-            if item_type == ClipItemType.IMAGE and last["image_blob"] == image_bytes:
-                return None
-            if item_type == ClipItemType.FILE and (last["text_content"] or "") == (text or ""):
-                return None
-        
-        # OCR işlemi (resim için ve OCR aktifse)
-        if item_type == ClipItemType.IMAGE and image_bytes and not ocr_text:
-            if self.settings and self.settings.get("ocr_enabled", False):
-                try:
-                    from .ocr_manager import OCRManager
-                    ocr = OCRManager(self.settings)
-                    if ocr.is_available():
-                        ocr_lang = self.settings.get("ocr_language", "tur+eng")
-                        ocr_text = ocr.extract_text(image_bytes, lang=ocr_lang)
-                        if ocr_text:
-                            print(f"[STORAGE OCR] Metin çıkarıldı: {ocr_text[:50]}...")
-                except Exception as e:
-                    print(f"[STORAGE OCR] Hata: {e}")
+        """
+        Yeni pano öğesini kaydet. `timings` verilirse aşama süreleri (saniye)
+        içine eklenir: dedupe, protect, classify, thumbnail, save_image,
+        encrypt, write, enforce. `sensitive_scan` metnin hassas veri
+        taramasıysa (ClipboardWatcher) engelleme, maskeleme ve saklanan
+        kategoriler için yeniden kullanılır.
+        """
+        timer = _StageTimer(timings)
+
+        # Özet maskelenmemiş içerikten; yinelenen aynı içerik aynı özeti verir
+        content_hash = _content_hash(item_type, text, html, image_bytes, self._get_content_hash_key())
+        timer.mark("dedupe")
 
+        # Politika yinelenen kontrolünden önce: engellenen içeriğin eski kaydı öne alınmaz
         item_type, text, html, ocr_text, should_drop = self._protect_clip_item(
-            item_type,
-            text,
-            html,
-            ocr_text,
+            item_type, text, html, ocr_text, sensitive_scan
         )
+        timer.mark("protect")
         if should_drop:
             return None
 
+        # Yinelenenler: aynı içerik zaten varsa yeni kayıt yerine eskisi öne alınır
+        if content_hash:
+            cur = self.conn.cursor()
+            cur.execute("SELECT id FROM clip_items WHERE content_hash = ?", (content_hash,))
+            existing = cur.fetchone()
+            if existing:
+                row = self._bump_duplicate_item(existing[0], created_at)
+                timer.mark("dedupe")
+                return row
+        timer.mark("dedupe")
+
+        clip = self._prepare_clip_insert(
+            item_type, text, image_bytes, html, ocr_text, source_app, is_sensitive, sensitive_scan, timer
+        )
+        clip.values["created_at"] = created_at
+        clip.values["content_hash"] = content_hash
+
+        # Yalnızca veritabanı yazımı kilit altında; ağır aşamalar yukarıda kaldı
+        with self._writing() as conn:
+            cur = conn.cursor()
+            if content_hash:
+                # Kuyruk ile GUI aynı içeriği aynı anda eklemiş olabilir
+                cur.execute("SELECT id FROM clip_items WHERE content_hash = ?", (content_hash,))
+                existing = cur.fetchone()
+                if existing:
+                    return self._bump_duplicate_item(existing[0], created_at)
+            inserted_id = self._insert_prepared_clip(cur, clip)
+            conn.commit()
+            timer.mark("write")
+
+            # Maksimum öğe sayısı / boyut kotası kontrolü
+            self._enforce_retention()
+            timer.mark("enforce")
+
+        if clip.values["pending_ocr"] and self.on_ocr_pending:
+            try:
+                self.on_ocr_pending(inserted_id)
+            except Exception as e:
+                print(f"[STORAGE OCR] Kuyruk bildirimi hatası: {e}")
+
+        row = self._load_clip_rows([inserted_id]).get(inserted_id)
+        if row is not None:
+            self._publish_clip_change(ClipChangeKind.INSERTED, (inserted_id,), rows=(row,))
+        return row
+
+    def _prepare_clip_insert(
+        self,
+        item_type: ClipItemType,
+        text: Optional[str],
+        image_bytes: Optional[bytes],
+        html: Optional[str],
+        ocr_text: Optional[str],
+        source_app: Optional[str],
+        is_sensitive: bool,
+        sensitive_scan: Optional[SensitiveScan],
+        timer: _StageTimer,
+    ) -> _PreparedClip:
+        """
+        Kaydın kilit dışında yapılan aşamaları: sınıflandırma, küçük resim,
+        harici görsel kaydı ve şifreleme. Hassas veri politikası
+        (_protect_clip_item) çağıran tarafından önceden uygulanır; created_at ve
+        content_hash da çağıran tarafından doldurulur.
+        """
+        # OCR kayıt anında yapılmaz: görsel hemen kaydedilir, metin OCRQueue ile
+        # arka planda çıkarılıp arama indeksine sonradan eklenir
+        pending_ocr = bool(
+            item_type == ClipItemType.IMAGE
+            and image_bytes
+            and not ocr_text
+            and self.settings
+            and self.settings.get("ocr_enabled", False)
+        )
+
+        # Kart alanları (tür, başlık, özet, HTML düz metni, hassas veri
+        # kategorileri) bir kez hesaplanır; maskelenmemiş metnin taraması
+        # kategoriler için de kullanılır
+        smart_fields = _classify_clip(item_type, text, html)
+        smart_fields.update(
+            _scan_sensitive(
+                self.settings, item_type, text, html, ocr_text, smart_fields["plain_text"], sensitive_scan
+            )
+        )
+        timer.mark("classify")
+
+        # Liste kartları için küçük resim (harici kayıttan önce, tam veri elimizdeyken)
+        thumb_bytes = _make_thumbnail(image_bytes) if item_type == ClipItemType.IMAGE else None
+        timer.mark("thumbnail")
+
         # Resimler için harici kaydetme kontrolü
         image_path = None
         if item_type == ClipItemType.IMAGE and image_bytes and self.settings:
@@ -539,83 +2438,721 @@ class Storage:
                     except Exception as e:
                         print(f"[STORAGE] Harici kayıt hatası: {e}")
 
-        # Şifreleme (harici kayıtta resimler şifrelenmez)
-        password = self._get_encryption_password()
-        if password:
-            if text:
-                text = encrypt_aes256(text, password)
-            if html:
-                html = encrypt_aes256(html, password)
-            if ocr_text:
-                ocr_text = encrypt_aes256(ocr_text, password)
-            if image_bytes:
-                image_bytes = encrypt_bytes(image_bytes, password)
+        timer.mark("save_image")
+
+        # Arama indeksi: şifresiz kayıtlar FTS'e, şifreliler (açıksa) kör indekse
+        encrypting = bool(self._get_encryption_password())
+        search_body = _build_search_body(item_type, text, html, ocr_text)
+        blind_index_key = self._get_blind_index_key() if encrypting else None
+
+        # Şifreleme (harici kayıtta resimler şifrelenmez)
+        if encrypting:
+            text = self._encrypt_text_field(text)
+            html = self._encrypt_text_field(html)
+            ocr_text = self._encrypt_text_field(ocr_text)
+            image_bytes = self._encrypt_blob_field(image_bytes)
+            thumb_bytes = self._encrypt_blob_field(thumb_bytes)
+            for column in _SMART_TEXT_COLUMNS:
+                smart_fields[column] = self._encrypt_text_field(smart_fields[column])
+        timer.mark("encrypt")
+
+        # Eğer image_path varsa text_content alanına kaydedelim
+        if image_path:
+            text = image_path
+
+        values = {
+            "created_at": None,
+            "item_type": int(item_type),
+            "text_content": text,
+            "image_blob": image_bytes,
+            "html_content": html,
+            "ocr_text": ocr_text,
+            "source_app": source_app,
+            "is_sensitive": 1 if is_sensitive else 0,
+            "thumb_blob": thumb_bytes,
+            "content_hash": None,
+            "pending_ocr": 1 if pending_ocr else 0,
+            "favorite": 0,
+            "pinned": 0,
+        }
+        for column in ("smart_kind", *_SMART_TEXT_COLUMNS, "smart_version"):
+            values[column] = smart_fields[column]
+        values["sensitive_categories"] = smart_fields["sensitive_categories"]
+        values["sensitive_fingerprint"] = smart_fields["sensitive_fingerprint"]
+        return _PreparedClip(values, search_body, encrypting, blind_index_key)
+
+    def _insert_prepared_clip(self, cur: sqlite3.Cursor, clip: _PreparedClip) -> int:
+        """Hazırlanmış kaydı ve arama indeksini yaz (commit çağırana aittir; kilit tutulmalı)."""
+        clip.values["recency"] = self._next_recency(cur)
+        columns = list(clip.values)
+        cur.execute(
+            f"INSERT INTO clip_items ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            [clip.values[column] for column in columns],
+        )
+        inserted_id = cur.lastrowid
+        if not clip.encrypted:
+            self._update_search_index(inserted_id, clip.search_body, commit=False)
+        elif clip.blind_index_key:
+            _write_blind_index(cur.connection, clip.blind_index_key, inserted_id, clip.search_body)
+        return inserted_id
+
+    @staticmethod
+    def _next_recency(cur: sqlite3.Cursor) -> int:
+        """Listenin başına gelecek kaydın recency değeri (indeksten okunur; kilit tutulmalı)."""
+        cur.execute("SELECT COALESCE(MAX(recency), 0) + 1 FROM clip_items")
+        return int(cur.fetchone()[0])
+
+    def _existing_content_hashes(self, digests) -> set:
+        """Verilen içerik özetlerinden veritabanında zaten bulunanlar."""
+        digests = [d for d in digests if d]
+        found = set()
+        cur = self.conn.cursor()
+        for start in range(0, len(digests), 500):
+            chunk = digests[start:start + 500]
+            cur.execute(
+                f"SELECT content_hash FROM clip_items WHERE content_hash IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            found.update(row[0] for row in cur.fetchall())
+        return found
+
+    def import_clips(self, records: List[dict]) -> Tuple[int, int]:
+        """
+        Yedekten gelen kayıtları tek işlemde (transaction) ekle. İçerik özeti
+        veritabanında ya da partide zaten bulunan kayıtlar atlanır (yinelenen
+        kayıt add_item'daki gibi öne alınmaz). Hassas veri politikası,
+        sınıflandırma ve şifreleme add_item ile aynıdır; yazım, commit ve
+        saklama (max_items / boyut kotası) kontrolü parti başına bir kez yapılır.
+
+        Kayıt alanları: item_type, text_content, html_content, image_bytes,
+        ocr_text, created_at, favorite, pinned, source_app.
+        (eklenen, atlanan) döner.
+        """
+        hash_key = self._get_content_hash_key()
+        seen: set = set()
+        hashed = []
+        for record in records:
+            item_type = ClipItemType(int(record.get("item_type") or ClipItemType.TEXT))
+            digest = _content_hash(
+                item_type,
+                record.get("text_content"),
+                record.get("html_content"),
+                record.get("image_bytes"),
+                hash_key,
+            )
+            hashed.append((record, item_type, digest))
+            if digest:
+                seen.add(digest)
+        existing = self._existing_content_hashes(seen)
+
+        skipped = 0
+        prepared: List[_PreparedClip] = []
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for record, item_type, digest in hashed:
+            if digest and digest in existing:
+                skipped += 1
+                continue
+            if digest:
+                existing.add(digest)
+            item_type, text, html, ocr_text, should_drop = self._protect_clip_item(
+                item_type, record.get("text_content"), record.get("html_content"), record.get("ocr_text")
+            )
+            if should_drop:
+                skipped += 1
+                continue
+            clip = self._prepare_clip_insert(
+                item_type,
+                text,
+                record.get("image_bytes"),
+                html,
+                ocr_text,
+                record.get("source_app"),
+                False,
+                None,
+                _StageTimer(None),
+            )
+            clip.values["created_at"] = record.get("created_at") or now
+            clip.values["content_hash"] = digest
+            clip.values["favorite"] = 1 if record.get("favorite") else 0
+            clip.values["pinned"] = 1 if record.get("pinned") else 0
+            prepared.append(clip)
+
+        inserted_ids: List[int] = []
+        if prepared:
+            with self._writing() as conn:
+                cur = conn.cursor()
+                # Alım işçisi aynı içeriği bu arada eklemiş olabilir
+                racing = self._existing_content_hashes(clip.values["content_hash"] for clip in prepared)
+                pending_ocr: List[int] = []
+                try:
+                    for clip in prepared:
+                        if clip.values["content_hash"] in racing:
+                            skipped += 1
+                            continue
+                        item_id = self._insert_prepared_clip(cur, clip)
+                        inserted_ids.append(item_id)
+                        if clip.values["pending_ocr"]:
+                            pending_ocr.append(item_id)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                self._enforce_retention()
+
+            if self.on_ocr_pending:
+                for item_id in pending_ocr:
+                    try:
+                        self.on_ocr_pending(item_id)
+                    except Exception as e:
+                        print(f"[STORAGE OCR] Kuyruk bildirimi hatası: {e}")
+
+        rows = self._load_clip_rows(inserted_ids)
+        if rows:
+            ordered = [rows[item_id] for item_id in inserted_ids if item_id in rows]
+            self._publish_clip_change(
+                ClipChangeKind.INSERTED, tuple(row["id"] for row in ordered), rows=tuple(ordered)
+            )
+        return len(inserted_ids), skipped
+
+    def count_items(self) -> int:
+        cur = self.conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM clip_items")
+        return int(cur.fetchone()[0])
+
+    def iter_export_clips(self, batch_size: int = 64) -> Iterator[dict]:
+        """
+        Tüm kayıtları eskiden yeniye, tam görselle ve çözülmüş olarak ver.
+        Satırlar id imleciyle parti parti okunur; bellekte en fazla bir parti
+        tutulur. Harici kaydedilmiş görseller dosyadan okunur.
+        """
+        after_id = 0
+        cur = self.conn.cursor()
+        while True:
+            cur.execute(
+                "SELECT * FROM clip_items WHERE id > ? ORDER BY id LIMIT ?",
+                (after_id, batch_size),
+            )
+            rows = cur.fetchall()
+            if not rows:
+                return
+            for row in rows:
+                row_dict = self._decrypt_clip_row(dict(row))
+                if row_dict.get("item_type") == int(ClipItemType.IMAGE) and not row_dict.get("image_blob"):
+                    image_path = Path(row_dict.get("text_content") or "")
+                    try:
+                        row_dict["image_blob"] = image_path.read_bytes() if image_path.is_file() else None
+                    except OSError as e:
+                        print(f"[STORAGE] Harici resim okunamadı: {e}")
+                    row_dict["text_content"] = None
+                yield row_dict
+            after_id = rows[-1]["id"]
+
+    @_write_locked
+    def import_table_rows(self, table: str, rows: List[dict]) -> int:
+        """
+        Yedekten gelen not / hatırlatma / snippet / görev / çizim satırlarını
+        tek işlemde ekle (şifreleme açıksa metin alanları şifrelenir).
+        """
+        columns, encrypted = _IMPORT_TABLES[table]
+        values = []
+        for row in rows:
+            values.append([
+                self._encrypt_text_field(row.get(column)) if column in encrypted else row.get(column)
+                for column in columns
+            ])
+        if not values:
+            return 0
+        cur = self.conn.cursor()
+        try:
+            cur.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                values,
+            )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        if table == "reminders":
+            self._notify_reminders_changed()
+        return len(values)
+
+    # ---------- Değişiklik günlüğü (artımlı bulut yedeği) ----------
+
+    def journal_version(self) -> int:
+        """Günlüğe yazılmış son değişikliğin sürümü (hiç değişiklik yoksa 0)."""
+        cur = self.conn.cursor()
+        cur.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_journal'")
+        row = cur.fetchone()
+        return int(row[0]) if row else 0
+
+    def iter_journal_changes(
+        self, since: int, upto: Optional[int] = None, batch_size: int = 200
+    ) -> Iterator[Tuple[int, str, int, Optional[dict]]]:
+        """
+        (since, upto] aralığında değişen varlıkları sürüm sırasıyla ver:
+        (sürüm, tablo, id, satır). Satır veritabanındaki hâliyle döner (şifreli
+        alanlar şifreli kalır); silinmiş varlıkta None'dır. Okuma sırasında
+        yeniden değişen bir varlığın sürümü upto'yu aşar ve sonraki deltaya da
+        girer; satırlar tam hâliyle yazıldığından tekrar uygulamak zararsızdır.
+        """
+        if upto is None:
+            upto = self.journal_version()
+        after = int(since)
+        cur = self.conn.cursor()
+        while True:
+            cur.execute(
+                """
+                SELECT version, entity, entity_id, deleted FROM change_journal
+                WHERE version > ? AND version <= ? ORDER BY version LIMIT ?
+                """,
+                (after, upto, batch_size),
+            )
+            entries = cur.fetchall()
+            if not entries:
+                return
+            live: Dict[str, List[int]] = {}
+            for entry in entries:
+                if not entry["deleted"] and entry["entity"] in _JOURNAL_TABLES:
+                    live.setdefault(entry["entity"], []).append(entry["entity_id"])
+            rows = {}
+            for table, ids in live.items():
+                cur.execute(f"SELECT * FROM {table} WHERE id IN ({', '.join('?' * len(ids))})", ids)
+                for row in cur.fetchall():
+                    rows[(table, row["id"])] = dict(row)
+            for entry in entries:
+                key = (entry["entity"], entry["entity_id"])
+                yield int(entry["version"]), key[0], int(key[1]), rows.get(key)
+            after = entries[-1]["version"]
+
+    @_write_locked
+    def apply_journal_changes(self, changes, batch_size: int = 500) -> int:
+        """
+        (tablo, id, satır) değişikliklerini olduğu gibi uygula; satır None ise
+        varlık silinir. Bulut geri yüklemesinde hazırlanan veritabanı için
+        kullanılır: değişiklik olayı yayınlanmaz, arama indeksleri açılışta
+        tamamlanır. Satırdaki bu şemada olmayan sütunlar atlanır.
+        """
+        columns_by_table: Dict[str, set] = {}
+        applied = 0
+        cur = self.conn.cursor()
+        try:
+            for table, item_id, row in changes:
+                if table not in _JOURNAL_TABLES:
+                    continue
+                # Silme tetikleyicileri arama ve kör indeks satırlarını da temizler
+                cur.execute(f"DELETE FROM {table} WHERE id = ?", (item_id,))
+                if row is not None:
+                    columns = columns_by_table.get(table)
+                    if columns is None:
+                        columns = {info[1] for info in cur.execute(f"PRAGMA table_info({table})").fetchall()}
+                        columns_by_table[table] = columns
+                    names = [name for name in row if name in columns]
+                    cur.execute(
+                        f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                        [row[name] for name in names],
+                    )
+                applied += 1
+                if applied % batch_size == 0:
+                    self.conn.commit()
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return applied
+
+    @_write_locked
+    def prune_journal(self, upto: int) -> int:
+        """Buluttaki tabanın kapsadığı (sürümü upto'ya kadar) günlük kayıtlarını sil."""
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM change_journal WHERE version <= ?", (int(upto),))
+        self.conn.commit()
+        return cur.rowcount
+
+    def portable_meta(self) -> Dict[str, str]:
+        """Yedekle taşınması gereken storage_meta değerleri (KDF tuzu; eşitleme durumu hariç)."""
+        cur = self.conn.cursor()
+        cur.execute("SELECT key, value FROM storage_meta WHERE key NOT LIKE 'sync\\_%' ESCAPE '\\'")
+        return {row["key"]: row["value"] for row in cur.fetchall()}
+
+    @_write_locked
+    def merge_portable_meta(self, values: Dict[str, str]) -> None:
+        """Yedekten gelen storage_meta değerlerini yaz (şifreli satırlar tabandan sonra oluşan tuza bağlı olabilir)."""
+        rows = [(key, value) for key, value in (values or {}).items() if not key.startswith("sync_")]
+        if not rows:
+            return
+        cur = self.conn.cursor()
+        cur.executemany("INSERT OR REPLACE INTO storage_meta (key, value) VALUES (?, ?)", rows)
+        self.conn.commit()
+        with self._key_lock:
+            self._key_cache = {}
+
+    def sync_state(self) -> Dict[str, int]:
+        """Bulut eşitleme durumu (storage_meta'daki sync_* anahtarları)."""
+        cur = self.conn.cursor()
+        cur.execute("SELECT key, value FROM storage_meta WHERE key LIKE 'sync\\_%' ESCAPE '\\'")
+        state = {}
+        for row in cur.fetchall():
+            try:
+                state[row["key"][len("sync_"):]] = int(row["value"])
+            except (TypeError, ValueError):
+                continue
+        return state
+
+    @_write_locked
+    def update_sync_state(self, **values: int) -> None:
+        cur = self.conn.cursor()
+        cur.executemany(
+            "INSERT OR REPLACE INTO storage_meta (key, value) VALUES (?, ?)",
+            [(f"sync_{name}", str(int(value))) for name, value in values.items()],
+        )
+        self.conn.commit()
+
+    @_write_locked
+    def reset_sync_state(self) -> None:
+        """Eşitleme durumunu ve günlüğü sıfırla; sonraki eşitleme yeni bir taban yükler."""
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM storage_meta WHERE key LIKE 'sync\\_%' ESCAPE '\\'")
+        cur.execute("DELETE FROM change_journal")
+        self.conn.commit()
+
+    # ---------- OCR iş kuyruğu ----------
+
+    def pending_ocr_ids(self, limit: int = 1) -> List[int]:
+        """OCR bekleyen görsellerin id'leri (önce hiç başarısız olmayanlar, yeniden eskiye)."""
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT id FROM clip_items WHERE pending_ocr = 1 ORDER BY ocr_attempts ASC, id DESC LIMIT ?",
+            (limit,),
+        )
+        return [row[0] for row in cur.fetchall()]
+
+    @_write_locked
+    def record_ocr_failure(self, item_id: int) -> int:
+        """
+        Geçici OCR hatasını kaydet; kayıt beklemede kalır. Başarısız deneme
+        sayısı döner (kayıt silinmiş ya da artık beklemiyorsa 0).
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            "UPDATE clip_items SET ocr_attempts = ocr_attempts + 1 WHERE id = ? AND pending_ocr = 1",
+            (item_id,),
+        )
+        self.conn.commit()
+        if not cur.rowcount:
+            return 0
+        cur.execute("SELECT ocr_attempts FROM clip_items WHERE id = ?", (item_id,))
+        return int(cur.fetchone()[0])
+
+    @_write_locked
+    def set_ocr_result(self, item_id: int, ocr_text: Optional[str]) -> bool:
+        """
+        OCR metnini yaz, bekleme işaretini kaldır ve arama indeksini güncelle.
+        OCR metni hassas veri politikasına göre engelleniyorsa görsel silinir;
+        bu durumda True döner.
+        """
+        cur = self.conn.cursor()
+        ocr_text = (ocr_text or "").strip() or None
+        ocr_scan = get_sensitive_detector(self.settings).scan(ocr_text) if ocr_text and self.settings else None
+        if ocr_text:
+            _, _, _, _, should_drop = self._protect_clip_item(ClipItemType.IMAGE, None, None, ocr_text, ocr_scan)
+            if should_drop:
+                cur.execute("DELETE FROM clip_items WHERE id = ?", (item_id,))
+                self.conn.commit()
+                if cur.rowcount > 0:
+                    self._publish_clip_change(ClipChangeKind.DELETED, (item_id,))
+                    return True
+                return False
+
+        encrypting = bool(self._get_encryption_password())
+        sensitive = _scan_sensitive(self.settings, ClipItemType.IMAGE, None, None, ocr_text, scan=ocr_scan)
+        cur.execute(
+            """
+            UPDATE clip_items SET ocr_text = ?, pending_ocr = 0,
+                sensitive_categories = ?, sensitive_fingerprint = ?
+            WHERE id = ?
+            """,
+            (
+                self._encrypt_text_field(ocr_text) if encrypting else ocr_text,
+                sensitive["sensitive_categories"],
+                sensitive["sensitive_fingerprint"],
+                item_id,
+            ),
+        )
+        updated = cur.rowcount > 0
+        if updated and ocr_text:
+            search_body = _build_search_body(ClipItemType.IMAGE, None, None, ocr_text)
+            if not encrypting:
+                self._update_search_index(item_id, search_body, commit=False)
+            else:
+                blind_index_key = self._get_blind_index_key()
+                if blind_index_key:
+                    _write_blind_index(self.conn, blind_index_key, item_id, search_body)
+        self.conn.commit()
+        if updated:
+            self._publish_clip_change(
+                ClipChangeKind.UPDATED, (item_id,), {"ocr_text": ocr_text, "pending_ocr": 0, **sensitive}
+            )
+        return False
+
+    @_write_locked
+    def _bump_duplicate_item(self, item_id: int, created_at: str) -> Optional[dict]:
+        """
+        Yeniden kopyalanan kaydı yerinde öne al: created_at, kullanım sayacı ve
+        liste sırası (recency) güncellenir; içerik, arama indeksleri ve id
+        olduğu gibi kalır. Kayıt zaten en yeniyse yalnızca sayaç güncellenir ve
+        None döner. Aksi halde güncel satır döner; UPDATED olayı satırı da
+        taşır, böylece görünümler kartı başa alır.
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._writing() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT recency FROM clip_items WHERE id = ?", (item_id,))
+            current = cur.fetchone()
+            recency = self._next_recency(cur)
+            if current is None or current[0] == recency - 1:
+                self._bump_use_count(item_id, now)
+                return None
+
+            cur.execute(
+                """
+                UPDATE clip_items SET created_at = ?, use_count = COALESCE(use_count, 0) + 1,
+                    last_used_at = ?, recency = ?
+                WHERE id = ?
+                """,
+                (created_at, now, recency, item_id),
+            )
+            conn.commit()
+            row = self._load_clip_rows([item_id]).get(item_id)
+        if row is not None:
+            values = {key: row[key] for key in ("created_at", "use_count", "last_used_at", "recency")}
+            self._publish_clip_change(ClipChangeKind.UPDATED, (item_id,), values, rows=(row,))
+        return row
+
+    # ---------- Saklama (max_items, boyut kotası, otomatik silme) ----------
 
-        # Eğer image_path varsa text_content alanına kaydedelim
-        if image_path:
-            text = image_path
+    def clip_stats(self) -> Dict[str, int]:
+        """Tetikleyicilerle güncel tutulan kayıt sayısı ve içerik boyutu (bayt)."""
+        cur = self.conn.cursor()
+        cur.execute("SELECT item_count, unfavorited_count, payload_bytes FROM clip_stats WHERE id = 1")
+        row = cur.fetchone()
+        if row is None:
+            return {"item_count": 0, "unfavorited_count": 0, "payload_bytes": 0}
+        return {key: int(row[key]) for key in row.keys()}
 
+    @_write_locked
+    def rebuild_clip_stats(self) -> Dict[str, int]:
+        """Özeti tablodan baştan hesapla (göç ve olası sapmalar için)."""
         cur = self.conn.cursor()
         cur.execute(
+            f"""
+            INSERT OR REPLACE INTO clip_stats (id, item_count, unfavorited_count, payload_bytes)
+            SELECT 1, COUNT(*), COALESCE(SUM(COALESCE(favorite, 0) = 0), 0),
+                   COALESCE(SUM({_payload_size_sql("clip_items")}), 0)
+            FROM clip_items
             """
-            INSERT INTO clip_items (
-                created_at, item_type, text_content, image_blob, html_content, ocr_text,
-                source_app, is_sensitive
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                created_at,
-                int(item_type),
-                text,
-                image_bytes,
-                html,
-                ocr_text,
-                source_app,
-                1 if is_sensitive else 0,
-            ),
         )
         self.conn.commit()
-        inserted_id = cur.lastrowid
-        
-        # Maksimum öğe sayısı kontrolü
-        self._enforce_max_items()
-        
-        return self.get_item(inserted_id)
-    
-    def _enforce_max_items(self):
-        """Maksimum öğe sayısını aşan eski öğeleri sil (favoriler hariç)"""
+        return self.clip_stats()
+
+    def _retention_excess(self) -> Tuple[int, int]:
+        """(silinmesi gereken kayıt sayısı, boşaltılması gereken bayt); sınır aşılmadıysa 0."""
+        stats = self.clip_stats()
+        max_items = int(self.settings.get("max_items", 1000) or 0)
+        quota = int(self.settings.get("max_history_mb", 0) or 0) * 1024 * 1024
+        excess_items = 0
+        if max_items > 0 and stats["unfavorited_count"] > max_items:
+            excess_items = stats["unfavorited_count"] - max_items + min(_RETENTION_BATCH, max_items // 50)
+        excess_bytes = 0
+        if quota > 0 and stats["payload_bytes"] > quota:
+            excess_bytes = stats["payload_bytes"] - quota + min(_RETENTION_BYTE_SLACK, quota // 50)
+        return excess_items, excess_bytes
+
+    def _retention_candidates(self, items: int, size: int, limit: int) -> List[int]:
+        """En eski (recency) silinebilir kayıtlar: en az items kayıt ve toplam size bayt (en fazla limit)."""
+        cur = self.conn.cursor()
+        ids: List[int] = []
+        freed = 0
+        last_recency = 0
+        while len(ids) < limit:
+            cur.execute(
+                f"""
+                SELECT id, recency, {_payload_size_sql("clip_items")} AS size FROM clip_items
+                WHERE pinned = 0 AND favorite = 0 AND recency > ?
+                ORDER BY recency ASC LIMIT ?
+                """,
+                (last_recency, min(limit - len(ids), 200)),
+            )
+            rows = cur.fetchall()
+            if not rows:
+                break
+            for row in rows:
+                if len(ids) >= items and freed >= size:
+                    return ids
+                ids.append(row["id"])
+                freed += int(row["size"] or 0)
+            last_recency = rows[-1]["recency"]
+        return ids
+
+    @_write_locked
+    def _enforce_retention(self) -> int:
+        """
+        max_items ya da max_history_mb sınırını aşan en eski kayıtları sil
+        (favoriler ve sabitlenenler hariç); silinen sayı döner. Sayım COUNT(*)
+        yerine clip_stats'tan okunur ve sınır aşılınca bir miktar fazlası
+        silinir: sonraki eklemeler pay dolana kadar hiçbir şey silmez.
+        """
         if not self.settings:
-            return
-        
-        max_items = self.settings.get("max_items", 1000)
-        
+            return 0
+        excess_items, excess_bytes = self._retention_excess()
+        if excess_items <= 0 and excess_bytes <= 0:
+            return 0
+        candidates = self._retention_candidates(excess_items, excess_bytes, _RETENTION_DELETE_BATCH)
+        deleted_ids = self._delete_clip_ids(candidates)
+        if deleted_ids:
+            print(f"[STORAGE] Saklama sınırı aşıldı, {len(deleted_ids)} eski öğe silindi")
+        return len(deleted_ids)
+
+    def _expired_clip_ids(self, cutoff: datetime, keep_fav: bool) -> List[int]:
+        """
+        created_at'i cutoff'tan eski kayıtlar. Kesim gününden önceki günler
+        indeksle dizgi karşılaştırmasıyla seçilir; kesim günündeki kayıtlar
+        ("T"li ISO ya da boşluklu biçim) tarih olarak ayrıştırılıp karşılaştırılır.
+        """
+        fav_filter = "favorite = 0 AND " if keep_fav else ""
+        day = cutoff.strftime("%Y-%m-%d")
+        next_day = (cutoff + timedelta(days=1)).strftime("%Y-%m-%d")
         cur = self.conn.cursor()
-        # Favori olmayan öğe sayısını bul
-        cur.execute("SELECT COUNT(*) FROM clip_items WHERE favorite = 0")
-        count = cur.fetchone()[0]
-        
-        if count > max_items:
-            # Silinecek öğe sayısı
-            to_delete = count - max_items
-            # En eski favori olmayan öğeleri sil
-            cur.execute("""
-                DELETE FROM clip_items WHERE id IN (
-                    SELECT id FROM clip_items WHERE favorite = 0 AND COALESCE(pinned, 0) = 0
-                    ORDER BY id ASC LIMIT ?
-                )
-            """, (to_delete,))
-            self.conn.commit()
-            print(f"[STORAGE] Max items aşıldı, {to_delete} eski öğe silindi")
+        cur.execute(f"SELECT id FROM clip_items WHERE {fav_filter}created_at < ?", (day,))
+        ids = [row[0] for row in cur.fetchall()]
+        cur.execute(
+            f"SELECT id, created_at FROM clip_items WHERE {fav_filter}created_at >= ? AND created_at < ?",
+            (day, next_day),
+        )
+        for row in cur.fetchall():
+            created = _parse_created_at(row["created_at"])
+            if created is not None and created < cutoff:
+                ids.append(row["id"])
+        return ids
+
+    def auto_delete_items(self) -> int:
+        """auto_delete_days'ten eski kayıtları sil; silinen sayı döner."""
+        if not self.settings or not self.settings.get("auto_delete_enabled", False):
+            return 0
+        days = int(self.settings.get("auto_delete_days", 7))
+        cutoff = datetime.now() - timedelta(days=days)
+        keep_fav = self.settings.get("auto_delete_keep_fav", True)
+        expired = self._expired_clip_ids(cutoff, keep_fav)
+        deleted = 0
+        for start in range(0, len(expired), _RETENTION_DELETE_BATCH):
+            if self._background_stop.is_set():
+                break
+            deleted += len(self._delete_clip_ids(expired[start:start + _RETENTION_DELETE_BATCH]))
+        if deleted:
+            print(f"[STORAGE] Otomatik silme: {deleted} eski öğe silindi")
+        return deleted
+
+    def _referenced_image_names(self) -> Optional[set]:
+        """Harici görsel kayıtlarının dosya adları; yollar çözülemiyorsa None."""
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT text_content FROM clip_items
+            WHERE item_type = ? AND image_blob IS NULL AND text_content IS NOT NULL
+            """,
+            (int(ClipItemType.IMAGE),),
+        )
+        names = set()
+        for row in cur.fetchall():
+            value = row[0]
+            if is_v2_text_envelope(value) or _looks_like_encrypted_value(value):
+                value = self._decrypt_text_field(value)
+                if value == _DECRYPT_FAILED or is_v2_text_envelope(value) or _looks_like_encrypted_value(value):
+                    return None
+            names.add(value.replace("\\", "/").rsplit("/", 1)[-1].lower())
+        return names
+
+    def _cleanup_orphan_images(self, grace: float = _ORPHAN_IMAGE_GRACE) -> int:
+        """
+        Harici görsel klasöründe hiçbir kaydın göstermediği img_*.png dosyalarını
+        sil. Kayıtlardaki yollardan biri çözülemezse (şifreli ve parola yok)
+        hiçbir dosyaya dokunulmaz; yeni dosyalar grace süresince korunur.
+        """
+        external_path = self.settings.get("external_images_path", "") if self.settings else ""
+        if not external_path:
+            return 0
+        folder = Path(external_path)
+        if not folder.is_dir():
+            return 0
+        referenced = self._referenced_image_names()
+        if referenced is None:
+            print("[STORAGE] Harici görsel yolları çözülemedi, temizlik atlandı")
+            return 0
+        cutoff = time.time() - grace
+        removed = 0
+        for path in folder.glob("img_*.png"):
+            if path.name.lower() in referenced:
+                continue
+            try:
+                if path.stat().st_mtime > cutoff:
+                    continue
+                path.unlink()
+                removed += 1
+            except OSError as e:
+                print(f"[STORAGE] Harici görsel silinemedi: {path} ({e})")
+        if removed:
+            print(f"[STORAGE] {removed} sahipsiz harici görsel silindi")
+        return removed
+
+    def apply_retention(self) -> Dict[str, int]:
+        """
+        Tam saklama geçişi: otomatik silme, max_items / boyut kotası (sınırın
+        altına inilene kadar parti parti) ve sahipsiz harici görsellerin
+        temizliği. Her aşamada silinen sayı döner.
+        """
+        expired = self.auto_delete_items()
+        trimmed = 0
+        while not self._background_stop.is_set():
+            count = self._enforce_retention()
+            if not count:
+                break
+            trimmed += count
+        orphans = 0 if self._background_stop.is_set() else self._cleanup_orphan_images()
+        return {"expired": expired, "trimmed": trimmed, "orphans": orphans}
+
+    def start_retention(self) -> bool:
+        """apply_retention'ı arka planda çalıştır (açılışta ve ayarlar değişince)."""
+        if self._retention_thread and self._retention_thread.is_alive():
+            return False
+        self._retention_thread = threading.Thread(
+            target=self._run_retention,
+            name="TaxClipRetention",
+            daemon=True,
+        )
+        self._retention_thread.start()
+        return True
+
+    def _run_retention(self) -> None:
+        try:
+            self.apply_retention()
+        except Exception as e:
+            print(f"[STORAGE] Saklama geçişi hatası: {e}")
+        finally:
+            if threading.get_ident() != self._owner_thread:
+                self.close_thread_connection()
 
-    def get_last_item(self):
+    def get_last_item(self, include_image: bool = True):
+        """Son öğe; include_image=False ise tam görsel (blob / harici dosya) yüklenmez."""
         cur = self.conn.cursor()
-        cur.execute("SELECT * FROM clip_items ORDER BY id DESC LIMIT 1")
+        columns = "*" if include_image else self._clip_list_columns
+        cur.execute(f"SELECT {columns} FROM clip_items ORDER BY recency DESC LIMIT 1")
         row = cur.fetchone()
         if not row:
             return None
 
         row_dict = dict(row)
+        if not include_image:
+            row_dict["image_blob"] = None
+            return self._decrypt_clip_row(row_dict)
 
         # Harici resim yükleme
         if row_dict.get("item_type") == int(ClipItemType.IMAGE):
@@ -631,61 +3168,137 @@ class Storage:
 
         return self._decrypt_clip_row(row_dict)
 
-    def list_items(self, limit: int = 200, favorites_only: bool = False, offset: int = 0) -> List[dict]:
+    def list_items(
+        self,
+        limit: int = 200,
+        favorites_only: bool = False,
+        offset: int = 0,
+        item_types: Optional[List[ClipItemType]] = None,
+        after: Optional[tuple] = None,
+    ) -> List[dict]:
+        """
+        Öğeleri liste sırasıyla (sabitlenen, favori, en yeni) döndür.
+        - item_types: yalnızca bu tipler (SQL tarafında filtrelenir)
+        - after: önceki sayfanın son satırı için clip_page_cursor() değeri;
+          verilirse keyset sayfalama yapılır ve offset yok sayılır
+        Satırlar tam görseli içermez (image_blob None, thumb_blob dolu);
+        tam veri için get_item kullanılır.
+        """
+        if after is not None or not offset:
+            item_ids = self._page_item_ids(limit, favorites_only, item_types, after)
+        else:
+            item_ids = self._offset_item_ids(limit, offset, favorites_only, item_types)
+        rows = self._load_clip_rows(item_ids)
+        return [rows[item_id] for item_id in item_ids if item_id in rows]
+
+    def _offset_item_ids(
+        self,
+        limit: int,
+        offset: int,
+        favorites_only: bool,
+        item_types: Optional[List[ClipItemType]],
+    ) -> List[int]:
+        """Eski offset tabanlı sayfalama (geriye dönük uyumluluk)."""
         cur = self.conn.cursor()
-        order = "ORDER BY pinned DESC, favorite DESC, id DESC"
+        conditions = []
+        params = []
         if favorites_only:
-            cur.execute(
-                f"SELECT * FROM clip_items WHERE favorite = 1 OR pinned = 1 {order} LIMIT ? OFFSET ?",
-                (limit, offset),
-            )
-        else:
-            cur.execute(
-                f"SELECT * FROM clip_items {order} LIMIT ? OFFSET ?",
-                (limit, offset),
-            )
-        rows = cur.fetchall()
+            conditions.append("(favorite = 1 OR pinned = 1)")
+        if item_types:
+            conditions.append(f"item_type IN ({','.join('?' * len(item_types))})")
+            params.extend(int(t) for t in item_types)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        cur.execute(
+            f"SELECT id FROM clip_items {where} {_CLIP_LIST_ORDER} LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        )
+        return [row[0] for row in cur.fetchall()]
 
-        result = []
-        for row in rows:
-            row_dict = dict(row)
-            
-            # Harici resim yükleme
-            if row_dict.get("item_type") == int(ClipItemType.IMAGE):
-                if not row_dict.get("image_blob") and row_dict.get("text_content"):
-                    # text_content alanında dosya yolu var
-                    from pathlib import Path
-                    try:
-                        image_path = Path(row_dict["text_content"])
-                        if image_path.exists():
-                            row_dict["image_blob"] = image_path.read_bytes()
-                            row_dict["text_content"] = None  # Yol görünmesin
-                        else:
-                            print(f"[STORAGE list_items] Resim dosyası bulunamadı: {image_path}")
-                    except Exception as e:
-                        print(f"[STORAGE list_items] Harici resim yükleme hatası: {e}")
-            
-            result.append(self._decrypt_clip_row(row_dict))
+    def _page_item_ids(
+        self,
+        limit: int,
+        favorites_only: bool,
+        item_types: Optional[List[ClipItemType]],
+        after: Optional[tuple],
+    ) -> List[int]:
+        """
+        Sayfadaki id'leri yalnızca indeks üzerinden bul. Her (pinned, favorite)
+        grubu ve tip için eşitlik + recency aralığı sorgusu yapılır; böylece sayfa
+        ne kadar derinde olursa olsun en fazla gösterilecek satırlar okunur.
+        """
+        cur = self.conn.cursor()
+        types = [int(t) for t in item_types] if item_types else [None]
+        ids: List[int] = []
+        for pinned, favorite in _CLIP_PAGE_GROUPS:
+            remaining = limit - len(ids)
+            if remaining <= 0:
+                break
+            if favorites_only and not (pinned or favorite):
+                continue
+            recency_bound = None
+            if after is not None:
+                group = (pinned, favorite)
+                cursor_group = (int(after[0]), int(after[1]))
+                if group > cursor_group:
+                    continue  # imleçten önceki gruplar zaten gösterildi
+                if group == cursor_group:
+                    recency_bound = int(after[2])
 
-        return result
+            group_rows = []
+            for item_type in types:
+                sql = "SELECT recency, id FROM clip_items WHERE pinned = ? AND favorite = ?"
+                params = [pinned, favorite]
+                if item_type is not None:
+                    sql += " AND item_type = ?"
+                    params.append(item_type)
+                if recency_bound is not None:
+                    sql += " AND recency < ?"
+                    params.append(recency_bound)
+                sql += " ORDER BY recency DESC LIMIT ?"
+                params.append(remaining)
+                cur.execute(sql, params)
+                group_rows.extend((row[0], row[1]) for row in cur.fetchall())
+            group_rows.sort(reverse=True)
+            ids.extend(item_id for _, item_id in group_rows[:remaining])
+        return ids
 
     def record_item_use(self, item_id: int) -> None:
         """Kullanım sayacı ve son kullanılma zamanını güncelle."""
+        self._bump_use_count(item_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+    @_write_locked
+    def _bump_use_count(self, item_id: int, now: str) -> None:
         cur = self.conn.cursor()
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         cur.execute(
             "UPDATE clip_items SET use_count = COALESCE(use_count, 0) + 1, last_used_at = ? WHERE id = ?",
             (now, item_id),
         )
         self.conn.commit()
+        if cur.rowcount:
+            cur.execute("SELECT use_count FROM clip_items WHERE id = ?", (item_id,))
+            self._publish_clip_change(
+                ClipChangeKind.UPDATED, (item_id,), {"use_count": cur.fetchone()[0], "last_used_at": now}
+            )
+
+    def _publish_row_update(self, item_id: int, values: dict) -> None:
+        """Liste üyeliğini etkileyen güncelleme: satırın kendisi de olaya eklenir."""
+        if not self._clip_listeners:
+            return
+        row = self._load_clip_rows([item_id]).get(item_id)
+        if row is not None:
+            self._publish_clip_change(ClipChangeKind.UPDATED, (item_id,), values, rows=(row,))
 
+    @_write_locked
     def set_pinned(self, item_id: int, pinned: bool) -> None:
         cur = self.conn.cursor()
         cur.execute("UPDATE clip_items SET pinned = ? WHERE id = ?", (1 if pinned else 0, item_id))
         if pinned:
             cur.execute("UPDATE clip_items SET favorite = 1 WHERE id = ?", (item_id,))
         self.conn.commit()
+        values = {"pinned": 1, "favorite": 1} if pinned else {"pinned": 0}
+        self._publish_row_update(item_id, values)
 
+    @_write_locked
     def update_item_meta(
         self,
         item_id: int,
@@ -710,6 +3323,13 @@ class Storage:
         params.append(item_id)
         cur.execute(f"UPDATE clip_items SET {', '.join(updates)} WHERE id = ?", params)
         self.conn.commit()
+        if cur.rowcount:
+            values = {"custom_title": custom_title, "tags": tags, "collection": collection}
+            self._publish_clip_change(
+                ClipChangeKind.UPDATED,
+                (item_id,),
+                {name: value for name, value in values.items() if value is not None},
+            )
 
     def list_collections(self) -> List[str]:
         cur = self.conn.cursor()
@@ -762,90 +3382,349 @@ class Storage:
         - date_to: "2025-12-31" formatında bitiş tarihi
         - fuzzy_threshold: 0-100 arası benzerlik skoru (60 = %60 benzer)
         - limit: Maksimum sonuç sayısı
+
+        Adaylar FTS indeksinden gelir; puanlama indeksteki normalize metin
+        üzerinden yapılır ve yalnızca ilk `limit` sonuç tam olarak yüklenir.
+        """
+        rows: List[dict] = []
+        for rows, _done in self.iter_search(query, item_types, date_from, date_to, fuzzy_threshold, limit):
+            pass
+        return rows
+
+    def iter_search(
+        self,
+        query: str = "",
+        item_types: Optional[List[ClipItemType]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        fuzzy_threshold: int = 60,
+        limit: int = 100,
+        cancel: Optional[threading.Event] = None,
+        first_batch: int = _SEARCH_FIRST_BATCH,
+    ) -> Iterator[Tuple[List[dict], bool]]:
+        """
+        search_items'ın akışlı hâli: (sıralı sonuçlar, bitti mi) çiftleri verir.
+
+        Her liste o ana kadarki en iyi sonuçların tamamıdır (öncekinin yerine
+        geçer). İndeks adayları puanlanınca ilk `first_batch` sonuç hemen
+        verilir; dizinlenmemiş kayıtlar parça parça taranırken sıralama
+        değiştikçe güncellenir; sonunda ilk `limit` sonuç sayfa sayfa yüklenir.
+        Son çift (done=True) search_items sonucuyla aynıdır.
+
+        Sorgu, yakın zamanda aranan bir sorgunun uzantısıysa ("pass" ->
+        "passw") terimleri içeren adaylar tüm tablo yerine önbellekteki
+        kümeden alınır (bkz. _SearchRefinementCache); sonuç değişmez.
+
+        cancel tetiklenirse aşama / parça aralarında SearchCancelled yükselir.
         """
+        def check_cancelled():
+            if cancel is not None and cancel.is_set():
+                raise SearchCancelled()
+
         cur = self.conn.cursor()
-        
-        # SQL query oluştur
-        sql = "SELECT * FROM clip_items WHERE 1=1"
-        params = []
-        
-        # Tip filtresi
+        first_batch = max(1, min(int(first_batch), int(limit)))
+
+        # Tip / tarih filtresi (clip_items takma adı: c)
+        filter_sql = ""
+        filter_params = []
         if item_types:
             placeholders = ",".join("?" * len(item_types))
-            sql += f" AND item_type IN ({placeholders})"
-            params.extend([int(t) for t in item_types])
-        
-        # Tarih filtresi
+            filter_sql += f" AND c.item_type IN ({placeholders})"
+            filter_params.extend([int(t) for t in item_types])
         if date_from:
-            sql += " AND created_at >= ?"
-            params.append(date_from)
+            filter_sql += " AND c.created_at >= ?"
+            filter_params.append(date_from)
         if date_to:
-            sql += " AND created_at <= ?"
-            params.append(date_to)
-        
-        sql += " ORDER BY id DESC"
-        
-        cur.execute(sql, params)
-        rows = cur.fetchall()
+            filter_sql += " AND c.created_at <= ?"
+            filter_params.append(date_to)
+
         normalized_query = _normalize_search_text(query)
-        
-        result = []
-        for row in rows:
-            row_dict = dict(row)
-            
-            # Harici resim yükleme
-            if row_dict.get("item_type") == int(ClipItemType.IMAGE):
-                if not row_dict.get("image_blob") and row_dict.get("text_content"):
-                    try:
-                        image_path = Path(row_dict["text_content"])
-                        if image_path.exists():
-                            row_dict["image_blob"] = image_path.read_bytes()
-                            row_dict["text_content"] = None
-                    except Exception:
-                        pass
-            
-            row_dict = self._decrypt_clip_row(row_dict)
-            
-            # Query ile fuzzy match kontrolü
-            if normalized_query:
-                text_parts = []
-                if row_dict.get("text_content"):
-                    text_parts.append(_normalize_search_text(row_dict["text_content"]))
-                if row_dict.get("html_content"):
-                    text_parts.append(_strip_html_tags(row_dict["html_content"]))
-                if row_dict.get("ocr_text"):
-                    text_parts.append(_normalize_search_text(row_dict["ocr_text"]))
-                
-                searchable_text = " ".join(part for part in text_parts if part).strip()
+
+        if not normalized_query:
+            # Query boşsa filtreye uyan en yeni kayıtlar
+            cur.execute(
+                f"SELECT c.id FROM clip_items c WHERE 1=1{filter_sql} ORDER BY c.id DESC LIMIT ?",
+                filter_params + [limit],
+            )
+            ids = [row[0] for row in cur.fetchall()]
+            check_cancelled()
+            yield self._ranked_search_rows([(item_id, 100) for item_id in ids], {}), True
+            return
+
+        scores = {}
+        loaded: dict = {}
+        shown: List[int] = []
+        terms = [term for term in normalized_query.split(" ") if term]
+
+        def ranking(count: int) -> List[Tuple[int, int]]:
+            return sorted(scores.items(), key=lambda kv: (kv[1], kv[0]), reverse=True)[:count]
+
+        # Önceki sorgunun aday kümesi: terimlerin hepsini içeren kayıtlar. Kör
+        # indeks adayları erken kesildiğinden o yolda küme tam değildir.
+        blind_index_key = self._get_blind_index_key()
+        cache_scope = (
+            tuple(sorted(int(t) for t in item_types or ())),
+            date_from or "",
+            date_to or "",
+            self._get_encryption_password() or "",
+        )
+        cache_generation = self._search_cache.generation
+        cached = None if blind_index_key else self._search_cache.lookup(cache_scope, normalized_query)
+        containing: set = set()
+        containing_unindexed: set = set()
+        index_floor = None
+
+        unindexed_sql = ""
+        if self._search_index_available:
+            candidates, index_floor = self._search_index_candidates(
+                normalized_query, filter_sql, filter_params, within=cached
+            )
+            for item_id, body in candidates.items():
+                if all(term in body for term in terms):
+                    containing.add(item_id)
+            for item_id, score in _score_search_matches(normalized_query, candidates).items():
+                if score >= fuzzy_threshold:
+                    scores[item_id] = score
+            unindexed_sql = " AND c.id NOT IN (SELECT rowid FROM clip_search)"
+        check_cancelled()
+
+        # İlk eşleşmeler: yalnızca ilk partiyi yükleyip hemen ver
+        last_emit = time.perf_counter()
+        if scores:
+            ranked = ranking(first_batch)
+            shown = [item_id for item_id, _ in ranked]
+            yield self._ranked_search_rows(ranked, loaded), False
+            last_emit = time.perf_counter()
+
+        unindexed_params = []
+        if blind_index_key:
+            scores.update(
+                self._score_blind_index_candidates(
+                    blind_index_key, normalized_query, filter_sql, filter_params, fuzzy_threshold, limit
+                )
+            )
+            unindexed_sql += " AND c.id NOT IN (SELECT item_id FROM clip_blind_index WHERE token = ?)"
+            unindexed_params.append(blind_index_token(blind_index_key, _BLIND_INDEX_MARKER))
+            check_cancelled()
+
+        # Hiçbir indekste olmayan kayıtlar: metin alanlarını parça parça çözüp puanla.
+        # Sorgu terimleri içermeyen kaydı eşleyemiyorsa yalnızca önbellekteki
+        # adaylar çözülür.
+        row_columns = "c.id, c.item_type, c.text_content, c.html_content, c.ocr_text"
+        within = cached.unindexed if cached is not None and not _search_allows_fuzzy(normalized_query) else None
+
+        def unindexed_chunks():
+            if within is None:
+                cur.execute(
+                    f"SELECT {row_columns} FROM clip_items c WHERE 1=1{filter_sql}{unindexed_sql} ORDER BY c.id DESC",
+                    filter_params + unindexed_params,
+                )
+                while True:
+                    chunk = cur.fetchmany(_SEARCH_SCAN_CHUNK)
+                    if not chunk:
+                        return
+                    yield chunk
+            ids = sorted(within, reverse=True)
+            for start in range(0, len(ids), _SEARCH_SCAN_CHUNK):
+                part = ids[start:start + _SEARCH_SCAN_CHUNK]
+                cur.execute(
+                    f"""
+                    SELECT {row_columns} FROM clip_items c
+                    WHERE c.id IN ({','.join('?' * len(part))}){filter_sql} ORDER BY c.id DESC
+                    """,
+                    part + filter_params,
+                )
+                yield cur.fetchall()
+
+        for chunk in unindexed_chunks():
+            bodies = {}
+            for row in chunk:
+                row_dict = self._decrypt_row_fields(dict(row), ("text_content", "html_content", "ocr_text"))
+                searchable_text = _build_search_body(
+                    row_dict["item_type"],
+                    row_dict.get("text_content"),
+                    row_dict.get("html_content"),
+                    row_dict.get("ocr_text"),
+                )
                 if searchable_text:
-                    score = _score_search_match(normalized_query, searchable_text)
-                    if score >= fuzzy_threshold:
-                        row_dict["_search_score"] = score
-                        result.append(row_dict)
-            else:
-                # Query boşsa hepsini ekle
-                row_dict["_search_score"] = 100
+                    if all(term in searchable_text for term in terms):
+                        containing_unindexed.add(row_dict["id"])
+                    bodies[row_dict["id"]] = searchable_text
+            for item_id, score in _score_search_matches(normalized_query, bodies).items():
+                if score >= fuzzy_threshold:
+                    scores[item_id] = score
+            check_cancelled()
+            if time.perf_counter() - last_emit < _SEARCH_BATCH_INTERVAL:
+                continue
+            ranked = ranking(first_batch)
+            if [item_id for item_id, _ in ranked] != shown:
+                shown = [item_id for item_id, _ in ranked]
+                yield self._ranked_search_rows(ranked, loaded), False
+                last_emit = time.perf_counter()
+
+        if not blind_index_key:
+            self._search_cache.store(
+                cache_scope,
+                normalized_query,
+                _SearchCandidates(frozenset(containing), index_floor, frozenset(containing_unindexed)),
+                cache_generation,
+            )
+
+        # Skora göre sırala, yalnızca ilk `limit` kaydı sayfa sayfa tam yükle
+        ranked = ranking(limit)
+        for end in range(first_batch, len(ranked), _SEARCH_SCAN_CHUNK):
+            check_cancelled()
+            if [item_id for item_id, _ in ranked[:end]] != shown:
+                shown = [item_id for item_id, _ in ranked[:end]]
+                yield self._ranked_search_rows(ranked[:end], loaded), False
+        check_cancelled()
+        yield self._ranked_search_rows(ranked, loaded), True
+
+    def _ranked_search_rows(self, ranked: List[Tuple[int, int]], loaded: dict) -> List[dict]:
+        """(id, skor) sırasıyla satırlar; loaded önceki partilerde yüklenenleri tutar."""
+        missing = [item_id for item_id, _ in ranked if item_id not in loaded]
+        loaded.update(self._load_clip_rows(missing))
+        result = []
+        for item_id, score in ranked:
+            row_dict = loaded.get(item_id)
+            if row_dict is not None:
+                row_dict = dict(row_dict)
+                row_dict["_search_score"] = score
                 result.append(row_dict)
-        
-        # Skora göre sırala
-        result.sort(key=lambda x: (x.get("_search_score", 0), x.get("id", 0)), reverse=True)
-        
-        return result[:limit]
+        return result
+
+    def _search_index_candidates(
+        self,
+        normalized_query: str,
+        filter_sql: str,
+        filter_params: list,
+        within: Optional[_SearchCandidates] = None,
+    ) -> Tuple[dict, Optional[int]]:
+        """
+        FTS indeksinden sınırlı sayıda aday (id -> normalize metin) ve, terim
+        içeren adaylar sınıra takıldıysa en küçük id'leri döndür.
+
+        within (önceki sorgunun adayları) verilirse terimleri içeren adaylar
+        tüm indeks yerine bu kümeden seçilir; kümenin alt sınırının altında
+        kalanlar için indekse yine bakılır. Sonuç aynıdır.
+        """
+        cur = self.conn.cursor()
+        terms = [term for term in normalized_query.split(" ") if term]
+        long_terms = [term for term in terms if len(term) >= 3]
+        short_terms = [term for term in terms if len(term) < 3]
+
+        # 1) Tüm terimleri alt dize olarak içeren kayıtlar (tam / önek / içerir eşleşmeleri)
+        candidates = {}
+        where = []
+        params = []
+        if within is not None:
+            floor = within.floor
+            ids = sorted((item_id for item_id in within.indexed if floor is None or item_id >= floor), reverse=True)
+            for start in range(0, len(ids), 500):
+                part = ids[start:start + 500]
+                cur.execute(
+                    f"""
+                    SELECT clip_search.rowid, clip_search.body
+                    FROM clip_search JOIN clip_items c ON c.id = clip_search.rowid
+                    WHERE clip_search.rowid IN ({','.join('?' * len(part))}){filter_sql}
+                    """,
+                    part + filter_params,
+                )
+                for row_id, body in cur.fetchall():
+                    if all(term in body for term in terms):
+                        candidates[row_id] = body
+            if floor is None or len(candidates) >= _SEARCH_CANDIDATE_LIMIT:
+                ranked = sorted(candidates, reverse=True)[:_SEARCH_CANDIDATE_LIMIT]
+                candidates = {row_id: candidates[row_id] for row_id in ranked}
+                where = None
+            else:
+                where.append("clip_search.rowid < ?")
+                params.append(floor)
+        if where is not None:
+            if long_terms:
+                where.append("clip_search MATCH ?")
+                params.append(" AND ".join(_fts_phrase(term) for term in long_terms))
+            for term in short_terms:
+                # trigram 3 karakterden kısa terimleri eşleyemez
+                where.append("instr(clip_search.body, ?) > 0")
+                params.append(term)
+            cur.execute(
+                f"""
+                SELECT clip_search.rowid, clip_search.body
+                FROM clip_search JOIN clip_items c ON c.id = clip_search.rowid
+                WHERE {' AND '.join(where)}{filter_sql}
+                ORDER BY clip_search.rowid DESC LIMIT ?
+                """,
+                params + filter_params + [_SEARCH_CANDIDATE_LIMIT - len(candidates)],
+            )
+            candidates.update((row[0], row[1]) for row in cur.fetchall())
+        floor = min(candidates) if len(candidates) >= _SEARCH_CANDIDATE_LIMIT else None
+        return self._add_fuzzy_search_candidates(candidates, normalized_query, filter_sql, filter_params), floor
+
+    def _add_fuzzy_search_candidates(
+        self, candidates: dict, normalized_query: str, filter_sql: str, filter_params: list
+    ) -> dict:
+        """
+        2) Bulanık eşleşme: terimlerin trigramlarından en az birini paylaşan,
+           FTS sıralamasına göre en iyi adaylar
+        """
+        cur = self.conn.cursor()
+        long_terms = [term for term in normalized_query.split(" ") if len(term) >= 3]
+        if _search_allows_fuzzy(normalized_query):
+            grams = []
+            for term in long_terms:
+                for i in range(len(term) - 2):
+                    gram = term[i:i + 3]
+                    if gram not in grams:
+                        grams.append(gram)
+            if grams:
+                cur.execute(
+                    f"""
+                    SELECT clip_search.rowid, clip_search.body
+                    FROM clip_search JOIN clip_items c ON c.id = clip_search.rowid
+                    WHERE clip_search MATCH ?{filter_sql}
+                    ORDER BY clip_search.rank LIMIT ?
+                    """,
+                    [" OR ".join(_fts_phrase(gram) for gram in grams[:64])]
+                    + filter_params
+                    + [_FUZZY_CANDIDATE_LIMIT],
+                )
+                for row_id, body in cur.fetchall():
+                    candidates.setdefault(row_id, body)
+        return candidates
 
     def delete_item(self, item_id: int):
+        self._delete_clip_ids([item_id])
+
+    @_write_locked
+    def _delete_clip_ids(self, item_ids: List[int]) -> List[int]:
+        """Kayıtları sil ve tek bir DELETED olayı yayınla; silinen id'ler döner."""
         cur = self.conn.cursor()
-        cur.execute("DELETE FROM clip_items WHERE id = ?", (item_id,))
+        deleted = []
+        for start in range(0, len(item_ids), 500):
+            chunk = item_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cur.execute(f"SELECT id FROM clip_items WHERE id IN ({placeholders})", chunk)
+            deleted.extend(row[0] for row in cur.fetchall())
+            cur.execute(f"DELETE FROM clip_items WHERE id IN ({placeholders})", chunk)
         self.conn.commit()
+        if deleted:
+            self._publish_clip_change(ClipChangeKind.DELETED, deleted)
+        return deleted
 
+    @_write_locked
     def clear_all(self):
         cur = self.conn.cursor()
         cur.execute("DELETE FROM clip_items")
         self.conn.commit()
+        self._publish_clip_change(ClipChangeKind.CLEARED)
 
+    @_write_locked
     def set_favorite(self, item_id: int, fav: bool):
         cur = self.conn.cursor()
         cur.execute("UPDATE clip_items SET favorite = ? WHERE id = ?", (1 if fav else 0, item_id))
         self.conn.commit()
+        self._publish_row_update(item_id, {"favorite": 1 if fav else 0})
 
     def toggle_favorite(self, item_id: int) -> bool:
         row = self.get_item(item_id)
@@ -855,11 +3734,9 @@ class Storage:
 
     # ---------- Notes (YENİ) ----------
 
+    @_write_locked
     def add_note(self, content: str, created_at: str):
-        if self.settings and self.settings.get("encrypt_data", False):
-            password = self.settings.get("encryption_key", None)
-            if password and content:
-                content = encrypt_aes256(content, password)
+        content = self._encrypt_text_field(content)
 
         cur = self.conn.cursor()
         cur.execute("INSERT INTO notes (created_at, content) VALUES (?, ?)", (created_at, content))
@@ -871,25 +3748,7 @@ class Storage:
         cur = self.conn.cursor()
         cur.execute("SELECT * FROM notes ORDER BY id DESC LIMIT ? OFFSET ?", (limit, offset))
         rows = cur.fetchall()
-
-        if not self.settings or not self.settings.get("encrypt_data", False):
-            return [dict(row) for row in rows]
-
-        password = self.settings.get("encryption_key", None)
-        if not password:
-            return [dict(row) for row in rows]
-
-        result = []
-        for row in rows:
-            row_dict = dict(row)
-            if row_dict.get("content"):
-                try:
-                    row_dict["content"] = decrypt_aes256(row_dict["content"], password)
-                except Exception:
-                    row_dict["content"] = "[Şifreli veri çözülemedi]"
-            result.append(row_dict)
-
-        return result
+        return [self._decrypt_row_fields(dict(row), ("content",)) for row in rows]
 
     def get_note(self, note_id: int):
         cur = self.conn.cursor()
@@ -898,33 +3757,23 @@ class Storage:
         if not row:
             return None
 
-        row_dict = dict(row)
-
-        if self.settings and self.settings.get("encrypt_data", False):
-            password = self.settings.get("encryption_key", None)
-            if password and row_dict.get("content"):
-                try:
-                    row_dict["content"] = decrypt_aes256(row_dict["content"], password)
-                except Exception:
-                    row_dict["content"] = "[Şifreli veri çözülemedi]"
-
-        return row_dict
+        return self._decrypt_row_fields(dict(row), ("content",))
 
+    @_write_locked
     def update_note(self, note_id: int, content: str):
-        if self.settings and self.settings.get("encrypt_data", False):
-            password = self.settings.get("encryption_key", None)
-            if password and content:
-                content = encrypt_aes256(content, password)
+        content = self._encrypt_text_field(content)
 
         cur = self.conn.cursor()
         cur.execute("UPDATE notes SET content = ? WHERE id = ?", (content, note_id))
         self.conn.commit()
 
+    @_write_locked
     def delete_note(self, note_id: int):
         cur = self.conn.cursor()
         cur.execute("DELETE FROM notes WHERE id = ?", (note_id,))
         self.conn.commit()
 
+    @_write_locked
     def clear_notes(self):
         cur = self.conn.cursor()
         cur.execute("DELETE FROM notes")
@@ -932,19 +3781,22 @@ class Storage:
 
     # ---------- Reminders (YENİ - EKSİK OLAN METODLAR) ----------
 
+    def _notify_reminders_changed(self) -> None:
+        if self.on_reminders_changed:
+            try:
+                self.on_reminders_changed()
+            except Exception as e:
+                print(f"[STORAGE] Hatırlatma bildirimi hatası: {e}")
+
+    @_write_locked
     def add_reminder(self, title: str, description: str, reminder_time: str, repeat_type: str = 'none', created_at: str = None):
         """Yeni hatırlatıcı ekle"""
         if created_at is None:
             created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         # Şifreleme
-        if self.settings and self.settings.get("encrypt_data", False):
-            password = self.settings.get("encryption_key", None)
-            if password:
-                if title:
-                    title = encrypt_aes256(title, password)
-                if description:
-                    description = encrypt_aes256(description, password)
+        title = self._encrypt_text_field(title)
+        description = self._encrypt_text_field(description)
 
         cur = self.conn.cursor()
         cur.execute(
@@ -956,6 +3808,7 @@ class Storage:
         )
         self.conn.commit()
         inserted_id = cur.lastrowid
+        self._notify_reminders_changed()
         return self.get_reminder(inserted_id)
 
     def list_reminders(self, limit: int = 200, offset: int = 0, active_only: bool = False) -> List[dict]:
@@ -974,30 +3827,13 @@ class Storage:
             )
         
         rows = cur.fetchall()
+        return [self._decrypt_row_fields(dict(row), ("title", "description")) for row in rows]
 
-        if not self.settings or not self.settings.get("encrypt_data", False):
-            return [dict(row) for row in rows]
-
-        password = self.settings.get("encryption_key", None)
-        if not password:
-            return [dict(row) for row in rows]
-
-        result = []
-        for row in rows:
-            row_dict = dict(row)
-            if row_dict.get("title"):
-                try:
-                    row_dict["title"] = decrypt_aes256(row_dict["title"], password)
-                except Exception:
-                    row_dict["title"] = "[Şifreli veri çözülemedi]"
-            if row_dict.get("description"):
-                try:
-                    row_dict["description"] = decrypt_aes256(row_dict["description"], password)
-                except Exception:
-                    row_dict["description"] = "[Şifreli veri çözülemedi]"
-            result.append(row_dict)
-
-        return result
+    def list_reminder_schedule(self) -> List[dict]:
+        """Aktif hatırlatmaların zamanlama alanları (başlık/açıklama çözülmez)."""
+        cur = self.conn.cursor()
+        cur.execute("SELECT id, reminder_time, last_triggered FROM reminders WHERE is_active = 1")
+        return [dict(row) for row in cur.fetchall()]
 
     def get_reminder(self, reminder_id: int):
         """Tek bir hatırlatıcıyı getir"""
@@ -1007,24 +3843,9 @@ class Storage:
         if not row:
             return None
 
-        row_dict = dict(row)
-
-        if self.settings and self.settings.get("encrypt_data", False):
-            password = self.settings.get("encryption_key", None)
-            if password:
-                if row_dict.get("title"):
-                    try:
-                        row_dict["title"] = decrypt_aes256(row_dict["title"], password)
-                    except Exception:
-                        row_dict["title"] = "[Şifreli veri çözülemedi]"
-                if row_dict.get("description"):
-                    try:
-                        row_dict["description"] = decrypt_aes256(row_dict["description"], password)
-                    except Exception:
-                        row_dict["description"] = "[Şifreli veri çözülemedi]"
-
-        return row_dict
+        return self._decrypt_row_fields(dict(row), ("title", "description"))
 
+    @_write_locked
     def update_reminder(self, reminder_id: int, title: str = None, description: str = None, 
                        reminder_time: str = None, repeat_type: str = None, is_active: bool = None):
         """Hatırlatıcıyı güncelle"""
@@ -1036,13 +3857,8 @@ class Storage:
             return
         
         # Şifreleme
-        if self.settings and self.settings.get("encrypt_data", False):
-            password = self.settings.get("encryption_key", None)
-            if password:
-                if title:
-                    title = encrypt_aes256(title, password)
-                if description:
-                    description = encrypt_aes256(description, password)
+        title = self._encrypt_text_field(title)
+        description = self._encrypt_text_field(description)
         
         # Güncellenecek alanları belirle
         updates = []
@@ -1069,59 +3885,52 @@ class Storage:
             query = f"UPDATE reminders SET {', '.join(updates)} WHERE id = ?"
             cur.execute(query, params)
             self.conn.commit()
+            self._notify_reminders_changed()
 
+    @_write_locked
     def delete_reminder(self, reminder_id: int):
         """Hatırlatıcıyı sil"""
         cur = self.conn.cursor()
         cur.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
         self.conn.commit()
+        self._notify_reminders_changed()
 
+    @_write_locked
     def clear_reminders(self):
         """Tüm hatırlatıcıları sil"""
         cur = self.conn.cursor()
         cur.execute("DELETE FROM reminders")
         self.conn.commit()
+        self._notify_reminders_changed()
 
+    @_write_locked
     def mark_reminder_triggered(self, reminder_id: int):
         """Hatırlatıcının tetiklendiği zamanı kaydet"""
         now = datetime.now().isoformat()
         cur = self.conn.cursor()
         cur.execute("UPDATE reminders SET last_triggered = ? WHERE id = ?", (now, reminder_id))
         self.conn.commit()
+        self._notify_reminders_changed()
 
-    def auto_delete_items(self):
-        if not self.settings or not self.settings.get("auto_delete_enabled", False):
-            return
-        days = int(self.settings.get("auto_delete_days", 7))
-        cutoff = datetime.now() - timedelta(days=days)
-        keep_fav = self.settings.get("auto_delete_keep_fav", True)
-        cur = self.conn.cursor()
-        if keep_fav:
-            cur.execute("""
-                DELETE FROM clip_items
-                WHERE favorite=0 AND created_at < ?
-            """, (cutoff.strftime("%Y-%m-%d %H:%M:%S"),))
-        else:
-            cur.execute("""
-                DELETE FROM clip_items
-                WHERE created_at < ?
-            """, (cutoff.strftime("%Y-%m-%d %H:%M:%S"),))
-        self.conn.commit()
-
+    @_write_locked
     def set_reminder_active(self, reminder_id: int, is_active: bool):
         """Hatırlatıcının aktiflik durumunu değiştir"""
         cur = self.conn.cursor()
         cur.execute("UPDATE reminders SET is_active = ? WHERE id = ?", (1 if is_active else 0, reminder_id))
         self.conn.commit()
+        self._notify_reminders_changed()
     
+    @_write_locked
     def update_reminder_time(self, reminder_id: int, new_time: str):
         """Hatırlatıcının zamanını güncelle ve last_triggered'ı sıfırla"""
         cur = self.conn.cursor()
         cur.execute("UPDATE reminders SET reminder_time = ?, last_triggered = NULL WHERE id = ?", (new_time, reminder_id))
         self.conn.commit()
+        self._notify_reminders_changed()
     
     # ---------- Snippets (Kod Parçacıkları) ----------
     
+    @_write_locked
     def add_snippet(self, title: str, code: str, language: str, tags: str = "", created_at: str = None) -> int:
         """Yeni snippet ekle"""
         if created_at is None:
@@ -1176,6 +3985,7 @@ class Storage:
             return None
         return self._decrypt_row_fields(dict(row), ("title", "code", "tags"))
     
+    @_write_locked
     def update_snippet(self, snippet_id: int, title: str = None, code: str = None, language: str = None, tags: str = None):
         """Snippet güncelle"""
         cur = self.conn.cursor()
@@ -1201,12 +4011,14 @@ class Storage:
             cur.execute(query, params)
             self.conn.commit()
     
+    @_write_locked
     def delete_snippet(self, snippet_id: int):
         """Snippet sil"""
         cur = self.conn.cursor()
         cur.execute("DELETE FROM snippets WHERE id = ?", (snippet_id,))
         self.conn.commit()
     
+    @_write_locked
     def toggle_snippet_favorite(self, snippet_id: int):
         """Snippet favori durumunu değiştir"""
         cur = self.conn.cursor()
@@ -1238,6 +4050,7 @@ class Storage:
     
     # ==================== MULTI-FILE SNIPPET İŞLEMLERİ ====================
     
+    @_write_locked
     def add_multi_file_snippet(self, title: str, files: List[dict], tags: str = "", created_at: str = None) -> int:
         """Multi-file snippet ekle
         files: [{"filename": "index.html", "content": "...", "language": "html"}, ...]
@@ -1294,6 +4107,7 @@ class Storage:
             for row in rows
         ]
     
+    @_write_locked
     def update_multi_file_snippet(self, snippet_id: int, title: str = None, files: List[dict] = None, tags: str = None):
         """Multi-file snippet güncelle"""
         cur = self.conn.cursor()
@@ -1345,10 +4159,10 @@ class Storage:
         cur = self.conn.cursor()
         
         if completed is None:
-            cur.execute("SELECT * FROM todos ORDER BY completed ASC, order_index ASC, id DESC")
+            cur.execute("SELECT * FROM todos ORDER BY completed ASC, id DESC")
         else:
             cur.execute(
-                "SELECT * FROM todos WHERE completed = ? ORDER BY order_index ASC, id DESC",
+                "SELECT * FROM todos WHERE completed = ? ORDER BY id DESC",
                 (1 if completed else 0,)
             )
         
@@ -1367,6 +4181,7 @@ class Storage:
             return None
         return self._decrypt_row_fields(dict(row), ("content",))
     
+    @_write_locked
     def update_todo(self, todo_id: int, content: str = None, completed: bool = None, order_index: int = None) -> None:
         """Todo güncelle"""
         from datetime import datetime
@@ -1399,12 +4214,14 @@ class Storage:
             cur.execute(sql, params)
             self.conn.commit()
     
+    @_write_locked
     def delete_todo(self, todo_id: int) -> None:
         """Todo sil"""
         cur = self.conn.cursor()
         cur.execute("DELETE FROM todos WHERE id = ?", (todo_id,))
         self.conn.commit()
     
+    @_write_locked
     def clear_completed_todos(self) -> None:
         """Tamamlanan todo'ları sil"""
         cur = self.conn.cursor()
@@ -1413,6 +4230,7 @@ class Storage:
     
     # ==================== ÇİZİM İŞLEMLERİ ====================
     
+    @_write_locked
     def add_drawing(self, image_data: str, title: str = None) -> int:
         """Yeni çizim ekle (image_data base64 string)"""
         from datetime import datetime
@@ -1452,6 +4270,7 @@ class Storage:
             return None
         return self._decrypt_row_fields(dict(row), ("title", "image_data"))
     
+    @_write_locked
     def update_drawing(self, drawing_id: int, image_data: str = None, title: str = None, favorite: bool = None) -> None:
         """Çizim güncelle (image_data base64 string)"""
         cur = self.conn.cursor()
@@ -1477,12 +4296,14 @@ class Storage:
             cur.execute(sql, params)
             self.conn.commit()
     
+    @_write_locked
     def delete_drawing(self, drawing_id: int) -> None:
         """Çizim sil"""
         cur = self.conn.cursor()
         cur.execute("DELETE FROM drawings WHERE id = ?", (drawing_id,))
         self.conn.commit()
     
+    @_write_locked
     def toggle_drawing_favorite(self, drawing_id: int) -> None:
         """Çizim favori durumunu değiştir"""
         cur = self.conn.cursor()
@@ -1520,6 +4341,7 @@ class Storage:
             for row in cur.fetchall()
         ]
     
+    @_write_locked
     def add_todo(self, list_id: int, content: str) -> int:
         """Yeni todo ekle"""
         cur = self.conn.cursor()
@@ -1530,12 +4352,14 @@ class Storage:
         self.conn.commit()
         return cur.lastrowid
     
+    @_write_locked
     def update_todo_status(self, todo_id: int, completed: bool) -> None:
         """Todo durumunu güncelle"""
         cur = self.conn.cursor()
         cur.execute("UPDATE todos SET completed = ? WHERE id = ?", (1 if completed else 0, todo_id))
         self.conn.commit()
     
+    @_write_locked
     def toggle_todo(self, todo_id: int) -> None:
         """Todo durumunu tersine çevir"""
         cur = self.conn.cursor()
@@ -1546,6 +4370,7 @@ class Storage:
             cur.execute("UPDATE todos SET completed = ? WHERE id = ?", (new_status, todo_id))
             self.conn.commit()
     
+    @_write_locked
     def update_todo_content(self, todo_id: int, content: str) -> None:
         """Todo içeriğini güncelle"""
         cur = self.conn.cursor()
@@ -1555,18 +4380,21 @@ class Storage:
         )
         self.conn.commit()
     
+    @_write_locked
     def delete_todo(self, todo_id: int) -> None:
         """Todo sil"""
         cur = self.conn.cursor()
         cur.execute("DELETE FROM todos WHERE id = ?", (todo_id,))
         self.conn.commit()
     
+    @_write_locked
     def update_todo_list_name(self, list_id: int, name: str) -> None:
         """Todo liste adını güncelle"""
         cur = self.conn.cursor()
         cur.execute("UPDATE todo_lists SET name = ? WHERE id = ?", (name, list_id))
         self.conn.commit()
     
+    @_write_locked
     def delete_todo_list(self, list_id: int) -> None:
         """Todo listesi sil (cascade)"""
         cur = self.conn.cursor()
@@ -1585,6 +4413,7 @@ class Storage:
         """, (limit,))
         return [dict(row) for row in cur.fetchall()]
     
+    @_write_locked
     def create_todo_list(self, name: str) -> int:
         """Yeni todo listesi oluştur"""
         cur = self.conn.cursor()
@@ -1594,3 +4423,16 @@ class Storage:
         """, (name,))
         self.conn.commit()
         return cur.lastrowid
+
+
+# (hedef sürüm, göç) — yeni şema değişiklikleri sona eklenir ve SCHEMA_VERSION artırılır
+_MIGRATIONS = (
+    (1, Storage._migrate_v1_baseline),
+    (2, Storage._migrate_v2_search_backfill),
+    (3, Storage._migrate_v3_smart_columns),
+    (4, Storage._migrate_v4_sensitive_columns),
+    (5, Storage._migrate_v5_change_journal),
+    (6, Storage._migrate_v6_retention_stats),
+    (7, Storage._migrate_v7_recency_order),
+    (8, Storage._migrate_v8_ocr_attempts),
+)
@@ -0,0 +1,1045 @@
+"""
+Pano geçmişi listesi (model / görünüm)
+
+Her satır için ayrı bir QWidget ağacı kurmak yerine sekmeler bir
+QListView (IconMode) kullanır: ClipListModel depodan sayfa sayfa okur
+(fetchMore, keyset imleç), ClipCardDelegate kartı doğrudan çizer ve üzerine
+gelinen kartta görünüm başına tek bir araç çubuğu gösterilir. Kart içeriği
+(ClipCard) yalnızca ekranda çizilen satırlar için hesaplanır ve önbelleğe
+alınır; 100 bin kayıtlı bir geçmişte de maliyet görünen kartlarla sınırlıdır.
+"""
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from bisect import bisect_left
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QByteArray,
+    QEvent,
+    QModelIndex,
+    QObject,
+    QPersistentModelIndex,
+    QPoint,
+    QRect,
+    QSize,
+    Qt,
+    QUrl,
+    Signal,
+)
+from PySide6.QtGui import (
+    QColor,
+    QCursor,
+    QDesktopServices,
+    QFont,
+    QFontMetrics,
+    QPainter,
+    QPalette,
+    QPixmap,
+)
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QFrame,
+    QHBoxLayout,
+    QInputDialog,
+    QListView,
+    QMenu,
+    QMessageBox,
+    QStyle,
+    QStyledItemDelegate,
+    QToolButton,
+    QWidget,
+)
+
+from ..i18n import i18n
+from ..sensitive_detector import requires_sensitive_access, stored_categories, verify_totp_for_sensitive
+from ..smart_content import (
+    CLASSIFIER_VERSION,
+    ContentKind,
+    SmartContent,
+    analyze_text,
+    describe_paths,
+    html_to_text,
+)
+from ..storage import ClipChange, ClipChangeKind, ClipItemType, clip_page_cursor
+from ..utils import svg_icon
+
+CARD_W = 260
+CARD_H = 160
+CARD_SPACING = 12
+PAGE_SIZE = 60
+
+# Çözülmüş kart küçük resimleri (öğe id -> QPixmap). Id'ler yeniden
+# kullanılmadığı için silinen öğelerin girdileri sadece eskiyip düşer.
+_THUMB_CACHE_LIMIT = 256
+_thumb_cache: "OrderedDict[int, QPixmap]" = OrderedDict()
+
+# Model başına hesaplanmış kart sayısı (görünen + yakın zamanda görünenler)
+_CARD_CACHE_LIMIT = 512
+
+# Satır anahtarları arasında bırakılan boşluk: araya ekleme yeniden numaralandırma gerektirmez
+_ROW_KEY_GAP = 1 << 20
+# Değişince satırın liste sırasındaki yerini değiştiren sütunlar
+_ORDER_COLUMNS = frozenset({"pinned", "favorite", "recency"})
+
+
+def _list_order_key(row: dict) -> tuple:
+    """Liste sırasında artan anahtar (storage._CLIP_LIST_ORDER'ın tersi)."""
+    return tuple(-value for value in clip_page_cursor(row))
+
+
+_KIND_ICONS = {
+    ContentKind.URL: "🔗",
+    ContentKind.EMAIL: "✉",
+    ContentKind.PHONE: "📞",
+    ContentKind.HEX_COLOR: "🎨",
+    ContentKind.JSON: "{ }",
+    ContentKind.CODE: "</>",
+    ContentKind.MARKDOWN: "MD",
+    ContentKind.FILE_PATH: "📂",
+    ContentKind.LONG_TEXT: "📝",
+    ContentKind.BASE64_IMAGE: "🖼",
+}
+
+
+def clear_thumbnail_cache() -> None:
+    """Veritabanı değiştiğinde (geri yükleme vb.) önbelleği boşalt."""
+    _thumb_cache.clear()
+
+
+def _tr(key: str, fallback: str) -> str:
+    try:
+        v = i18n.t(key)
+    except Exception:
+        v = ""
+    return v if v and v != key else fallback
+
+
+def _shorten(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+class ClipCard:
+    """Bir pano satırının kartta gösterilen içeriği (başlık, önizleme, meta)."""
+
+    def __init__(self, row: dict, settings=None):
+        self.row = row
+        self.row_id = row["id"]
+        self.item_type = ClipItemType(row["item_type"])
+        self.settings = settings
+        self.preview_text: Optional[str] = None
+        self.file_paths: List[str] = []
+        self.smart = None
+        self.hex_color: Optional[str] = None
+        self.title = ""
+        self.preview = ""
+        self.sensitive_probe_text = self._build_sensitive_probe_text()
+        # Kayıtta saklanan kategoriler ayarlarla eşleşiyorsa metin yeniden taranmaz
+        self.requires_sensitive_access = requires_sensitive_access(
+            settings, self.sensitive_probe_text, stored_categories(row, settings)
+        )
+
+        custom_title = self.get("custom_title") or ""
+        if self.requires_sensitive_access:
+            self.title = "🔒 Hassas veri"
+            self.preview = "Görüntülemek için açın"
+        elif self.item_type == ClipItemType.FILE:
+            self._build_file_card(custom_title)
+        elif self.item_type in (ClipItemType.TEXT, ClipItemType.HTML):
+            self._build_text_card(custom_title)
+        elif self.item_type == ClipItemType.IMAGE:
+            self.title = custom_title or "🖼 Görsel"
+            self.preview = _tr("item.unsupported", "(Unsupported)")
+        else:
+            self.title = "?"
+            self.preview = _tr("item.unsupported", "(Unsupported)")
+        self.meta = self._build_meta()
+
+    def get(self, key: str, default=None):
+        return self.row.get(key, default)
+
+    @property
+    def favorite(self) -> bool:
+        return bool(self.get("favorite", False))
+
+    @property
+    def pinned(self) -> bool:
+        return bool(self.get("pinned", False))
+
+    def _build_file_card(self, custom_title: str):
+        raw = self.get("text_content") or ""
+        try:
+            data = json.loads(raw)
+            self.file_paths = list(data.get("paths") or [])
+        except Exception:
+            self.file_paths = [raw] if raw else []
+        count = len(self.file_paths)
+        self.title = custom_title or (f"📎 {count} dosya" if count != 1 else f"📎 {Path(self.file_paths[0]).name}")
+        self.preview_text = "\n".join(self.file_paths)
+        self.preview = describe_paths(self.file_paths)
+
+    def _plain_text(self) -> str:
+        text = self.get("text_content", "") or self.get("plain_text", "") or ""
+        if not text:
+            html = self.get("html_content", "") or ""
+            if html:
+                text = html_to_text(html)
+        return text
+
+    def _stored_smart(self) -> Optional[SmartContent]:
+        # Kayıt anında hesaplanan sınıflandırma; sürümü eskiyse yeniden analiz edilir
+        kind = self.get("smart_kind")
+        if not kind or self.get("smart_version") != CLASSIFIER_VERSION:
+            return None
+        try:
+            kind = ContentKind(kind)
+        except ValueError:
+            return None
+        return SmartContent(kind, self.get("smart_title") or "", self.get("smart_summary") or "", {})
+
+    def _build_text_card(self, custom_title: str):
+        text = self._plain_text()
+        self.preview_text = text
+        self.smart = self._stored_smart() or analyze_text(text)
+        icon = _KIND_ICONS.get(self.smart.kind, "")
+        self.title = f"{icon} {custom_title or self.smart.title}".strip()
+        if self.smart.kind == ContentKind.HEX_COLOR:
+            self.hex_color = self.smart.meta.get("hex") or text.strip() or "#000"
+            self.preview = f"{self.hex_color}\n{self.smart.summary}"
+        else:
+            self.preview = _shorten(self.smart.summary or text, 280)
+
+    def _build_meta(self) -> str:
+        meta_parts = [str(self.get("created_at", ""))]
+        source = self.get("source_app") or ""
+        if source:
+            meta_parts.append(source.replace(".exe", ""))
+        use_count = int(self.get("use_count") or 0)
+        if use_count:
+            meta_parts.append(f"×{use_count}")
+        if self.get("collection"):
+            meta_parts.append(str(self.get("collection")))
+        if self.get("is_sensitive"):
+            meta_parts.append("🔒")
+        return " · ".join(p for p in meta_parts if p)
+
+    def _build_sensitive_probe_text(self) -> str:
+        if self.item_type in (ClipItemType.TEXT, ClipItemType.HTML):
+            return self._plain_text()
+        if self.item_type == ClipItemType.IMAGE:
+            return self.get("ocr_text", "") or ""
+        return ""
+
+    def thumbnail(self) -> Optional[QPixmap]:
+        if self.item_type != ClipItemType.IMAGE or self.requires_sensitive_access:
+            return None
+        cached = _thumb_cache.get(self.row_id)
+        if cached is not None:
+            _thumb_cache.move_to_end(self.row_id)
+            return cached
+        # Liste satırları küçük resim taşır; eski yollar tam görsel de verebilir
+        blob = self.get("thumb_blob") or self.get("image_blob")
+        if not blob:
+            return None
+        pm = QPixmap()
+        if not pm.loadFromData(QByteArray(blob)):
+            return None
+        thumb = pm.scaled(CARD_W - 20, CARD_H - 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        _thumb_cache[self.row_id] = thumb
+        while len(_thumb_cache) > _THUMB_CACHE_LIMIT:
+            _thumb_cache.popitem(last=False)
+        return thumb
+
+    def copy_payload(self):
+        if self.item_type in (ClipItemType.TEXT, ClipItemType.HTML):
+            return self.get("text_content") or (self.get("html_content") or "")
+        if self.item_type == ClipItemType.IMAGE:
+            return self.get("image_blob")  # liste satırında None; pencere depodan yükler
+        if self.item_type == ClipItemType.FILE:
+            return self.get("text_content")
+        return None
+
+
+class ClipChangeRelay(QObject):
+    """
+    Storage değişiklik olaylarını GUI thread'ine taşır. Olaylar yazan
+    thread'de (ör. alım işçisi) yayınlanır; sinyal alıcıya kuyrukla ulaşır.
+    """
+
+    changed = Signal(object)  # ClipChange
+
+    def __init__(self, storage, parent=None):
+        super().__init__(parent)
+        unsubscribe = storage.subscribe_clip_changes(self.changed.emit)
+        self._unsubscribe = unsubscribe
+        self.destroyed.connect(lambda *_: unsubscribe())
+
+    def close(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+
+class ClipListModel(QAbstractListModel):
+    """
+    Bir sekmenin pano satırları; depodan keyset imleciyle sayfa sayfa okunur.
+
+    Satırlar liste sırasıyla artan bir anahtar taşır (başa eklenenler
+    küçülen, sona eklenenler büyüyen anahtar alır). id -> anahtar sözlüğü ve
+    anahtar listesinde ikili arama sayesinde bir değişiklik olayının satırı
+    bulunurken liste taranmaz.
+    """
+
+    CardRole = Qt.UserRole + 1
+    RowIdRole = Qt.UserRole + 2
+
+    def __init__(
+        self,
+        storage,
+        item_types: Optional[Iterable[ClipItemType]] = None,
+        favorites_only: bool = False,
+        settings=None,
+        page_size: int = PAGE_SIZE,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.storage = storage
+        self.item_types = tuple(item_types) if item_types else None
+        self._type_values = {int(t) for t in self.item_types} if self.item_types else None
+        self.favorites_only = favorites_only
+        self.settings = settings
+        self.page_size = page_size
+        self._rows: List[dict] = []
+        self._keys: List[int] = []
+        self._key_of: Dict[int, int] = {}
+        self._front_key = 0
+        self._back_key = 0
+        self._cards: "OrderedDict[int, ClipCard]" = OrderedDict()
+        self._cursor = None
+        self._exhausted = True
+        self._search_active = False
+        self._search_matcher: Optional[Callable[[dict], bool]] = None
+
+    # ---------- Qt model arayüzü ----------
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        if role == self.RowIdRole:
+            return self._rows[index.row()]["id"]
+        if role == self.CardRole:
+            return self.card_at(index.row())
+        if role == Qt.DisplayRole:
+            return self.card_at(index.row()).title
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted and not self._search_active
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if not self.canFetchMore(parent):
+            return
+        try:
+            rows = self.storage.list_items(
+                limit=self.page_size,
+                favorites_only=self.favorites_only,
+                item_types=self.item_types,
+                after=self._cursor,
+            )
+        except Exception as e:
+            print(f"[CLIPLIST] Sayfa yüklenemedi: {e}")
+            rows = []
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        if not rows:
+            return
+        self._cursor = clip_page_cursor(rows[-1])
+        # Olayla başa eklenmiş satırlar sayfada yeniden gelebilir
+        rows = [row for row in rows if row["id"] not in self._key_of]
+        if not rows:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        for row in rows:
+            self._append(dict(row))
+        self.endInsertRows()
+
+    # ---------- Satır dizini ----------
+
+    def _append(self, row: dict) -> None:
+        self._back_key += _ROW_KEY_GAP
+        self._rows.append(row)
+        self._keys.append(self._back_key)
+        self._key_of[row["id"]] = self._back_key
+
+    def _insert_at(self, i: int, row: dict) -> None:
+        """Satırı i. sıraya koy; anahtar komşuların arasından seçilir."""
+        if i >= len(self._rows):
+            self._append(row)
+            return
+        if i == 0:
+            self._front_key -= _ROW_KEY_GAP
+            key = self._front_key
+        else:
+            key = (self._keys[i - 1] + self._keys[i]) // 2
+            if key == self._keys[i - 1]:
+                self._respace_keys()
+                key = (self._keys[i - 1] + self._keys[i]) // 2
+        self._rows.insert(i, row)
+        self._keys.insert(i, key)
+        self._key_of[row["id"]] = key
+
+    def _respace_keys(self) -> None:
+        # Aynı noktaya art arda eklemelerde anahtar aralığı tükenir: yeniden dağıt
+        self._keys = [index * _ROW_KEY_GAP for index in range(len(self._rows))]
+        self._key_of = {row["id"]: key for row, key in zip(self._rows, self._keys)}
+        self._front_key = self._keys[0] if self._keys else 0
+        self._back_key = self._keys[-1] if self._keys else 0
+
+    def _position_of(self, row: dict) -> int:
+        """
+        Satırın liste sırasındaki yeri (_CLIP_LIST_ORDER: sabitlenen, favori,
+        recency). Arama sonuçları sıralamaya göre dizildiğinden orada başa konur.
+        """
+        if self._search_active:
+            return 0
+        return bisect_left(self._rows, _list_order_key(row), key=_list_order_key)
+
+    def _reset_rows(self, rows: List[dict]) -> None:
+        self._rows = []
+        self._keys = []
+        self._key_of = {}
+        self._front_key = self._back_key = 0
+        self._cards.clear()
+        for row in rows:
+            self._append(row)
+
+    # ---------- Satırlar ----------
+
+    @property
+    def search_active(self) -> bool:
+        return self._search_active
+
+    def card_at(self, row: int) -> ClipCard:
+        data = self._rows[row]
+        card = self._cards.get(data["id"])
+        if card is None:
+            card = ClipCard(data, self.settings)
+            self._cards[data["id"]] = card
+            while len(self._cards) > _CARD_CACHE_LIMIT:
+                self._cards.popitem(last=False)
+        else:
+            self._cards.move_to_end(data["id"])
+        return card
+
+    def row_of(self, row_id: int) -> int:
+        key = self._key_of.get(row_id)
+        return -1 if key is None else bisect_left(self._keys, key)
+
+    def row_data(self, row_id: int) -> Optional[dict]:
+        i = self.row_of(row_id)
+        return self._rows[i] if i >= 0 else None
+
+    def row_ids(self) -> List[int]:
+        return [row["id"] for row in self._rows]
+
+    def _passes_filters(self, row) -> bool:
+        if self._type_values and int(row["item_type"]) not in self._type_values:
+            return False
+        if self.favorites_only and not (row.get("favorite") or row.get("pinned")):
+            return False
+        return True
+
+    def accepts(self, row) -> bool:
+        """Satır bu sekmede gösterilir mi (tip / favori filtresi, arama açıksa eşleşme)?"""
+        if not self._passes_filters(row):
+            return False
+        if self._search_active and self._search_matcher and not self._search_matcher(row):
+            return False
+        return True
+
+    def reload(self) -> None:
+        """Listeyi baştan yükle (arama modundan da çıkar)."""
+        self.beginResetModel()
+        self._reset_rows([])
+        self._cursor = None
+        self._exhausted = False
+        self._search_active = False
+        self._search_matcher = None
+        self.endResetModel()
+        self.fetchMore()
+
+    def show_search_results(
+        self, rows: Iterable[dict], matcher: Optional[Callable[[dict], bool]] = None
+    ) -> None:
+        """
+        Arama sonuçlarını (sekme filtresine uyanları) göster; sayfalama durur.
+        matcher verilirse arama sürerken gelen yeni / değişen satırlar onunla süzülür.
+        Akışlı aramada yeni parti gösterilen listenin devamıysa yalnızca yeni
+        satırlar eklenir; kaydırma konumu ve çizilmiş kartlar korunur.
+        """
+        rows = [dict(row) for row in rows if self._passes_filters(row)]
+        current = self.row_ids()
+        if self._search_active and current and [row["id"] for row in rows[:len(current)]] == current:
+            self._search_matcher = matcher
+            extra = rows[len(current):]
+            if extra:
+                start = len(self._rows)
+                self.beginInsertRows(QModelIndex(), start, start + len(extra) - 1)
+                for row in extra:
+                    self._append(row)
+                self.endInsertRows()
+            return
+        self.beginResetModel()
+        self._search_active = True
+        self._reset_rows(rows)
+        self._search_matcher = matcher
+        self.endResetModel()
+
+    def prepend(self, row) -> bool:
+        """Yeni (ya da sekmeye yeni giren) satırı liste sırasındaki yerine ekle."""
+        row = dict(row)
+        if row["id"] in self._key_of or not self.accepts(row):
+            return False
+        i = self._position_of(row)
+        if i >= len(self._rows) and self.canFetchMore():
+            return False  # yüklenmemiş sayfalardan birine ait; sırası gelince okunur
+        self.beginInsertRows(QModelIndex(), i, i)
+        self._insert_at(i, row)
+        self.endInsertRows()
+        return True
+
+    def remove(self, row_id: int) -> bool:
+        i = self.row_of(row_id)
+        if i < 0:
+            return False
+        self.beginRemoveRows(QModelIndex(), i, i)
+        del self._rows[i]
+        del self._keys[i]
+        del self._key_of[row_id]
+        self.endRemoveRows()
+        self._cards.pop(row_id, None)
+        return True
+
+    def update_row(self, row_id: int, **changes) -> bool:
+        i = self.row_of(row_id)
+        if i < 0:
+            return False
+        self._rows[i].update(changes)
+        self._cards.pop(row_id, None)
+        index = self.index(i)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def _reposition(self, row_id: int) -> None:
+        """Sıralama alanları (pinned, favorite, recency) değişen satırı yeni yerine taşı."""
+        i = self.row_of(row_id)
+        if i < 0:
+            return
+        n = len(self._rows)
+        target = i  # satır çıkarıldıktan sonraki listede hedef sıra
+        if self._search_active:
+            target = 0
+        else:
+            key = _list_order_key(self._rows[i])
+            if i > 0 and _list_order_key(self._rows[i - 1]) > key:
+                target = bisect_left(self._rows, key, 0, i, key=_list_order_key)
+            elif i + 1 < n and _list_order_key(self._rows[i + 1]) < key:
+                target = bisect_left(self._rows, key, i + 1, n, key=_list_order_key) - 1
+                if target == n - 1 and self.canFetchMore():
+                    # Yüklenmemiş sayfalardan birine ait; sırası gelince okunur
+                    self.remove(row_id)
+                    return
+        if target == i:
+            return
+        self.beginMoveRows(QModelIndex(), i, i, QModelIndex(), target if target < i else target + 1)
+        row = self._rows.pop(i)
+        del self._keys[i]
+        self._insert_at(target, row)
+        self.endMoveRows()
+
+    def clear(self) -> None:
+        """Tüm geçmiş silindi: depoda okunacak satır da kalmadı."""
+        self.beginResetModel()
+        self._reset_rows([])
+        self._exhausted = True
+        self.endResetModel()
+
+    # ---------- Depo değişiklik olayları ----------
+
+    def apply_change(self, change: ClipChange) -> None:
+        """Storage olayını sorgu yapmadan uygula (satır başına sözlük + ikili arama)."""
+        if change.kind == ClipChangeKind.CLEARED:
+            self.clear()
+        elif change.kind == ClipChangeKind.RELOADED:
+            # Yeni veritabanında aynı id başka kaydı gösterebilir
+            clear_thumbnail_cache()
+            self.reload()
+        elif change.kind == ClipChangeKind.DELETED:
+            for row_id in change.ids:
+                self.remove(row_id)
+        elif change.kind == ClipChangeKind.INSERTED:
+            for row in change.rows:
+                self.prepend(row)
+        elif change.kind == ClipChangeKind.UPDATED:
+            rows = {row["id"]: row for row in change.rows}
+            for row_id in change.ids:
+                self._apply_update(row_id, change.values, rows.get(row_id))
+
+    def _apply_update(self, row_id: int, values: dict, row: Optional[dict]) -> None:
+        current = self.row_data(row_id)
+        if current is None:
+            # Favori / sabitleme ile bu sekmeye yeni giren satır
+            if row is not None:
+                self.prepend(row)
+            return
+        if not self._passes_filters({**current, **values}):
+            self.remove(row_id)
+            return
+        self.update_row(row_id, **values)
+        # Sabitleme, favori ya da yeniden kopyalama (recency) kartın grubunu / sırasını değiştirir
+        if not _ORDER_COLUMNS.isdisjoint(values):
+            self._reposition(row_id)
+
+
+class ClipCardDelegate(QStyledItemDelegate):
+    """Kartı widget oluşturmadan çizer (başlık, önizleme, meta, yıldız)."""
+
+    PADDING = 10
+    STAR_SIZE = 18
+    RADIUS = 12
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._star_on = svg_icon("assets/icons/star_on.svg").pixmap(self.STAR_SIZE, self.STAR_SIZE)
+        self._star_off = svg_icon("assets/icons/star_off.svg").pixmap(self.STAR_SIZE, self.STAR_SIZE)
+        self._fonts_for: Optional[QFont] = None
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(CARD_W, CARD_H)
+
+    def _fonts(self, base: QFont):
+        if self._fonts_for != base:
+            self._fonts_for = QFont(base)
+            self._title_font = QFont(base)
+            self._title_font.setPixelSize(11)
+            self._title_font.setWeight(QFont.DemiBold)
+            self._meta_font = QFont(base)
+            self._meta_font.setPixelSize(10)
+            self._title_height = QFontMetrics(self._title_font).height()
+            self._meta_height = QFontMetrics(self._meta_font).height()
+        return self._title_font, self._meta_font
+
+    def star_rect(self, rect: QRect) -> QRect:
+        return QRect(
+            rect.right() - self.PADDING - self.STAR_SIZE + 1,
+            rect.bottom() - self.PADDING - self.STAR_SIZE + 1,
+            self.STAR_SIZE,
+            self.STAR_SIZE,
+        )
+
+    def paint(self, painter: QPainter, option, index) -> None:
+        card: Optional[ClipCard] = index.data(ClipListModel.CardRole)
+        if card is None:
+            return
+        rect = option.rect
+        title_font, meta_font = self._fonts(option.font)
+        text_color = option.palette.color(QPalette.Text)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing, True)
+
+        if option.state & QStyle.State_MouseOver:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(0, 0, 0, 26))
+            painter.drawRoundedRect(rect, self.RADIUS, self.RADIUS)
+        if option.state & QStyle.State_Selected:
+            pen = painter.pen()
+            pen.setColor(QColor("#3b82f6"))
+            pen.setWidth(2)
+            painter.setPen(pen)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRoundedRect(rect.adjusted(1, 1, -1, -1), self.RADIUS, self.RADIUS)
+
+        content = rect.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+
+        # Başlık
+        painter.setFont(title_font)
+        painter.setPen(text_color)
+        title_rect = QRect(content.left(), content.top(), content.width(), self._title_height)
+        title = QFontMetrics(title_font).elidedText(card.title, Qt.ElideRight, content.width())
+        painter.drawText(title_rect, Qt.AlignLeft | Qt.AlignVCenter, title)
+
+        # Önizleme
+        bottom_h = max(self._meta_height, self.STAR_SIZE)
+        preview_rect = QRect(
+            content.left(),
+            title_rect.bottom() + 5,
+            content.width(),
+            content.bottom() - bottom_h - 4 - title_rect.bottom() - 4,
+        )
+        thumb = card.thumbnail()
+        if thumb is not None:
+            painter.drawPixmap(preview_rect.topLeft(), thumb, thumb.rect().intersected(QRect(QPoint(0, 0), preview_rect.size())))
+        elif card.hex_color:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(card.hex_color))
+            painter.drawRoundedRect(preview_rect, 6, 6)
+            painter.setPen(QColor("#fff"))
+            painter.setFont(option.font)
+            painter.drawText(preview_rect.adjusted(6, 6, -6, -6), Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, card.preview)
+        else:
+            painter.setFont(option.font)
+            painter.setClipRect(preview_rect)
+            painter.drawText(preview_rect, Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, card.preview)
+            painter.setClipping(False)
+
+        # Meta + yıldız
+        star = self.star_rect(rect)
+        painter.setFont(meta_font)
+        painter.setPen(QColor("#888"))
+        meta_rect = QRect(content.left(), star.center().y() - self._meta_height // 2, star.left() - content.left() - 6, self._meta_height)
+        meta = QFontMetrics(meta_font).elidedText(card.meta, Qt.ElideRight, meta_rect.width())
+        painter.drawText(meta_rect, Qt.AlignLeft | Qt.AlignVCenter, meta)
+        painter.drawPixmap(star, self._star_on if card.favorite else self._star_off)
+
+        painter.restore()
+
+
+class ClipListView(QListView):
+    """Kart ızgarası; eski ItemWidget ile aynı sinyalleri yayar."""
+
+    on_copy_requested = Signal(int, int, object)       # (row_id, item_type, payload)
+    on_delete_requested = Signal(int)                  # row_id
+    on_favorite_toggled = Signal(int, bool)            # (row_id, new_state)
+    on_pin_toggled = Signal(int, bool)
+    on_save_snippet = Signal(int)
+    on_meta_changed = Signal(int)
+
+    TOOLBAR_H = 32
+
+    def __init__(self, model: ClipListModel, parent=None, settings=None):
+        super().__init__(parent)
+        self.settings = settings
+        self.setModel(model)
+        self._delegate = ClipCardDelegate(self)
+        self.setItemDelegate(self._delegate)
+
+        self.setViewMode(QListView.IconMode)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setGridSize(QSize(CARD_W + CARD_SPACING, CARD_H + CARD_SPACING))
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(24)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover, True)
+        self.setDragEnabled(False)
+
+        # Tüm kartlar için tek araç çubuğu; üzerine gelinen kartın üstüne taşınır
+        self._hover_index = QPersistentModelIndex()
+        self.toolbar = QWidget(self.viewport())
+        self.toolbar.setObjectName("HoverToolbar")
+        self.toolbar.setAttribute(Qt.WA_StyledBackground, True)
+        self.toolbar.setStyleSheet("background-color: rgba(0,0,0,0.22); border-top-left-radius: 12px; border-top-right-radius: 12px;")
+        toolbar_layout = QHBoxLayout(self.toolbar)
+        toolbar_layout.setContentsMargins(6, 4, 6, 4)
+        toolbar_layout.setSpacing(6)
+        for icon, key, fallback, slot in (
+            ("copy", "item.tooltip.copy", "Copy to clipboard", self._copy),
+            ("expand", "item.tooltip.expand", "Expand", self._expand),
+            ("delete", "item.tooltip.delete", "Delete", self._delete),
+            ("share", "item.tooltip.share", "Paylaş", self._share),
+        ):
+            btn = QToolButton(self.toolbar)
+            btn.setIcon(svg_icon(f"assets/icons/{icon}.svg"))
+            btn.setToolTip(_tr(key, fallback))
+            btn.setAutoRaise(True)
+            btn.clicked.connect(lambda _checked=False, fn=slot: self._run_on_hovered(fn))
+            toolbar_layout.addWidget(btn)
+        toolbar_layout.addStretch(1)
+        self.toolbar.hide()
+
+        model.modelReset.connect(self._clear_hover)
+        model.rowsRemoved.connect(lambda *_: self._update_hover())
+        model.rowsInserted.connect(lambda *_: self._update_hover())
+
+    # ---------- Yardımcılar ----------
+
+    def clip_model(self) -> ClipListModel:
+        return self.model()
+
+    def card(self, index: QModelIndex) -> Optional[ClipCard]:
+        return index.data(ClipListModel.CardRole) if index.isValid() else None
+
+    def _storage(self):
+        return getattr(self.window(), "storage", None) or getattr(self.clip_model(), "storage", None)
+
+    def _run_on_hovered(self, fn):
+        card = self.card(QModelIndex(self._hover_index))
+        if card is not None:
+            fn(card)
+
+    # ---------- Üzerine gelme / araç çubuğu ----------
+
+    def _clear_hover(self):
+        self._hover_index = QPersistentModelIndex()
+        self.toolbar.hide()
+
+    def _set_hover(self, index: QModelIndex):
+        if not index.isValid():
+            self._clear_hover()
+            return
+        self._hover_index = QPersistentModelIndex(index)
+        rect = self.visualRect(index)
+        self.toolbar.setGeometry(rect.left(), rect.top(), rect.width(), self.TOOLBAR_H)
+        self.toolbar.show()
+        self.toolbar.raise_()
+
+    def _update_hover(self):
+        pos = self.viewport().mapFromGlobal(QCursor.pos())
+        if self.viewport().rect().contains(pos) and self.isVisible():
+            self._set_hover(self.indexAt(pos))
+        else:
+            self._clear_hover()
+
+    def mouseMoveEvent(self, event):
+        index = self.indexAt(event.position().toPoint())
+        if QPersistentModelIndex(index) != self._hover_index:
+            self._set_hover(index)
+        super().mouseMoveEvent(event)
+
+    def scrollContentsBy(self, dx: int, dy: int):
+        super().scrollContentsBy(dx, dy)
+        self._update_hover()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._clear_hover()
+
+    def viewportEvent(self, event):
+        if event.type() == QEvent.Leave and not self.toolbar.underMouse():
+            self._clear_hover()
+        return super().viewportEvent(event)
+
+    # ---------- Fare ----------
+
+    def mousePressEvent(self, event):
+        index = self.indexAt(event.position().toPoint())
+        card = self.card(index)
+        if card is None:
+            return super().mousePressEvent(event)
+        self.setCurrentIndex(index)
+        if event.button() == Qt.LeftButton:
+            if self._delegate.star_rect(self.visualRect(index)).contains(event.position().toPoint()):
+                self.on_favorite_toggled.emit(card.row_id, not card.favorite)
+            else:
+                self._copy(card)
+        elif event.button() == Qt.RightButton:
+            self._show_context_menu(card, event.globalPosition().toPoint())
+        event.accept()
+
+    def contextMenuEvent(self, event):
+        card = self.card(self.indexAt(event.pos()))
+        if card is not None and event.reason() != event.Reason.Mouse:
+            self._show_context_menu(card, event.globalPos())
+
+    # ---------- Klavye seçimi (pencere kısayolları) ----------
+
+    def move_selection(self, delta: int) -> None:
+        count = self.model().rowCount()
+        if not count:
+            return
+        current = self.currentIndex().row() if self.currentIndex().isValid() else -1
+        row = max(0, min(count - 1, current + delta))
+        self.select_row(row)
+
+    def select_row(self, row: int) -> None:
+        index = self.model().index(row, 0)
+        if index.isValid():
+            self.setCurrentIndex(index)
+            self.scrollTo(index)
+
+    def selected_card(self) -> Optional[ClipCard]:
+        index = self.currentIndex()
+        if not index.isValid():
+            index = self.model().index(0, 0)
+        return self.card(index)
+
+    # ---------- Kart eylemleri ----------
+
+    def copy_card(self, card: ClipCard) -> None:
+        self._copy(card)
+
+    def delete_card(self, card: ClipCard) -> None:
+        self._delete(card)
+
+    def _ensure_sensitive_access(self, card: ClipCard) -> bool:
+        if not card.requires_sensitive_access or verify_totp_for_sensitive(self.settings, self):
+            return True
+        QMessageBox.warning(
+            self,
+            "Erişim Engellendi",
+            "Bu içerik hassas veri içeriyor. Görüntülemek veya kopyalamak için doğrulama gerekli."
+        )
+        return False
+
+    def _full_row(self, card: ClipCard):
+        """Kopyalama / önizleme için tam satır (görsel kartlarında tam görsel depodan yüklenir)."""
+        if card.item_type != ClipItemType.IMAGE or card.get("image_blob") is not None:
+            return card.row
+        storage = self._storage()
+        if storage is not None:
+            try:
+                full = storage.get_item(card.row_id)
+                if full:
+                    return full
+            except Exception as e:
+                print(f"[ITEM] Tam görsel yüklenemedi: {e}")
+        return card.row
+
+    def _copy(self, card: ClipCard):
+        if card.requires_sensitive_access and not self._ensure_sensitive_access(card):
+            return
+        self.on_copy_requested.emit(card.row_id, int(card.item_type), card.copy_payload())
+
+    def _delete(self, card: ClipCard):
+        self.on_delete_requested.emit(card.row_id)
+
+    def _exec_preview(self, card: ClipCard) -> None:
+        """Önizleme dialogu; kayıt bu sırada silinirse (ör. OCR politikası) dialog kapanır."""
+        from .item_preview_dialog import ItemPreviewDialog
+        dlg = ItemPreviewDialog(self._full_row(card), self, settings=self.settings)
+        events = ClipChangeRelay(self.clip_model().storage, dlg)
+
+        def _on_change(change):
+            if change.kind in (ClipChangeKind.CLEARED, ClipChangeKind.RELOADED) or (
+                change.kind == ClipChangeKind.DELETED and card.row_id in change.ids
+            ):
+                dlg.reject()
+
+        events.changed.connect(_on_change)
+        try:
+            dlg.exec()
+        finally:
+            events.close()
+
+    def _expand(self, card: ClipCard):
+        self._exec_preview(card)
+
+    def _share(self, card: ClipCard):
+        if card.requires_sensitive_access and not self._ensure_sensitive_access(card):
+            return
+        self._exec_preview(card)
+        # Paylaşım dialog içinden yapılabilir; yoksa kopyala
+        content = card.get("text_content") or card.get("html_content") or ""
+        if content:
+            QApplication.clipboard().setText(str(content))
+
+    def _show_context_menu(self, card: ClipCard, global_pos):
+        menu = QMenu(self)
+        menu.addAction("Kopyala", lambda: self._copy(card))
+        menu.addAction("Genişlet", lambda: self._expand(card))
+        menu.addSeparator()
+
+        pinned = card.pinned
+        menu.addAction("Sabitlemeyi kaldır" if pinned else "Sabitle", lambda: self.on_pin_toggled.emit(card.row_id, not pinned))
+        menu.addAction("Favori değiştir", lambda: self.on_favorite_toggled.emit(card.row_id, not card.favorite))
+
+        if card.item_type in (ClipItemType.TEXT, ClipItemType.HTML):
+            menu.addAction("Snippet olarak kaydet", lambda: self.on_save_snippet.emit(card.row_id))
+
+        menu.addAction("İsim ver…", lambda: self._rename(card))
+        menu.addAction("Koleksiyona ekle…", lambda: self._set_collection(card))
+        menu.addAction("Etiket ekle…", lambda: self._set_tags(card))
+        menu.addSeparator()
+
+        # Akıllı eylemler (meta verisi yalnızca menü açılınca hesaplanır)
+        smart = card.smart
+        if smart and not smart.meta and smart.kind not in (ContentKind.PLAIN, ContentKind.LONG_TEXT):
+            smart = analyze_text(card.preview_text or "")
+        if card.item_type == ClipItemType.FILE and card.file_paths:
+            menu.addAction("Dosyayı aç", lambda: self._open_file(card))
+            menu.addAction("Klasörde göster", lambda: self._reveal_path(card.file_paths[0]))
+            menu.addAction("Yolu kopyala", lambda: QApplication.clipboard().setText("\n".join(card.file_paths)))
+        elif smart:
+            if smart.kind == ContentKind.URL:
+                menu.addAction("Tarayıcıda aç", lambda: QDesktopServices.openUrl(QUrl(smart.meta["url"])))
+            elif smart.kind == ContentKind.EMAIL:
+                menu.addAction("E-posta gönder", lambda: QDesktopServices.openUrl(QUrl(f"mailto:{smart.meta['email']}")))
+            elif smart.kind == ContentKind.JSON:
+                menu.addAction("Biçimlendirilmiş kopyala", lambda: QApplication.clipboard().setText(smart.meta.get("pretty", "")))
+                menu.addAction("Küçültülmüş kopyala", lambda: QApplication.clipboard().setText(smart.meta.get("compact", "")))
+            elif smart.kind == ContentKind.HEX_COLOR:
+                menu.addAction("RGB kopyala", lambda: QApplication.clipboard().setText(smart.summary))
+            elif smart.kind == ContentKind.FILE_PATH:
+                menu.addAction("Konumu aç", lambda: self._reveal_path(smart.meta.get("path", "")))
+            elif smart.kind == ContentKind.MARKDOWN:
+                menu.addAction("Düz metin kopyala", lambda: QApplication.clipboard().setText(card.preview_text or ""))
+
+        menu.addSeparator()
+        menu.addAction("Sil", lambda: self._delete(card))
+        menu.exec(global_pos)
+
+    def _update_meta(self, card: ClipCard, **fields):
+        storage = self._storage()
+        if storage:
+            storage.update_item_meta(card.row_id, **fields)
+            self.on_meta_changed.emit(card.row_id)
+
+    def _rename(self, card: ClipCard):
+        current = card.get("custom_title") or ""
+        name, ok = QInputDialog.getText(self, "İsim ver", "Kart adı:", text=current)
+        if ok:
+            self._update_meta(card, custom_title=name.strip())
+
+    def _set_collection(self, card: ClipCard):
+        presets = ["Kodlar", "Adresler", "Cevaplar", "Komutlar", ""]
+        name, ok = QInputDialog.getItem(self, "Koleksiyon", "Koleksiyon seç/yaz:", presets, 0, True)
+        if ok:
+            self._update_meta(card, collection=name.strip())
+
+    def _set_tags(self, card: ClipCard):
+        current = card.get("tags") or ""
+        tags, ok = QInputDialog.getText(self, "Etiketler", "Virgülle ayırın:", text=current)
+        if ok:
+            self._update_meta(card, tags=tags.strip())
+
+    def _open_file(self, card: ClipCard):
+        if not card.file_paths:
+            return
+        path = card.file_paths[0]
+        if not Path(path).exists():
+            QMessageBox.warning(self, "Dosya", "Dosya artık mevcut değil.")
+            return
+        QDesktopServices.openUrl(QUrl.fromLocalFile(path))
+
+    def _reveal_path(self, path: str):
+        p = Path(path)
+        if not p.exists():
+            QMessageBox.warning(self, "Dosya", "Dosya artık mevcut değil.")
+            return
+        if sys.platform == "win32":
+            subprocess.Popen(["explorer", "/select,", str(p)], shell=False)
+        else:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(str(p.parent if p.is_file() else p)))
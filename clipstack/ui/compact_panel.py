@@ -12,8 +12,12 @@ from PySide6.QtWidgets import (
     QPushButton, QAbstractItemView,
 )
 
-from ..storage import ClipItemType, Storage
+from ..storage import ClipChangeKind, ClipItemType, Storage
 from ..utils import copy_to_clipboard_safely
+from .clip_list_view import ClipChangeRelay
+
+# Panelde gösterilen son öğe sayısı
+ITEM_LIMIT = 10
 
 
 class CompactPanel(QWidget):
@@ -52,6 +56,11 @@ class CompactPanel(QWidget):
         hint.setWordWrap(True)
         lay.addWidget(hint)
 
+        # Silmelerle liste kısalırsa eksik satırlar panel bir sonraki açılışta okunur
+        self._stale = False
+        self._events = ClipChangeRelay(storage, self)
+        self._events.changed.connect(self._on_clip_change)
+
         QShortcut(QKeySequence("Escape"), self, activated=self.hide)
         QShortcut(QKeySequence("Return"), self, activated=self._copy_current)
         QShortcut(QKeySequence("Ctrl+Return"), self, activated=self._paste_current)
@@ -62,15 +71,52 @@ class CompactPanel(QWidget):
 
     def reload(self):
         self.list.clear()
-        items = self.storage.list_items(limit=10)
+        self._stale = False
+        items = self.storage.list_items(limit=ITEM_LIMIT)
         for row in items:
-            label = self._label_for(row)
-            item = QListWidgetItem(label)
-            item.setData(Qt.UserRole, row)
-            self.list.addItem(item)
+            self.list.addItem(self._make_item(row))
         if self.list.count():
             self.list.setCurrentRow(0)
 
+    def _make_item(self, row: dict) -> QListWidgetItem:
+        item = QListWidgetItem(self._label_for(row))
+        item.setData(Qt.UserRole, row)
+        return item
+
+    def _row_index(self, item_id: int) -> int:
+        for i in range(self.list.count()):
+            if int(self.list.item(i).data(Qt.UserRole)["id"]) == item_id:
+                return i
+        return -1
+
+    def _on_clip_change(self, change):
+        """Storage olayını en fazla ITEM_LIMIT satırlık listeye sorgusuz uygula."""
+        if change.kind == ClipChangeKind.CLEARED:
+            self.list.clear()
+        elif change.kind == ClipChangeKind.RELOADED:
+            self.reload()
+        elif change.kind == ClipChangeKind.DELETED:
+            for item_id in change.ids:
+                i = self._row_index(item_id)
+                if i >= 0:
+                    self.list.takeItem(i)
+                    self._stale = True
+        elif change.kind == ClipChangeKind.INSERTED:
+            for row in change.rows:
+                self.list.insertItem(0, self._make_item(dict(row)))
+            while self.list.count() > ITEM_LIMIT:
+                self.list.takeItem(self.list.count() - 1)
+            if self.list.currentRow() < 0 and self.list.count():
+                self.list.setCurrentRow(0)
+        elif change.kind == ClipChangeKind.UPDATED:
+            for item_id in change.ids:
+                i = self._row_index(item_id)
+                if i >= 0:
+                    item = self.list.item(i)
+                    row = {**item.data(Qt.UserRole), **change.values}
+                    item.setData(Qt.UserRole, row)
+                    item.setText(self._label_for(row))
+
     def _label_for(self, row: dict) -> str:
         t = ClipItemType(row.get("item_type", 1))
         title = row.get("custom_title") or ""
@@ -113,7 +159,9 @@ class CompactPanel(QWidget):
     def _copy_row(self, row: dict):
         kind = ClipItemType(row.get("item_type", 1))
         if kind == ClipItemType.IMAGE:
-            payload = row.get("image_blob")
+            # Liste satırında tam görsel yok; kopyalama anında yükle
+            full = self.storage.get_item(int(row["id"]))
+            payload = full.get("image_blob") if full else None
         elif kind == ClipItemType.HTML:
             payload = row.get("html_content")
         else:
@@ -132,12 +180,12 @@ class CompactPanel(QWidget):
             row = self._current_row()
             if row:
                 self.storage.delete_item(int(row["id"]))
-                self.reload()
             return
         super().keyPressEvent(event)
 
     def showEvent(self, event):
-        self.reload()
+        if self._stale or not self.list.count():
+            self.reload()
         self.activateWindow()
         self.list.setFocus()
         super().showEvent(event)
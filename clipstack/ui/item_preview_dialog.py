@@ -10,7 +10,7 @@ from PySide6.QtWidgets import (
 )
 import requests
 
-from ..sensitive_detector import ensure_sensitive_access, requires_sensitive_access
+from ..sensitive_detector import requires_sensitive_access, stored_categories, verify_totp_for_sensitive
 from ..utils import resource_path, copy_to_clipboard_safely, svg_icon
 from ..storage import ClipItemType
 from ..i18n import i18n
@@ -80,10 +80,12 @@ class ItemPreviewDialog(QDialog):
         self.settings = settings or getattr(parent, "settings", None) or getattr(parent_window, "settings", None)
         self.item_type = ClipItemType(row["item_type"])
         self._sensitive_probe_text = self._build_sensitive_probe_text()
-        self._requires_sensitive_access = requires_sensitive_access(self.settings, self._sensitive_probe_text)
+        self._requires_sensitive_access = requires_sensitive_access(
+            self.settings, self._sensitive_probe_text, stored_categories(row, self.settings)
+        )
         self._sensitive_access_granted = not self._requires_sensitive_access
         if self._requires_sensitive_access:
-            self._sensitive_access_granted = ensure_sensitive_access(self.settings, self._sensitive_probe_text, self)
+            self._sensitive_access_granted = verify_totp_for_sensitive(self.settings, self)
 
         v = QVBoxLayout(self)
 
@@ -28,12 +28,13 @@ from PySide6.QtWidgets import (
 )
 
 from ..i18n import i18n
+from ..search_worker import SearchWorker
 from ..settings import Settings
-from ..sensitive_detector import ensure_sensitive_access
+from ..sensitive_detector import ensure_sensitive_access, stored_categories
 from ..storage import ClipItemType, Storage, _normalize_search_text, _strip_html_tags
 from ..utils import copy_to_clipboard_safely, resource_path, svg_icon
+from .clip_list_view import ClipChangeRelay, ClipListModel, ClipListView
 from .flow_layout import FlowLayout
-from .item_widget import ItemWidget
 from .note_widget import NoteWidget
 from .toast import Toast
 from .reminder_widget import ReminderWidget
@@ -42,6 +43,15 @@ from .reminder_dialog import ReminderDialog
 
 PRIME_COUNT = 9
 PAGE_SIZE = 30
+
+# Pano sekmeleri (sekme indeksi sırasıyla) ve SQL'de filtrelenecek öğe tipleri
+# ("all" / "fav" tüm tipler)
+CLIP_TABS = ("all", "text", "image", "files", "fav")
+TAB_ITEM_TYPES = {
+    "text": (ClipItemType.TEXT, ClipItemType.HTML),
+    "image": (ClipItemType.IMAGE,),
+    "files": (ClipItemType.FILE,),
+}
 LOADER_DELAY_MS = 300
 
 
@@ -341,84 +351,65 @@ class HistoryWindow(QWidget):
         loading_layout.addWidget(self._loading_label)
         self._search_loading_widget.setVisible(False)
 
+        # Pano sekmeleri: model/görünüm (kartlar delegeyle çizilir). Depodaki
+        # değişiklikler olay olarak gelir; modeller yeniden sorgu yapmaz.
+        self._clip_models: dict = {}
+        self._clip_views: dict = {}
+        self._clip_events = ClipChangeRelay(self.storage, self)
+        self._clip_events.changed.connect(self._on_clip_change)
+
+        # Aramalar işçi thread'inde; her tuş vuruşu süren aramayı iptal eder,
+        # sonuçlar sıralı partiler hâlinde gelir
+        self.search_worker = SearchWorker(
+            self.storage.iter_search,
+            on_thread_exit=getattr(self.storage, "close_thread_connection", None),
+        )
+        self.search_worker.results_ready.connect(self._on_search_results)
+        self.search_worker.search_failed.connect(self._on_search_failed)
+        self._search_query_id = 0
+        self._search_query = ""
+        self._search_empty_message = True
+
         # Tümü
         self.tab_all = QWidget()
-        self.container_all = QWidget(self.tab_all)
-        self.flow_all = FlowLayout(self.container_all, margin=8, hspacing=12, vspacing=12)
-        self.container_all.setLayout(self.flow_all)
-
-        self.scroll_all = QScrollArea(self.tab_all)
-        self.scroll_all.setWidgetResizable(True)
-        self.scroll_all.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.scroll_all.setWidget(self.container_all)
-
+        self.view_all = self._create_clip_view("all")
         lay_all = QVBoxLayout(self.tab_all)
         lay_all.setContentsMargins(0, 0, 0, 0)
         lay_all.addWidget(self._search_loading_widget)
         lay_all.addWidget(self._no_results_widget)
-        lay_all.addWidget(self.scroll_all)
+        lay_all.addWidget(self.view_all)
         self.tabs.addTab(self.tab_all, "")
 
         # Metin
         self.tab_text = QWidget()
-        self.container_text = QWidget(self.tab_text)
-        self.flow_text = FlowLayout(self.container_text, margin=8, hspacing=12, vspacing=12)
-        self.container_text.setLayout(self.flow_text)
-
-        self.scroll_text = QScrollArea(self.tab_text)
-        self.scroll_text.setWidgetResizable(True)
-        self.scroll_text.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.scroll_text.setWidget(self.container_text)
-
+        self.view_text = self._create_clip_view("text")
         lay_text = QVBoxLayout(self.tab_text)
         lay_text.setContentsMargins(0, 0, 0, 0)
-        lay_text.addWidget(self.scroll_text)
+        lay_text.addWidget(self.view_text)
         self.tabs.addTab(self.tab_text, "")
 
         # Resim
         self.tab_image = QWidget()
-        self.container_image = QWidget(self.tab_image)
-        self.flow_image = FlowLayout(self.container_image, margin=8, hspacing=12, vspacing=12)
-        self.container_image.setLayout(self.flow_image)
-
-        self.scroll_image = QScrollArea(self.tab_image)
-        self.scroll_image.setWidgetResizable(True)
-        self.scroll_image.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.scroll_image.setWidget(self.container_image)
-
+        self.view_image = self._create_clip_view("image")
         lay_image = QVBoxLayout(self.tab_image)
         lay_image.setContentsMargins(0, 0, 0, 0)
-        lay_image.addWidget(self.scroll_image)
+        lay_image.addWidget(self.view_image)
         self.tabs.addTab(self.tab_image, "")
 
         # Dosyalar
         self.tab_files = QWidget()
-        self.container_files = QWidget(self.tab_files)
-        self.flow_files = FlowLayout(self.container_files, margin=8, hspacing=12, vspacing=12)
-        self.container_files.setLayout(self.flow_files)
-        self.scroll_files = QScrollArea(self.tab_files)
-        self.scroll_files.setWidgetResizable(True)
-        self.scroll_files.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.scroll_files.setWidget(self.container_files)
+        self.view_files = self._create_clip_view("files")
         lay_files = QVBoxLayout(self.tab_files)
         lay_files.setContentsMargins(0, 0, 0, 0)
-        lay_files.addWidget(self.scroll_files)
+        lay_files.addWidget(self.view_files)
         self.tabs.addTab(self.tab_files, "")
 
         # Favoriler
         self.tab_fav = QWidget()
-        self.container_fav = QWidget(self.tab_fav)
-        self.flow_fav = FlowLayout(self.container_fav, margin=8, hspacing=12, vspacing=12)
-        self.container_fav.setLayout(self.flow_fav)
-
-        self.scroll_fav = QScrollArea(self.tab_fav)
-        self.scroll_fav.setWidgetResizable(True)
-        self.scroll_fav.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.scroll_fav.setWidget(self.container_fav)
-
+        self.view_fav = self._create_clip_view("fav")
         lay_fav = QVBoxLayout(self.tab_fav)
         lay_fav.setContentsMargins(0, 0, 0, 0)
-        lay_fav.addWidget(self.scroll_fav)
+        lay_fav.addWidget(self.view_fav)
         self.tabs.addTab(self.tab_fav, "")
 
         # Notlar
@@ -546,57 +537,27 @@ class HistoryWindow(QWidget):
         self._toast = Toast(self)
 
         # Durum
-        self._items_all: List[ItemWidget] = []
-        self._items_text: List[ItemWidget] = []
-        self._items_image: List[ItemWidget] = []
-        self._items_files: List[ItemWidget] = []
-        self._items_fav: List[ItemWidget] = []
-        self._selected_clip_index = 0
         self._paste_and_hide_callback = None  # app.py bağlar
         self._note_cards: List[NoteWidget] = []
         self._reminder_cards: List[ReminderWidget] = []
         self._snippet_cards = []
         self._first_show = True  # İlk açılış kontrolü
 
-        # Sayfalama durumları
-        self._offset_all = 0
-        self._offset_text = 0
-        self._offset_image = 0
-        self._offset_fav = 0
+        # Sayfalama durumları (pano sekmelerinde sayfalama modelde: fetchMore)
         self._offset_notes = 0
         self._offset_reminders = 0
         self._offset_snippets = 0
-        self._loading_all = False
-        self._loading_text = False
-        self._loading_image = False
-        self._loading_fav = False
         self._loading_notes = False
         self._loading_reminders = False
         self._loading_snippets = False
-        self._no_more_all = False
-        self._no_more_text = False
-        self._no_more_image = False
-        self._no_more_files = False
-        self._no_more_fav = False
         self._no_more_notes = False
         self._no_more_reminders = False
         self._no_more_snippets = False
-        self._offset_files = 0
-        self._loading_files = False
 
         # Loader widget’ları ve gecikme timer’ları
-        self._loader_all: Optional[LoaderWidget] = None
-        self._loader_text: Optional[LoaderWidget] = None
-        self._loader_image: Optional[LoaderWidget] = None
-        self._loader_files: Optional[LoaderWidget] = None
-        self._loader_fav: Optional[LoaderWidget] = None
         self._loader_notes: Optional[LoaderWidget] = None
         self._loader_reminders: Optional[LoaderWidget] = None
         self._loader_snippets: Optional[LoaderWidget] = None
-        self._loader_timer_all: Optional[QTimer] = None
-        self._loader_timer_text: Optional[QTimer] = None
-        self._loader_timer_image: Optional[QTimer] = None
-        self._loader_timer_fav: Optional[QTimer] = None
         self._loader_timer_notes: Optional[QTimer] = None
         self._loader_timer_snippets: Optional[QTimer] = None
         self._loader_timer_reminders: Optional[QTimer] = None
@@ -618,12 +579,7 @@ class HistoryWindow(QWidget):
         for i in range(1, 10):
             QShortcut(QKeySequence(f"Alt+{i}"), self, activated=lambda n=i: self._kb_paste_nth(n - 1))
 
-        # Scroll izleme
-        self.scroll_all.verticalScrollBar().valueChanged.connect(lambda _: self._maybe_load_more("all"))
-        self.scroll_text.verticalScrollBar().valueChanged.connect(lambda _: self._maybe_load_more("text"))
-        self.scroll_image.verticalScrollBar().valueChanged.connect(lambda _: self._maybe_load_more("image"))
-        self.scroll_files.verticalScrollBar().valueChanged.connect(lambda _: self._maybe_load_more("files"))
-        self.scroll_fav.verticalScrollBar().valueChanged.connect(lambda _: self._maybe_load_more("fav"))
+        # Scroll izleme (pano sekmeleri modelin fetchMore'u ile kendiliğinden yüklenir)
         self.scroll_notes.verticalScrollBar().valueChanged.connect(lambda _: self._maybe_load_more("notes"))
         self.scroll_reminders.verticalScrollBar().valueChanged.connect(lambda _: self._maybe_load_more("reminders"))
 
@@ -639,7 +595,7 @@ class HistoryWindow(QWidget):
         if self._first_show:  # Sadece ilk seferde
             print("[DEBUG] _initial_load: Tüm veriler yükleniyor...")
             
-            # Clip items (all, text, image, fav)
+            # Clip items (all, text, image, files, fav)
             self.reload_items()
             
             # Notlar
@@ -710,14 +666,7 @@ class HistoryWindow(QWidget):
         if not self.filter_panel.isVisible():
             # Arama boşsa tüm widget'ları göster
             if not query:
-                for w in self._items_all:
-                    w.setVisible(True)
-                for w in self._items_text:
-                    w.setVisible(True)
-                for w in self._items_image:
-                    w.setVisible(True)
-                for w in self._items_fav:
-                    w.setVisible(True)
+                self._restore_clip_lists()
                 for card in self._note_cards:
                     card.setVisible(True)
                 for card in self._reminder_cards:
@@ -752,123 +701,63 @@ class HistoryWindow(QWidget):
         # Fuzzy threshold
         fuzzy_threshold = self.cmb_fuzzy.currentData()
         
-        # Aramayı yap
-        try:
-            results = self.storage.search_items(
-                query=query,
-                item_types=item_types,
-                date_from=date_from,
-                date_to=date_to,
-                fuzzy_threshold=fuzzy_threshold,
-                limit=500
-            )
-            
-            # Sonuçları göster
-            self._display_search_results(results)
-            
-        except Exception as e:
-            print(f"[ERROR] Arama hatası: {e}")
-            import traceback
-            traceback.print_exc()
-    
-    def _display_search_results(self, results: List[dict]):
-        """Arama sonuçlarını göster - yüklenmemiş içerikler için widget oluştur"""
-        # Önce tüm widget'ları gizle
-        for w in self._items_all:
-            w.setVisible(False)
-        for w in self._items_text:
-            w.setVisible(False)
-        for w in self._items_image:
-            w.setVisible(False)
-        for w in self._items_fav:
-            w.setVisible(False)
-        
-        # Mevcut widget ID'lerini topla
-        existing_ids_all = {w.row_id for w in self._items_all}
-        existing_ids_text = {w.row_id for w in self._items_text}
-        existing_ids_image = {w.row_id for w in self._items_image}
-        existing_ids_fav = {w.row_id for w in self._items_fav}
-        
-        # Sonuçları göster veya oluştur
-        for row in results:
-            row_id = row["id"]
-            item_type = int(row.get("item_type", 0))
-            is_favorite = bool(row.get("favorite", False))
-            
-            # ALL sekmesi
-            if row_id in existing_ids_all:
-                # Widget zaten var, sadece göster
-                for w in self._items_all:
-                    if w.row_id == row_id:
-                        w.setVisible(True)
-                        break
-            else:
-                # Widget yok, oluştur
-                w = ItemWidget(row, self.container_all)
-                w.on_copy_requested.connect(self.on_copy_requested)
-                w.on_delete_requested.connect(self.on_delete_requested)
-                w.on_favorite_toggled.connect(self.on_favorite_toggled)
-                self.flow_all.addWidget(w)
-                self._items_all.append(w)
-                w.setVisible(True)
-            
-            # TEXT sekmesi
-            if item_type in (int(ClipItemType.TEXT), int(ClipItemType.HTML)):
-                if row_id in existing_ids_text:
-                    for w in self._items_text:
-                        if w.row_id == row_id:
-                            w.setVisible(True)
-                            break
-                else:
-                    w_text = ItemWidget(row, self.container_text)
-                    w_text.on_copy_requested.connect(self.on_copy_requested)
-                    w_text.on_delete_requested.connect(self.on_delete_requested)
-                    w_text.on_favorite_toggled.connect(self.on_favorite_toggled)
-                    self.flow_text.addWidget(w_text)
-                    self._items_text.append(w_text)
-                    w_text.setVisible(True)
-            
-            # IMAGE sekmesi
-            if item_type == int(ClipItemType.IMAGE):
-                if row_id in existing_ids_image:
-                    for w in self._items_image:
-                        if w.row_id == row_id:
-                            w.setVisible(True)
-                            break
-                else:
-                    w_image = self._wire_clip_widget(ItemWidget(row, self.container_image))
-                    self.flow_image.addWidget(w_image)
-                    self._items_image.append(w_image)
-                    w_image.setVisible(True)
-
-            # FILES sekmesi
-            if item_type == int(ClipItemType.FILE):
-                existing_ids_files = {w.row_id for w in self._items_files}
-                if row_id in existing_ids_files:
-                    for w in self._items_files:
-                        if w.row_id == row_id:
-                            w.setVisible(True)
-                            break
-                else:
-                    w_file = self._wire_clip_widget(ItemWidget(row, self.container_files))
-                    self.flow_files.addWidget(w_file)
-                    self._items_files.append(w_file)
-                    w_file.setVisible(True)
-            
-            # FAVORITES sekmesi
-            if is_favorite or bool(row.get("pinned", False)):
-                if row_id in existing_ids_fav:
-                    for w in self._items_fav:
-                        if w.row_id == row_id:
-                            w.setVisible(True)
-                            break
-                else:
-                    w_fav = self._wire_clip_widget(ItemWidget(row, self.container_fav))
-                    self.flow_fav.addWidget(w_fav)
-                    self._items_fav.append(w_fav)
-                    w_fav.setVisible(True)
-        
-        self._refresh_layouts()
+        # Aramayı işçi thread'inde başlat; sonuçlar _on_search_results'a gelir
+        self._start_search(
+            query,
+            show_empty_message=False,
+            item_types=item_types,
+            date_from=date_from,
+            date_to=date_to,
+            fuzzy_threshold=fuzzy_threshold,
+            limit=500,
+        )
+
+    def _start_search(self, query: str, show_empty_message: bool, **params):
+        """Süren aramayı iptal edip yenisini işçiye gönder"""
+        self._search_query = query
+        self._search_empty_message = show_empty_message
+        self._search_loading_widget.setVisible(True)
+        self._no_results_widget.setVisible(False)
+        self._search_query_id = self.search_worker.submit(query=query, **params)
+
+    def _on_search_results(self, query_id: int, results: List[dict], done: bool):
+        """İşçiden gelen sıralı sonuç partisi (eski sorgulara ait partiler yok sayılır)"""
+        if query_id != self._search_query_id or not self.search_worker.is_current(query_id):
+            return
+        if done:
+            self._search_loading_widget.setVisible(False)
+        if not results and self._search_empty_message:
+            if done:
+                self._no_results_widget.setVisible(True)
+                self._no_results_label.setText(f"'{self._search_query}' için sonuç bulunamadı")
+            return
+        self._no_results_widget.setVisible(False)
+        self._display_search_results(results, self._search_query)
+
+    def _on_search_failed(self, query_id: int, message: str):
+        if query_id != self._search_query_id:
+            return
+        print(f"[ERROR] Veritabanı araması hatası: {message}")
+        self._search_loading_widget.setVisible(False)
+        self._no_results_widget.setVisible(True)
+        self._no_results_label.setText("Arama sırasında bir hata oluştu")
+
+    def _display_search_results(self, results: List[dict], query: Optional[str] = None):
+        """Arama sonuçlarını pano sekmelerinde göster (her sekme kendi tip filtresiyle)"""
+        if query is None:
+            query = self.search.text() or ""
+        query = query.lower().strip()
+        for model in self._clip_models.values():
+            model.show_search_results(results, matcher=lambda row: self._match_row_text(row, query))
+
+    def _restore_clip_lists(self):
+        """Arama temizlendiğinde pano sekmelerini normal (sayfalı) listeye döndür"""
+        self.search_worker.cancel()
+        self._search_query_id = 0
+        self._no_results_widget.setVisible(False)
+        self._search_loading_widget.setVisible(False)
+        if any(model.search_active for model in self._clip_models.values()):
+            self.reload_items()
 
     # ---------- End Gelişmiş Arama ----------
 
@@ -990,27 +879,7 @@ class HistoryWindow(QWidget):
 
     # Reflow'u anında zorlayan yardımcı
     def _reflow_now(self, which: str):
-        if which == "all":
-            flow = self.flow_all
-            container = self.container_all
-            scroll = self.scroll_all
-        elif which == "text":
-            flow = self.flow_text
-            container = self.container_text
-            scroll = self.scroll_text
-        elif which == "image":
-            flow = self.flow_image
-            container = self.container_image
-            scroll = self.scroll_image
-        elif which == "files":
-            flow = self.flow_files
-            container = self.container_files
-            scroll = self.scroll_files
-        elif which == "fav":
-            flow = self.flow_fav
-            container = self.container_fav
-            scroll = self.scroll_fav
-        elif which == "notes":
+        if which == "notes":
             flow = self.flow_notes
             container = self.container_notes
             scroll = self.scroll_notes
@@ -1042,7 +911,7 @@ class HistoryWindow(QWidget):
             print(f"[DEBUG] _reflow_now: {len(self._reminder_cards) if hasattr(self, '_reminder_cards') else 0} hatırlatma kartı güncelleniyor")
 
     def _refresh_layouts(self):
-        for which in ("all", "text", "image", "fav", "notes", "reminders"):
+        for which in ("notes", "reminders"):
             self._reflow_now(which)
         # Çizimler için de yenile
         if hasattr(self, 'flow_drawings') and hasattr(self, '_drawing_cards'):
@@ -1051,37 +920,18 @@ class HistoryWindow(QWidget):
     # ---------- Lazy load ----------
 
     def reload_items(self):
-        # durum sıfırla - SADECE clip items için
-        self._clear_flows()
-        self._offset_all = self._offset_text = self._offset_image = self._offset_files = self._offset_fav = 0
-        self._no_more_all = self._no_more_text = self._no_more_image = self._no_more_files = self._no_more_fav = False
-        self._loading_all = self._loading_text = self._loading_image = self._loading_files = self._loading_fav = False
-
-        # İlk 9 - clip items
-        self._load_page("all", first=True)
-        self._load_page("text", first=True)
-        self._load_page("image", first=True)
-        self._load_page("files", first=True)
-        self._load_page("fav", first=True)
+        # durum sıfırla - SADECE clip items için; her model ilk sayfasını okur,
+        # kalan sayfalar kaydırdıkça fetchMore ile gelir
+        for model in self._clip_models.values():
+            model.reload()
         
         # Notlar ve hatırlatmalar ilk açılışta yüklendiler, tekrar yükleme!
 
-
     def _maybe_load_more(self, which: str):
         # Arama aktifken lazy load devre dışı (basitlik)
         if (self.search.text() or "").strip():
             return
-        if which == "all":
-            scroll = self.scroll_all
-        elif which == "text":
-            scroll = self.scroll_text
-        elif which == "image":
-            scroll = self.scroll_image
-        elif which == "files":
-            scroll = self.scroll_files
-        elif which == "fav":
-            scroll = self.scroll_fav
-        elif which == "notes":
+        if which == "notes":
             scroll = self.scroll_notes
         else:
             scroll = self.scroll_reminders
@@ -1092,23 +942,7 @@ class HistoryWindow(QWidget):
     def _show_loader_later(self, which: str):
         def _create_and_show():
             loader = LoaderWidget(self._tr("loader.loading", "Loading…"))
-            if which == "all":
-                self._loader_all = loader
-                self.flow_all.addWidget(loader)
-                self._reflow_now("all")
-            elif which == "text":
-                self._loader_text = loader
-                self.flow_text.addWidget(loader)
-                self._reflow_now("text")
-            elif which == "image":
-                self._loader_image = loader
-                self.flow_image.addWidget(loader)
-                self._reflow_now("image")
-            elif which == "fav":
-                self._loader_fav = loader
-                self.flow_fav.addWidget(loader)
-                self._reflow_now("fav")
-            elif which == "notes":
+            if which == "notes":
                 self._loader_notes = loader
                 self.flow_notes.addWidget(loader)
                 self._reflow_now("notes")
@@ -1120,45 +954,13 @@ class HistoryWindow(QWidget):
         t.setSingleShot(True)
         t.timeout.connect(_create_and_show)
         t.start(LOADER_DELAY_MS)
-        if which == "all":
-            self._loader_timer_all = t
-        elif which == "text":
-            self._loader_timer_text = t
-        elif which == "image":
-            self._loader_timer_image = t
-        elif which == "fav":
-            self._loader_timer_fav = t
-        elif which == "notes":
+        if which == "notes":
             self._loader_timer_notes = t
         else:
             self._loader_timer_reminders = t
 
     def _hide_loader(self, which: str):
-        if which == "all":
-            if self._loader_timer_all:
-                self._loader_timer_all.stop()
-            w = self._loader_all
-            self._loader_timer_all = None
-            self._loader_all = None
-        elif which == "text":
-            if self._loader_timer_text:
-                self._loader_timer_text.stop()
-            w = self._loader_text
-            self._loader_timer_text = None
-            self._loader_text = None
-        elif which == "image":
-            if self._loader_timer_image:
-                self._loader_timer_image.stop()
-            w = self._loader_image
-            self._loader_timer_image = None
-            self._loader_image = None
-        elif which == "fav":
-            if self._loader_timer_fav:
-                self._loader_timer_fav.stop()
-            w = self._loader_fav
-            self._loader_timer_fav = None
-            self._loader_fav = None
-        elif which == "notes":
+        if which == "notes":
             if self._loader_timer_notes:
                 self._loader_timer_notes.stop()
             w = self._loader_notes
@@ -1172,15 +974,7 @@ class HistoryWindow(QWidget):
             self._loader_reminders = None
         if w:
             try:
-                if which == "all":
-                    layout = self.flow_all
-                elif which == "text":
-                    layout = self.flow_text
-                elif which == "image":
-                    layout = self.flow_image
-                elif which == "fav":
-                    layout = self.flow_fav
-                elif which == "notes":
+                if which == "notes":
                     layout = self.flow_notes
                 else:
                     layout = self.flow_reminders
@@ -1192,28 +986,8 @@ class HistoryWindow(QWidget):
             self._reflow_now(which)
 
     def _load_page(self, which: str, first: bool):  # <- 4 BOŞLUK GİRİNTİ (sınıf içinde)
-        # Halihazırda yükleniyor ya da bitti mi?
-        if which == "all":  # <- 8 BOŞLUK GİRİNTİ (metod içinde)
-            if self._loading_all or self._no_more_all:  # <- 12 BOŞLUK
-                return  # <- 16 BOŞLUK
-            self._loading_all = True  # <- 12 BOŞLUK
-        elif which == "text":
-            if self._loading_text or self._no_more_text:
-                return
-            self._loading_text = True
-        elif which == "image":
-            if self._loading_image or self._no_more_image:
-                return
-            self._loading_image = True
-        elif which == "files":
-            if getattr(self, "_loading_files", False) or getattr(self, "_no_more_files", False):
-                return
-            self._loading_files = True
-        elif which == "fav":
-            if self._loading_fav or self._no_more_fav:
-                return
-            self._loading_fav = True
-        elif which == "notes":
+        # Halihazırda yükleniyor ya da bitti mi? (pano sekmeleri ClipListModel'de)
+        if which == "notes":  # <- 8 BOŞLUK GİRİNTİ (metod içinde)
             if self._loading_notes or self._no_more_notes:
                 return
             self._loading_notes = True
@@ -1227,59 +1001,7 @@ class HistoryWindow(QWidget):
 
         # Sorgu
         try:
-            if which in ("all", "text", "image", "files", "fav"):
-                limit = PRIME_COUNT if first else PAGE_SIZE
-                
-                # Text ve image için DB'den tüm verileri çek, sonra filtrele
-                # (çünkü offset sistem text/image'e uymuyor)
-                if which == "text":
-                    # Tüm itemları çek (büyük limit)
-                    all_rows = self.storage.list_items(limit=10000, favorites_only=False, offset=0)
-                    # Sadece text/html olanları filtrele
-                    rows = [r for r in all_rows if int(row_val(r, "item_type", 0)) in (int(ClipItemType.TEXT), int(ClipItemType.HTML))]
-                    # Offset ve limit uygula
-                    rows = rows[self._offset_text:self._offset_text + limit]
-                elif which == "image":
-                    # Tüm itemları çek
-                    all_rows = self.storage.list_items(limit=10000, favorites_only=False, offset=0)
-                    # Sadece image olanları filtrele
-                    rows = [r for r in all_rows if int(row_val(r, "item_type", 0)) == int(ClipItemType.IMAGE)]
-                    # Offset ve limit uygula
-                    rows = rows[self._offset_image:self._offset_image + limit]
-                elif which == "files":
-                    all_rows = self.storage.list_items(limit=10000, favorites_only=False, offset=0)
-                    rows = [r for r in all_rows if int(row_val(r, "item_type", 0)) == int(ClipItemType.FILE)]
-                    rows = rows[self._offset_files:self._offset_files + limit]
-                else:
-                    # All ve fav için normal offset kullan
-                    offset = self._offset_all if which == "all" else self._offset_fav
-                    rows = self.storage.list_items(limit=limit, favorites_only=(which == "fav"), offset=offset)
-                
-                if not rows:
-                    if which == "all":
-                        self._no_more_all = True
-                    elif which == "text":
-                        self._no_more_text = True
-                    elif which == "image":
-                        self._no_more_image = True
-                    elif which == "files":
-                        self._no_more_files = True
-                    else:
-                        self._no_more_fav = True
-                else:
-                    for row in rows:
-                        self._add_row_widget(which, row, immediate_layout=True)
-                    if which == "all":
-                        self._offset_all += len(rows)
-                    elif which == "text":
-                        self._offset_text += len(rows)
-                    elif which == "image":
-                        self._offset_image += len(rows)
-                    elif which == "files":
-                        self._offset_files += len(rows)
-                    else:
-                        self._offset_fav += len(rows)
-            elif which == "notes":
+            if which == "notes":
                 limit = PRIME_COUNT if first else PAGE_SIZE
                 rows = self.storage.list_notes(limit=limit, offset=self._offset_notes)
                 if not rows:
@@ -1299,17 +1021,7 @@ class HistoryWindow(QWidget):
                     self._offset_reminders += len(rows)
         finally:
             self._hide_loader(which)
-            if which == "all":
-                self._loading_all = False
-            elif which == "text":
-                self._loading_text = False
-            elif which == "image":
-                self._loading_image = False
-            elif which == "files":
-                self._loading_files = False
-            elif which == "fav":
-                self._loading_fav = False
-            elif which == "notes":
+            if which == "notes":
                 self._loading_notes = False
             else:  # reminders
                 self._loading_reminders = False
@@ -1447,134 +1159,25 @@ class HistoryWindow(QWidget):
 
     # ---------- Metin ve favori kartları ----------
 
-    def _add_row_widget(self, kind: str, row, immediate_layout: bool = False):
-        if kind == "all":
-            w = self._wire_clip_widget(ItemWidget(row, self.container_all))
-            w.setVisible(False)
-            self.flow_all.addWidget(w)
-            self._items_all.append(w)
-            which = "all"
-        elif kind == "text":
-            w = self._wire_clip_widget(ItemWidget(row, self.container_text))
-            w.setVisible(False)
-            self.flow_text.addWidget(w)
-            self._items_text.append(w)
-            which = "text"
-        elif kind == "image":
-            w = self._wire_clip_widget(ItemWidget(row, self.container_image))
-            w.setVisible(False)
-            self.flow_image.addWidget(w)
-            self._items_image.append(w)
-            which = "image"
-        elif kind == "files":
-            w = self._wire_clip_widget(ItemWidget(row, self.container_files))
-            w.setVisible(False)
-            self.flow_files.addWidget(w)
-            self._items_files.append(w)
-            which = "files"
-        else:  # fav
-            w = self._wire_clip_widget(ItemWidget(row, self.container_fav))
-            w.setVisible(False)
-            self.flow_fav.addWidget(w)
-            self._items_fav.append(w)
-            which = "fav"
-
-        if immediate_layout:
-            self._reflow_now(which)
-
-        q = (self.search.text() or "").lower().strip()
-        w.setVisible(self._match_row_text(w, q))
-        QTimer.singleShot(0, lambda: self._reflow_now(which))
-
-    def _clear_flows(self):
-        for w in self._items_all:
-            try:
-                self.flow_all.removeWidget(w)
-            except Exception:
-                pass
-            w.setParent(None)
-            w.deleteLater()
-        self._items_all.clear()
-
-        for w in self._items_text:
-            try:
-                self.flow_text.removeWidget(w)
-            except Exception:
-                pass
-            w.setParent(None)
-            w.deleteLater()
-        self._items_text.clear()
-
-        for w in self._items_image:
-            try:
-                self.flow_image.removeWidget(w)
-            except Exception:
-                pass
-            w.setParent(None)
-            w.deleteLater()
-        self._items_image.clear()
-
-        for w in self._items_files:
-            try:
-                self.flow_files.removeWidget(w)
-            except Exception:
-                pass
-            w.setParent(None)
-            w.deleteLater()
-        self._items_files.clear()
-
-        for w in self._items_fav:
-            try:
-                self.flow_fav.removeWidget(w)
-            except Exception:
-                pass
-            w.setParent(None)
-            w.deleteLater()
-        self._items_fav.clear()
-
-        # NOT: Notlar ve hatırlatmalar reload_items'da SİLİNMEMELİ!
-        # Bunlar ayrı sekmelerde ve ayrı yükleniyorlar
-
-        self.flow_all.invalidate()
-        self.flow_fav.invalidate()
-
-    def _match_row_text(self, row_or_widget, query: str) -> bool:
+    def _match_row_text(self, row, query: str) -> bool:
         normalized_query = _normalize_search_text(query)
         if not normalized_query:
             return True
-        if isinstance(row_or_widget, ItemWidget):
-            item_type = row_or_widget.item_type
-            if item_type in (ClipItemType.TEXT, ClipItemType.HTML):
-                content = _normalize_search_text(row_or_widget.preview_text or "")
-                if not content and item_type == ClipItemType.HTML:
-                    content = _strip_html_tags(row_or_widget._row("html_content", "") or "")
-                return normalized_query in content
-            return False
-        else:
-            t = int(row_val(row_or_widget, "item_type", 0))
-            if t in (int(ClipItemType.TEXT), int(ClipItemType.HTML)):
-                content = _normalize_search_text(row_val(row_or_widget, "text_content", "") or "")
-                if not content:
-                    content = _strip_html_tags(row_val(row_or_widget, "html_content", "") or "")
-                return normalized_query in content
-            return False
+        t = int(row_val(row, "item_type", 0))
+        if t in (int(ClipItemType.TEXT), int(ClipItemType.HTML)):
+            content = _normalize_search_text(row_val(row, "text_content", "") or "")
+            if not content:
+                content = _strip_html_tags(row_val(row, "html_content", "") or "")
+            return normalized_query in content
+        return False
 
     def apply_filter(self, text: str):
         """Arama filtresi uygula - veritabanında da ara"""
         q = (text or "").lower().strip()
         
         if not q:
-            # Arama boş - tüm widget'ları göster
-            self._no_results_widget.setVisible(False)
-            self._search_loading_widget.setVisible(False)
-            for w in self._items_all:
-                w.setVisible(True)
-            for w in self._items_text:
-                w.setVisible(True)
-            for w in self._items_image:
-                w.setVisible(True)
-            for w in self._items_fav:
-                w.setVisible(True)
+            # Arama boş - tüm kartları göster
+            self._restore_clip_lists()
             for card in self._note_cards:
                 card.setVisible(True)
             for card in self._reminder_cards:
@@ -1600,110 +1203,75 @@ class HistoryWindow(QWidget):
         self._refresh_layouts()
     
     def _search_in_database(self, query: str):
-        """Veritabanında arama yap ve sonuçları yükle"""
-        self._search_loading_widget.setVisible(True)
-        self._no_results_widget.setVisible(False)
-        QApplication.processEvents()  # UI'ı güncelle
-        
-        try:
-            # Veritabanında ara (fuzzy search ile)
-            threshold = self._default_search_threshold(query)
-            results = self.storage.search_items(
-                query=query,
-                fuzzy_threshold=threshold,
-                limit=100
-            )
-            
-            self._search_loading_widget.setVisible(False)
-            
-            if not results:
-                # Sonuç bulunamadı
-                self._no_results_widget.setVisible(True)
-                self._no_results_label.setText(f"'{query}' için sonuç bulunamadı")
-                return
-            
-            # Sonuçları göster
-            self._display_search_results(results)
-            self._no_results_widget.setVisible(False)
-            
-        except Exception as e:
-            print(f"[ERROR] Veritabanı araması hatası: {e}")
-            self._search_loading_widget.setVisible(False)
-            self._no_results_widget.setVisible(True)
-            self._no_results_label.setText("Arama sırasında bir hata oluştu")
+        """Veritabanında aramayı başlat (fuzzy search ile); sonuçlar partiler hâlinde gelir"""
+        self._start_search(
+            query,
+            show_empty_message=True,
+            fuzzy_threshold=self._default_search_threshold(query),
+            limit=100,
+        )
 
     # ------------------ Anlık olaylar ------------------
 
-    def _wire_clip_widget(self, w: ItemWidget):
-        w.on_copy_requested.connect(self.on_copy_requested)
-        w.on_delete_requested.connect(self.on_delete_requested)
-        w.on_favorite_toggled.connect(self.on_favorite_toggled)
-        try:
-            w.on_pin_toggled.connect(self.on_pin_toggled)
-            w.on_save_snippet.connect(self.on_save_as_snippet)
-            w.on_meta_changed.connect(self.on_item_meta_changed)
-        except Exception:
-            pass
-        return w
-
-    def _visible_clip_widgets(self) -> List[ItemWidget]:
+    def _create_clip_view(self, which: str) -> ClipListView:
+        model = ClipListModel(
+            self.storage,
+            item_types=TAB_ITEM_TYPES.get(which),
+            favorites_only=(which == "fav"),
+            settings=self.settings,
+            parent=self,
+        )
+        view = ClipListView(model, settings=self.settings)
+        view.on_copy_requested.connect(self.on_copy_requested)
+        view.on_delete_requested.connect(self.on_delete_requested)
+        view.on_favorite_toggled.connect(self.on_favorite_toggled)
+        view.on_pin_toggled.connect(self.on_pin_toggled)
+        view.on_save_snippet.connect(self.on_save_as_snippet)
+        self._clip_models[which] = model
+        self._clip_views[which] = view
+        return view
+
+    def _current_clip_view(self) -> ClipListView:
         idx = self.tabs.currentIndex()
-        # 0=all, 1=text, 2=image, 3=files, 4=fav
-        mapping = {
-            0: self._items_all,
-            1: self._items_text,
-            2: self._items_image,
-            3: self._items_files,
-            4: self._items_fav,
-        }
-        items = mapping.get(idx, self._items_all)
-        return [w for w in items if w.isVisible()]
+        # 0=all, 1=text, 2=image, 3=files, 4=fav; diğer sekmelerde Tümü
+        which = CLIP_TABS[idx] if 0 <= idx < len(CLIP_TABS) else "all"
+        return self._clip_views[which]
 
     def _kb_move_selection(self, delta: int):
-        widgets = self._visible_clip_widgets()
-        if not widgets:
-            return
-        self._selected_clip_index = max(0, min(len(widgets) - 1, self._selected_clip_index + delta))
-        for i, w in enumerate(widgets):
-            w.set_selected(i == self._selected_clip_index)
-
-    def _kb_selected_widget(self) -> Optional[ItemWidget]:
-        widgets = self._visible_clip_widgets()
-        if not widgets:
-            return None
-        self._selected_clip_index = max(0, min(len(widgets) - 1, self._selected_clip_index))
-        return widgets[self._selected_clip_index]
+        self._current_clip_view().move_selection(delta)
 
     def _kb_copy_selected(self):
-        w = self._kb_selected_widget()
-        if w:
-            w._copy()
+        view = self._current_clip_view()
+        card = view.selected_card()
+        if card:
+            view.copy_card(card)
 
     def _kb_paste_selected(self):
-        w = self._kb_selected_widget()
-        if not w:
+        view = self._current_clip_view()
+        card = view.selected_card()
+        if not card:
             return
-        w._copy()
+        view.copy_card(card)
         if callable(self._paste_and_hide_callback):
             self._paste_and_hide_callback()
         self.hide()
 
     def _kb_delete_selected(self):
-        w = self._kb_selected_widget()
-        if w:
-            w._delete()
+        view = self._current_clip_view()
+        card = view.selected_card()
+        if card:
+            view.delete_card(card)
 
     def _kb_pin_selected(self):
-        w = self._kb_selected_widget()
-        if not w:
+        card = self._current_clip_view().selected_card()
+        if not card:
             return
-        pinned = bool(w._row("pinned", False))
-        self.on_pin_toggled(w.row_id, not pinned)
+        self.on_pin_toggled(card.row_id, not card.pinned)
 
     def _kb_paste_nth(self, index: int):
-        widgets = self._visible_clip_widgets()
-        if 0 <= index < len(widgets):
-            self._selected_clip_index = index
+        view = self._current_clip_view()
+        if 0 <= index < view.model().rowCount():
+            view.select_row(index)
             self._kb_paste_selected()
 
     def on_pin_toggled(self, row_id: int, pinned: bool):
@@ -1711,7 +1279,6 @@ class HistoryWindow(QWidget):
             self.storage.set_pinned(row_id, pinned)
         except Exception:
             return
-        self.reload_items()
 
     def on_save_as_snippet(self, row_id: int):
         try:
@@ -1737,63 +1304,14 @@ class HistoryWindow(QWidget):
         except Exception:
             pass
 
-    def on_item_meta_changed(self, row_id: int):
-        self.reload_items()
-
-    def on_item_added(self, row):
-        if not self.isVisible():
-            return
-
-        # Tümü sekmesine ekle
-        w = self._wire_clip_widget(ItemWidget(row, self.container_all))
-        w.setVisible(False)
-        try:
-            self.flow_all.insertWidget(0, w)
-        except Exception:
-            self.flow_all.addWidget(w)
-        self._items_all.insert(0, w)
-        self._reflow_now("all")
-        w.setVisible(self._match_row_text(row, (self.search.text() or "").lower().strip()))
-        
-        # Text sekmesine ekle (eğer metin ise)
-        item_type = int(row_val(row, "item_type", 0))
-        if item_type in (int(ClipItemType.TEXT), int(ClipItemType.HTML)):
-            w_text = self._wire_clip_widget(ItemWidget(row, self.container_text))
-            w_text.setVisible(False)
-            try:
-                self.flow_text.insertWidget(0, w_text)
-            except Exception:
-                self.flow_text.addWidget(w_text)
-            self._items_text.insert(0, w_text)
-            self._reflow_now("text")
-            w_text.setVisible(self._match_row_text(row, (self.search.text() or "").lower().strip()))
-        
-        # Resim sekmesine ekle (eğer resim ise)
-        if item_type == int(ClipItemType.IMAGE):
-            w_image = self._wire_clip_widget(ItemWidget(row, self.container_image))
-            w_image.setVisible(False)
-            try:
-                self.flow_image.insertWidget(0, w_image)
-            except Exception:
-                self.flow_image.addWidget(w_image)
-            self._items_image.insert(0, w_image)
-            self._reflow_now("image")
-            w_image.setVisible(self._match_row_text(row, (self.search.text() or "").lower().strip()))
-
-        # Dosya sekmesi
-        if item_type == int(ClipItemType.FILE):
-            w_file = self._wire_clip_widget(ItemWidget(row, self.container_files))
-            w_file.setVisible(False)
-            try:
-                self.flow_files.insertWidget(0, w_file)
-            except Exception:
-                self.flow_files.addWidget(w_file)
-            self._items_files.insert(0, w_file)
-            w_file.setVisible(True)
-        
-        if bool(row_val(row, "favorite", False)) or bool(row_val(row, "pinned", False)):
-            self._add_to_favorites_ui(row)
-        QTimer.singleShot(0, lambda: self._reflow_now("all"))
+    def _on_clip_change(self, change):
+        """
+        Storage olayı: her sekmenin modeli değişikliği kendi tip / favori /
+        arama filtresine göre uygular (pencere gizliyken de; açılışta yeniden
+        yükleme gerekmez).
+        """
+        for model in self._clip_models.values():
+            model.apply_change(change)
 
     def on_copy_requested(self, row_id: int, data_kind: ClipItemType, payload):
         try:
@@ -1808,7 +1326,8 @@ class HistoryWindow(QWidget):
             else:
                 probe_text = row.get("ocr_text") or ""
 
-            if probe_text and not ensure_sensitive_access(self.settings, probe_text, self):
+            categories = stored_categories(row, self.settings)
+            if probe_text and not ensure_sensitive_access(self.settings, probe_text, self, categories):
                 QMessageBox.warning(
                     self,
                     "Erişim Engellendi",
@@ -1822,6 +1341,10 @@ class HistoryWindow(QWidget):
         except Exception:
             kind = data_kind
 
+        # Kartlar yalnızca küçük resim taşır; tam görsel depodan gelir
+        if kind == ClipItemType.IMAGE and row and row.get("image_blob"):
+            payload = row["image_blob"]
+
         success = copy_to_clipboard_safely(self, kind, payload)
         if not success:
             QMessageBox.warning(
@@ -1852,38 +1375,23 @@ class HistoryWindow(QWidget):
             if mb.exec() != QMessageBox.Yes:
                 return
 
-        self._remove_item_from_ui(row_id)
-
         try:
             self.storage.delete_item(row_id)
-        except Exception:
-            # DB başarısızsa yeniden yükle
-            self.reload_items()
+        except Exception as e:
+            print(f"[ERROR] Öğe silinemedi: {e}")
 
     def on_favorite_toggled(self, row_id: int, fav: bool):
+        # Yıldızlar ve Favoriler sekmesi depo olayıyla güncellenir
         try:
             self.storage.set_favorite(row_id, fav)
         except Exception:
-            pass
-
-        # All sekmesindeki butonu senkronla
-        self._sync_star_in_all(row_id, fav)
-
-        # Favoriler UI
-        if fav:
-            w_all = self._find_in_list(self._items_all, row_id)
-            if w_all:
-                self._add_to_favorites_ui(w_all.row)
-        else:
-            self._remove_from_favorites_ui(row_id)
+            return
 
         if self.settings.get("show_toast", True) and self._toast:
             self._toast.show_message(
                 self._tr("item.favorited" if fav else "item.unfavorited",
                          "Added to favorites." if fav else "Removed from favorites.")
             )
-        self.apply_filter(self.search.text())
-        QTimer.singleShot(0, lambda: self._reflow_now("fav"))
 
     def clear_history(self):
         mb = QMessageBox(self)
@@ -1896,70 +1404,6 @@ class HistoryWindow(QWidget):
             return
 
         self.storage.clear_all()
-        self.reload_items()
-
-    # ---- helpers for favorites ----
-
-    def _find_in_list(self, lst: List[ItemWidget], row_id: int) -> Optional[ItemWidget]:
-        return next((w for w in lst if getattr(w, "row_id", None) == row_id), None)
-
-    def _sync_star_in_all(self, row_id: int, fav: bool):
-        w_all = self._find_in_list(self._items_all, row_id)
-        if not w_all:
-            return
-        if w_all.btn_fav.isChecked() != fav:
-            old = w_all.btn_fav.blockSignals(True)
-            try:
-                w_all.btn_fav.setChecked(fav)
-                w_all._apply_fav_icon()
-            finally:
-                w_all.btn_fav.blockSignals(old)
-
-    def _add_to_favorites_ui(self, row):
-        if any(getattr(w, "row_id", None) == row_val(row, "id") for w in self._items_fav):
-            return
-        row2 = row_to_dict(row)
-        row2["favorite"] = True
-
-        wf = ItemWidget(row2, self.container_fav)
-        wf.setVisible(False)
-        wf.on_copy_requested.connect(self.on_copy_requested)
-        wf.on_delete_requested.connect(self.on_delete_requested)
-        wf.on_favorite_toggled.connect(self.on_favorite_toggled)
-        try:
-            self.flow_fav.insertWidget(0, wf)
-        except Exception:
-            self.flow_fav.addWidget(wf)
-        self._items_fav.insert(0, wf)
-
-        self._reflow_now("fav")
-        wf.setVisible(self._match_row_text(row2, (self.search.text() or "").lower().strip()))
-        self._reflow_now("fav")
-
-    def _remove_from_favorites_ui(self, row_id: int):
-        idx = next((i for i, w in enumerate(self._items_fav) if getattr(w, "row_id", None) == row_id), -1)
-        if idx >= 0:
-            w = self._items_fav.pop(idx)
-            try:
-                self.flow_fav.removeWidget(w)
-            except Exception:
-                pass
-            w.setParent(None)
-            w.deleteLater()
-            self._reflow_now("fav")
-
-    def _remove_item_from_ui(self, row_id: int):
-        idx = next((i for i, w in enumerate(self._items_all) if getattr(w, "row_id", None) == row_id), -1)
-        if idx >= 0:
-            w = self._items_all.pop(idx)
-            try:
-                self.flow_all.removeWidget(w)
-            except Exception:
-                pass
-            w.setParent(None)
-            w.deleteLater()
-        self._remove_from_favorites_ui(row_id)
-        self._reflow_now("all")
 
     # ---------- Notlar: toplu sil ----------
     def _clear_all_notes(self):
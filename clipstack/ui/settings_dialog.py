@@ -23,6 +23,7 @@ from PySide6.QtWidgets import (
     QStyle,
     QFrame,
     QScrollArea,
+    QProgressDialog,
 )
 
 from ..settings import Settings
@@ -187,9 +188,11 @@ class KeyCaptureLineEdit(QLineEdit):
 class SettingsDialog(QDialog):
     applied = Signal()
 
-    def __init__(self, settings: Settings, parent=None):
+    def __init__(self, settings: Settings, parent=None, storage=None):
         super().__init__(parent)
         self.settings = settings
+        # Uygulamanın paylaşılan Storage örneği (dışa/içe aktarma ve senkronizasyon)
+        self.storage = storage
 
         self._sound_tester: SoundPlayer | None = None
         if is_sound_backend_available():
@@ -334,6 +337,12 @@ class SettingsDialog(QDialog):
         self.spn_max_items = QSpinBox()
         self.spn_max_items.setRange(100, 5000)
         self.spn_max_items.setValue(int(settings.get("max_items", 1000)))
+        self.spn_max_history_mb = QSpinBox()
+        self.spn_max_history_mb.setRange(0, 100000)
+        self.spn_max_history_mb.setSingleStep(50)
+        self.spn_max_history_mb.setSuffix(" MB")
+        self.spn_max_history_mb.setSpecialValueText(self._tr("settings.behavior.max_history_unlimited", "Sınırsız"))
+        self.spn_max_history_mb.setValue(int(settings.get("max_history_mb", 0) or 0))
         self.spn_dedupe_ms = QSpinBox()
         self.spn_dedupe_ms.setRange(0, 10000)
         self.spn_dedupe_ms.setValue(int(settings.get("dedupe_window_ms", 1200)))
@@ -343,6 +352,7 @@ class SettingsDialog(QDialog):
         form_b.addRow(self._tr("settings.behavior.hide_after_copy", "Kopyalama sonrası gizle"), self.tgl_hide_after_copy)
         form_b.addRow(self._tr("settings.behavior.stay_on_top", "Pencereyi üstte tut"), self.tgl_stay_on_top)
         form_b.addRow(self._tr("settings.behavior.max_items", "Maksimum öğe sayısı"), self.spn_max_items)
+        form_b.addRow(self._tr("settings.behavior.max_history_mb", "Geçmiş boyutu sınırı"), self.spn_max_history_mb)
         form_b.addRow(self._tr("settings.behavior.dedupe_ms", "Tekrar engelleme süresi (ms)"), self.spn_dedupe_ms)
         form_b.addRow(self._tr("settings.behavior.confirm_delete", "Silmeden önce onayla"), self.tgl_confirm_delete)
         form_b.addRow(self._tr("settings.behavior.show_toast", "Uygulama içi bildirimleri göster"), self.tgl_toast)
@@ -363,6 +373,12 @@ class SettingsDialog(QDialog):
 
         self.tgl_encrypt = ToggleSwitch(checked=bool(settings.get("encrypt_data", False)))
         form_s.addRow("Panoyu ve notları şifrele (AES-256)", self.tgl_encrypt)
+        self.tgl_encrypted_search = ToggleSwitch(checked=bool(settings.get("encrypted_search_index", False)))
+        self.tgl_encrypted_search.setToolTip(
+            "Şifreli geçmişte hızlı arama için kelime parçalarının anahtarlı özetlerini (HMAC) saklar.\n"
+            "Düz metin saklanmaz; ancak kelime tekrar sıklığı gibi bilgiler dolaylı olarak görülebilir."
+        )
+        form_s.addRow("Şifreli geçmişte hızlı arama indeksi", self.tgl_encrypted_search)
         
         # Google Authenticator (TOTP)
         form_s.addRow(QLabel(""))  # Boşluk
@@ -898,13 +914,13 @@ class SettingsDialog(QDialog):
         export_btns = QHBoxLayout()
         export_btns.setSpacing(8)
         
-        self.btn_export_json = QPushButton("📤 JSON Olarak Dışa Aktar")
+        self.btn_export_json = QPushButton("📤 Yedek Olarak Dışa Aktar")
         self.btn_export_json.setMinimumHeight(36)
         self.btn_export_json.setCursor(Qt.PointingHandCursor)
         self.btn_export_json.clicked.connect(self._export_to_json)
         export_btns.addWidget(self.btn_export_json)
         
-        self.btn_import_json = QPushButton("📥 JSON'dan İçe Aktar")
+        self.btn_import_json = QPushButton("📥 Yedekten İçe Aktar")
         self.btn_import_json.setMinimumHeight(36)
         self.btn_import_json.setCursor(Qt.PointingHandCursor)
         self.btn_import_json.clicked.connect(self._import_from_json)
@@ -912,12 +928,35 @@ class SettingsDialog(QDialog):
         
         form_sync.addRow("", export_btns)
         
+        # Anlık görüntü (veritabanı kopyası) butonları
+        snapshot_btns = QHBoxLayout()
+        snapshot_btns.setSpacing(8)
+        
+        self.btn_snapshot_backup = QPushButton("🗄️ Anlık Yedek Al")
+        self.btn_snapshot_backup.setMinimumHeight(36)
+        self.btn_snapshot_backup.setCursor(Qt.PointingHandCursor)
+        self.btn_snapshot_backup.clicked.connect(self._create_snapshot_backup)
+        snapshot_btns.addWidget(self.btn_snapshot_backup)
+        
+        self.btn_snapshot_restore = QPushButton("♻️ Anlık Yedekten Geri Yükle")
+        self.btn_snapshot_restore.setMinimumHeight(36)
+        self.btn_snapshot_restore.setCursor(Qt.PointingHandCursor)
+        self.btn_snapshot_restore.clicked.connect(self._restore_snapshot_backup)
+        snapshot_btns.addWidget(self.btn_snapshot_restore)
+        
+        form_sync.addRow("", snapshot_btns)
+        
         # Export Info
-        export_info = QLabel("ℹ️ JSON formatında tüm pano geçmişi, notlar, hatırlatmalar ve snippet'ler dışa aktarılır.")
+        export_info = QLabel("ℹ️ Tüm pano geçmişi, notlar, hatırlatmalar ve snippet'ler zip arşivine aktarılır. Eski JSON yedekleri de içe aktarılabilir.")
         export_info.setWordWrap(True)
         export_info.setStyleSheet("color: #666; font-size: 11px;")
         form_sync.addRow("", export_info)
         
+        snapshot_info = QLabel("ℹ️ Anlık yedek veritabanının sıkıştırılmış kopyasıdır; şifreli veriler yedekte de şifreli kalır. Geri yükleme mevcut verilerin yerine geçer.")
+        snapshot_info.setWordWrap(True)
+        snapshot_info.setStyleSheet("color: #666; font-size: 11px;")
+        form_sync.addRow("", snapshot_info)
+        
         # Ayırıcı
         form_sync.addRow(QLabel(""))
         
@@ -966,13 +1005,25 @@ class SettingsDialog(QDialog):
         self.lbl_last_sync.setStyleSheet("color: #888; font-size: 11px;")
         form_sync.addRow("", self.lbl_last_sync)
         
-        # Manuel sync
+        # Manuel sync (artımlı: yalnızca son eşitlemeden bu yana değişenler yüklenir)
+        cloud_btns = QHBoxLayout()
+        cloud_btns.setSpacing(8)
+        
         self.btn_sync_now = QPushButton("🔄 Şimdi Senkronize Et")
         self.btn_sync_now.setMinimumHeight(36)
         self.btn_sync_now.setEnabled(False)
         self.btn_sync_now.setCursor(Qt.PointingHandCursor)
         self.btn_sync_now.clicked.connect(self._sync_now)
-        form_sync.addRow("", self.btn_sync_now)
+        cloud_btns.addWidget(self.btn_sync_now)
+        
+        self.btn_cloud_restore = QPushButton("☁️ Drive'dan Geri Yükle")
+        self.btn_cloud_restore.setMinimumHeight(36)
+        self.btn_cloud_restore.setEnabled(False)
+        self.btn_cloud_restore.setCursor(Qt.PointingHandCursor)
+        self.btn_cloud_restore.clicked.connect(self._restore_from_cloud)
+        cloud_btns.addWidget(self.btn_cloud_restore)
+        
+        form_sync.addRow("", cloud_btns)
         
         # Ayırıcı
         form_sync.addRow(QLabel(""))
@@ -1102,6 +1153,11 @@ class SettingsDialog(QDialog):
         self._deferred_inited = False
         self._gdrive_status_thread: GoogleDriveStatusThread | None = None
         self._video_probe_thread: VideoProbeThread | None = None
+        self._archive_worker = None
+        self._cloud_buttons_enabled = False
+        self._archive_progress = None
+        self._archive_mode = None
+        self._archive_path = None
 
     def showEvent(self, event):
         super().showEvent(event)
@@ -1561,11 +1617,13 @@ class SettingsDialog(QDialog):
         self.settings.set("hide_after_copy", self.tgl_hide_after_copy.isChecked())
         self.settings.set("stay_on_top", self.tgl_stay_on_top.isChecked())
         self.settings.set("max_items", self.spn_max_items.value())
+        self.settings.set("max_history_mb", self.spn_max_history_mb.value())
         self.settings.set("dedupe_window_ms", self.spn_dedupe_ms.value())
         self.settings.set("confirm_delete", self.tgl_confirm_delete.isChecked())
         self.settings.set("show_toast", self.tgl_toast.isChecked())
 
         self.settings.set("encrypt_data", self.tgl_encrypt.isChecked())
+        self.settings.set("encrypted_search_index", self.tgl_encrypted_search.isChecked())
         
         # TOTP ayarları
         self.settings.set("totp_on_startup", self.tgl_totp_on_startup.isChecked())
@@ -1669,152 +1727,45 @@ class SettingsDialog(QDialog):
         self.accept()
 
     # ==================== SENKRONİZASYON METODLARI ====================
+
+    def _get_storage(self):
+        """Paylaşılan Storage; verilmemişse (bağımsız kullanım) bir kez açılır."""
+        if self.storage is None:
+            from clipstack.storage import Storage
+            data_dir = Path.home() / "AppData" / "Roaming" / "TaxClip"
+            self.storage = Storage(data_dir / "taxclip.db", self.settings)
+        return self.storage
     
     def _export_to_json(self):
-        """Tüm verileri JSON dosyasına aktar"""
-        import json
+        """Tüm verileri yedek arşivine (zip: NDJSON parçaları + görseller) aktar"""
         from datetime import datetime
         
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             self._tr("settings.sync.export_title", "Verileri Dışa Aktar"),
-            f"taxclip_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-            "JSON Files (*.json)"
+            f"taxclip_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+            "TaxClip Yedeği (*.zip)"
         )
         
         if not file_path:
             return
-            
-        try:
-            # Storage'dan verileri al
-            from pathlib import Path
-            from clipstack.storage import Storage
-            data_dir = Path.home() / "AppData" / "Roaming" / "TaxClip"
-            storage = Storage(data_dir / "taxclip.db", self.settings)
-            
-            export_data = {
-                "version": "1.0",
-                "exported_at": datetime.now().isoformat(),
-                "clips": [],
-                "notes": [],
-                "reminders": [],
-                "snippets": [],
-                "todos": [],
-                "drawings": [],
-                "settings": {}
-            }
-            
-            # Klipleri al
-            clips = storage.list_items(limit=10000)
-            for clip in clips:
-                clip_entry = {
-                    "id": clip.get("id"),
-                    "item_type": clip.get("item_type"),
-                    "text_content": clip.get("text_content"),
-                    "html_content": clip.get("html_content"),
-                    "favorite": clip.get("favorite"),
-                    "created_at": clip.get("created_at"),
-                    "ocr_text": clip.get("ocr_text")
-                }
-                # Resimleri base64 olarak ekle
-                if clip.get("image_blob"):
-                    import base64
-                    clip_entry["image_base64"] = base64.b64encode(clip["image_blob"]).decode("utf-8")
-                export_data["clips"].append(clip_entry)
-            
-            # Notları al
-            notes = storage.list_notes(limit=10000)
-            for note in notes:
-                export_data["notes"].append({
-                    "id": note.get("id"),
-                    "title": note.get("title", ""),
-                    "content": note.get("content"),
-                    "created_at": note.get("created_at"),
-                    "updated_at": note.get("updated_at")
-                })
-            
-            # Hatırlatıcıları al
-            reminders = storage.list_reminders(limit=10000)
-            for rem in reminders:
-                export_data["reminders"].append({
-                    "id": rem.get("id"),
-                    "title": rem.get("title"),
-                    "description": rem.get("description"),
-                    "reminder_time": rem.get("reminder_time"),
-                    "repeat": rem.get("repeat_type"),
-                    "completed": rem.get("completed")
-                })
-            
-            # Snippetları al
-            snippets = storage.list_snippets(limit=10000)
-            for snip in snippets:
-                export_data["snippets"].append({
-                    "id": snip.get("id"),
-                    "title": snip.get("title"),
-                    "content": snip.get("code"),
-                    "language": snip.get("language"),
-                    "tags": snip.get("tags"),
-                    "created_at": snip.get("created_at")
-                })
-            
-            # Todoları al
-            todos = storage.list_todos()
-            for todo in todos:
-                export_data["todos"].append({
-                    "id": todo.get("id"),
-                    "title": todo.get("content"),  # todos tablosunda 'content' kullanılıyor
-                    "completed": todo.get("completed"),
-                    "list_id": todo.get("list_id"),
-                    "created_at": todo.get("created_at")
-                })
-            
-            # Çizimleri al
-            drawings = storage.list_drawings(limit=10000)
-            for drawing in drawings:
-                export_data["drawings"].append({
-                    "id": drawing.get("id"),
-                    "title": drawing.get("title"),
-                    "image_data": drawing.get("image"),  # list_drawings 'image' olarak dönüyor
-                    "created_at": drawing.get("created_at")
-                })
-            
-            # Ayarları al
-            all_settings = self.settings._data.copy() if hasattr(self.settings, '_data') else {}
-            # Hassas verileri çıkar
-            safe_settings = {k: v for k, v in all_settings.items() 
-                           if not any(x in k.lower() for x in ['password', 'secret', 'key', 'token'])}
-            export_data["settings"] = safe_settings
-            
-            # JSON'a yaz
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, ensure_ascii=False, indent=2, default=str)
-            
-            total_items = (len(export_data["clips"]) + len(export_data["notes"]) + 
-                          len(export_data["reminders"]) + len(export_data["snippets"]) + 
-                          len(export_data["todos"]) + len(export_data["drawings"]))
-            
-            QMessageBox.information(
-                self,
-                self._tr("settings.sync.export_success", "Dışa Aktarma Başarılı"),
-                f"✅ {total_items} öğe başarıyla dışa aktarıldı!\n\n📁 {file_path}"
-            )
-            
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                self._tr("settings.sync.export_error", "Dışa Aktarma Hatası"),
-                f"❌ Dışa aktarma başarısız:\n{str(e)}"
-            )
+        
+        # Ayarlar GUI thread'inde kopyalanır; hassas anahtarlar arşivde çıkarılır
+        settings_data = self.settings._data.copy() if hasattr(self.settings, '_data') else {}
+        self._start_archive_job(
+            "export",
+            file_path,
+            self._tr("settings.sync.export_title", "Verileri Dışa Aktar"),
+            settings_data=settings_data,
+        )
     
     def _import_from_json(self):
-        """JSON dosyasından verileri içe aktar"""
-        import json
-        
+        """Yedek arşivinden (ya da eski JSON yedeğinden) verileri içe aktar"""
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             self._tr("settings.sync.import_title", "Verileri İçe Aktar"),
             "",
-            "JSON Files (*.json)"
+            "TaxClip Yedeği (*.zip *.json);;JSON Files (*.json)"
         )
         
         if not file_path:
@@ -1832,135 +1783,255 @@ class SettingsDialog(QDialog):
         
         if reply != QMessageBox.Yes:
             return
-            
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                import_data = json.load(f)
-            
-            from pathlib import Path
-            from clipstack.storage import Storage
-            data_dir = Path.home() / "AppData" / "Roaming" / "TaxClip"
-            storage = Storage(data_dir / "taxclip.db", self.settings)
-            
-            imported_counts = {
-                "clips": 0,
-                "notes": 0,
-                "reminders": 0,
-                "snippets": 0,
-                "todos": 0,
-                "drawings": 0
-            }
-            
-            # Klipleri içe aktar
-            from clipstack.storage import ClipItemType
-            for clip in import_data.get("clips", []):
-                try:
-                    item_type_val = clip.get("item_type", 1)
-                    item_type = ClipItemType(item_type_val) if isinstance(item_type_val, int) else ClipItemType.TEXT
-                    text_content = clip.get("text_content") or clip.get("content", "")
-                    html_content = clip.get("html_content")
-                    image_bytes = None
-                    if clip.get("image_base64"):
-                        import base64
-                        image_bytes = base64.b64decode(clip["image_base64"])
-                    created_at = clip.get("created_at") or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    storage.add_item(
-                        item_type=item_type,
-                        text=text_content,
-                        image_bytes=image_bytes,
-                        html=html_content,
-                        created_at=created_at,
-                        ocr_text=clip.get("ocr_text")
-                    )
-                    imported_counts["clips"] += 1
-                except Exception:
-                    pass
-            
-            # Notları içe aktar
-            for note in import_data.get("notes", []):
-                try:
-                    from datetime import datetime
-                    storage.add_note(
-                        content=note.get("content", ""),
-                        created_at=note.get("created_at") or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    )
-                    imported_counts["notes"] += 1
-                except:
-                    pass
-            
-            # Hatırlatıcıları içe aktar
-            for rem in import_data.get("reminders", []):
-                try:
-                    storage.add_reminder(
-                        title=rem.get("title", "İçe Aktarılan Hatırlatıcı"),
-                        description=rem.get("description", ""),
-                        reminder_time=rem.get("reminder_time"),
-                        repeat_type=rem.get("repeat", "none")
-                    )
-                    imported_counts["reminders"] += 1
-                except:
-                    pass
-            
-            # Snippetları içe aktar
-            for snip in import_data.get("snippets", []):
-                try:
-                    storage.add_snippet(
-                        title=snip.get("title", "İçe Aktarılan Snippet"),
-                        code=snip.get("content", ""),
-                        language=snip.get("language", "text"),
-                        tags=snip.get("tags", "")
-                    )
-                    imported_counts["snippets"] += 1
-                except:
-                    pass
-            
-            # Todoları içe aktar (varsayılan liste id=1)
-            for todo in import_data.get("todos", []):
-                try:
-                    storage.add_todo(
-                        list_id=1,  # Varsayılan liste
-                        content=todo.get("title", "") or todo.get("content", "İçe Aktarılan Görev")
-                    )
-                    imported_counts["todos"] += 1
-                except:
-                    pass
-            
-            # Çizimleri içe aktar
-            for drawing in import_data.get("drawings", []):
-                try:
-                    storage.add_drawing(
-                        image_data=drawing.get("image_data", ""),
-                        title=drawing.get("title", "İçe Aktarılan Çizim")
-                    )
-                    imported_counts["drawings"] += 1
-                except:
-                    pass
-            
-            total = sum(imported_counts.values())
-            
+        
+        self._start_archive_job(
+            "import",
+            file_path,
+            self._tr("settings.sync.import_title", "Verileri İçe Aktar"),
+        )
+    
+    def _create_snapshot_backup(self):
+        """Veritabanının sıkıştırılmış anlık görüntüsünü al (şifreli alanlar şifreli kalır)"""
+        from datetime import datetime
+        from clipstack.snapshot import SNAPSHOT_SUFFIX
+        
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            self._tr("settings.sync.snapshot_title", "Anlık Yedek Al"),
+            f"taxclip_snapshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}{SNAPSHOT_SUFFIX}",
+            f"TaxClip Anlık Yedeği (*{SNAPSHOT_SUFFIX})"
+        )
+        
+        if not file_path:
+            return
+        
+        self._start_archive_job(
+            "snapshot",
+            file_path,
+            self._tr("settings.sync.snapshot_title", "Anlık Yedek Al"),
+        )
+    
+    def _restore_snapshot_backup(self):
+        """Anlık yedeği arka planda hazırla; hazır olunca mevcut veritabanının yerine koy"""
+        from clipstack.snapshot import SNAPSHOT_SUFFIX
+        
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            self._tr("settings.sync.restore_title", "Anlık Yedekten Geri Yükle"),
+            "",
+            f"TaxClip Anlık Yedeği (*{SNAPSHOT_SUFFIX} *.db)"
+        )
+        
+        if not file_path:
+            return
+        
+        reply = QMessageBox.question(
+            self,
+            self._tr("settings.sync.restore_confirm_title", "Geri Yükleme Onayı"),
+            self._tr("settings.sync.restore_confirm_msg",
+                    "⚠️ Mevcut pano geçmişi, notlar ve diğer veriler yedektekilerle değiştirilecek.\n\nDevam etmek istiyor musunuz?"),
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        
+        if reply != QMessageBox.Yes:
+            return
+        
+        self._start_archive_job(
+            "restore",
+            file_path,
+            self._tr("settings.sync.restore_title", "Anlık Yedekten Geri Yükle"),
+        )
+    
+    def _start_archive_job(self, mode: str, file_path: str, title: str, settings_data: dict = None, drive=None):
+        """Dışa / içe aktarmayı ya da bulut yedeğini arka planda başlat; ilerleme penceresi iptal edilebilir."""
+        from clipstack.archive import ArchiveWorker
+        
+        if self._archive_worker is not None and self._archive_worker.is_running():
+            return
+        
+        storage = self._get_storage()
+        worker = ArchiveWorker(storage, on_thread_exit=storage.close_thread_connection)
+        worker.progress.connect(self._on_archive_progress)
+        worker.finished.connect(self._on_archive_finished)
+        worker.failed.connect(self._on_archive_failed)
+        worker.cancelled.connect(self._on_archive_cancelled)
+        
+        progress = QProgressDialog(
+            "⏳ " + title + "...",
+            self._tr("common.cancel", "İptal"),
+            0,
+            0,
+            self,
+        )
+        progress.setWindowTitle(title)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        progress.canceled.connect(worker.cancel)
+        
+        self._archive_worker = worker
+        self._archive_progress = progress
+        self._archive_mode = mode
+        self._archive_path = file_path
+        self._set_archive_buttons_enabled(False)
+        
+        if mode == "export":
+            worker.start_export(file_path, settings_data=settings_data)
+        elif mode == "snapshot":
+            worker.start_snapshot(file_path)
+        elif mode == "restore":
+            worker.start_restore(file_path)
+        elif mode == "cloud_backup":
+            worker.start_cloud_backup(drive)
+        elif mode == "cloud_restore":
+            worker.start_cloud_restore(drive)
+        else:
+            worker.start_import(file_path)
+    
+    def _set_archive_buttons_enabled(self, enabled: bool):
+        for button in (self.btn_export_json, self.btn_import_json, self.btn_snapshot_backup, self.btn_snapshot_restore):
+            button.setEnabled(enabled)
+        # Drive düğmeleri yalnızca bağlıyken açıktır; iş bitince önceki durumlarına döner
+        if not enabled:
+            self._cloud_buttons_enabled = self.btn_sync_now.isEnabled()
+        for button in (self.btn_sync_now, self.btn_cloud_restore):
+            button.setEnabled(enabled and self._cloud_buttons_enabled)
+    
+    def _on_archive_progress(self, done: int, total: int):
+        if self._archive_progress is None:
+            return
+        self._archive_progress.setMaximum(max(total, done, 1))
+        self._archive_progress.setValue(done)
+    
+    def _finish_archive_job(self):
+        if self._archive_progress is not None:
+            self._archive_progress.close()
+            self._archive_progress.deleteLater()
+            self._archive_progress = None
+        self._archive_worker = None
+        self._set_archive_buttons_enabled(True)
+    
+    def _on_archive_finished(self, counts: dict):
+        mode = self._archive_mode
+        self._finish_archive_job()
+        
+        if mode == "snapshot":
+            size_mb = counts.get("compressed_bytes", 0) / (1024 * 1024)
             QMessageBox.information(
                 self,
-                self._tr("settings.sync.import_success", "İçe Aktarma Başarılı"),
-                f"✅ Toplam {total} öğe başarıyla içe aktarıldı!\n\n"
-                f"📋 Klipler: {imported_counts['clips']}\n"
-                f"📝 Notlar: {imported_counts['notes']}\n"
-                f"⏰ Hatırlatıcılar: {imported_counts['reminders']}\n"
-                f"💻 Snippetlar: {imported_counts['snippets']}\n"
-                f"✅ Görevler: {imported_counts['todos']}\n"
-                f"🎨 Çizimler: {imported_counts['drawings']}"
+                self._tr("settings.sync.snapshot_success", "Anlık Yedek Alındı"),
+                f"✅ Veritabanı yedeklendi ({size_mb:.1f} MB).\n\n📁 {self._archive_path}"
             )
-            
-        except json.JSONDecodeError:
-            QMessageBox.critical(
+            return
+        
+        if mode == "restore":
+            self._apply_restored_snapshot(counts)
+            return
+        
+        if mode == "cloud_restore":
+            self._apply_restored_snapshot(counts, "✅ Veriler Google Drive yedeğinden geri yüklendi.")
+            return
+        
+        if mode == "cloud_backup":
+            from datetime import datetime
+            self.lbl_last_sync.setText(f"Son senkronizasyon: {datetime.now().strftime('%d.%m.%Y %H:%M')}")
+            if counts.get("mode") == "base":
+                size_mb = counts.get("bytes", 0) / (1024 * 1024)
+                message = f"✅ Tam yedek Google Drive'a yüklendi ({size_mb:.1f} MB)."
+            elif counts.get("mode") == "delta":
+                size_kb = counts.get("bytes", 0) / 1024
+                message = f"✅ {counts.get('records', 0)} değişiklik Google Drive'a yüklendi ({size_kb:.0f} KB)."
+            else:
+                message = "✅ Yedek güncel, yüklenecek değişiklik yok."
+            QMessageBox.information(
                 self,
-                self._tr("settings.sync.import_error", "İçe Aktarma Hatası"),
-                "❌ Geçersiz JSON dosyası!"
+                self._tr("settings.sync.sync_success", "Senkronizasyon Başarılı"),
+                message
+            )
+            return
+        
+        if mode == "export":
+            total_items = sum(counts.get(name, 0) for name in ("clips", "notes", "reminders", "snippets", "todos", "drawings"))
+            QMessageBox.information(
+                self,
+                self._tr("settings.sync.export_success", "Dışa Aktarma Başarılı"),
+                f"✅ {total_items} öğe başarıyla dışa aktarıldı!\n\n📁 {self._archive_path}"
             )
+            return
+        
+        total = sum(counts.get(name, 0) for name in ("clips", "notes", "reminders", "snippets", "todos", "drawings"))
+        QMessageBox.information(
+            self,
+            self._tr("settings.sync.import_success", "İçe Aktarma Başarılı"),
+            f"✅ Toplam {total} öğe başarıyla içe aktarıldı!\n\n"
+            f"📋 Klipler: {counts.get('clips', 0)} (atlanan: {counts.get('skipped', 0)})\n"
+            f"📝 Notlar: {counts.get('notes', 0)}\n"
+            f"⏰ Hatırlatıcılar: {counts.get('reminders', 0)}\n"
+            f"💻 Snippetlar: {counts.get('snippets', 0)}\n"
+            f"✅ Görevler: {counts.get('todos', 0)}\n"
+            f"🎨 Çizimler: {counts.get('drawings', 0)}"
+        )
+    
+    def _apply_restored_snapshot(self, result: dict, message: str = "✅ Veriler anlık yedekten geri yüklendi."):
+        """Hazırlanan veritabanını GUI thread'inde tek adımda yerine koy"""
+        from clipstack.snapshot import discard_restore
+        
+        try:
+            self._get_storage().replace_database(Path(result["staged"]))
         except Exception as e:
+            discard_restore(result)
+            QMessageBox.critical(
+                self,
+                self._tr("settings.sync.restore_error", "Geri Yükleme Hatası"),
+                f"❌ Geri yükleme başarısız, mevcut veriler korundu:\n{str(e)}"
+            )
+            return
+        QMessageBox.information(
+            self,
+            self._tr("settings.sync.restore_success", "Geri Yükleme Başarılı"),
+            message
+        )
+    
+    def _on_archive_failed(self, error: str):
+        mode = self._archive_mode
+        self._finish_archive_job()
+        if mode in ("snapshot", "restore", "cloud_restore"):
+            QMessageBox.critical(
+                self,
+                self._tr("settings.sync.restore_error", "Geri Yükleme Hatası") if mode in ("restore", "cloud_restore")
+                else self._tr("settings.sync.snapshot_error", "Yedekleme Hatası"),
+                f"❌ İşlem başarısız:\n{error}"
+            )
+        elif mode == "cloud_backup":
+            QMessageBox.critical(
+                self,
+                self._tr("settings.sync.sync_error", "Senkronizasyon Hatası"),
+                f"❌ Senkronizasyon başarısız:\n{error}"
+            )
+        elif mode == "export":
+            QMessageBox.critical(
+                self,
+                self._tr("settings.sync.export_error", "Dışa Aktarma Hatası"),
+                f"❌ Dışa aktarma başarısız:\n{error}"
+            )
+        else:
             QMessageBox.critical(
                 self,
                 self._tr("settings.sync.import_error", "İçe Aktarma Hatası"),
-                f"❌ İçe aktarma başarısız:\n{str(e)}"
+                f"❌ İçe aktarma başarısız:\n{error}"
+            )
+    
+    def _on_archive_cancelled(self):
+        mode = self._archive_mode
+        self._finish_archive_job()
+        if mode == "import":
+            # Tamamlanan partiler geri alınmaz
+            QMessageBox.information(
+                self,
+                self._tr("settings.sync.import_title", "Verileri İçe Aktar"),
+                "İçe aktarma iptal edildi; o ana kadar eklenen öğeler korundu."
             )
     
     def _connect_google_drive(self):
@@ -2027,11 +2098,13 @@ class SettingsDialog(QDialog):
             self.lbl_gdrive_status.setStyleSheet("color: #4CAF50; font-weight: bold;")
             self.btn_gdrive_connect.setText("🔓 Bağlantıyı Kes")
             self.btn_sync_now.setEnabled(True)
+            self.btn_cloud_restore.setEnabled(True)
         else:
             self.lbl_gdrive_status.setText("❌ Bağlı Değil")
             self.lbl_gdrive_status.setStyleSheet("color: #f44336; font-weight: bold;")
             self.btn_gdrive_connect.setText("🔗 Google Drive'a Bağlan")
             self.btn_sync_now.setEnabled(False)
+            self.btn_cloud_restore.setEnabled(False)
 
     def _check_gdrive_status_async(self):
         if self._gdrive_status_thread and self._gdrive_status_thread.isRunning():
@@ -2053,11 +2126,13 @@ class SettingsDialog(QDialog):
             self.lbl_gdrive_status.setStyleSheet("color: #4CAF50; font-weight: bold;")
             self.btn_gdrive_connect.setText("🔓 Bağlantıyı Kes")
             self.btn_sync_now.setEnabled(True)
+            self.btn_cloud_restore.setEnabled(True)
         else:
             self.lbl_gdrive_status.setText("❌ Bağlı Değil")
             self.lbl_gdrive_status.setStyleSheet("color: #f44336; font-weight: bold;")
             self.btn_gdrive_connect.setText("🔗 Google Drive'a Bağlan")
             self.btn_sync_now.setEnabled(False)
+            self.btn_cloud_restore.setEnabled(False)
         self._gdrive_status_thread = None
 
     def _apply_gdrive_status_failure(self, error: str):
@@ -2066,10 +2141,11 @@ class SettingsDialog(QDialog):
         self.lbl_gdrive_status.setStyleSheet("color: #f44336; font-weight: bold;")
         self.btn_gdrive_connect.setText("🔗 Google Drive'a Bağlan")
         self.btn_sync_now.setEnabled(False)
+        self.btn_cloud_restore.setEnabled(False)
         self._gdrive_status_thread = None
     
     def _sync_now(self):
-        """Manuel senkronizasyon başlat - Google Drive'a yedekle"""
+        """Google Drive'a artımlı yedek: yalnızca son eşitlemeden bu yana değişenler yüklenir"""
         from clipstack.gdrive_sync import GoogleDriveSync
         
         sync = GoogleDriveSync(self.settings)
@@ -2082,74 +2158,45 @@ class SettingsDialog(QDialog):
             )
             return
         
-        try:
-            # Export verilerini hazırla
-            import json
-            from datetime import datetime
-            from pathlib import Path
-            from clipstack.storage import Storage
-            
-            data_dir = Path.home() / "AppData" / "Roaming" / "TaxClip"
-            storage = Storage(data_dir / "taxclip.db", self.settings)
-            
-            export_data = {
-                "version": "1.0",
-                "exported_at": datetime.now().isoformat(),
-                "clips": [],
-                "notes": [],
-                "reminders": [],
-                "snippets": [],
-                "todos": [],
-                "drawings": []
-            }
-            
-            # Verileri topla
-            clips = storage.list_items(limit=10000)
-            for clip in clips:
-                clip_entry = {
-                    "id": clip.get("id"),
-                    "item_type": clip.get("item_type"),
-                    "text_content": clip.get("text_content"),
-                    "html_content": clip.get("html_content"),
-                    "favorite": clip.get("favorite"),
-                    "created_at": clip.get("created_at"),
-                    "ocr_text": clip.get("ocr_text")
-                }
-                if clip.get("image_blob"):
-                    import base64
-                    clip_entry["image_base64"] = base64.b64encode(clip["image_blob"]).decode("utf-8")
-                export_data["clips"].append(clip_entry)
-            
-            export_data["notes"] = storage.list_notes(limit=10000)
-            export_data["reminders"] = storage.list_reminders(limit=10000)
-            export_data["snippets"] = storage.list_snippets(limit=10000)
-            export_data["todos"] = storage.list_todos()
-            export_data["drawings"] = storage.list_drawings(limit=10000)
-            
-            json_data = json.dumps(export_data, ensure_ascii=False, indent=2, default=str)
-            
-            # Google Drive'a yükle
-            success, result = sync.upload_backup(json_data)
-            
-            if success:
-                QMessageBox.information(
-                    self,
-                    self._tr("settings.sync.sync_success", "Senkronizasyon Başarılı"),
-                    f"✅ Veriler Google Drive'a yedeklendi!\n\nDosya ID: {result}"
-                )
-            else:
-                QMessageBox.warning(
-                    self,
-                    self._tr("settings.sync.sync_error", "Senkronizasyon Hatası"),
-                    f"❌ {result}"
-                )
+        self._start_archive_job(
+            "cloud_backup",
+            None,
+            self._tr("settings.sync.sync_title", "Google Drive'a Yedekle"),
+            drive=sync,
+        )
+    
+    def _restore_from_cloud(self):
+        """Google Drive'daki taban yedeği ve sonraki değişiklikleri indirip geri yükle"""
+        from clipstack.gdrive_sync import GoogleDriveSync
         
-        except Exception as e:
-            QMessageBox.critical(
+        sync = GoogleDriveSync(self.settings)
+        
+        if not sync.is_connected():
+            QMessageBox.warning(
                 self,
-                self._tr("settings.sync.sync_error", "Senkronizasyon Hatası"),
-                f"❌ Senkronizasyon başarısız:\n{str(e)}"
+                self._tr("settings.sync.not_connected", "Bağlı Değil"),
+                "Önce Google Drive'a bağlanmalısınız."
             )
+            return
+        
+        reply = QMessageBox.question(
+            self,
+            self._tr("settings.sync.restore_confirm_title", "Geri Yükleme Onayı"),
+            self._tr("settings.sync.cloud_restore_confirm_msg",
+                    "⚠️ Mevcut pano geçmişi, notlar ve diğer veriler Google Drive'daki yedekle değiştirilecek.\n\nDevam etmek istiyor musunuz?"),
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        
+        if reply != QMessageBox.Yes:
+            return
+        
+        self._start_archive_job(
+            "cloud_restore",
+            None,
+            self._tr("settings.sync.cloud_restore_title", "Drive'dan Geri Yükle"),
+            drive=sync,
+        )
 
     def _check_for_updates(self):
         """GitHub'dan güncelleme kontrolü yap"""
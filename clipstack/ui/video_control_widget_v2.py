@@ -144,7 +144,7 @@ class VideoControlWidgetV2(QWidget):
 
         pixmap = icon_pixmap(icon_path, size=60, color=icon_color)
         btn.setIcon(pixmap)
-        btn.setIconSize(pixmap.size())
+        btn.setIconSize(pixmap.deviceIndependentSize().toSize())
         btn.setText("")
         btn.setToolTip(spec["active_tooltip"] if active else spec["tooltip"])
         btn.setStyleSheet(f"""
@@ -1,9 +1,12 @@
+import functools
 import sys
 import time
+from collections import OrderedDict
 from pathlib import Path
+from typing import Iterable
 
 from PySide6.QtCore import QByteArray, QMimeData, Qt, QSize, QUrl
-from PySide6.QtGui import QClipboard, QColor, QIcon, QImage, QPainter, QPixmap
+from PySide6.QtGui import QClipboard, QColor, QGuiApplication, QIcon, QImage, QPainter, QPixmap
 from PySide6.QtWidgets import QApplication, QSystemTrayIcon
 
 from .storage import ClipItemType
@@ -32,6 +35,87 @@ def _normalize_color(color) -> QColor | None:
     return qcolor if qcolor.isValid() else None
 
 
+# Süreç genelinde ikon önbelleği: (dosya, genişlik, yükseklik, renk, DPR) -> QPixmap.
+# Kartlar ve araç çubukları aynı birkaç ikonu tekrar tekrar ister; SVG her
+# seferinde yeniden ayrıştırılıp renklendirilmez.
+_ICON_CACHE_LIMIT = 256
+_icon_cache: "OrderedDict[tuple, QPixmap]" = OrderedDict()
+
+# Açılışta önceden hazırlanan, kart ve araç çubuklarında sık kullanılan ikonlar
+COMMON_ICONS = (
+    "assets/icons/copy.svg",
+    "assets/icons/expand.svg",
+    "assets/icons/edit.svg",
+    "assets/icons/delete.svg",
+    "assets/icons/share.svg",
+    "assets/icons/star_on.svg",
+    "assets/icons/star_off.svg",
+    "assets/icons/clear.svg",
+    "assets/icons/gear.svg",
+)
+
+
+def _device_pixel_ratio() -> float:
+    app = QGuiApplication.instance()
+    try:
+        return float(app.devicePixelRatio()) if app is not None else 1.0
+    except AttributeError:  # yalnızca QCoreApplication
+        return 1.0
+
+
+def _tint_image_numpy(image: QImage, hue: int, saturation: int) -> bool:
+    """
+    ARGB32 tamponunu yerinde renklendir (piksel döngüsüyle aynı HSL kuralları).
+    NumPy yoksa False döner.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return False
+
+    width, height = image.width(), image.height()
+    buffer = np.frombuffer(image.bits(), dtype=np.uint8)
+    pixels = buffer.reshape(height, image.bytesPerLine())[:, : width * 4].reshape(height, width, 4)
+    # Format_ARGB32 bellekte 0xAARRGGBB tamsayılarıdır
+    b, g, r, a = (0, 1, 2, 3) if sys.byteorder == "little" else (3, 2, 1, 0)
+    red = pixels[..., r].astype(np.int32)
+    green = pixels[..., g].astype(np.int32)
+    blue = pixels[..., b].astype(np.int32)
+
+    mask = (pixels[..., a] > 0) & ~((red > 240) & (green > 240) & (blue > 240))
+    if not mask.any():
+        return True
+
+    # QColor.lightness(): (max + min) / 2, yarımlar yukarı yuvarlanır
+    lightness = (np.maximum(np.maximum(red, green), blue) + np.minimum(np.minimum(red, green), blue) + 1) // 2
+    lightness = np.maximum(lightness[mask], 18)
+
+    if saturation <= 5:
+        channels = (lightness, lightness, lightness)
+    else:
+        # QColor.fromHsl -> RGB (16 bit ara değerler, Qt ile aynı yuvarlama)
+        h = hue / 360.0
+        s = saturation / 255.0
+        l = lightness / 255.0
+        q = np.where(l < 0.5, l * (1 + s), l + s - l * s)
+        p = 2 * l - q
+        channels = []
+        for offset in (1.0 / 3.0, 0.0, -1.0 / 3.0):
+            t = (h + offset) % 1.0
+            c = np.where(
+                6 * t < 1,
+                p + (q - p) * 6 * t,
+                np.where(2 * t < 1, q, np.where(3 * t < 2, p + (q - p) * (2.0 / 3.0 - t) * 6, p)),
+            )
+            c16 = np.rint(c * 65535).astype(np.int32)
+            channels.append((c16 - (c16 >> 8) + 0x80) >> 8)
+
+    pixels[..., r][mask] = channels[0]
+    pixels[..., g][mask] = channels[1]
+    pixels[..., b][mask] = channels[2]
+    return True
+
+
 def _tint_pixmap_preserving_highlights(pixmap: QPixmap, color: QColor) -> QPixmap:
     if pixmap.isNull() or not color or not color.isValid():
         return pixmap
@@ -40,6 +124,11 @@ def _tint_pixmap_preserving_highlights(pixmap: QPixmap, color: QColor) -> QPixma
     hue = color.hslHue() if color.hslHue() >= 0 else 0
     saturation = color.hslSaturation()
 
+    if _tint_image_numpy(image, hue, saturation):
+        tinted_pixmap = QPixmap.fromImage(image)
+        tinted_pixmap.setDevicePixelRatio(pixmap.devicePixelRatio())
+        return tinted_pixmap
+
     for y in range(image.height()):
         for x in range(image.width()):
             pixel = image.pixelColor(x, y)
@@ -55,18 +144,51 @@ def _tint_pixmap_preserving_highlights(pixmap: QPixmap, color: QColor) -> QPixma
                 tinted = QColor.fromHsl(hue, saturation, lightness, pixel.alpha())
             image.setPixelColor(x, y, tinted)
 
-    return QPixmap.fromImage(image)
+    tinted_pixmap = QPixmap.fromImage(image)
+    tinted_pixmap.setDevicePixelRatio(pixmap.devicePixelRatio())
+    return tinted_pixmap
 
 
 def icon_pixmap(path_or_rel, size: int = 64, color=None) -> QPixmap:
-    """Dosyadan pixmap üretir, istenirse renklendirir."""
+    """
+    Dosyadan pixmap üretir, istenirse renklendirir. Sonuç ekranın piksel
+    oranında çizilir ve süreç genelindeki önbellekte tutulur.
+    """
+    p = _icon_path(str(path_or_rel))
+    target_size = _normalize_icon_size(size)
+    tint_color = _normalize_color(color)
+    dpr = _device_pixel_ratio()
+    key = (
+        str(p),
+        target_size.width(),
+        target_size.height(),
+        tint_color.name(QColor.HexArgb) if tint_color else None,
+        dpr,
+    )
+    cached = _icon_cache.get(key)
+    if cached is not None:
+        _icon_cache.move_to_end(key)
+        return cached
+
+    pixmap = _render_icon(p, target_size, tint_color, dpr)
+    if not pixmap.isNull():
+        _icon_cache[key] = pixmap
+        while len(_icon_cache) > _ICON_CACHE_LIMIT:
+            _icon_cache.popitem(last=False)
+    return pixmap
+
+
+@functools.lru_cache(maxsize=512)
+def _icon_path(path_or_rel: str) -> Path:
     p = Path(path_or_rel)
-    if not p.is_absolute():
-        p = resource_path(str(path_or_rel))
+    return p if p.is_absolute() else resource_path(path_or_rel)
+
+
+def _render_icon(p: Path, logical_size: QSize, tint_color: QColor | None, dpr: float) -> QPixmap:
     if not p.exists():
         return QPixmap()
 
-    target_size = _normalize_icon_size(size)
+    target_size = QSize(round(logical_size.width() * dpr), round(logical_size.height() * dpr))
 
     if not str(p).lower().endswith((".svg", ".svgz")):
         pixmap = QPixmap(str(p))
@@ -92,14 +214,24 @@ def icon_pixmap(path_or_rel, size: int = 64, color=None) -> QPixmap:
 
     if pixmap.size() != target_size:
         pixmap = pixmap.scaled(target_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    pixmap.setDevicePixelRatio(dpr)
 
-    tint_color = _normalize_color(color)
     if tint_color:
         pixmap = _tint_pixmap_preserving_highlights(pixmap, tint_color)
 
     return pixmap
 
 
+def warm_icon_cache(paths: Iterable[str] = COMMON_ICONS, size: int = 64, color=None) -> int:
+    """Sık kullanılan ikonları önceden çiz; önbelleğe alınan ikon sayısı döner."""
+    return sum(1 for path in paths if not icon_pixmap(path, size=size, color=color).isNull())
+
+
+def clear_icon_cache() -> None:
+    """Tema / ekran değişince ikonları yeniden çizdirmek için önbelleği boşalt."""
+    _icon_cache.clear()
+
+
 def svg_icon(path_or_rel, size: int = 64, color=None) -> QIcon:
     """Dosyadan QIcon üretir, istenirse renklendirir."""
     pixmap = icon_pixmap(path_or_rel, size=size, color=color)
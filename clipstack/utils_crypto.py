@@ -49,6 +49,11 @@ def encrypt_aes256(text: str, password: str) -> str:
 
 _BLOB_MAGIC = b"ENC1"
 
+# Sürüm 2 zarf: anahtar oturum başına bir kez (veritabanı tuzu ile) türetilir,
+# kayıt başına yalnızca nonce + tag + ciphertext saklanır.
+_TEXT_ENVELOPE_V2 = "ENC2:"
+_BLOB_MAGIC_V2 = b"ENC2"
+
 
 def encrypt_bytes(data: bytes, password: str) -> bytes:
     """Binary veri için AES-256-GCM şifreleme. Format: ENC1 + salt + nonce + tag + ciphertext"""
@@ -101,6 +106,97 @@ def decrypt_aes256(b64text: str, password: str) -> str:
     except Exception as exc:
         raise ValueError("Unable to decrypt payload with the supplied password or data format") from exc
 
+def derive_master_key(password: str, salt: bytes) -> bytes:
+    """Veritabanı tuzundan oturum ana anahtarını türet (kilit açılışında bir kez)."""
+    return _pbkdf2_key(password, salt)
+
+
+def derive_subkey(master_key: bytes, label: bytes) -> bytes:
+    """Ana anahtardan amaca özel alt anahtar türet (HMAC-SHA256)."""
+    return hmac.new(master_key, b"taxclip/" + label, hashlib.sha256).digest()
+
+
+def blind_index_token(index_key: bytes, value: str) -> bytes:
+    """Kör indeks için anahtarlı token (HMAC-SHA256, 16 byte'a kısaltılmış)."""
+    return hmac.new(index_key, value.encode("utf-8"), hashlib.sha256).digest()[:16]
+
+
+def is_v2_text_envelope(value) -> bool:
+    return isinstance(value, str) and value.startswith(_TEXT_ENVELOPE_V2)
+
+
+def is_v2_blob_envelope(data) -> bool:
+    return isinstance(data, (bytes, bytearray)) and bytes(data[:4]) == _BLOB_MAGIC_V2
+
+
+def encrypt_text_with_key(text: str, key: bytes) -> str:
+    """
+    Türetilmiş anahtarla AES-256-GCM şifrele (PBKDF2 yok).
+
+    Format: "ENC2:" + base64(nonce + tag + ciphertext)
+    """
+    nonce = get_random_bytes(12)
+    cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
+    ciphertext, tag = cipher.encrypt_and_digest(text.encode("utf-8"))
+    return _TEXT_ENVELOPE_V2 + base64.b64encode(nonce + tag + ciphertext).decode("utf-8")
+
+
+def decrypt_text_with_key(value: str, key: bytes) -> str:
+    """ENC2 metin zarfını türetilmiş anahtarla çöz."""
+    if not is_v2_text_envelope(value):
+        raise ValueError("Unsupported encrypted payload format")
+    try:
+        raw = base64.b64decode(value[len(_TEXT_ENVELOPE_V2):].encode("utf-8"), validate=True)
+    except (binascii.Error, ValueError) as exc:
+        raise ValueError("Encrypted payload is not valid base64") from exc
+    if len(raw) < 28:
+        raise ValueError("Unsupported encrypted payload format")
+    try:
+        cipher = AES.new(key, AES.MODE_GCM, nonce=raw[:12])
+        return cipher.decrypt_and_verify(raw[28:], raw[12:28]).decode("utf-8")
+    except Exception as exc:
+        raise ValueError("Unable to decrypt payload with the supplied key") from exc
+
+
+def encrypt_bytes_with_key(data: bytes, key: bytes) -> bytes:
+    """Binary veri için türetilmiş anahtarla şifreleme. Format: ENC2 + nonce + tag + ciphertext"""
+    if not data:
+        return data
+    nonce = get_random_bytes(12)
+    cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
+    ciphertext, tag = cipher.encrypt_and_digest(data)
+    return _BLOB_MAGIC_V2 + nonce + tag + ciphertext
+
+
+def decrypt_bytes_with_key(data: bytes, key: bytes) -> bytes:
+    """ENC2 binary zarfını çöz. ENC2 olmayan veriler olduğu gibi döner."""
+    if not is_v2_blob_envelope(data):
+        return data
+    raw = bytes(data[len(_BLOB_MAGIC_V2):])
+    if len(raw) < 28:
+        raise ValueError("Unsupported encrypted blob format")
+    cipher = AES.new(key, AES.MODE_GCM, nonce=raw[:12])
+    return cipher.decrypt_and_verify(raw[28:], raw[12:28])
+
+
+def decrypt_text_envelope(value: str, password: str, key: bytes = None) -> str:
+    """ENC2 zarfını anahtarla, eski (kayıt başına tuzlu) zarfı parola ile çöz."""
+    if is_v2_text_envelope(value):
+        if key is None:
+            raise ValueError("Session key is required for ENC2 payloads")
+        return decrypt_text_with_key(value, key)
+    return decrypt_aes256(value, password)
+
+
+def decrypt_bytes_envelope(data: bytes, password: str, key: bytes = None) -> bytes:
+    """ENC2 / ENC1 binary zarflarını çöz; şifresiz veriler olduğu gibi döner."""
+    if is_v2_blob_envelope(data):
+        if key is None:
+            raise ValueError("Session key is required for ENC2 blobs")
+        return decrypt_bytes_with_key(data, key)
+    return decrypt_bytes(data, password)
+
+
 def generate_secure_password(length: int = 32) -> str:
     """Güvenli rastgele şifre üret (mod bias yok)"""
     alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789!@#$%^&*"
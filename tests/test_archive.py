@@ -0,0 +1,216 @@
+import json
+import sqlite3
+import tempfile
+import threading
+import unittest
+import zipfile
+from pathlib import Path
+
+from PySide6.QtCore import Qt
+
+from clipstack.archive import (
+    ArchiveCancelled,
+    ArchiveWorker,
+    export_archive,
+    import_archive,
+)
+from clipstack.storage import ClipChangeKind, ClipItemType, Storage
+
+
+class _FakeSettings:
+    def __init__(self, **values):
+        self.values = {"max_items": 1000}
+        self.values.update(values)
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+def _png_bytes(width, height):
+    from PySide6.QtCore import QBuffer, QIODevice
+    from PySide6.QtGui import QColor, QImage
+
+    image = QImage(width, height, QImage.Format_ARGB32)
+    image.fill(QColor(20, 120, 220))
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(buffer.data())
+
+
+class ArchiveRoundTripTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.storages = []
+
+    def tearDown(self):
+        for storage in self.storages:
+            storage.stop_background_tasks()
+            storage.conn.close()
+        self._tmp.cleanup()
+
+    def _storage(self, name, **settings):
+        storage = Storage(self.root / name, _FakeSettings(**settings))
+        self.storages.append(storage)
+        return storage
+
+    def _fill(self, storage):
+        self.image = _png_bytes(40, 30)
+        storage.add_item(ClipItemType.TEXT, "merhaba dünya", None, None, "2024-01-01 10:00:00")
+        storage.add_item(ClipItemType.IMAGE, None, self.image, None, "2024-01-01 10:01:00", ocr_text="fatura")
+        html = storage.add_item(ClipItemType.HTML, "kalın", None, "<b>kalın</b>", "2024-01-01 10:02:00")
+        storage.set_favorite(html["id"], True)
+        storage.add_note("not içeriği", "2024-01-02 09:00:00")
+        storage.add_reminder("toplantı", "oda 3", "2030-01-01 09:00:00")
+        storage.add_snippet("selam", "print('selam')", "python", "demo")
+
+    def _texts(self, storage):
+        return sorted(
+            (row["item_type"], row["text_content"] or "", row["created_at"])
+            for row in storage.list_items(limit=100)
+        )
+
+    def test_export_writes_chunked_ndjson_with_binary_images(self):
+        source = self._storage("source.db")
+        self._fill(source)
+        path = self.root / "backup.zip"
+
+        counts = export_archive(source, path, settings_data={"theme": "dark", "encryption_key": "gizli"}, chunk_size=2)
+
+        self.assertEqual(counts["clips"], 3)
+        self.assertEqual(counts["images"], 1)
+        with zipfile.ZipFile(path) as archive:
+            names = archive.namelist()
+            self.assertIn("clips/000001.ndjson", names)
+            self.assertIn("clips/000002.ndjson", names)
+            image_members = [name for name in names if name.startswith("images/")]
+            self.assertEqual(len(image_members), 1)
+            self.assertEqual(archive.read(image_members[0]), self.image)
+            self.assertEqual(archive.getinfo(image_members[0]).compress_type, zipfile.ZIP_STORED)
+            first_chunk = archive.read("clips/000001.ndjson").decode("utf-8").splitlines()
+            self.assertEqual(len(first_chunk), 2)
+            self.assertNotIn("image_base64", first_chunk[1])
+            self.assertEqual(json.loads(archive.read("settings.json")), {"theme": "dark"})
+            self.assertEqual(json.loads(archive.read("manifest.json"))["counts"]["notes"], 1)
+        self.assertFalse(path.with_name("backup.zip.part").exists())
+
+    def test_import_round_trips_and_skips_duplicates(self):
+        source = self._storage("source.db")
+        self._fill(source)
+        path = self.root / "backup.zip"
+        export_archive(source, path)
+
+        target = self._storage("target.db", encrypt_data=True, encryption_key="hedef parola")
+        target.add_item(ClipItemType.TEXT, "merhaba dünya", None, None, "2023-12-31 08:00:00")
+        changes = []
+        target.subscribe_clip_changes(changes.append)
+        progress = []
+
+        counts = import_archive(target, path, progress=lambda done, total: progress.append((done, total)))
+
+        self.assertEqual(counts["clips"], 2)
+        self.assertEqual(counts["skipped"], 1)
+        self.assertEqual((counts["notes"], counts["reminders"], counts["snippets"]), (1, 1, 1))
+        self.assertEqual(progress[-1], (6, 6))
+        inserts = [change for change in changes if change.kind == ClipChangeKind.INSERTED]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(len(inserts[0].rows), 2)
+
+        image_row = next(row for row in target.list_items(limit=10) if row["item_type"] == int(ClipItemType.IMAGE))
+        self.assertEqual(target.get_item(image_row["id"])["image_blob"], self.image)
+        self.assertEqual(image_row["ocr_text"], "fatura")
+        self.assertTrue(image_row["thumb_blob"])
+        html_row = next(row for row in target.list_items(limit=10) if row["item_type"] == int(ClipItemType.HTML))
+        self.assertEqual(html_row["favorite"], 1)
+        self.assertEqual(target.list_notes()[0]["content"], "not içeriği")
+        self.assertEqual([row["id"] for row in target.search_items("fatura")], [image_row["id"]])
+
+        # Şifreli hedefte alanlar diskte şifreli durur
+        conn = sqlite3.connect(str(self.root / "target.db"))
+        try:
+            raw = conn.execute("SELECT content FROM notes").fetchone()[0]
+            raw_clip = conn.execute("SELECT text_content FROM clip_items WHERE id = ?", (html_row["id"],)).fetchone()[0]
+        finally:
+            conn.close()
+        self.assertTrue(raw.startswith("ENC2:"))
+        self.assertTrue(raw_clip.startswith("ENC2:"))
+
+        # Aynı yedeği tekrar almak pano kaydı eklemez
+        again = import_archive(target, path)
+        self.assertEqual(again["clips"], 0)
+        self.assertEqual(again["skipped"], 3)
+
+    def test_import_reads_legacy_json_backup(self):
+        import base64
+
+        image = _png_bytes(10, 10)
+        legacy = {
+            "version": "1.0",
+            "clips": [
+                {"item_type": 1, "text_content": "eski kayıt", "created_at": "2023-05-05 10:00:00"},
+                {"item_type": 2, "image_base64": base64.b64encode(image).decode("ascii")},
+                {"item_type": 1, "text_content": "eski kayıt"},
+                {"item_type": 99, "text_content": "bilinmeyen tür"},
+            ],
+            "notes": [{"content": "eski not", "created_at": "2023-05-05 10:00:00"}],
+            "snippets": [{"title": "s", "code": "x = 1", "language": "python"}],
+            "todos": [{"content": "görev", "completed": 1}],
+        }
+        path = self.root / "legacy.json"
+        path.write_text(json.dumps(legacy), encoding="utf-8")
+        target = self._storage("target.db")
+
+        counts = import_archive(target, path)
+
+        self.assertEqual(counts["clips"], 2)
+        self.assertEqual(counts["skipped"], 2)
+        self.assertEqual(target.list_snippets()[0]["code"], "x = 1")
+        self.assertEqual(target.list_todos()[0]["content"], "görev")
+        texts = self._texts(target)
+        self.assertIn((int(ClipItemType.TEXT), "eski kayıt", "2023-05-05 10:00:00"), texts)
+
+    def test_cancelled_export_leaves_no_file(self):
+        source = self._storage("source.db")
+        self._fill(source)
+        path = self.root / "backup.zip"
+        cancel = threading.Event()
+        cancel.set()
+
+        with self.assertRaises(ArchiveCancelled):
+            export_archive(source, path, cancel=cancel)
+
+        self.assertFalse(path.exists())
+        self.assertFalse(path.with_name("backup.zip.part").exists())
+
+    def test_worker_imports_off_the_calling_thread(self):
+        source = self._storage("source.db")
+        self._fill(source)
+        path = self.root / "backup.zip"
+        export_archive(source, path)
+        target = self._storage("target.db")
+        done = threading.Event()
+        result = {}
+        caller = threading.get_ident()
+
+        def on_finished(counts):
+            result["counts"] = counts
+            result["thread"] = threading.get_ident()
+            done.set()
+
+        worker = ArchiveWorker(target, on_thread_exit=target.close_thread_connection)
+        worker.finished.connect(on_finished, type=Qt.DirectConnection)
+        self.assertTrue(worker.start_import(path))
+        self.assertTrue(done.wait(10))
+        self.assertTrue(worker.wait(5))
+
+        self.assertEqual(result["counts"]["clips"], 3)
+        self.assertNotEqual(result["thread"], caller)
+        self.assertEqual(len(target.list_items(limit=10)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
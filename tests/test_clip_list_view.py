@@ -0,0 +1,219 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PySide6.QtWidgets import QApplication
+
+from clipstack.storage import ClipItemType, Storage
+from clipstack.ui.clip_list_view import ClipCard, ClipListModel
+
+
+class _FakeSettings:
+    def __init__(self, **values):
+        self.values = {"max_items": 1000}
+        self.values.update(values)
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+class ClipListModelTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.settings = _FakeSettings()
+        self.storage = Storage(Path(self._tmp.name) / "taxclip.db", self.settings)
+        for i in range(25):
+            self.storage.add_item(ClipItemType.TEXT, f"metin {i}", None, None, "2024-01-01 10:00:00")
+        self.storage.add_item(ClipItemType.IMAGE, None, b"png-bytes", None, "2024-01-01 10:00:00")
+
+    def tearDown(self):
+        self.storage.stop_background_tasks()
+        self.storage.close()
+        self._tmp.cleanup()
+
+    def test_rows_are_fetched_page_by_page(self):
+        model = ClipListModel(self.storage, settings=self.settings, page_size=10)
+        model.reload()
+
+        self.assertEqual(model.rowCount(), 10)
+        self.assertTrue(model.canFetchMore())
+
+        while model.canFetchMore():
+            model.fetchMore()
+
+        ids = model.row_ids()
+        self.assertEqual(len(ids), 26)
+        self.assertEqual(len(set(ids)), 26)
+        self.assertEqual(ids, sorted(ids, reverse=True))
+
+    def test_type_filter_and_incremental_updates(self):
+        model = ClipListModel(self.storage, item_types=[ClipItemType.TEXT], settings=self.settings, page_size=10)
+        model.reload()
+        image = self.storage.add_item(ClipItemType.IMAGE, None, b"other-png", None, "2024-01-01 10:00:00")
+        text = self.storage.add_item(ClipItemType.TEXT, "yeni metin", None, None, "2024-01-01 10:00:00")
+
+        self.assertFalse(model.prepend(image))
+        self.assertTrue(model.prepend(text))
+        self.assertFalse(model.prepend(text))
+        self.assertEqual(model.row_ids()[0], text["id"])
+        self.assertEqual(model.card_at(0).preview_text, "yeni metin")
+
+        self.assertTrue(model.update_row(text["id"], favorite=1))
+        self.assertTrue(model.card_at(0).favorite)
+
+        self.assertTrue(model.remove(text["id"]))
+        self.assertEqual(model.row_of(text["id"]), -1)
+
+    def test_search_results_pause_paging_until_reload(self):
+        model = ClipListModel(self.storage, item_types=[ClipItemType.TEXT], settings=self.settings, page_size=10)
+        model.reload()
+        rows = self.storage.list_items(limit=100)
+
+        model.show_search_results(rows[:5])
+
+        self.assertTrue(model.search_active)
+        self.assertFalse(model.canFetchMore())
+        self.assertEqual(model.rowCount(), sum(1 for row in rows[:5] if row["item_type"] == ClipItemType.TEXT))
+
+        model.reload()
+        self.assertFalse(model.search_active)
+        self.assertEqual(model.rowCount(), 10)
+
+    def test_streamed_search_batches_append_when_the_ranking_extends(self):
+        model = ClipListModel(self.storage, item_types=[ClipItemType.TEXT], settings=self.settings)
+        rows = self.storage.list_items(limit=12, item_types=[ClipItemType.TEXT])
+        resets, inserts = [], []
+        model.modelReset.connect(lambda: resets.append(True))
+        model.rowsInserted.connect(lambda parent, first, last: inserts.append((first, last)))
+
+        model.show_search_results(rows[:4])
+        card = model.card_at(0)
+        model.show_search_results(rows[:10])
+
+        self.assertEqual((len(resets), inserts), (1, [(4, 9)]))
+        self.assertIs(model.card_at(0), card)
+
+        model.show_search_results(rows[5:8])
+        self.assertEqual(len(resets), 2)
+        self.assertEqual(model.row_ids(), [row["id"] for row in rows[5:8]])
+
+    def test_storage_changes_are_applied_without_requery(self):
+        all_model = ClipListModel(self.storage, settings=self.settings, page_size=10)
+        fav_model = ClipListModel(self.storage, favorites_only=True, settings=self.settings, page_size=10)
+        all_model.reload()
+        fav_model.reload()
+
+        def apply(change):
+            all_model.apply_change(change)
+            fav_model.apply_change(change)
+
+        self.storage.subscribe_clip_changes(apply)
+        with mock.patch.object(self.storage, "list_items", side_effect=AssertionError("requery")):
+            row = self.storage.add_item(ClipItemType.TEXT, "olay", None, None, "2024-01-01 10:00:00")
+            self.assertEqual(all_model.row_ids()[0], row["id"])
+
+            self.storage.set_favorite(row["id"], True)
+            self.assertEqual(fav_model.row_ids(), [row["id"]])
+            self.assertTrue(all_model.card_at(0).favorite)
+
+            pinned_id = all_model.row_ids()[5]
+            self.storage.set_pinned(pinned_id, True)
+            self.assertEqual(all_model.row_ids()[0], pinned_id)
+            self.assertIn(pinned_id, fav_model.row_ids())
+
+            # Yeniden kopyalanan eski kayıt yerinde güncellenir, sabitlenen ve favorilerin ardına gelir
+            count = all_model.rowCount()
+            older_id = all_model.row_ids()[-1]
+            self.storage.add_item(ClipItemType.TEXT, "metin 16", None, None, "2024-01-02 10:00:00")
+            self.assertEqual(all_model.row_ids()[:3], [pinned_id, row["id"], older_id])
+            self.assertEqual(all_model.rowCount(), count)
+
+            self.storage.set_favorite(row["id"], False)
+            self.assertEqual(fav_model.row_ids(), [pinned_id])
+
+            self.storage.delete_item(row["id"])
+            self.assertEqual(all_model.row_of(row["id"]), -1)
+
+            self.storage.clear_all()
+            self.assertEqual(all_model.rowCount(), 0)
+            self.assertFalse(all_model.canFetchMore())
+
+    def test_rows_stay_in_list_order_around_pinned_rows(self):
+        model = ClipListModel(self.storage, settings=self.settings, page_size=10)
+        model.reload()
+        self.storage.subscribe_clip_changes(model.apply_change)
+
+        def stored_order():
+            return [item["id"] for item in self.storage.list_items(limit=model.rowCount())]
+
+        with mock.patch.object(self.storage, "list_items", side_effect=AssertionError("requery")):
+            pinned_id = model.row_ids()[4]
+            self.storage.set_pinned(pinned_id, True)
+            new = self.storage.add_item(ClipItemType.TEXT, "yeni", None, None, "2024-01-02 10:00:00")
+            bumped = self.storage.add_item(ClipItemType.TEXT, "metin 20", None, None, "2024-01-02 10:00:00")
+            favorite_id = model.row_ids()[-1]
+            self.storage.set_favorite(favorite_id, True)
+            self.storage.set_favorite(favorite_id, False)
+            ids = model.row_ids()
+            # Aynı noktaya art arda eklemeler anahtar aralığını tüketir (yeniden numaralandırma)
+            for i in range(30):
+                self.storage.add_item(ClipItemType.TEXT, f"toplu {i}", None, None, "2024-01-02 10:00:00")
+        self.assertEqual(model.row_ids(), stored_order())
+        self.assertEqual([model.row_of(row_id) for row_id in model.row_ids()], list(range(model.rowCount())))
+
+        # Yeni ve yeniden kopyalanan kayıtlar sabitlenenin üstüne değil ardına gelir
+        self.assertEqual(ids[:3], [pinned_id, bumped["id"], new["id"]])
+
+    def test_database_reload_refetches_rows(self):
+        from clipstack.storage import ClipChange, ClipChangeKind
+
+        model = ClipListModel(self.storage, settings=self.settings, page_size=10)
+        model.reload()
+        model.show_search_results(self.storage.list_items(limit=3))
+        self.storage.clear_all()
+        self.storage.add_item(ClipItemType.TEXT, "yeni veritabanı", None, None, "2024-01-01 10:00:00")
+
+        model.apply_change(ClipChange(ClipChangeKind.RELOADED))
+
+        self.assertEqual(model.rowCount(), 1)
+        self.assertEqual(model.row_data(model.row_ids()[0])["text_content"], "yeni veritabanı")
+
+    def test_cards_render_from_stored_classification(self):
+        self.storage.add_item(ClipItemType.TEXT, "https://example.com", None, None, "2024-01-01 10:00:00")
+        self.storage.add_item(ClipItemType.HTML, None, None, "<p>#00ff00</p>", "2024-01-01 10:00:00")
+        rows = self.storage.list_items(limit=2)
+
+        with mock.patch("clipstack.ui.clip_list_view.analyze_text", side_effect=AssertionError("analyze")):
+            color, url = (ClipCard(row, self.settings) for row in rows)
+
+        self.assertEqual(url.smart.kind.value, "url")
+        self.assertIn("Bağlantı", url.title)
+        self.assertEqual(color.hex_color, "#00ff00")
+        self.assertEqual(color.preview_text, "#00ff00")
+
+    def test_cards_use_stored_sensitive_categories(self):
+        self.settings.set("totp_for_sensitive", True)
+        self.storage.add_item(ClipItemType.TEXT, "password: hunter2", None, None, "2024-01-01 10:00:00")
+        secret, plain = self.storage.list_items(limit=2)
+
+        with mock.patch(
+            "clipstack.sensitive_detector.SensitiveDataDetector.detect_sensitive_data",
+            side_effect=AssertionError("rescan"),
+        ):
+            self.assertTrue(ClipCard(secret, self.settings).requires_sensitive_access)
+            self.assertFalse(ClipCard(plain, self.settings).requires_sensitive_access)
+
+        self.settings.set("mask_passwords", False)
+        self.assertFalse(ClipCard(secret, self.settings).requires_sensitive_access)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,13 @@
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import patch
 
 from PySide6.QtCore import QByteArray, QMimeData
 from PySide6.QtGui import QImage
 
 from clipstack.clipboard_watcher import ClipboardWatcher
-from clipstack.storage import ClipItemType
+from clipstack.storage import ClipItemType, Storage
 
 
 class _FakeSignal:
@@ -35,7 +37,7 @@ class _FakeStorage:
     def __init__(self):
         self.added = []
 
-    def add_item(self, item_type, text, image_bytes, html, created_at):
+    def add_item(self, item_type, text, image_bytes, html, created_at, **kwargs):
         self.added.append((item_type, text, image_bytes, html, created_at))
         return {"id": len(self.added)}
 
@@ -77,11 +79,34 @@ class ClipboardWatcherImageStabilizationTests(unittest.TestCase):
         ):
             watcher._on_clip_changed()
             watcher._on_clip_changed()
+        self.assertTrue(watcher.wait_for_ingestion(timeout=5))
 
         self.assertEqual([item[0] for item in storage.added], [ClipItemType.IMAGE])
         self.assertEqual(copy_mock.call_count, 2)
         self.assertEqual(scheduled_delays, [80, 200, 500, 80, 200, 500])
 
 
+class ClipboardWatcherIngestionTests(unittest.TestCase):
+    def test_text_capture_is_stored_by_the_worker_thread(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = Storage(Path(tmp) / "taxclip.db", _FakeSettings())
+            mime_data = QMimeData()
+            mime_data.setText("arka planda kaydedilen metin")
+            watcher = ClipboardWatcher(_FakeClipboard(QImage(), mime_data), storage, _FakeSettings())
+
+            with patch("clipstack.clipboard_watcher.get_foreground_process_name", return_value="editor.exe"):
+                watcher._on_clip_changed()
+            self.assertTrue(watcher.wait_for_ingestion(timeout=5))
+            watcher.stop()
+
+            rows = storage.list_items(limit=10)
+            self.assertEqual([row["text_content"] for row in rows], ["arka planda kaydedilen metin"])
+            self.assertEqual(rows[0]["source_app"], "editor.exe")
+            stages = watcher.ingestion_stats()["stages"]
+            self.assertIn("sensitive", stages)
+            self.assertIn("write", stages)
+            storage.conn.close()
+
+
 if __name__ == "__main__":
     unittest.main()
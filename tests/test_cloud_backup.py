@@ -0,0 +1,214 @@
+import gzip
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from clipstack.cloud_backup import backup_chain, prepare_cloud_restore, read_delta, sync_incremental
+from clipstack.storage import ClipItemType, Storage
+
+
+class _FakeSettings:
+    def __init__(self, **values):
+        self.values = {"max_items": 1000}
+        self.values.update(values)
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+class _FakeDrive:
+    """GoogleDriveSync'in dosya yöntemlerini yerel bir klasörle taklit eder."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.root.mkdir()
+        self.files = {}
+        self.uploads = []
+        self._next_id = 0
+
+    def upload_file(self, path, filename=None, mimetype="application/octet-stream"):
+        self._next_id += 1
+        file_id = f"f{self._next_id}"
+        shutil.copyfile(path, self.root / file_id)
+        self.files[file_id] = filename
+        self.uploads.append(filename)
+        return True, file_id
+
+    def download_file(self, file_id, dest_path):
+        if file_id not in self.files:
+            return False, "İndirme hatası: dosya yok"
+        shutil.copyfile(self.root / file_id, dest_path)
+        return True, dest_path
+
+    def list_backups(self):
+        return [
+            {"id": file_id, "name": name, "size": str((self.root / file_id).stat().st_size)}
+            for file_id, name in reversed(list(self.files.items()))
+        ]
+
+    def delete_backup(self, file_id):
+        self.files.pop(file_id, None)
+        (self.root / file_id).unlink()
+        return True, "Dosya silindi"
+
+    def delete_backups(self, file_ids):
+        file_ids = list(file_ids)
+        for file_id in file_ids:
+            self.delete_backup(file_id)
+        return len(file_ids), []
+
+    def path_of(self, name):
+        return next(self.root / file_id for file_id, file_name in self.files.items() if file_name == name)
+
+
+class ChangeJournalTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.storage = Storage(Path(self._tmp.name) / "taxclip.db", _FakeSettings())
+
+    def tearDown(self):
+        self.storage.close()
+        self._tmp.cleanup()
+
+    def test_journal_keeps_the_latest_version_and_tombstones(self):
+        first = self.storage.add_item(ClipItemType.TEXT, "ilk", None, None, "2024-01-01 10:00:00")
+        second = self.storage.add_item(ClipItemType.TEXT, "ikinci", None, None, "2024-01-01 10:00:01")
+        note = self.storage.add_note("not", "2024-01-01 10:00:00")
+        since = self.storage.journal_version()
+        self.storage.toggle_favorite(first["id"])
+        self.storage.delete_item(second["id"])
+
+        changes = list(self.storage.iter_journal_changes(since))
+
+        self.assertEqual([(entity, item_id) for _, entity, item_id, _ in changes], [
+            ("clip_items", first["id"]),
+            ("clip_items", second["id"]),
+        ])
+        self.assertEqual(changes[0][3]["favorite"], 1)
+        self.assertIsNone(changes[1][3])
+        versions = [version for version, *_ in changes]
+        self.assertEqual(versions, sorted(versions))
+        self.assertEqual(versions[-1], self.storage.journal_version())
+        # Her varlığın tek kaydı kalır: eski sürümler günlükten düşer
+        all_changes = list(self.storage.iter_journal_changes(0))
+        self.assertEqual(len(all_changes), 3)
+        self.assertIn(("notes", note["id"]), [(entity, item_id) for _, entity, item_id, _ in all_changes])
+
+    def test_prune_drops_entries_covered_by_a_base(self):
+        self.storage.add_item(ClipItemType.TEXT, "eski", None, None, "2024-01-01 10:00:00")
+        covered = self.storage.journal_version()
+        self.storage.add_item(ClipItemType.TEXT, "yeni", None, None, "2024-01-01 10:00:01")
+
+        self.assertEqual(self.storage.prune_journal(covered), 1)
+        self.assertEqual(len(list(self.storage.iter_journal_changes(0))), 1)
+
+
+class IncrementalCloudBackupTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.settings = _FakeSettings()
+        self.storage = Storage(self.root / "taxclip.db", self.settings)
+        self.drive = _FakeDrive(self.root / "drive")
+        for i in range(100):
+            self.storage.add_item(ClipItemType.TEXT, f"kayıt {i} " + "x" * 200, None, None, "2024-01-01 10:00:00")
+
+    def tearDown(self):
+        self.storage.stop_background_tasks()
+        self.storage.close()
+        self._tmp.cleanup()
+
+    def _restore(self):
+        result = prepare_cloud_restore(self.storage, self.drive)
+        self.storage.replace_database(Path(result["staged"]))
+        return result
+
+    def test_sync_uploads_a_base_then_only_the_changes(self):
+        first = sync_incremental(self.storage, self.drive)
+        self.assertEqual(first["mode"], "base")
+
+        changed = self.storage.add_item(ClipItemType.TEXT, "yeni kayıt", None, None, "2024-01-02 10:00:00")
+        old_id = self.storage.list_items(limit=200)[-1]["id"]
+        self.storage.delete_item(old_id)
+        second = sync_incremental(self.storage, self.drive)
+
+        self.assertEqual(second["mode"], "delta")
+        self.assertEqual(second["from"], first["to"])
+        self.assertEqual(second["records"], 2)
+        records = list(read_delta(self.drive.path_of(self.drive.uploads[-1])))
+        self.assertEqual(records[0][:2], ("clip_items", changed["id"]))
+        self.assertEqual(records[1], ("clip_items", old_id, None))
+        self.assertEqual(sync_incremental(self.storage, self.drive)["mode"], "none")
+        self.assertEqual(len(self.drive.uploads), 2)
+
+    def test_restore_applies_the_base_and_every_delta(self):
+        sync_incremental(self.storage, self.drive)
+        new = self.storage.add_item(ClipItemType.TEXT, "bulutta aranan", None, None, "2024-01-02 10:00:00")
+        self.storage.add_note("delta notu", "2024-01-02 10:00:00")
+        sync_incremental(self.storage, self.drive)
+        self.storage.toggle_favorite(new["id"])
+        removed = self.storage.list_items(limit=200)[-1]["id"]
+        self.storage.delete_item(removed)
+        sync_incremental(self.storage, self.drive)
+        expected = [(row["id"], row["favorite"]) for row in self.storage.list_items(limit=200)]
+
+        # Yerel veri kaybolsa bile zincir aynı durumu verir
+        self.storage.clear_all()
+        self.storage.clear_notes()
+        result = self._restore()
+
+        self.assertEqual(result["deltas"], 2)
+        self.assertEqual([(row["id"], row["favorite"]) for row in self.storage.list_items(limit=200)], expected)
+        self.assertIsNone(self.storage.get_item(removed))
+        self.assertEqual([note["content"] for note in self.storage.list_notes()], ["delta notu"])
+        self.assertEqual([row["id"] for row in self.storage.search_items("bulutta aranan")][:1], [new["id"]])
+        # Geri yüklenen veritabanı sonraki eşitlemede yeni bir taban yükler
+        self.assertEqual(sync_incremental(self.storage, self.drive)["mode"], "base")
+
+    def test_compaction_replaces_the_chain_with_a_new_base(self):
+        sync_incremental(self.storage, self.drive)
+        for i in range(3):
+            self.storage.add_item(ClipItemType.TEXT, f"değişiklik {i}", None, None, "2024-01-02 10:00:00")
+            self.assertEqual(sync_incremental(self.storage, self.drive, compact_deltas=3)["mode"], "delta")
+        self.storage.add_item(ClipItemType.TEXT, "son değişiklik", None, None, "2024-01-02 10:00:00")
+
+        result = sync_incremental(self.storage, self.drive, compact_deltas=3)
+
+        self.assertEqual(result["mode"], "base")
+        self.assertEqual(result["deleted"], 4)
+        base, deltas, version = backup_chain(self.drive.list_backups())
+        self.assertEqual(len(self.drive.files), 1)
+        self.assertEqual(deltas, [])
+        self.assertEqual(version, self.storage.journal_version())
+        self.assertEqual(list(self.storage.iter_journal_changes(0)), [])
+
+    def test_missing_cloud_chain_triggers_a_new_base(self):
+        sync_incremental(self.storage, self.drive)
+        for file_id in list(self.drive.files):
+            self.drive.delete_backup(file_id)
+        self.storage.add_item(ClipItemType.TEXT, "yeni", None, None, "2024-01-02 10:00:00")
+
+        self.assertEqual(sync_incremental(self.storage, self.drive)["mode"], "base")
+
+    def test_encrypted_rows_stay_encrypted_in_deltas(self):
+        self.settings.set("encrypt_data", True)
+        self.settings.set("encryption_key", "bulut parolası")
+        sync_incremental(self.storage, self.drive)
+        self.storage.add_item(ClipItemType.TEXT, "gizli bulut metni", None, None, "2024-01-02 10:00:00")
+
+        sync_incremental(self.storage, self.drive)
+
+        with gzip.open(self.drive.path_of(self.drive.uploads[-1]), "rt", encoding="utf-8") as f:
+            payload = f.read()
+        self.assertNotIn("gizli bulut metni", payload)
+        self.assertIn("ENC2:", payload)
+        self._restore()
+        self.assertEqual(self.storage.list_items(limit=1)[0]["text_content"], "gizli bulut metni")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,329 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from clipstack.archive import export_archive
+from clipstack.gdrive_sync import GoogleDriveSync
+from clipstack.storage import ClipItemType, Storage
+
+
+class _FakeSettings:
+    def __init__(self, **values):
+        self.values = {"max_items": 1000}
+        self.values.update(values)
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+class _HttpError(Exception):
+    """googleapiclient.errors.HttpError gibi: durum kodu resp.status'ta."""
+
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.resp = type("Resp", (), {"status": status})()
+
+
+class _Status:
+    def __init__(self, done, total):
+        self.resumable_progress = done
+        self.total_size = total
+
+
+class _Executable:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self):
+        return self._fn()
+
+
+class _UploadRequest:
+    """Devam ettirilebilir yükleme oturumu: sunucu yalnızca onayladığı baytları tutar."""
+
+    def __init__(self, drive, body, media):
+        self.drive = drive
+        self.body = body
+        self.media = media
+        self.total = os.path.getsize(media.path)
+        self.acked = 0
+        self.received = bytearray()
+
+    def next_chunk(self):
+        with open(self.media.path, "rb") as f:
+            f.seek(self.acked)
+            chunk = f.read(self.media.chunksize)
+        self.drive.bytes_sent += len(chunk)
+        if self.drive.failures:
+            raise self.drive.failures.pop(0)
+        self.received += chunk
+        self.acked += len(chunk)
+        if self.acked < self.total:
+            return _Status(self.acked, self.total), None
+        file_id = self.drive.store(self.body["name"], bytes(self.received))
+        return None, {"id": file_id}
+
+
+class _Downloader:
+    def __init__(self, target, request, chunksize):
+        self.target = target
+        self.data = request.data
+        self.drive = request.drive
+        self.chunksize = chunksize
+        self.position = 0
+
+    def next_chunk(self):
+        if self.drive.failures:
+            raise self.drive.failures.pop(0)
+        chunk = self.data[self.position:self.position + self.chunksize]
+        self.target.write(chunk)
+        self.position += len(chunk)
+        self.drive.chunks_received += 1
+        return _Status(self.position, len(self.data)), self.position >= len(self.data)
+
+
+class _Batch:
+    def __init__(self, drive, callback):
+        self.drive = drive
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id=None):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.drive.batches.append(len(self.requests))
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.execute(), None)
+            except Exception as e:
+                self.callback(request_id, None, e)
+
+
+class _FakeDriveService:
+    """Drive v3 files() API'sinin yerel taklidi (yalnızca kullanılan çağrılar)."""
+
+    def __init__(self):
+        self.files_by_id = {}
+        self.failures = []
+        self.bytes_sent = 0
+        self.chunks_received = 0
+        self.batches = []
+        self.list_calls = 0
+        self._next_id = 0
+
+    def store(self, name, data, created=None):
+        self._next_id += 1
+        file_id = f"f{self._next_id}"
+        self.files_by_id[file_id] = {
+            "id": file_id,
+            "name": name,
+            "data": data,
+            "createdTime": created or f"2024-01-01T00:00:{self._next_id:02d}Z",
+        }
+        return file_id
+
+    # -- service --
+    def files(self):
+        return self
+
+    def new_batch_http_request(self, callback=None):
+        return _Batch(self, callback)
+
+    # -- files() --
+    def create(self, body=None, media_body=None, fields=None):
+        return _UploadRequest(self, body, media_body)
+
+    def get_media(self, fileId=None):
+        request = type("MediaRequest", (), {})()
+        request.data = self.files_by_id[fileId]["data"]
+        request.drive = self
+        return request
+
+    def list(self, q=None, spaces=None, fields=None, orderBy=None, pageSize=100, pageToken=None):
+        def run():
+            self.list_calls += 1
+            items = sorted(self.files_by_id.values(), key=lambda item: item["createdTime"], reverse=True)
+            start = int(pageToken or 0)
+            page = [
+                {"id": item["id"], "name": item["name"], "createdTime": item["createdTime"], "size": str(len(item["data"]))}
+                for item in items[start:start + pageSize]
+            ]
+            result = {"files": page}
+            if start + pageSize < len(items):
+                result["nextPageToken"] = str(start + pageSize)
+            return result
+        return _Executable(run)
+
+    def delete(self, fileId=None):
+        def run():
+            if fileId not in self.files_by_id:
+                raise _HttpError(404)
+            del self.files_by_id[fileId]
+            return ""
+        return _Executable(run)
+
+
+class _MediaUpload:
+    def __init__(self, path, mimetype, chunksize):
+        self.path = path
+        self.mimetype = mimetype
+        self.chunksize = chunksize
+
+
+class _LocalDriveSync(GoogleDriveSync):
+    """Medya sınıfları yerel taklide yönlendirilir; bekleme kaydedilir."""
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, service, settings=None):
+        super().__init__(settings)
+        self.service = service
+        self.folder_id = "folder"
+        self.delays = []
+        self._sleep = self.delays.append
+
+    def _media_upload(self, path, mimetype, chunk_size):
+        return _MediaUpload(path, mimetype, chunk_size)
+
+    def _media_download(self, target, request, chunk_size):
+        return _Downloader(target, request, chunk_size)
+
+
+class GoogleDriveTransferTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        home = mock.patch.object(Path, "home", return_value=self.root)
+        home.start()
+        self.addCleanup(home.stop)
+        self.service = _FakeDriveService()
+        self.sync = _LocalDriveSync(self.service, _FakeSettings())
+        # Sıkıştırılamayan içerik: yükleme birden çok parçaya bölünsün
+        self.payload = json.dumps({"clips": [os.urandom(96).hex() for _ in range(4000)]})
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_upload_resumes_from_the_last_acknowledged_chunk(self):
+        self.service.failures = [ConnectionError("bağlantı koptu"), _HttpError(503), _HttpError(429)]
+        steps = []
+
+        success, file_id = self.sync.upload_backup(self.payload, progress=lambda done, total: steps.append(done))
+
+        self.assertTrue(success, file_id)
+        stored = self.service.files_by_id[file_id]
+        self.assertTrue(stored["name"].endswith(".json.gz"))
+        self.assertEqual(gzip.decompress(stored["data"]).decode("utf-8"), self.payload)
+        # Yalnızca düşen parçalar yeniden gönderilir
+        self.assertLessEqual(self.service.bytes_sent, len(stored["data"]) + 3 * self.sync.CHUNK_SIZE)
+        self.assertGreater(len(steps), 2)
+        self.assertEqual(len(self.sync.delays), 3)
+        self.assertLess(self.sync.delays[0], self.sync.delays[2])
+
+    def test_upload_gives_up_on_permanent_errors_and_after_the_retry_budget(self):
+        self.service.failures = [_HttpError(403)]
+        success, message = self.sync.upload_backup(self.payload)
+        self.assertFalse(success)
+        self.assertIn("403", message)
+        self.assertEqual(self.sync.delays, [])
+
+        self.service.failures = [_HttpError(500)] * (self.sync.MAX_RETRIES + 1)
+        success, _ = self.sync.upload_backup(self.payload)
+        self.assertFalse(success)
+        self.assertEqual(len(self.sync.delays), self.sync.MAX_RETRIES)
+        self.assertEqual(self.service.files_by_id, {})
+
+    def test_upload_accepts_streamed_chunks(self):
+        parts = (self.payload[i:i + 5000] for i in range(0, len(self.payload), 5000))
+
+        success, file_id = self.sync.upload_backup(parts, filename="taxclip_backup_parca.json.gz")
+
+        self.assertTrue(success)
+        self.assertEqual(self.sync.download_backup(file_id), (True, self.payload))
+
+    def test_download_streams_to_disk_and_retries(self):
+        file_id = self.service.store("taxclip_backup_eski.json", self.payload.encode("utf-8"))
+        self.service.failures = [TimeoutError("zaman aşımı")]
+        dest = self.root / "indirilen.json"
+
+        success, result = self.sync.download_file(file_id, str(dest))
+
+        self.assertTrue(success, result)
+        self.assertEqual(dest.read_text(encoding="utf-8"), self.payload)
+        self.assertGreater(self.service.chunks_received, 2)
+        self.assertFalse(Path(str(dest) + ".part").exists())
+
+        self.service.failures = [_HttpError(404)]
+        self.assertFalse(self.sync.download_file(file_id, str(self.root / "yok.json"))[0])
+        self.assertFalse((self.root / "yok.json.part").exists())
+
+    def test_import_backup_feeds_the_importer_from_the_download(self):
+        source = Storage(self.root / "kaynak.db", _FakeSettings())
+        target = Storage(self.root / "hedef.db", _FakeSettings())
+        try:
+            for i in range(30):
+                source.add_item(ClipItemType.TEXT, f"drive kaydı {i}", None, None, "2024-01-01 10:00:00")
+            source.add_note("drive notu", "2024-01-01 10:00:00")
+            archive = self.root / "yedek.zip"
+            export_archive(source, archive)
+            success, file_id = self.sync.upload_file(str(archive), "taxclip_backup_arsiv.zip", "application/zip")
+            self.assertTrue(success)
+
+            counts = self.sync.import_backup(target, file_id)
+
+            self.assertEqual(counts["clips"], 30)
+            self.assertEqual(counts["notes"], 1)
+            self.assertEqual(len(target.list_items(limit=100)), 30)
+        finally:
+            source.close()
+            target.close()
+
+    def test_list_backups_follows_every_page(self):
+        for i in range(7):
+            self.service.store(f"taxclip_backup_{i}.json.gz", b"{}")
+        self.sync.LIST_PAGE_SIZE = 3
+
+        files = self.sync.list_backups()
+
+        self.assertEqual(len(files), 7)
+        self.assertEqual(self.service.list_calls, 3)
+        self.assertEqual(files[0]["name"], "taxclip_backup_6.json.gz")
+
+    def test_prune_keeps_the_newest_backups_and_the_live_chain_in_batches(self):
+        for i in range(8):
+            self.service.store(f"taxclip_backup_{i}.json.gz", b"{}")
+        stale_base = self.service.store("taxclip_base_000000000001.db.gz", b"x")
+        base = self.service.store("taxclip_base_000000000005.db.gz", b"x")
+        delta = self.service.store("taxclip_delta_000000000005_000000000009.ndjson.gz", b"x")
+        orphan = self.service.store("taxclip_delta_000000000002_000000000003.ndjson.gz", b"x")
+        self.sync.DELETE_BATCH = 2
+
+        deleted, failed = self.sync.prune_backups(keep=3)
+
+        self.assertEqual((deleted, failed), (7, []))
+        self.assertEqual(self.service.batches, [2, 2, 2, 1])
+        names = sorted(item["name"] for item in self.service.files_by_id.values() if "backup" in item["name"])
+        self.assertEqual(names, ["taxclip_backup_5.json.gz", "taxclip_backup_6.json.gz", "taxclip_backup_7.json.gz"])
+        self.assertIn(base, self.service.files_by_id)
+        self.assertIn(delta, self.service.files_by_id)
+        self.assertNotIn(stale_base, self.service.files_by_id)
+        self.assertNotIn(orphan, self.service.files_by_id)
+
+    def test_batched_delete_reports_files_that_could_not_be_removed(self):
+        kept = self.service.store("taxclip_backup_0.json.gz", b"{}")
+
+        deleted, failed = self.sync.delete_backups([kept, "kayip"])
+
+        self.assertEqual((deleted, failed), (1, ["kayip"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from unittest import mock
+
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication
+
+from clipstack import utils
+
+
+class IconCacheTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        utils.clear_icon_cache()
+
+    def tearDown(self):
+        utils.clear_icon_cache()
+
+    def test_repeated_requests_are_served_from_cache(self):
+        first = utils.icon_pixmap("assets/icons/copy.svg", size=32, color="#3b82f6")
+        with mock.patch.object(utils, "_render_icon") as render:
+            second = utils.icon_pixmap("assets/icons/copy.svg", size=32, color="#3B82F6")
+        render.assert_not_called()
+        self.assertIs(first, second)
+        self.assertEqual(first.deviceIndependentSize().toSize().width(), 32)
+
+    def test_cache_is_bounded(self):
+        with mock.patch.object(utils, "_ICON_CACHE_LIMIT", 3):
+            for size in range(10, 16):
+                utils.icon_pixmap("assets/icons/copy.svg", size=size)
+        self.assertEqual(len(utils._icon_cache), 3)
+        self.assertEqual([key[1] for key in utils._icon_cache], [13, 14, 15])
+
+    def test_vectorized_tint_matches_per_pixel_tint(self):
+        source = utils._render_icon(
+            utils.resource_path("assets/icons/video_record.svg"), utils._normalize_icon_size(40), None, 1.0
+        )
+        for color in ("#3b82f6", "#F8FAFC", "#7F8794", "#22c55e"):
+            fast = utils._tint_pixmap_preserving_highlights(source, QColor(color))
+            with mock.patch.object(utils, "_tint_image_numpy", return_value=False):
+                slow = utils._tint_pixmap_preserving_highlights(source, QColor(color))
+            self.assertEqual(
+                fast.toImage().convertToFormat(QImage.Format_ARGB32),
+                slow.toImage().convertToFormat(QImage.Format_ARGB32),
+                color,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import threading
+import unittest
+
+from clipstack.ingestion import IngestionPipeline
+
+
+class IngestionPipelineTests(unittest.TestCase):
+    def test_jobs_run_off_thread_and_stage_timings_are_reported(self):
+        threads = []
+
+        def process(capture, timings):
+            threads.append(threading.current_thread())
+            timings["store"] = 0.002
+            return {"id": capture}
+
+        pipeline = IngestionPipeline(process)
+        for i in range(3):
+            pipeline.submit(i)
+
+        self.assertTrue(pipeline.wait_idle(timeout=5))
+        stats = pipeline.stats()
+        self.assertEqual(stats["processed"], 3)
+        self.assertEqual(stats["pending"], 0)
+        self.assertEqual(stats["stages"]["store"]["count"], 3)
+        self.assertAlmostEqual(stats["stages"]["store"]["avg_ms"], 2.0)
+        self.assertIn("queue_wait", stats["stages"])
+        self.assertNotIn(threading.main_thread(), threads)
+        pipeline.stop()
+
+    def test_full_queue_drops_the_oldest_pending_capture(self):
+        started = threading.Event()
+        release = threading.Event()
+        seen = []
+
+        def process(capture, timings):
+            started.set()
+            release.wait(5)
+            seen.append(capture)
+            return None
+
+        pipeline = IngestionPipeline(process, max_pending=2)
+        pipeline.submit("ilk")
+        self.assertTrue(started.wait(5))
+        for capture in ("a", "b", "c"):
+            pipeline.submit(capture)
+        self.assertEqual(pipeline.pending(), 2)
+
+        release.set()
+        self.assertTrue(pipeline.wait_idle(timeout=5))
+        self.assertEqual(seen, ["ilk", "b", "c"])
+        self.assertEqual(pipeline.stats()["dropped"], 1)
+        pipeline.stop()
+
+    def test_failed_jobs_are_counted_and_do_not_stop_the_worker(self):
+        def process(capture, timings):
+            if capture == "bozuk":
+                raise ValueError("hata")
+            return None
+
+        pipeline = IngestionPipeline(process)
+        pipeline.submit("bozuk")
+        pipeline.submit("sağlam")
+
+        self.assertTrue(pipeline.wait_idle(timeout=5))
+        stats = pipeline.stats()
+        self.assertEqual((stats["processed"], stats["failed"]), (1, 1))
+        pipeline.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,19 @@
+import base64
+import queue
+import subprocess
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import patch
 
-from clipstack.ocr_manager import OCRManager, _WIN_OCR_SCRIPT_B64
+from clipstack.ocr_manager import (
+    OCR_MAX_ATTEMPTS,
+    OCRManager,
+    OCRQueue,
+    _WIN_OCR_SCRIPT_B64,
+    _WIN_OCR_SERVER_SCRIPT_B64,
+)
+from clipstack.storage import ClipItemType, Storage
 
 
 class OCRManagerWindowsCommandTests(unittest.TestCase):
@@ -14,8 +26,9 @@ class OCRManagerWindowsCommandTests(unittest.TestCase):
         mock_run.return_value.stderr = ""
 
         manager = OCRManager()
-        text = manager._extract_win_ocr(b"fake png bytes", "tur+eng")
+        ok, text = manager._extract_win_ocr_once(b"fake png bytes", "tur+eng")
 
+        self.assertTrue(ok)
         self.assertEqual(text, "test")
         args, kwargs = mock_run.call_args
         command = args[0]
@@ -28,5 +41,188 @@ class OCRManagerWindowsCommandTests(unittest.TestCase):
         self.assertTrue(kwargs["text"])
 
 
+class _FakeServerStdin:
+    def __init__(self, process):
+        self._process = process
+        self.requests = []
+
+    def write(self, data):
+        self.requests.append(data)
+
+    def flush(self):
+        lang, payload = self.requests[-1].rstrip("\n").split(" ", 1)
+        text = f"{lang}:{len(base64.b64decode(payload))}"
+        self._process.lines.put("OK " + base64.b64encode(text.encode("utf-8")).decode("ascii") + "\n")
+
+    def close(self):
+        self._process.lines.put(None)
+
+
+class _FakeServerProcess:
+    instances = []
+
+    def __init__(self, command, **kwargs):
+        self.command = command
+        self.lines = queue.Queue()
+        self.lines.put("READY\n")
+        self.stdin = _FakeServerStdin(self)
+        self.stdout = iter(self.lines.get, None)
+        self.returncode = None
+        _FakeServerProcess.instances.append(self)
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        self.returncode = 0
+        return 0
+
+
+class OCRManagerPersistentProcessTests(unittest.TestCase):
+    @patch.object(OCRManager, "_check_tesseract", return_value=False)
+    @patch.object(OCRManager, "_check_win_ocr", return_value=True)
+    @patch("clipstack.ocr_manager.subprocess.Popen", side_effect=_FakeServerProcess)
+    def test_windows_ocr_reuses_one_process_per_thread(self, mock_popen, _mock_check_win, _mock_check_tesseract):
+        _FakeServerProcess.instances = []
+        manager = OCRManager()
+
+        self.assertEqual(manager.extract_text(b"1234", "tur+eng"), "tr:4")
+        self.assertEqual(manager.extract_text(b"123456", "eng"), "en:6")
+
+        self.assertEqual(mock_popen.call_count, 1)
+        self.assertIn(_WIN_OCR_SERVER_SCRIPT_B64, _FakeServerProcess.instances[0].command)
+        manager.close()
+        self.assertEqual(_FakeServerProcess.instances[0].returncode, 0)
+
+    @patch.object(OCRManager, "_check_tesseract", return_value=False)
+    @patch.object(OCRManager, "_check_win_ocr", return_value=True)
+    @patch("clipstack.ocr_manager.subprocess.run", side_effect=subprocess.TimeoutExpired("powershell", 30))
+    @patch("clipstack.ocr_manager.subprocess.Popen", side_effect=OSError("powershell yok"))
+    def test_engine_failures_are_reported_as_unsuccessful(self, *_mocks):
+        manager = OCRManager()
+
+        self.assertEqual(manager.recognize(b"1234", "tur+eng"), (False, None))
+        self.assertIsNone(manager.extract_text(b"1234", "tur+eng"))
+
+
+class _FakeSettings:
+    def __init__(self, **values):
+        self.values = {"max_items": 1000, "ocr_enabled": True}
+        self.values.update(values)
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+class _FakeOcrManager:
+    def __init__(self, text, failures=0):
+        self.text = text
+        self.failures = failures
+        self.calls = []
+
+    def is_available(self):
+        return True
+
+    def recognize(self, image_bytes, lang="tur+eng"):
+        self.calls.append(image_bytes)
+        if len(self.calls) <= self.failures:
+            return False, None
+        return True, self.text
+
+    def close(self):
+        pass
+
+
+class OCRQueueTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self._tmp.name) / "taxclip.db"
+        self.settings = _FakeSettings()
+        self.storage = Storage(self.db_path, self.settings)
+
+    def tearDown(self):
+        self.storage.conn.close()
+        self._tmp.cleanup()
+
+    def _run_queue(self, manager):
+        done = queue.Queue()
+        ocr_queue = OCRQueue(self.storage, self.settings, idle_timeout=0.05)
+        ocr_queue.on_done = lambda item_id, text, dropped: done.put((item_id, text, dropped))
+        with patch("clipstack.ocr_manager.get_ocr_manager", return_value=manager):
+            ocr_queue.start()
+            result = done.get(timeout=5)
+            ocr_queue.stop()
+        return result
+
+    def test_images_are_saved_first_and_indexed_after_ocr(self):
+        row = self.storage.add_item(ClipItemType.IMAGE, None, b"png-bytes", None, "2024-01-01 10:00:00")
+        self.assertEqual(self.storage.pending_ocr_ids(limit=5), [row["id"]])
+        self.assertEqual(self.storage.search_items("fatura"), [])
+
+        result = self._run_queue(_FakeOcrManager("Fatura No 42"))
+
+        self.assertEqual(result, (row["id"], "Fatura No 42", False))
+        self.assertEqual(self.storage.pending_ocr_ids(limit=5), [])
+        self.assertEqual(self.storage.get_item(row["id"])["ocr_text"], "Fatura No 42")
+        self.assertEqual([r["id"] for r in self.storage.search_items("fatura")], [row["id"]])
+
+    def test_pending_jobs_survive_a_restart(self):
+        row = self.storage.add_item(ClipItemType.IMAGE, None, b"png-bytes", None, "2024-01-01 10:00:00")
+        self.storage.conn.close()
+        self.storage = Storage(self.db_path, self.settings)
+
+        manager = _FakeOcrManager("yeniden açılışta")
+        self.assertEqual(self._run_queue(manager)[0], row["id"])
+        self.assertEqual(manager.calls, [b"png-bytes"])
+
+    def test_transient_failures_keep_the_job_pending(self):
+        row = self.storage.add_item(ClipItemType.IMAGE, None, b"png-bytes", None, "2024-01-01 10:00:00")
+        manager = _FakeOcrManager("ikinci denemede", failures=1)
+
+        with patch("clipstack.ocr_manager._OCR_RETRY_DELAY", 0.0):
+            result = self._run_queue(manager)
+
+        self.assertEqual(result, (row["id"], "ikinci denemede", False))
+        self.assertEqual(len(manager.calls), 2)
+        attempts = self.storage.conn.execute(
+            "SELECT ocr_attempts FROM clip_items WHERE id = ?", (row["id"],)
+        ).fetchone()[0]
+        self.assertEqual(attempts, 1)
+
+    def test_job_is_dropped_after_the_attempt_limit(self):
+        row = self.storage.add_item(ClipItemType.IMAGE, None, b"png-bytes", None, "2024-01-01 10:00:00")
+        ocr_queue = OCRQueue(self.storage, self.settings)
+        manager = _FakeOcrManager("hiç", failures=OCR_MAX_ATTEMPTS)
+
+        def attempt():
+            item_id = ocr_queue._claim()
+            self.assertEqual(item_id, row["id"])
+            self.assertFalse(ocr_queue._process(item_id))
+            ocr_queue._retry_later(item_id)
+            ocr_queue._inflight.discard(item_id)
+
+        with patch("clipstack.ocr_manager.get_ocr_manager", return_value=manager):
+            attempt()
+            # Bekleme süresi dolmadan yeniden alınmaz
+            self.assertIsNone(ocr_queue._claim())
+            self.assertEqual(self.storage.pending_ocr_ids(limit=5), [row["id"]])
+            with patch("clipstack.ocr_manager._OCR_RETRY_DELAY", 0.0):
+                ocr_queue._retry_at.clear()
+                for _ in range(OCR_MAX_ATTEMPTS - 1):
+                    attempt()
+
+        self.assertEqual(self.storage.pending_ocr_ids(limit=5), [])
+        self.assertEqual(len(manager.calls), OCR_MAX_ATTEMPTS)
+
+    def test_sensitive_ocr_text_drops_the_image(self):
+        row = self.storage.add_item(ClipItemType.IMAGE, None, b"png-bytes", None, "2024-01-01 10:00:00")
+
+        with patch.object(Storage, "_protect_clip_item", return_value=(ClipItemType.IMAGE, None, None, "x", True)):
+            result = self._run_queue(_FakeOcrManager("Kart: 4111 1111 1111 1111"))
+
+        self.assertTrue(result[2])
+        self.assertIsNone(self.storage.get_item(row["id"]))
+
+
 if __name__ == "__main__":
     unittest.main()
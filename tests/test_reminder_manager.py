@@ -1,7 +1,8 @@
+import time
 import unittest
 from datetime import datetime, timedelta
 
-from PySide6.QtCore import QCoreApplication
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer
 
 from clipstack.reminder_manager import ReminderManager
 
@@ -14,6 +15,24 @@ class FakeSettings:
 class FakeStorage:
     def __init__(self, reminders):
         self.reminders = {reminder["id"]: dict(reminder) for reminder in reminders}
+        self.on_reminders_changed = None
+        self.schedule_loads = 0
+
+    def _changed(self):
+        if self.on_reminders_changed:
+            self.on_reminders_changed()
+
+    def add_reminder(self, reminder):
+        self.reminders[reminder["id"]] = dict(reminder)
+        self._changed()
+
+    def list_reminder_schedule(self):
+        self.schedule_loads += 1
+        return [
+            {key: reminder.get(key) for key in ("id", "reminder_time", "last_triggered")}
+            for reminder in self.reminders.values()
+            if reminder.get("is_active", 1)
+        ]
 
     def list_reminders(self, active_only=False):
         reminders = list(self.reminders.values())
@@ -27,13 +46,16 @@ class FakeStorage:
 
     def mark_reminder_triggered(self, reminder_id):
         self.reminders[reminder_id]["last_triggered"] = datetime.now().isoformat()
+        self._changed()
 
     def update_reminder_time(self, reminder_id, new_time):
         self.reminders[reminder_id]["reminder_time"] = new_time
         self.reminders[reminder_id]["last_triggered"] = None
+        self._changed()
 
     def set_reminder_active(self, reminder_id, is_active):
         self.reminders[reminder_id]["is_active"] = 1 if is_active else 0
+        self._changed()
 
 
 class ReminderManagerTests(unittest.TestCase):
@@ -101,6 +123,58 @@ class ReminderManagerTests(unittest.TestCase):
         self.assertEqual(updated["is_active"], 1)
         self.assertIsNone(updated["last_triggered"])
 
+    def _wait_for_trigger(self, manager, timeout_ms):
+        fired = []
+        loop = QEventLoop()
+        manager.reminder_triggered.connect(lambda reminder: (fired.append(time.monotonic()), loop.quit()))
+        QTimer.singleShot(timeout_ms, loop.quit)
+        loop.exec()
+        return fired
+
+    def _reminder(self, reminder_id, due_time):
+        return {
+            "id": reminder_id,
+            "title": "Zamanlı",
+            "description": "",
+            "reminder_time": due_time.isoformat(),
+            "is_active": 1,
+            "repeat_type": "none",
+            "last_triggered": None,
+        }
+
+    def test_earliest_reminder_fires_on_time_without_polling(self):
+        due_time = datetime.now() + timedelta(milliseconds=400)
+        manager, storage = self._create_manager([
+            self._reminder(1, due_time),
+            self._reminder(2, datetime.now() + timedelta(hours=1)),
+        ])
+        manager.start()
+        due_monotonic = time.monotonic() + (due_time - datetime.now()).total_seconds()
+
+        fired = self._wait_for_trigger(manager, 3000)
+        manager.stop()
+
+        self.assertEqual(len(fired), 1)
+        self.assertLess(fired[0] - due_monotonic, 0.1)
+        # Bekleme sırasında yalnızca başlangıçta bir kez zamanlama okunur
+        self.assertEqual(storage.schedule_loads, 1)
+        self.assertEqual(storage.get_reminder(1)["is_active"], 0)
+        self.assertEqual(storage.get_reminder(2)["is_active"], 1)
+
+    def test_new_reminder_rearms_the_timer(self):
+        manager, storage = self._create_manager([
+            self._reminder(1, datetime.now() + timedelta(hours=1)),
+        ])
+        manager.start()
+        self.assertGreater(manager.check_timer.remainingTime(), 1000)
+
+        storage.add_reminder(self._reminder(2, datetime.now() + timedelta(milliseconds=200)))
+        fired = self._wait_for_trigger(manager, 3000)
+        manager.stop()
+
+        self.assertEqual(len(fired), 1)
+        self.assertEqual(storage.get_reminder(2)["is_active"], 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,47 @@
+import threading
+import unittest
+
+from PySide6.QtCore import Qt
+
+from clipstack.search_worker import SearchWorker
+from clipstack.storage import SearchCancelled
+
+
+class SearchWorkerTests(unittest.TestCase):
+    def test_new_query_cancels_the_running_scan(self):
+        started = threading.Event()
+        finished = threading.Event()
+        seen = []
+
+        def search(cancel, query):
+            if query == "yavaş":
+                yield [{"id": 1}], False
+                started.set()
+                cancel.wait(5)
+                if cancel.is_set():
+                    raise SearchCancelled()
+                yield [{"id": 1}, {"id": 2}], True
+            else:
+                yield [{"id": 3}], True
+
+        worker = SearchWorker(search)
+
+        def on_results(query_id, rows, done):
+            seen.append((query_id, [row["id"] for row in rows], done))
+            if done:
+                finished.set()
+
+        worker.results_ready.connect(on_results, type=Qt.DirectConnection)
+        slow_id = worker.submit(query="yavaş")
+        self.assertTrue(started.wait(5))
+        fast_id = worker.submit(query="hızlı")
+        self.assertTrue(finished.wait(5))
+        worker.stop()
+
+        self.assertEqual(seen, [(slow_id, [1], False), (fast_id, [3], True)])
+        self.assertFalse(worker.is_current(slow_id))
+        self.assertIsNotNone(worker.last_first_batch_ms)
+
+
+if __name__ == "__main__":
+    unittest.main()
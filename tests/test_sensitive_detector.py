@@ -0,0 +1,72 @@
+import unittest
+from unittest import mock
+
+from clipstack import sensitive_detector
+from clipstack.sensitive_detector import SensitiveDataDetector
+
+
+class _FakeSettings:
+    def __init__(self, **values):
+        self.values = dict(values)
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+class SensitiveScanTests(unittest.TestCase):
+    def setUp(self):
+        self.detector = SensitiveDataDetector(_FakeSettings(mask_phones=True, block_sensitive_data=True))
+
+    def test_single_scan_finds_every_enabled_category(self):
+        text = (
+            "kart 4111 1111 1111 1111, password: hunter2 api_key='abcdefghijklmnopqrstuvwx' "
+            "tc 10000000146 iban TR33 0006 1005 1978 6457 8413 26 tel 0532 123 45 67"
+        )
+        scan = self.detector.scan(text)
+
+        self.assertEqual(
+            scan.categories,
+            ["credit_cards", "passwords", "api_keys", "phones", "tc_ids", "ibans"],
+        )
+        self.assertEqual(scan.by_category()["api_keys"], ["abcdefghijklmnopqrstuvwx"])
+        masked, was_masked = self.detector.mask_text(text, scan)
+        self.assertTrue(was_masked)
+        self.assertEqual(
+            masked,
+            "kart **** **** **** 1111, password: ******** api_key='************************' "
+            "tc 10*******46 iban TR** **** **** **** **** **** 26 tel *** *** 4567",
+        )
+
+    def test_block_and_mask_reuse_the_given_scan(self):
+        text = "password: hunter2"
+        scan = self.detector.scan(text)
+
+        with mock.patch.object(SensitiveDataDetector, "scan", side_effect=AssertionError("rescan")):
+            self.assertEqual(self.detector.should_block(text, scan), (True, "Hassas veri tespit edildi: şifre"))
+            self.assertEqual(self.detector.mask_text(text, scan), ("password: ********", True))
+
+        # Başka bir metnin taraması kullanılmaz
+        self.assertEqual(self.detector.mask_text("sıradan metin", scan), ("sıradan metin", False))
+
+    def test_overlapping_matches_mask_the_whole_secret(self):
+        masked, _ = self.detector.mask_text("pass= 4111 1111 1111 1111 ve pass= password: x1")
+        self.assertEqual(masked, "pass= **** **** **** 1111 ve pass= password: ********")
+
+    def test_long_text_is_scanned_in_chunks_up_to_the_cap(self):
+        secret = "4111 1111 1111 1111"
+        text = "a" * 95 + " " + secret + " " + "b" * 200 + " password: gizli"
+        with mock.patch.object(sensitive_detector, "SCAN_CHUNK_CHARS", 100), mock.patch.object(
+            sensitive_detector, "SCAN_OVERLAP_CHARS", 40
+        ):
+            scan = self.detector.scan(text)
+            self.assertEqual([m.value for m in scan.matches], [secret, "password: gizli"])
+            self.assertFalse(scan.truncated)
+
+            self.detector.MAX_SCAN_CHARS = 200
+            capped = self.detector.scan(text)
+        self.assertTrue(capped.truncated)
+        self.assertEqual(capped.categories, ["credit_cards"])
+
+
+if __name__ == "__main__":
+    unittest.main()
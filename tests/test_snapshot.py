@@ -0,0 +1,130 @@
+import gzip
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from clipstack.archive import ArchiveCancelled
+from clipstack.snapshot import SnapshotError, create_snapshot, prepare_restore, restore_snapshot
+from clipstack.storage import SCHEMA_VERSION, ClipChangeKind, ClipItemType, Storage
+
+
+class _FakeSettings:
+    def __init__(self, **values):
+        self.values = {"max_items": 1000}
+        self.values.update(values)
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+class SnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.settings = _FakeSettings(encrypt_data=True, encryption_key="yedek parolası")
+        self.storage = Storage(self.root / "taxclip.db", self.settings)
+        for i in range(200):
+            self.storage.add_item(ClipItemType.TEXT, f"kayıt {i} " + "x" * 500, None, None, "2024-01-01 10:00:00")
+        self.storage.add_note("gizli not", "2024-01-01 10:00:00")
+
+    def tearDown(self):
+        self.storage.stop_background_tasks()
+        self.storage.close()
+        self._tmp.cleanup()
+
+    def _unpack(self, path):
+        plain = self.root / "unpacked.db"
+        with gzip.open(path, "rb") as source, open(plain, "wb") as target:
+            shutil.copyfileobj(source, target)
+        return sqlite3.connect(str(plain))
+
+    def test_snapshot_is_consistent_while_the_writer_keeps_committing(self):
+        path = self.root / "snap.db.gz"
+        steps = []
+
+        def on_progress(done, total):
+            steps.append((done, total))
+            if len(steps) <= 3:
+                self.storage.add_item(ClipItemType.TEXT, f"yedek sırasında {len(steps)}", None, None, "2024-01-02")
+
+        info = create_snapshot(self.storage, path, progress=on_progress, pages=8)
+
+        self.assertGreater(len(steps), 3)
+        self.assertEqual(steps[-1][0], steps[-1][1])
+        self.assertLess(info["compressed_bytes"], info["bytes"])
+        conn = self._unpack(path)
+        try:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM clip_items").fetchone()[0], 200)
+            self.assertEqual(conn.execute("PRAGMA integrity_check").fetchone()[0], "ok")
+            # Satırlar çözülmeden kopyalanır: şifreli alanlar şifreli kalır
+            texts = [row[0] for row in conn.execute("SELECT text_content FROM clip_items")]
+            self.assertTrue(all(text.startswith("ENC2:") for text in texts))
+            self.assertTrue(conn.execute("SELECT content FROM notes").fetchone()[0].startswith("ENC2:"))
+        finally:
+            conn.close()
+        self.assertEqual(len(self.storage.list_items(limit=500)), 203)
+
+    def test_cancelled_snapshot_leaves_no_files(self):
+        cancel = threading.Event()
+        cancel.set()
+
+        with self.assertRaises(ArchiveCancelled):
+            create_snapshot(self.storage, self.root / "snap.db.gz", cancel=cancel)
+
+        self.assertEqual(sorted(p.name for p in self.root.iterdir() if "snap" in p.name), [])
+
+    def test_restore_swaps_the_database_and_refreshes_readers(self):
+        path = self.root / "snap.db.gz"
+        create_snapshot(self.storage, path)
+        self.storage.add_item(ClipItemType.TEXT, "yedekten sonra", None, None, "2024-01-03")
+        events = []
+        self.storage.subscribe_clip_changes(events.append)
+
+        # Uzun yaşayan arka plan thread'i okuyucusunu geri yüklemeden önce almış olsun
+        requests, results = [threading.Event(), threading.Event()], []
+
+        def background():
+            results.append(len(self.storage.list_items(limit=500)))
+            requests[0].wait(5)
+            results.append(len(self.storage.list_items(limit=500)))
+            self.storage.close_thread_connection()
+
+        thread = threading.Thread(target=background)
+        thread.start()
+        while not results:
+            thread.join(0.01)
+
+        result = restore_snapshot(self.storage, path)
+        requests[0].set()
+        thread.join(5)
+
+        self.assertEqual(results, [201, 200])
+        self.assertEqual(result["schema"], SCHEMA_VERSION)
+        self.assertEqual([event.kind for event in events], [ClipChangeKind.RELOADED])
+        self.assertEqual(self.storage.list_items(limit=1)[0]["text_content"], "kayıt 199 " + "x" * 500)
+        self.assertEqual(self.storage.list_notes()[0]["content"], "gizli not")
+        self.assertEqual(len(self.storage.search_items("kayıt 150")), 1)
+        self.assertFalse(Path(result["staged"]).exists())
+        row = self.storage.add_item(ClipItemType.TEXT, "geri yüklemeden sonra", None, None, "2024-01-04")
+        self.assertEqual(row["text_content"], "geri yüklemeden sonra")
+
+    def test_invalid_snapshot_is_rejected_and_database_kept(self):
+        bad = self.root / "bad.db.gz"
+        with gzip.open(bad, "wb") as f:
+            f.write(b"bu bir veritabani degil" * 100)
+
+        with self.assertRaises(SnapshotError):
+            prepare_restore(self.storage, bad)
+
+        self.assertFalse((self.root / "taxclip.db.restore").exists())
+        self.assertEqual(len(self.storage.list_items(limit=500)), 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,1043 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+from clipstack.sensitive_detector import (
+    SensitiveDataDetector,
+    detection_fingerprint,
+    get_sensitive_detector,
+    stored_categories,
+)
+from clipstack.smart_content import CLASSIFIER_VERSION
+from clipstack.storage import (
+    SCHEMA_VERSION,
+    ClipChangeKind,
+    ClipItemType,
+    SearchCancelled,
+    Storage,
+    _content_hash,
+    _unhashed_mark,
+    _normalize_search_text,
+    _score_search_match,
+    _score_search_matches,
+    clip_page_cursor,
+)
+from clipstack.utils_crypto import encrypt_aes256, encrypt_bytes
+
+
+class _FakeSettings:
+    def __init__(self, **values):
+        self.values = {"max_items": 1000}
+        self.values.update(values)
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+class EncryptedStorageTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self._tmp.name) / "taxclip.db"
+        self.settings = _FakeSettings(encrypt_data=True, encryption_key="master password")
+        self.storage = Storage(self.db_path, self.settings)
+
+    def tearDown(self):
+        self.storage.stop_background_tasks()
+        self.storage.conn.close()
+        self._tmp.cleanup()
+
+    def _raw_row(self, item_id):
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            return conn.execute(
+                "SELECT text_content, image_blob FROM clip_items WHERE id = ?", (item_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+
+    def test_new_items_use_session_key_envelope(self):
+        row = self.storage.add_item(ClipItemType.TEXT, "merhaba dünya", None, None, "2024-01-01 10:00:00")
+
+        self.assertEqual(row["text_content"], "merhaba dünya")
+        self.assertTrue(self._raw_row(row["id"])[0].startswith("ENC2:"))
+
+    def test_legacy_rows_are_readable_and_reencrypted(self):
+        with self.storage._writing() as conn:
+            cur = conn.execute(
+                "INSERT INTO clip_items (created_at, item_type, text_content, image_blob) VALUES (?, ?, ?, ?)",
+                (
+                    "2024-01-01 10:00:00",
+                    int(ClipItemType.IMAGE),
+                    encrypt_aes256("eski metin", "master password"),
+                    encrypt_bytes(b"png-bytes", "master password"),
+                ),
+            )
+            conn.commit()
+        item_id = cur.lastrowid
+
+        self.assertEqual(self.storage.get_item(item_id)["image_blob"], b"png-bytes")
+
+        converted = self.storage._reencrypt_legacy_rows(
+            "master password", self.storage._get_session_key()
+        )
+
+        self.assertEqual(converted, 2)
+        text_value, blob_value = self._raw_row(item_id)
+        self.assertTrue(text_value.startswith("ENC2:"))
+        self.assertTrue(blob_value.startswith(b"ENC2"))
+        row = self.storage.get_item(item_id)
+        self.assertEqual(row["text_content"], "eski metin")
+        self.assertEqual(row["image_blob"], b"png-bytes")
+
+    def test_key_cache_miss_does_not_deadlock_with_an_open_write(self):
+        with self.storage._key_lock:
+            self.storage._key_cache = {}
+        writer_ready = threading.Event()
+        release_writer = threading.Event()
+        results = {}
+
+        def writer():
+            with self.storage._writing():
+                writer_ready.set()
+                release_writer.wait(5)
+                results["writer"] = self.storage._encrypt_text_field("yazıcı")
+
+        def reader():
+            results["reader"] = self.storage._get_session_key()
+
+        threads = [threading.Thread(target=writer, daemon=True), threading.Thread(target=reader, daemon=True)]
+        threads[0].start()
+        self.assertTrue(writer_ready.wait(5))
+        threads[1].start()
+        time.sleep(0.2)  # okuyucu önbellek kaçırıp tuzu beklemeye başlasın
+        release_writer.set()
+        for thread in threads:
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+
+        self.assertTrue(results["writer"].startswith("ENC2:"))
+        self.assertEqual(results["reader"], self.storage._get_session_key())
+
+    def test_notes_and_reminders_round_trip(self):
+        note = self.storage.add_note("not içeriği", "2024-01-01 10:00:00")
+        reminder = self.storage.add_reminder("başlık", "açıklama", "2024-01-02 10:00:00")
+
+        self.assertEqual(self.storage.get_note(note["id"])["content"], "not içeriği")
+        self.assertEqual(self.storage.get_reminder(reminder["id"])["title"], "başlık")
+        self.assertEqual(self.storage.list_reminders()[0]["description"], "açıklama")
+
+
+class SearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.storage = Storage(Path(self._tmp.name) / "taxclip.db", _FakeSettings())
+
+    def tearDown(self):
+        self.storage.conn.close()
+        self._tmp.cleanup()
+
+    def _add(self, text=None, html=None, item_type=ClipItemType.TEXT):
+        return self.storage.add_item(item_type, text, None, html, "2024-01-01 10:00:00")["id"]
+
+    def _search_ids(self, query, **kwargs):
+        return [row["id"] for row in self.storage.search_items(query, **kwargs)]
+
+    def test_search_uses_turkish_folding_and_strips_html(self):
+        text_id = self._add("Işık İstanbul'da yanıyor")
+        html_id = self._add(html="<b>ISIK</b> <span>gece</span>", item_type=ClipItemType.HTML)
+        self._add("alakasız içerik")
+
+        self.assertEqual(set(self._search_ids("isik")), {text_id, html_id})
+        self.assertEqual(self._search_ids("span"), [])
+
+    def test_search_matches_short_prefix_and_fuzzy_terms(self):
+        target_id = self._add("bilgisayar klavyesi")
+        self._add("masa lambası")
+
+        self.assertEqual(self._search_ids("kl"), [target_id])
+        self.assertEqual(self._search_ids("bilgisyar"), [target_id])
+
+    def test_deleted_items_leave_the_index(self):
+        item_id = self._add("silinecek kayıt")
+
+        self.storage.delete_item(item_id)
+
+        self.assertEqual(self._search_ids("silinecek"), [])
+        count = self.storage.conn.execute("SELECT COUNT(*) FROM clip_search").fetchone()[0]
+        self.assertEqual(count, 0)
+
+    def test_encrypted_items_are_not_indexed_but_still_searchable(self):
+        self.storage.settings.values.update(encrypt_data=True, encryption_key="pw")
+        item_id = self._add("gizli toplantı notu")
+
+        count = self.storage.conn.execute(
+            "SELECT COUNT(*) FROM clip_search WHERE rowid = ?", (item_id,)
+        ).fetchone()[0]
+        self.assertEqual(count, 0)
+        self.assertEqual(self._search_ids("toplanti"), [item_id])
+
+    def test_iter_search_streams_the_first_batch_then_the_full_ranking(self):
+        ids = [self._add(f"rapor {i}") for i in range(30)]
+
+        batches = list(self.storage.iter_search("rapor", fuzzy_threshold=60, limit=25, first_batch=5))
+
+        self.assertEqual([done for _, done in batches], [False] * (len(batches) - 1) + [True])
+        self.assertEqual(len(batches[0][0]), 5)
+        final = [row["id"] for row in batches[-1][0]]
+        self.assertEqual(final, self._search_ids("rapor", fuzzy_threshold=60, limit=25))
+        self.assertEqual(final[:5], [row["id"] for row in batches[0][0]])
+        self.assertEqual(set(final), set(ids[-25:]))
+
+    def test_iter_search_stops_between_chunks_when_cancelled(self):
+        self.storage.settings.values.update(encrypt_data=True, encryption_key="pw")
+        for i in range(450):
+            self._add(f"gizli kayıt {i}")
+        cancel = threading.Event()
+        decrypted = []
+        original = self.storage._decrypt_row_fields
+
+        def decrypt(row, columns):
+            decrypted.append(row["id"])
+            if len(decrypted) == 10:
+                cancel.set()
+            return original(row, columns)
+
+        with mock.patch.object(self.storage, "_decrypt_row_fields", side_effect=decrypt):
+            with self.assertRaises(SearchCancelled):
+                list(self.storage.iter_search("kayit", cancel=cancel))
+
+        self.assertLessEqual(len(decrypted), 200)
+
+    def test_extended_query_rescores_only_the_previous_candidates(self):
+        self.storage.settings.values.update(encrypt_data=True, encryption_key="pw")
+        matching = {self._add(f"rapor {i}") for i in range(5)}
+        for i in range(40):
+            self._add(f"fatura {i}")
+        self.assertEqual(set(self._search_ids("rap")), matching)
+
+        with mock.patch.object(
+            self.storage, "_decrypt_row_fields", wraps=self.storage._decrypt_row_fields
+        ) as decrypt:
+            self.assertEqual(set(self._search_ids("rapo")), matching)
+
+        self.assertEqual(decrypt.call_count, len(matching))
+        self.assertEqual(self.storage._search_cache.hits, 1)
+
+    def test_refinement_cache_follows_inserts_and_deletes(self):
+        first = self._add("parola defteri")
+        second = self._add("parola listesi")
+        self.assertEqual(set(self._search_ids("par")), {first, second})
+
+        self.storage.delete_item(first)
+        self.assertEqual(self._search_ids("paro"), [second])
+
+        third = self._add("parola kasası")
+        self.assertEqual(set(self._search_ids("parol")), {second, third})
+
+
+class SearchScoringTests(unittest.TestCase):
+    def test_batched_scores_match_row_by_row_scoring(self):
+        words = ["bilgisayar", "bilgisyar", "klavye", "rapor", "raporlar", "fatura", "e-posta", "c++", "masa"]
+        bodies = {
+            i: _normalize_search_text(" ".join(words[(i * 7 + k) % len(words)] for k in range(i % 5 + 1)))
+            for i in range(200)
+        }
+        bodies[200] = ""
+        bodies[201] = "-- ,,"
+
+        for query in ("bilgisayar", "bilgisayr", "rapo", "klavyx", "rapor fatura", "rapor faturs", "c++", "e-pos"):
+            with self.subTest(query=query):
+                normalized_query = _normalize_search_text(query)
+                expected = {i: _score_search_match(normalized_query, body) for i, body in bodies.items()}
+                self.assertEqual(_score_search_matches(normalized_query, bodies), expected)
+
+    def test_tiers_are_preserved(self):
+        scores = _score_search_matches("rapor", {1: "rapor", 2: "raporlar", 3: "yillikrapor", 4: "masa"})
+        self.assertEqual(scores, {1: 100, 2: 98, 3: 96, 4: 0})
+
+
+class ListItemsPaginationTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.storage = Storage(Path(self._tmp.name) / "taxclip.db", _FakeSettings())
+        self.ids = []
+        for i in range(12):
+            item_type = ClipItemType.FILE if i % 3 == 0 else ClipItemType.TEXT
+            row = self.storage.add_item(item_type, f"öğe {i}", None, None, "2024-01-01 10:00:00")
+            self.ids.append(row["id"])
+        self.storage.set_favorite(self.ids[2], True)
+        self.storage.set_pinned(self.ids[5], True)
+
+    def tearDown(self):
+        self.storage.conn.close()
+        self._tmp.cleanup()
+
+    def _page_through(self, page_size, **kwargs):
+        seen = []
+        cursor = None
+        while True:
+            rows = self.storage.list_items(limit=page_size, after=cursor, **kwargs)
+            if not rows:
+                return seen
+            seen.extend(row["id"] for row in rows)
+            cursor = clip_page_cursor(rows[-1])
+
+    def test_keyset_pages_follow_list_order(self):
+        expected = [row["id"] for row in self.storage.list_items(limit=100, offset=0)]
+
+        self.assertEqual(expected[:2], [self.ids[5], self.ids[2]])
+        self.assertEqual(self._page_through(5), expected)
+        self.assertEqual(len(expected), 12)
+
+    def test_item_type_filter_is_applied_in_sql(self):
+        file_ids = self._page_through(2, item_types=[ClipItemType.FILE])
+
+        self.assertEqual(file_ids, [self.ids[9], self.ids[6], self.ids[3], self.ids[0]])
+        text_ids = self._page_through(3, item_types=[ClipItemType.TEXT, ClipItemType.HTML])
+        self.assertEqual(text_ids[:2], [self.ids[5], self.ids[2]])
+        self.assertEqual(len(text_ids), 8)
+
+    def test_favorites_only_pages(self):
+        self.assertEqual(self._page_through(1, favorites_only=True), [self.ids[5], self.ids[2]])
+
+
+def _png_bytes(width, height):
+    from PySide6.QtCore import QBuffer, QIODevice
+    from PySide6.QtGui import QColor, QImage
+
+    image = QImage(width, height, QImage.Format_ARGB32)
+    image.fill(QColor("#3366cc"))
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(buffer.data())
+
+
+class ThumbnailTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.storage = Storage(
+            Path(self._tmp.name) / "taxclip.db",
+            _FakeSettings(encrypt_data=True, encryption_key="pw"),
+        )
+        self.png = _png_bytes(1200, 800)
+
+    def tearDown(self):
+        self.storage.conn.close()
+        self._tmp.cleanup()
+
+    def test_list_rows_carry_thumbnail_instead_of_full_image(self):
+        from PySide6.QtGui import QImage
+
+        item_id = self.storage.add_item(ClipItemType.IMAGE, None, self.png, None, "2024-01-01 10:00:00")["id"]
+
+        row = self.storage.list_items(limit=10)[0]
+        self.assertIsNone(row["image_blob"])
+        thumb = QImage.fromData(row["thumb_blob"])
+        self.assertLessEqual(thumb.width(), 240)
+        self.assertLessEqual(thumb.height(), 100)
+        self.assertEqual(self.storage.get_item(item_id)["image_blob"], self.png)
+
+    def test_missing_thumbnails_are_backfilled_once_in_the_background(self):
+        item_id = self.storage.add_item(ClipItemType.IMAGE, None, self.png, None, "2024-01-01 10:00:00")["id"]
+        broken_id = self.storage.add_item(ClipItemType.IMAGE, None, b"bozuk", None, "2024-01-01 10:00:00")["id"]
+        with self.storage._writing() as conn:
+            conn.execute("UPDATE clip_items SET thumb_blob = NULL")
+            conn.commit()
+
+        # Liste okuması tam görsele inmez ve yazmaz
+        with mock.patch.object(self.storage, "_writing", side_effect=AssertionError("yazma")):
+            rows = {row["id"]: row for row in self.storage.list_items(limit=10)}
+        self.assertIsNone(rows[item_id]["thumb_blob"])
+
+        changes = []
+        self.storage.subscribe_clip_changes(changes.append)
+        key = self.storage._get_session_key()
+        self.assertEqual(self.storage._backfill_thumbnails("pw", key), 1)
+
+        stored = dict(self.storage.conn.execute("SELECT id, thumb_blob FROM clip_items").fetchall())
+        self.assertTrue(bytes(stored[item_id]).startswith(b"ENC2"))
+        self.assertEqual(bytes(stored[broken_id]), b"")  # bozuk görsel işaretlendi, yeniden denenmez
+        self.assertEqual([change.ids for change in changes], [(item_id,)])
+        self.assertTrue(self.storage.list_items(limit=10)[-1]["thumb_blob"])
+        self.assertFalse(self.storage._has_missing_thumbnails())
+        self.assertEqual(self.storage._backfill_thumbnails("pw", key), 0)
+
+
+class DuplicateContentTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self._tmp.name) / "taxclip.db"
+        self.storage = Storage(self.db_path, _FakeSettings())
+
+    def tearDown(self):
+        self.storage.stop_background_tasks()
+        self.storage.conn.close()
+        self._tmp.cleanup()
+
+    def _add(self, text, item_type=ClipItemType.TEXT):
+        return self.storage.add_item(item_type, text, None, None, "2024-01-01 10:00:00")
+
+    def _count(self):
+        return self.storage.conn.execute("SELECT COUNT(*) FROM clip_items").fetchone()[0]
+
+    def test_recopying_an_older_item_moves_it_to_the_top(self):
+        first = self._add("ilk kayıt")
+        self._add("ikinci kayıt")
+        self.storage.set_favorite(first["id"], True)
+
+        changes = []
+        self.storage.subscribe_clip_changes(changes.append)
+        bumped = self.storage.add_item(ClipItemType.TEXT, "ilk kayıt", None, None, "2024-01-02 09:00:00")
+
+        # Satır kopyalanmaz: aynı id yerinde güncellenir ve silme kaydı oluşmaz
+        self.assertEqual(bumped["id"], first["id"])
+        self.assertEqual(bumped["use_count"], 1)
+        self.assertEqual(bumped["favorite"], 1)
+        self.assertEqual(bumped["created_at"], "2024-01-02 09:00:00")
+        self.assertEqual(self._count(), 2)
+        self.assertEqual([row["id"] for row in self.storage.search_items("ilk")], [first["id"]])
+        self.assertEqual(
+            self.storage.conn.execute("SELECT COUNT(*) FROM change_journal WHERE deleted = 1").fetchone()[0], 0
+        )
+        self.assertEqual([change.kind for change in changes], [ClipChangeKind.UPDATED])
+        self.assertIn("recency", changes[0].values)
+
+    def test_recopied_item_leads_its_group_across_pages(self):
+        ids = [self._add(f"kayıt {index}")["id"] for index in range(5)]
+
+        bumped = self._add("kayıt 1")
+        self.assertEqual(bumped["id"], ids[1])
+        # En yeni kaydın yeniden kopyalanması sırayı değiştirmez
+        self.assertIsNone(self._add("kayıt 1"))
+
+        first_page = self.storage.list_items(limit=2)
+        second_page = self.storage.list_items(limit=10, after=clip_page_cursor(first_page[-1]))
+        self.assertEqual(
+            [row["id"] for row in first_page + second_page], [ids[1], ids[4], ids[3], ids[2], ids[0]]
+        )
+        self.assertEqual(self.storage.get_last_item()["id"], ids[1])
+
+    def test_recopying_the_newest_item_only_counts_the_use(self):
+        row = self._add("aynı metin")
+
+        self.assertIsNone(self._add("aynı metin"))
+        self.assertEqual(self.storage.get_item(row["id"])["use_count"], 1)
+        self.assertEqual(self._count(), 1)
+
+    def test_same_content_with_another_type_is_not_a_duplicate(self):
+        self._add("C:/belgeler/rapor.txt")
+        self.assertIsNotNone(self._add("C:/belgeler/rapor.txt", ClipItemType.FILE))
+        self.assertEqual(self._count(), 2)
+
+    def test_encrypted_hash_is_keyed_and_blind_index_follows_the_row(self):
+        self.storage.settings.values.update(
+            encrypt_data=True, encryption_key="pw", encrypted_search_index=True
+        )
+        first = self._add("gizli içerik")
+        self._add("başka içerik")
+
+        stored = self.storage.conn.execute(
+            "SELECT content_hash FROM clip_items WHERE id = ?", (first["id"],)
+        ).fetchone()[0]
+        self.assertTrue(stored)
+        self.assertNotEqual(stored, _content_hash(ClipItemType.TEXT, "gizli içerik", None, None))
+
+        bumped = self._add("gizli içerik")
+        self.assertEqual(bumped["text_content"], "gizli içerik")
+        self.assertEqual([row["id"] for row in self.storage.search_items("gizli")], [bumped["id"]])
+
+    def test_existing_rows_are_hashed_once_in_the_background(self):
+        with self.storage._writing() as conn:
+            cur = conn.cursor()
+            for text in ("eski kayıt", "eski kayıt", ""):
+                cur.execute(
+                    "INSERT INTO clip_items (created_at, item_type, text_content) VALUES (?, ?, ?)",
+                    ("2024-01-01 10:00:00", int(ClipItemType.TEXT), text),
+                )
+                if text:
+                    newest_id = cur.lastrowid
+            empty_id = cur.lastrowid
+            conn.commit()
+
+        # Açılış özet taramasını çalıştırmaz; iş bakım thread'ine kalır
+        with mock.patch.object(Storage, "_backfill_content_hashes") as backfill:
+            Storage(self.storage.path, _FakeSettings()).close()
+        backfill.assert_not_called()
+        self.assertTrue(self.storage.start_background_maintenance())
+        self.storage._reencrypt_thread.join(5)
+
+        hashes = dict(self.storage.conn.execute("SELECT id, content_hash FROM clip_items").fetchall())
+        self.assertEqual(hashes[newest_id - 1], _unhashed_mark(newest_id - 1))
+        self.assertEqual(hashes[empty_id], _unhashed_mark(empty_id))
+        self.assertNotIn(None, hashes.values())
+        # Yinelenen ve boş kayıtlar işaretli: sonraki açılışlarda taranacak kayıt kalmaz
+        self.assertFalse(self.storage.start_background_maintenance())
+        self.assertEqual(self.storage._backfill_content_hashes(), 0)
+        self._add("yeni kayıt")
+        bumped = self._add("eski kayıt")
+        self.assertEqual(bumped["id"], newest_id)
+
+
+class BlindIndexSearchTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self._tmp.name) / "taxclip.db"
+        self.settings = _FakeSettings(
+            encrypt_data=True,
+            encryption_key="master password",
+            encrypted_search_index=True,
+        )
+        self.storage = Storage(self.db_path, self.settings)
+
+    def tearDown(self):
+        self.storage.stop_background_tasks()
+        self.storage.conn.close()
+        self._tmp.cleanup()
+
+    def _add(self, text):
+        return self.storage.add_item(ClipItemType.TEXT, text, None, None, "2024-01-01 10:00:00")["id"]
+
+    def test_blind_index_stores_no_plaintext_and_finds_matches(self):
+        target_id = self._add("Toplantı notları istanbul")
+        self._add("alışveriş listesi")
+
+        tokens = self.storage.conn.execute("SELECT token FROM clip_blind_index").fetchall()
+        self.assertTrue(tokens)
+        self.assertFalse(any(b"topl" in bytes(row[0]) for row in tokens))
+        self.assertEqual([row["id"] for row in self.storage.search_items("toplanti")], [target_id])
+        self.assertEqual([row["id"] for row in self.storage.search_items("istnbul")], [target_id])
+
+    def test_backfill_indexes_existing_encrypted_rows(self):
+        self.settings.values["encrypted_search_index"] = False
+        item_id = self._add("eski şifreli kayıt")
+        self.settings.values["encrypted_search_index"] = True
+
+        added = self.storage._backfill_blind_index(
+            "master password",
+            self.storage._get_session_key(),
+            self.storage._get_blind_index_key(),
+        )
+
+        self.assertEqual(added, 1)
+        self.assertEqual([row["id"] for row in self.storage.search_items("kayit")], [item_id])
+
+    def test_disabling_the_option_clears_the_index(self):
+        self._add("geçici kayıt")
+        self.settings.values["encrypted_search_index"] = False
+
+        self.storage.sync_blind_index()
+
+        count = self.storage.conn.execute("SELECT COUNT(*) FROM clip_blind_index").fetchone()[0]
+        self.assertEqual(count, 0)
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.storage = Storage(Path(self._tmp.name) / "taxclip.db", _FakeSettings())
+
+    def tearDown(self):
+        self.storage.close()
+        self._tmp.cleanup()
+
+    def _in_thread(self, func):
+        result = {}
+
+        def run():
+            try:
+                result["value"] = func()
+            except Exception as e:
+                result["error"] = e
+            finally:
+                self.storage.close_thread_connection()
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join(5)
+        if "error" in result:
+            raise result["error"]
+        return result.get("value")
+
+    def test_writer_uses_wal_with_tuned_pragmas(self):
+        with self.storage._writing() as conn:
+            self.assertIs(self.storage.conn, conn)
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+            self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -8192)
+
+    def test_owner_thread_reads_do_not_see_another_threads_open_write(self):
+        self.storage.add_item(ClipItemType.TEXT, "kayıt", None, None, "2024-01-01 10:00:00")
+        started = threading.Event()
+        release = threading.Event()
+
+        def write():
+            with self.storage._writing() as conn:
+                conn.execute(
+                    "INSERT INTO clip_items (created_at, item_type, text_content) VALUES (?, ?, ?)",
+                    ("2024-01-01 10:00:00", int(ClipItemType.TEXT), "commit edilmemiş"),
+                )
+                started.set()
+                release.wait(5)
+                conn.rollback()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            self.assertTrue(started.wait(5))
+            self.assertEqual(self.storage.conn.execute("PRAGMA query_only").fetchone()[0], 1)
+            self.assertEqual(len(self.storage.list_items(limit=10)), 1)
+        finally:
+            release.set()
+            writer.join(5)
+        self.assertEqual(len(self.storage.list_items(limit=10)), 1)
+
+    def test_background_threads_read_from_the_pool_and_write_through_the_lock(self):
+        self.storage.add_item(ClipItemType.TEXT, "ilk", None, None, "2024-01-01 10:00:00")
+
+        def work():
+            query_only = self.storage.conn.execute("PRAGMA query_only").fetchone()[0]
+            row = self.storage.add_item(ClipItemType.TEXT, "thread", None, None, "2024-01-01 10:00:00")
+            return query_only, row["text_content"], len(self.storage.list_items(limit=10))
+
+        self.assertEqual(self._in_thread(work), (1, "thread", 2))
+        self.assertEqual(len(self.storage.list_items(limit=10)), 2)
+
+    def test_maintenance_passes_write_through_the_shared_writer(self):
+        with self.storage._writing() as conn:
+            for i in range(3):
+                conn.execute(
+                    "INSERT INTO clip_items (created_at, item_type, text_content) VALUES (?, ?, ?)",
+                    ("2024-01-01 10:00:00", int(ClipItemType.TEXT), f"eski kayıt {i}"),
+                )
+            conn.commit()
+        started = threading.Event()
+
+        def hold_write():
+            # İçe aktarma partisi gibi açık bir yazma işlemi
+            with self.storage._writing() as conn:
+                conn.execute(
+                    "INSERT INTO notes (created_at, content) VALUES (?, ?)", ("2024-01-01 10:00:00", "not")
+                )
+                started.set()
+                time.sleep(0.3)
+                conn.commit()
+
+        holder = threading.Thread(target=hold_write)
+        holder.start()
+        self.assertTrue(started.wait(5))
+        begun = time.perf_counter()
+        updated = self.storage._backfill_content_hashes()
+        elapsed = time.perf_counter() - begun
+        holder.join(5)
+
+        self.assertEqual(updated, 3)
+        self.assertGreater(elapsed, 0.1)
+        self.assertEqual(len(self.storage.list_notes()), 1)
+
+    def test_close_connections_retires_readers_that_are_still_checked_out(self):
+        pool = self.storage._pool
+        reader = pool.acquire_reader()
+        generation = pool.generation
+
+        pool.close_connections()
+        pool.release_reader(reader)
+
+        self.assertEqual(pool.generation, generation + 1)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            reader.execute("SELECT 1")
+        self.assertEqual(self._in_thread(lambda: len(self.storage.list_items(limit=10))), 0)
+
+    def test_readers_do_not_wait_for_an_open_write_transaction(self):
+        self.storage.add_item(ClipItemType.TEXT, "kayıt", None, None, "2024-01-01 10:00:00")
+
+        with self.storage._writing() as conn:
+            conn.execute(
+                "INSERT INTO clip_items (created_at, item_type, text_content) VALUES (?, ?, ?)",
+                ("2024-01-01 10:00:00", int(ClipItemType.TEXT), "commit edilmemiş"),
+            )
+            started = time.perf_counter()
+            count = self._in_thread(lambda: len(self.storage.list_items(limit=10)))
+            elapsed = time.perf_counter() - started
+            conn.rollback()
+
+        self.assertEqual(count, 1)
+        self.assertLess(elapsed, 1.0)
+
+
+class SchemaMigrationTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self._tmp.name) / "taxclip.db"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _user_version(self):
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_migrated_database_opens_without_running_migrations(self):
+        storage = Storage(self.db_path, _FakeSettings())
+        storage.add_item(ClipItemType.TEXT, "kayıt", None, None, "2024-01-01 10:00:00")
+        storage.close()
+        self.assertEqual(self._user_version(), SCHEMA_VERSION)
+
+        with mock.patch.object(Storage, "_migrate_v1_baseline") as baseline, mock.patch.object(
+            Storage, "_backfill_search_index"
+        ) as backfill:
+            storage = Storage(self.db_path, _FakeSettings())
+            try:
+                self.assertEqual([row["text_content"] for row in storage.search_items("kayıt")], ["kayıt"])
+            finally:
+                storage.close()
+
+        baseline.assert_not_called()
+        backfill.assert_not_called()
+
+    def test_legacy_database_is_upgraded_and_indexed_once(self):
+        conn = sqlite3.connect(str(self.db_path))
+        conn.executescript(
+            """
+            CREATE TABLE clip_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT NOT NULL,
+                item_type INTEGER NOT NULL,
+                text_content TEXT,
+                image_blob BLOB,
+                html_content TEXT,
+                favorite INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE todos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT NOT NULL,
+                content TEXT NOT NULL,
+                completed INTEGER NOT NULL DEFAULT 0,
+                completed_at TEXT
+            );
+            INSERT INTO clip_items (created_at, item_type, text_content) VALUES ('2024-01-01 10:00:00', 0, 'eski kayıt');
+            INSERT INTO todos (created_at, content) VALUES ('2024-01-01 10:00:00', 'eski görev');
+            """
+        )
+        conn.close()
+
+        storage = Storage(self.db_path, _FakeSettings())
+        try:
+            self.assertIn("pending_ocr", storage._clip_columns)
+            self.assertNotIn("image_blob", storage._clip_list_columns)
+            self.assertEqual([row["text_content"] for row in storage.search_items("eski")], ["eski kayıt"])
+            todos = storage.conn.execute("SELECT list_id, content FROM todos").fetchall()
+            self.assertEqual([tuple(row) for row in todos], [(1, "eski görev")])
+        finally:
+            storage.close()
+        self.assertEqual(self._user_version(), SCHEMA_VERSION)
+
+
+class ClipChangeEventTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.settings = _FakeSettings(max_items=3)
+        self.storage = Storage(Path(self._tmp.name) / "taxclip.db", self.settings)
+        self.changes = []
+        self.unsubscribe = self.storage.subscribe_clip_changes(self.changes.append)
+
+    def tearDown(self):
+        self.storage.stop_background_tasks()
+        self.storage.close()
+        self._tmp.cleanup()
+
+    def _add(self, text):
+        return self.storage.add_item(ClipItemType.TEXT, text, None, None, "2024-01-01 10:00:00")
+
+    def test_mutations_publish_typed_changes(self):
+        row = self._add("ilk")
+        self.storage.set_favorite(row["id"], True)
+        self.storage.update_item_meta(row["id"], custom_title="Başlık")
+        self.storage.delete_item(row["id"])
+        self.storage.clear_all()
+
+        kinds = [change.kind for change in self.changes]
+        self.assertEqual(
+            kinds,
+            [
+                ClipChangeKind.INSERTED,
+                ClipChangeKind.UPDATED,
+                ClipChangeKind.UPDATED,
+                ClipChangeKind.DELETED,
+                ClipChangeKind.CLEARED,
+            ],
+        )
+        inserted, favorited, renamed, deleted, _ = self.changes
+        self.assertEqual(inserted.rows[0]["text_content"], "ilk")
+        self.assertEqual(favorited.values, {"favorite": 1})
+        self.assertEqual(favorited.rows[0]["favorite"], 1)
+        self.assertEqual(renamed.columns, frozenset({"custom_title"}))
+        self.assertEqual(deleted.ids, (row["id"],))
+
+    def test_trimmed_rows_are_deleted_and_bumped_rows_updated(self):
+        first = self._add("bir")
+        self._add("iki")
+        self._add("üç")
+        self._add("dört")
+        self.assertIn((ClipChangeKind.DELETED, (first["id"],)), [(c.kind, c.ids) for c in self.changes])
+
+        self.changes.clear()
+        second = self.storage.list_items(limit=10)[-1]
+        bumped = self._add(second["text_content"])
+
+        self.assertEqual(bumped["id"], second["id"])
+        self.assertEqual([(c.kind, c.ids) for c in self.changes], [(ClipChangeKind.UPDATED, (second["id"],))])
+        self.assertEqual(self.changes[0].rows[0]["id"], second["id"])
+
+    def test_unsubscribe_stops_delivery(self):
+        self.unsubscribe()
+        self._add("sessiz")
+        self.assertEqual(self.changes, [])
+
+
+class SmartContentColumnsTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self._tmp.name) / "taxclip.db"
+        self.settings = _FakeSettings()
+        self.storage = Storage(self.db_path, self.settings)
+
+    def tearDown(self):
+        self.storage.stop_background_tasks()
+        self.storage.close()
+        self._tmp.cleanup()
+
+    def test_classification_is_stored_at_ingest(self):
+        url = self.storage.add_item(ClipItemType.TEXT, "https://example.com/a", None, None, "2024-01-01 10:00:00")
+        html = self.storage.add_item(
+            ClipItemType.HTML, None, None, "<p>Merhaba <b>dünya</b></p><script>x()</script>", "2024-01-01 10:00:00"
+        )
+
+        self.assertEqual(url["smart_kind"], "url")
+        self.assertEqual(url["smart_version"], CLASSIFIER_VERSION)
+        self.assertIsNone(url["plain_text"])
+        self.assertEqual(html["plain_text"], "Merhaba dünya")
+        self.assertEqual(html["smart_title"], "Merhaba dünya")
+
+    def test_stale_rows_are_reclassified_and_published(self):
+        row = self.storage.add_item(ClipItemType.TEXT, "#ff8800", None, None, "2024-01-01 10:00:00")
+        with self.storage._writing() as conn:
+            conn.execute("UPDATE clip_items SET smart_kind = NULL, smart_version = 0 WHERE id = ?", (row["id"],))
+            conn.commit()
+        changes = []
+        self.storage.subscribe_clip_changes(changes.append)
+
+        self.assertEqual(self.storage._reclassify_clips(), 1)
+        self.assertEqual(self.storage._reclassify_clips(), 0)
+
+        stored = self.storage.get_item(row["id"])
+        self.assertEqual(stored["smart_kind"], "hex_color")
+        self.assertEqual(stored["smart_version"], CLASSIFIER_VERSION)
+        self.assertEqual([(c.kind, c.ids) for c in changes], [(ClipChangeKind.UPDATED, (row["id"],))])
+        self.assertEqual(changes[0].values["smart_summary"], "RGB(255, 136, 0)")
+
+    def test_smart_text_is_encrypted_at_rest(self):
+        self.storage.close()
+        settings = _FakeSettings(encrypt_data=True, encryption_key="master password")
+        self.storage = Storage(self.db_path, settings)
+        row = self.storage.add_item(ClipItemType.TEXT, "gizli not", None, None, "2024-01-01 10:00:00")
+
+        self.assertEqual(row["smart_title"], "gizli not")
+        raw = self.storage.conn.execute(
+            "SELECT smart_kind, smart_title, smart_summary FROM clip_items WHERE id = ?", (row["id"],)
+        ).fetchone()
+        self.assertEqual(raw["smart_kind"], "plain")
+        self.assertTrue(raw["smart_title"].startswith("ENC2:"))
+        self.assertTrue(raw["smart_summary"].startswith("ENC2:"))
+
+
+class SensitiveCategoriesTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.settings = _FakeSettings()
+        self.storage = Storage(Path(self._tmp.name) / "taxclip.db", self.settings)
+
+    def tearDown(self):
+        self.storage.stop_background_tasks()
+        self.storage.close()
+        self._tmp.cleanup()
+
+    def test_categories_are_stored_with_the_settings_fingerprint(self):
+        row = self.storage.add_item(ClipItemType.TEXT, "password: hunter2", None, None, "2024-01-01 10:00:00")
+        plain = self.storage.add_item(ClipItemType.TEXT, "sıradan metin", None, None, "2024-01-01 10:00:00")
+
+        self.assertEqual(row["sensitive_categories"], "passwords")
+        self.assertEqual(row["sensitive_fingerprint"], detection_fingerprint(self.settings))
+        self.assertEqual(stored_categories(row, self.settings), ["passwords"])
+        self.assertEqual(stored_categories(plain, self.settings), [])
+
+        self.settings.set("mask_passwords", False)
+        self.assertIsNone(stored_categories(row, self.settings))
+
+    def test_settings_change_rescans_only_stale_rows(self):
+        row = self.storage.add_item(ClipItemType.TEXT, "password: hunter2", None, None, "2024-01-01 10:00:00")
+        self.storage.add_item(ClipItemType.TEXT, "sıradan metin", None, None, "2024-01-01 10:00:00")
+        changes = []
+        self.storage.subscribe_clip_changes(changes.append)
+        self.assertFalse(self.storage.start_sensitive_rescan())
+
+        self.settings.set("mask_passwords", False)
+        self.assertEqual(self.storage._rescan_sensitive(), 1)
+        self.assertEqual(self.storage._rescan_sensitive(), 0)
+
+        stored = self.storage.get_item(row["id"])
+        self.assertEqual(stored_categories(stored, self.settings), [])
+        self.assertEqual([(c.kind, c.ids) for c in changes], [(ClipChangeKind.UPDATED, (row["id"],))])
+
+    def test_blocked_content_does_not_bump_its_earlier_copy(self):
+        row = self.storage.add_item(ClipItemType.TEXT, "password: hunter2", None, None, "2024-01-01 10:00:00")
+        self.storage.add_item(ClipItemType.TEXT, "sıradan metin", None, None, "2024-01-01 10:00:00")
+        changes = []
+        self.storage.subscribe_clip_changes(changes.append)
+
+        self.settings.set("block_sensitive_data", True)
+        blocked = self.storage.add_item(ClipItemType.TEXT, "password: hunter2", None, None, "2024-01-02 10:00:00")
+
+        self.assertIsNone(blocked)
+        self.assertEqual(changes, [])
+        stored = self.storage.get_item(row["id"])
+        self.assertEqual((stored["created_at"], stored["use_count"]), (row["created_at"], row["use_count"]))
+        self.assertNotEqual(self.storage.list_items(limit=1)[0]["id"], row["id"])
+
+    def test_ingest_reuses_the_callers_scan(self):
+        text = "e-posta ali@example.com"
+        scan = get_sensitive_detector(self.settings).scan(text)
+
+        with mock.patch.object(SensitiveDataDetector, "scan", side_effect=AssertionError("rescan")):
+            row = self.storage.add_item(
+                ClipItemType.TEXT, text, None, None, "2024-01-01 10:00:00", sensitive_scan=scan
+            )
+
+        self.assertEqual(row["text_content"], text)
+        self.assertEqual(row["sensitive_categories"], "")
+
+
+class RetentionTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.settings = _FakeSettings()
+        self.storage = Storage(self.root / "taxclip.db", self.settings)
+        self.changes = []
+        self.storage.subscribe_clip_changes(self.changes.append)
+
+    def tearDown(self):
+        self.storage.stop_background_tasks()
+        self.storage.close()
+        self._tmp.cleanup()
+
+    def _add(self, text, created_at="2024-01-01 10:00:00"):
+        return self.storage.add_item(ClipItemType.TEXT, text, None, None, created_at)
+
+    def _deleted_batches(self):
+        return [len(change.ids) for change in self.changes if change.kind == ClipChangeKind.DELETED]
+
+    def test_stats_follow_inserts_updates_and_deletes(self):
+        first = self._add("ilk kayıt")
+        second = self._add("ikinci kayıt")
+        third = self._add("üçüncü kayıt")
+        self.storage.set_favorite(first["id"], True)
+        with self.storage._writing() as conn:
+            conn.execute(
+                "UPDATE clip_items SET text_content = ? WHERE id = ?", ("uzatılmış üçüncü kayıt " * 20, third["id"])
+            )
+            conn.commit()
+        self.storage.delete_item(second["id"])
+
+        stats = self.storage.clip_stats()
+
+        self.assertEqual(stats["item_count"], 2)
+        self.assertEqual(stats["unfavorited_count"], 1)
+        self.assertGreater(stats["payload_bytes"], 0)
+        self.assertEqual(stats, self.storage.rebuild_clip_stats())
+
+    def test_max_items_trims_in_amortized_batches(self):
+        self.settings.set("max_items", 100)
+        for i in range(101):
+            self._add(f"kayıt {i}")
+
+        # Sınır aşılınca %2 pay kadar fazlası silinir; sonraki eklemeler silmez
+        self.assertEqual(self._deleted_batches(), [3])
+        self.assertEqual(self.storage.clip_stats()["unfavorited_count"], 98)
+        self._add("kayıt 101")
+        self._add("kayıt 102")
+        self.assertEqual(self._deleted_batches(), [3])
+        self.assertEqual(self.storage.clip_stats()["unfavorited_count"], 100)
+
+    def test_byte_quota_removes_the_oldest_unprotected_rows(self):
+        self.settings.set("max_history_mb", 1)
+        favorite = self._add("f" * 300_000)
+        self.storage.set_favorite(favorite["id"], True)
+        rows = [self._add(f"{i}" + "x" * 300_000) for i in range(4)]
+
+        stats = self.storage.clip_stats()
+        remaining = {row["id"] for row in self.storage.list_items(limit=10)}
+
+        self.assertLessEqual(stats["payload_bytes"], 1024 * 1024)
+        self.assertIn(favorite["id"], remaining)
+        self.assertIn(rows[-1]["id"], remaining)
+        self.assertNotIn(rows[0]["id"], remaining)
+
+    def test_auto_delete_compares_timestamps_across_formats(self):
+        self.settings.values.update(auto_delete_enabled=True, auto_delete_days=1)
+        now = datetime.now()
+        old = self._add("üç gün önce", (now - timedelta(days=3)).isoformat())
+        # Kesim gününde "T"li ISO kayıt dizgi olarak boşluklu kesimden büyük görünür
+        expired = self._add("kesimden önce", (now - timedelta(days=1, hours=1)).isoformat())
+        kept = self._add("kesimden sonra", (now - timedelta(hours=23)).strftime("%Y-%m-%d %H:%M:%S"))
+        favorite = self._add("eski favori", (now - timedelta(days=3)).isoformat())
+        self.storage.set_favorite(favorite["id"], True)
+
+        result = self.storage.apply_retention()
+
+        self.assertEqual(result["expired"], 2)
+        remaining = {row["id"] for row in self.storage.list_items(limit=10)}
+        self.assertEqual(remaining, {kept["id"], favorite["id"]})
+        self.assertNotIn(old["id"], remaining)
+        self.assertNotIn(expired["id"], remaining)
+
+    def test_orphaned_external_images_are_cleaned_up(self):
+        folder = self.root / "gorseller"
+        self.settings.values.update(save_images_externally=True, external_images_path=str(folder))
+        kept = self.storage.add_item(ClipItemType.IMAGE, None, _png_bytes(20, 20), None, "2024-01-01 10:00:00")
+        removed = self.storage.add_item(ClipItemType.IMAGE, None, _png_bytes(30, 30), None, "2024-01-01 10:00:01")
+        paths = dict(self.storage.conn.execute("SELECT id, text_content FROM clip_items").fetchall())
+        kept_path = Path(paths[kept["id"]])
+        removed_path = Path(paths[removed["id"]])
+        self.storage.delete_item(removed["id"])
+        fresh = folder / "img_yazılıyor.png"
+        fresh.write_bytes(b"png")
+        unrelated = folder / "baska.png"
+        unrelated.write_bytes(b"png")
+        stale = time.time() - 2 * 3600
+        for path in (kept_path, removed_path, unrelated):
+            os.utime(path, (stale, stale))
+
+        result = self.storage.apply_retention()
+
+        self.assertEqual(result["orphans"], 1)
+        self.assertTrue(kept_path.exists())
+        self.assertFalse(removed_path.exists())
+        self.assertTrue(fresh.exists())
+        self.assertTrue(unrelated.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,18 @@
 import base64
 import unittest
 
-from clipstack.utils_crypto import decrypt_aes256, encrypt_aes256, hash_password, verify_password
+from clipstack.utils_crypto import (
+    decrypt_aes256,
+    decrypt_bytes_envelope,
+    decrypt_text_envelope,
+    derive_master_key,
+    encrypt_aes256,
+    encrypt_bytes,
+    encrypt_bytes_with_key,
+    encrypt_text_with_key,
+    hash_password,
+    verify_password,
+)
 
 
 class CryptoUtilsTests(unittest.TestCase):
@@ -22,6 +33,26 @@ class CryptoUtilsTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             decrypt_aes256(unsupported_payload, "password")
 
+    def test_v2_envelope_round_trip_with_session_key(self):
+        key = derive_master_key("master", b"0123456789abcdef")
+        encrypted = encrypt_text_with_key("gizli veri", key)
+
+        self.assertTrue(encrypted.startswith("ENC2:"))
+        self.assertEqual(decrypt_text_envelope(encrypted, "master", key), "gizli veri")
+
+    def test_v2_envelope_rejects_wrong_key(self):
+        encrypted = encrypt_text_with_key("gizli veri", derive_master_key("a", b"0123456789abcdef"))
+
+        with self.assertRaises(ValueError):
+            decrypt_text_envelope(encrypted, "b", derive_master_key("b", b"0123456789abcdef"))
+
+    def test_envelope_helpers_still_read_legacy_payloads(self):
+        key = derive_master_key("master", b"0123456789abcdef")
+
+        self.assertEqual(decrypt_text_envelope(encrypt_aes256("eski", "master"), "master", key), "eski")
+        self.assertEqual(decrypt_bytes_envelope(encrypt_bytes(b"png", "master"), "master", key), b"png")
+        self.assertEqual(decrypt_bytes_envelope(encrypt_bytes_with_key(b"png", key), "master", key), b"png")
+
     def test_password_hash_verify(self):
         stored_hash = hash_password("master password")
 
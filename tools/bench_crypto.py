@@ -0,0 +1,74 @@
+"""
+Şifreli depolama ölçümü: eski (kayıt başına PBKDF2) format ile oturum
+anahtarlı ENC2 formatının liste yükleme süresini karşılaştırır.
+
+Kullanım:
+    python tools/bench_crypto.py [öğe_sayısı]
+"""
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from clipstack.storage import ClipItemType, Storage  # noqa: E402
+from clipstack.utils_crypto import encrypt_aes256  # noqa: E402
+
+PASSWORD = "bench password"
+
+
+class _Settings:
+    def __init__(self):
+        self._data = {"encrypt_data": True, "encryption_key": PASSWORD, "max_items": 100000}
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def set(self, key, value):
+        self._data[key] = value
+
+
+def _seed_legacy(storage: Storage, count: int) -> None:
+    with storage._writing() as conn:
+        cur = conn.cursor()
+        for i in range(count):
+            cur.execute(
+                "INSERT INTO clip_items (created_at, item_type, text_content) VALUES (?, ?, ?)",
+                ("2024-01-01 10:00:00", int(ClipItemType.TEXT), encrypt_aes256(f"eski öğe {i}", PASSWORD)),
+            )
+        conn.commit()
+
+
+def _time_list(storage: Storage, count: int) -> float:
+    start = time.perf_counter()
+    rows = storage.list_items(limit=count)
+    elapsed = time.perf_counter() - start
+    assert len(rows) == count
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = Storage(Path(tmp) / "bench.db", _Settings())
+        print(f"{count} eski formatlı öğe oluşturuluyor...")
+        _seed_legacy(storage, count)
+
+        legacy = _time_list(storage, count)
+        print(f"Eski format   : {legacy * 1000:9.1f} ms  ({legacy * 1000 / count:.2f} ms/öğe)")
+
+        start = time.perf_counter()
+        converted = storage._reencrypt_legacy_rows(PASSWORD, storage._get_session_key())
+        print(f"Geçiş         : {(time.perf_counter() - start) * 1000:9.1f} ms  ({converted} alan)")
+
+        current = _time_list(storage, count)
+        print(f"ENC2 (oturum) : {current * 1000:9.1f} ms  ({current * 1000 / count:.2f} ms/öğe)")
+        if current > 0:
+            print(f"Hızlanma      : {legacy / current:.0f}x")
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
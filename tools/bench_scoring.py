@@ -0,0 +1,80 @@
+"""
+Arama puanlama ölçümü: kayıt başına _score_search_match ile toplu
+_score_search_matches (rapidfuzz.process.cdist) motorunu 10k ve 100k
+arama gövdesinde karşılaştırır; iki yolun skorlarının aynı olduğunu da
+doğrular.
+
+Kullanım:
+    python tools/bench_scoring.py [satır_sayısı ...]
+"""
+from pathlib import Path
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from clipstack.storage import (  # noqa: E402
+    _normalize_search_text,
+    _score_search_match,
+    _score_search_matches,
+)
+
+ROWS = (10_000, 100_000)
+# (etiket, sorgu): önek katmanı, tek terim bulanık, çok terim bulanık
+QUERIES = (
+    ("önek", "topl"),
+    ("tek terim", "bilgisyar"),
+    ("çok terim", "rapor faturs"),
+)
+WORDS = (
+    "merhaba dünya ışık istanbul ankara python kodu şifre örnek kitap masa kalem "
+    "bilgisayar klavye ekran pencere toplantı rapor fatura sipariş müşteri proje"
+).split()
+
+
+def _make_bodies(count: int) -> dict:
+    random.seed(count)
+    vocab = WORDS + [
+        "".join(random.choice(string.ascii_lowercase) for _ in range(random.randint(3, 10)))
+        for _ in range(5000)
+    ]
+    return {
+        i: _normalize_search_text(" ".join(random.choice(vocab) for _ in range(random.randint(4, 24))))
+        for i in range(count)
+    }
+
+
+def _best(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or list(ROWS)
+    print(f"{'satır':>8} {'sorgu':<12} {'tek tek':>10} {'toplu':>10} {'hız':>6} {'eşleşme':>8}")
+    for count in sizes:
+        bodies = _make_bodies(count)
+        repeat = 3 if count <= 20_000 else 1
+        for label, query in QUERIES:
+            normalized_query = _normalize_search_text(query)
+            scalar, expected = _best(
+                lambda: {i: _score_search_match(normalized_query, body) for i, body in bodies.items()}, repeat
+            )
+            batched, scores = _best(lambda: _score_search_matches(normalized_query, bodies), repeat)
+            if scores != expected:
+                raise SystemExit(f"Skorlar farklı: {query!r}")
+            matches = sum(1 for score in scores.values() if score > 0)
+            print(
+                f"{count:>8} {label:<12} {scalar * 1000:8.1f}ms {batched * 1000:8.1f}ms "
+                f"{scalar / batched:5.1f}x {matches:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Arama ölçümü: şifresiz (FTS5), şifreli tam tarama ve şifreli kör indeks
+modlarında search_items gecikmesini karşılaştırır. "yazarken" satırı bir
+sorgunun harf harf yazılışında tuş başına ortalama süredir (önceki sorgunun
+aday önbelleğiyle / önbelleksiz).
+
+Kullanım:
+    python tools/bench_search.py [öğe_sayısı]
+"""
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from clipstack.storage import (  # noqa: E402
+    ClipItemType,
+    Storage,
+    _build_search_body,
+    _write_blind_index,
+)
+
+WORDS = (
+    "merhaba dünya ışık istanbul ankara python kodu şifre örnek kitap masa kalem "
+    "bilgisayar klavye ekran pencere toplantı rapor fatura sipariş müşteri proje"
+).split()
+QUERIES = ("istanbul", "topl", "bilgisyar", "rapor fatura", "kl", "bulunmayan")
+TYPED_QUERY = "toplanti"
+
+
+class _Settings:
+    def __init__(self, **values):
+        self._data = {"max_items": 10 ** 9}
+        self._data.update(values)
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def set(self, key, value):
+        self._data[key] = value
+
+
+def _seed(storage: Storage, count: int) -> None:
+    """add_item yerine tek işlemde toplu ekleme (kurulumu hızlandırmak için)."""
+    random.seed(7)
+    encrypting = bool(storage._get_encryption_password())
+    blind_key = storage._get_blind_index_key()
+    with storage._writing() as conn:
+        cur = conn.cursor()
+        for i in range(count):
+            text = " ".join(random.choice(WORDS) for _ in range(8)) + f" #{i}"
+            body = _build_search_body(ClipItemType.TEXT, text, None, None)
+            cur.execute(
+                "INSERT INTO clip_items (created_at, item_type, text_content) VALUES (?, ?, ?)",
+                ("2024-01-01 10:00:00", int(ClipItemType.TEXT), storage._encrypt_text_field(text)),
+            )
+            if not encrypting:
+                storage._update_search_index(cur.lastrowid, body, commit=False)
+            elif blind_key:
+                _write_blind_index(conn, blind_key, cur.lastrowid, body)
+        conn.commit()
+
+
+def _run(label: str, count: int, **settings) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = Storage(Path(tmp) / "bench.db", _Settings(**settings))
+        _seed(storage, count)
+        timings = []
+        for query in QUERIES:
+            start = time.perf_counter()
+            storage.search_items(query)
+            timings.append((query, (time.perf_counter() - start) * 1000))
+        for cached in (False, True):
+            storage._search_cache.clear()
+            start = time.perf_counter()
+            for end in range(1, len(TYPED_QUERY) + 1):
+                if not cached:
+                    storage._search_cache.clear()
+                storage.search_items(TYPED_QUERY[:end])
+            per_key = (time.perf_counter() - start) * 1000 / len(TYPED_QUERY)
+            timings.append(("yazarken" + (" (önbellek)" if cached else ""), per_key))
+        storage.close()
+    print(f"{label}:")
+    for query, ms in timings:
+        print(f"    {query:<22} {ms:9.1f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"{count} öğe ile arama süreleri")
+    _run("Şifresiz (FTS5)", count)
+    _run("Şifreli, tam tarama", count, encrypt_data=True, encryption_key="bench")
+    _run(
+        "Şifreli, kör indeks",
+        count,
+        encrypt_data=True,
+        encryption_key="bench",
+        encrypted_search_index=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
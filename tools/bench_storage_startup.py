@@ -0,0 +1,108 @@
+"""
+Açılış ölçümü: büyük bir veritabanında Storage() oluşturma süresi.
+
+Önce güncel şemalı bir veritabanı hazırlanır, ardından Storage birkaç kez
+açılıp kapatılarak ortanca süre ölçülür (tam göç edilmiş açılış). Aynı
+veritabanında şema sürümü sıfırlanarak eski (sürümsüz) bir veritabanının
+ilk açılışı da ölçülür.
+
+Kullanım:
+    python tools/bench_storage_startup.py [öğe_sayısı] [tekrar]
+"""
+from pathlib import Path
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from clipstack.storage import ClipItemType, Storage, _build_search_body, _content_hash  # noqa: E402
+
+WORDS = (
+    "merhaba dünya ışık istanbul ankara python kodu şifre örnek kitap masa kalem "
+    "bilgisayar klavye ekran pencere toplantı rapor fatura sipariş müşteri proje"
+).split()
+
+
+class _Settings:
+    def __init__(self, **values):
+        self._data = {"max_items": 10 ** 9}
+        self._data.update(values)
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def set(self, key, value):
+        self._data[key] = value
+
+
+def _seed(storage: Storage, count: int) -> None:
+    """add_item yerine tek işlemde toplu ekleme (kurulumu hızlandırmak için)."""
+    random.seed(7)
+    with storage._writing() as conn:
+        cur = conn.cursor()
+        for i in range(count):
+            text = " ".join(random.choice(WORDS) for _ in range(8)) + f" #{i}"
+            cur.execute(
+                "INSERT INTO clip_items (created_at, item_type, text_content, content_hash) VALUES (?, ?, ?, ?)",
+                (
+                    "2024-01-01 10:00:00",
+                    int(ClipItemType.TEXT),
+                    text,
+                    _content_hash(ClipItemType.TEXT, text, None, None),
+                ),
+            )
+            storage._update_search_index(cur.lastrowid, _build_search_body(ClipItemType.TEXT, text, None, None), commit=False)
+        for i in range(count // 10):
+            cur.execute(
+                "INSERT INTO notes (created_at, content) VALUES (?, ?)",
+                ("2024-01-01 10:00:00", " ".join(random.choice(WORDS) for _ in range(20))),
+            )
+        conn.commit()
+
+
+def _open_ms(path: Path) -> float:
+    start = time.perf_counter()
+    storage = Storage(path, _Settings())
+    elapsed = (time.perf_counter() - start) * 1000
+    storage.stop_background_tasks()
+    storage.close()
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        storage = Storage(path, _Settings())
+        _seed(storage, count)
+        storage.close()
+        size_mb = path.stat().st_size / (1024 * 1024)
+        print(f"{count} öğe, {size_mb:.1f} MB veritabanı, {repeat} tekrar")
+
+        _open_ms(path)  # ısınma (işletim sistemi önbelleği)
+        timings = [_open_ms(path) for _ in range(repeat)]
+        print(
+            f"    Güncel şema       ortanca {statistics.median(timings):8.2f} ms"
+            f"   en kötü {max(timings):8.2f} ms"
+        )
+
+        legacy = []
+        for _ in range(max(1, repeat // 2)):
+            conn = sqlite3.connect(str(path))
+            conn.execute("PRAGMA user_version = 0")
+            conn.commit()
+            conn.close()
+            legacy.append(_open_ms(path))
+        print(
+            f"    Sürümsüz ilk açılış ortanca {statistics.median(legacy):8.2f} ms"
+            f"   en kötü {max(legacy):8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()